@@ -19,6 +19,29 @@ from pathlib import Path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from policy_as_code.features.rego import load_rego_policy  # noqa: E402
+
+QUERY = "data.org.policy_as_code.loan_approval.v1"
+
+
+def run_rego_evaluation(input_data, policy_path):
+    """
+    Evaluate the policy in-process, without the OPA binary
+
+    The policy directory is compiled once and cached; the result has the
+    same shape as ``opa eval`` output.
+    """
+    try:
+        document = load_rego_policy(policy_path).evaluate(input_data)
+        return {
+            "success": True,
+            "result": {
+                "result": [{"expressions": [{"value": document, "text": QUERY}]}]
+            },
+        }
+    except Exception as e:
+        return {"success": False, "error": f"Rego evaluation failed: {str(e)}"}
+
 
 def run_opa_evaluation(input_data, policy_path):
     """
@@ -31,6 +54,9 @@ def run_opa_evaluation(input_data, policy_path):
     Returns:
         Dictionary with OPA evaluation result
     """
+    if not (project_root / "opa").exists():
+        return run_rego_evaluation(input_data, policy_path)
+
     try:
         # Convert input to JSON
         input_json = json.dumps(input_data)
@@ -43,7 +69,7 @@ def run_opa_evaluation(input_data, policy_path):
             policy_path,
             "-i",
             "-",
-            "data.org.policy_as_code.loan_approval.v1",
+            QUERY,
         ]
 
         result = subprocess.run(
@@ -99,7 +125,7 @@ def opa_loan_approval(input_data):
         # Extract decision from OPA result
         opa_result = result["result"]
         if "result" in opa_result and len(opa_result["result"]) > 0:
-            decision_data = opa_result["result"][0]
+            decision_data = opa_result["result"][0]["expressions"][0]["value"]
 
             print("📋 OPA Decision Result:")
             print(f"   Approved: {decision_data.get('approved', False)}")
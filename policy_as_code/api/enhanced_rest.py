@@ -5,7 +5,7 @@ FastAPI-based API with OpenAPI 3.0 documentation
 
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
-from uuid import UUID
+from uuid import uuid4
 import json
 import hashlib
 import time
@@ -21,11 +21,16 @@ from fastapi import (
     Header,
 )
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field
 
+from policy_as_code.core.admission import AdmissionRejectedError
+from policy_as_code.core.circuit_breaker import CircuitOpenError
 from policy_as_code.core.enhanced_engine import DecisionEngine
+from policy_as_code.core.errors import ExecutionTimeoutError
 from policy_as_code.core.types import DecisionContext, DecisionResult
+from policy_as_code.utils.canonical import CanonicalPayload
 from policy_as_code.core.security import SecurityConfig, SecurityManager
 from policy_as_code.api.graphql_api import create_graphql_router
 from policy_as_code.api.websocket_api import WebSocketHandler
@@ -181,6 +186,7 @@ async def root():
         "version": "1.0.0",
         "docs": "/docs",
         "health": "/health",
+        "ready": "/ready",
     }
 
 
@@ -196,6 +202,15 @@ async def health_check():
     )
 
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until startup warm-up has finished"""
+    readiness = decision_engine.readiness_check()
+    if not readiness["ready"]:
+        return JSONResponse(status_code=503, content=readiness)
+    return readiness
+
+
 @app.post("/decisions", response_model=DecisionResponse)
 async def execute_decision(
     request: DecisionRequest,
@@ -217,8 +232,11 @@ async def execute_decision(
                 detail="Invalid X-ROAD-CLIENT format. Expected: xroad:FI/ORG/...",
             )
 
+        # Canonicalise and hash the input once for every downstream consumer
+        canonical_input = CanonicalPayload.of(request.input_data)
+
         # Check idempotency
-        idempotency_key = get_idempotency_key(request, x_road_client)
+        idempotency_key = get_idempotency_key(request, x_road_client, canonical_input)
         if idempotency_key in idempotency_cache:
             cached_result = idempotency_cache[idempotency_key]
             # Check if cache entry is still valid (5 minutes TTL)
@@ -226,15 +244,13 @@ async def execute_decision(
                 return cached_result["response"]
 
         # Create decision context
-        input_hash = hashlib.sha256(
-            json.dumps(request.input_data, sort_keys=True).encode()
-        ).hexdigest()
         context = DecisionContext(
             function_id=request.function_id,
             version=request.version,
-            input_hash=input_hash,
+            input_hash=canonical_input.digest,
             timestamp=datetime.now(),
-            trace_id=request.trace_id or str(UUID()),
+            trace_id=request.trace_id or str(uuid4()),
+            canonical_input=canonical_input,
         )
 
         # Execute decision
@@ -243,6 +259,7 @@ async def execute_decision(
             version=request.version,
             input_data=request.input_data,
             context=context,
+            client_id=x_road_client,
         )
 
         # Create response
@@ -272,13 +289,27 @@ async def execute_decision(
 
     except HTTPException:
         raise
+    except (AdmissionRejectedError, CircuitOpenError) as e:
+        raise HTTPException(
+            status_code=e.http_status,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, round(e.retry_after_seconds)))},
+        )
+    except ExecutionTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-def get_idempotency_key(request: DecisionRequest, x_road_client: str) -> str:
+def get_idempotency_key(
+    request: DecisionRequest,
+    x_road_client: str,
+    canonical_input: Optional[CanonicalPayload] = None,
+) -> str:
     """Generate idempotency key from request"""
-    key_data = f"{x_road_client}:{request.function_id}:{request.version}:{hashlib.sha256(str(request.input_data).encode()).hexdigest()}"
+    if canonical_input is None:
+        canonical_input = CanonicalPayload.of(request.input_data)
+    key_data = f"{x_road_client}:{request.function_id}:{request.version}:{canonical_input.digest}"
     return hashlib.sha256(key_data.encode()).hexdigest()
 
 
@@ -1231,12 +1262,27 @@ def register_use_cases():
     )
 
 
+# Canary input per function ID, run once during startup warm-up
+warm_up_canary_inputs: Dict[str, Dict[str, Any]] = {}
+
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
     """Initialize the API on startup"""
     register_use_cases()
-    print("Policy as Code API started successfully")
+    report = await decision_engine.warm_up(canary_inputs=warm_up_canary_inputs)
+    for failure in report.failed:
+        logger.warning(
+            "Warm-up failed for %s:%s: %s",
+            failure.function_id,
+            failure.version,
+            failure.error,
+        )
+    print(
+        f"Policy as Code API started successfully "
+        f"({report.warmed} functions warmed in {report.duration_ms:.0f} ms)"
+    )
 
 
 # Shutdown event
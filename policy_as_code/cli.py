@@ -339,6 +339,93 @@ def info(function_id: str, version: Optional[str]):
         click.echo(f"Metadata: {entry['metadata']}")
 
 
+@cli.command()
+@click.option("--storage", default="./functions", help="Function storage path")
+@click.option(
+    "--versions",
+    type=click.Choice(["latest", "active", "all"]),
+    default="latest",
+    help="Which versions to warm",
+)
+@click.option("--canaries", help="JSON file mapping function IDs to canary inputs")
+@click.option("--concurrency", default=8, help="Functions warmed in parallel")
+def warmup(storage: str, versions: str, canaries: Optional[str], concurrency: int):
+    """Compile and canary-run deployed functions, failing on any error"""
+    import asyncio
+
+    from policy_as_code.core.engine import DecisionEngine as CoreDecisionEngine
+
+    canary_inputs = None
+    if canaries:
+        with open(canaries, "r") as f:
+            canary_inputs = json.load(f)
+
+    engine = CoreDecisionEngine(
+        config={
+            "storage": {"path": storage},
+            "plugins": {"tracing": {"enabled": False}},
+        }
+    )
+    click.echo(f"🔥 Warming {versions} versions from {storage}...")
+    report = asyncio.run(engine.warm_up(versions, canary_inputs, concurrency))
+
+    click.echo(
+        f"✅ Warmed {report.warmed} function versions " f"in {report.duration_ms:.0f} ms"
+    )
+    for failure in report.failed:
+        click.echo(f"❌ {failure.function_id} v{failure.version}: {failure.error}")
+    if report.failed:
+        sys.exit(1)
+
+
+@cli.command("rebuild-stats")
+@click.option("--storage", default="./functions", help="Function storage path")
+@click.option(
+    "--decision-log", is_flag=True, help="Decisions are stored in a segmented log"
+)
+@click.option("--postgres", help="PostgreSQL connection string to rebuild instead")
+@click.option("--check", is_flag=True, help="Only verify, do not replace the rollups")
+def rebuild_stats(
+    storage: str, decision_log: bool, postgres: Optional[str], check: bool
+):
+    """Recompute decision statistics from stored decisions and verify them"""
+    import asyncio
+
+    from policy_as_code.core.storage import create_storage_backend
+
+    if postgres:
+        backend = create_storage_backend("postgresql", {"connection_string": postgres})
+    else:
+        backend = create_storage_backend(
+            "file", {"path": storage, "decision_log": {"enabled": decision_log}}
+        )
+
+    async def rebuild():
+        try:
+            return await backend.rebuild_decision_stats(dry_run=check)
+        finally:
+            if postgres:
+                await backend.close()
+
+    report = asyncio.run(rebuild())
+    click.echo(
+        f"📊 {report['decisions']} decisions over {report['days']} days "
+        f"for {report['functions']} functions"
+    )
+    for mismatch in report["mismatches"]:
+        click.echo(
+            f"❌ {mismatch['function_id']} {mismatch['day']}: "
+            f"expected {mismatch['expected']['total']} decisions, "
+            f"rollup had {mismatch['actual']['total']}"
+        )
+    if not report["mismatches"]:
+        click.echo("✅ Rollups match the stored decisions")
+    elif check:
+        sys.exit(1)
+    else:
+        click.echo(f"🔧 Replaced {len(report['mismatches'])} rollups")
+
+
 @cli.command()
 def status():
     """Check system status"""
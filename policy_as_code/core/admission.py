@@ -0,0 +1,492 @@
+"""
+Admission control for decision execution
+
+Caps in-flight executions globally and per function. Callers beyond a cap
+wait in a bounded queue for at most ``queue_timeout_seconds``; when the queue
+is full, or the wait runs out, the request is rejected immediately with
+:class:`AdmissionRejectedError` so clients can back off and retry instead of
+piling up behind a saturated engine.
+
+Waiters for the global cap are queued per client (an X-Road client or tenant
+id) and granted slots by deficit round robin with configurable weights, so a
+client running a bulk job cannot starve interactive clients while still using
+any capacity they leave idle.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+from .errors import DecisionLayerError
+
+DEFAULT_CLIENT = "default"
+# Stats bucket for clients evicted from the per-client table
+OTHER_CLIENTS = "(other)"
+
+
+class AdmissionRejectedError(DecisionLayerError):
+    """Request rejected by admission control; safe to retry later"""
+
+    retryable = True
+
+    def __init__(
+        self,
+        function_id: str,
+        reason: str,
+        retry_after_seconds: float = 1.0,
+    ):
+        self.function_id = function_id
+        self.reason = reason  # "queue_full" or "queue_timeout"
+        self.retry_after_seconds = retry_after_seconds
+        super().__init__(
+            f"Admission rejected for {function_id}: {reason.replace('_', ' ')}"
+        )
+
+    @property
+    def http_status(self) -> int:
+        """429 when the wait queue is full, 503 when the queue wait timed out"""
+        return 429 if self.reason == "queue_full" else 503
+
+
+@dataclass
+class AdmissionConfig:
+    """Concurrency limits and queue bounds"""
+
+    enabled: bool = True
+    # None means unlimited
+    max_concurrency: Optional[int] = 256
+    function_concurrency: Optional[int] = None
+    function_limits: Dict[str, int] = field(default_factory=dict)
+    max_queue_size: int = 1000
+    queue_timeout_seconds: float = 5.0
+    retry_after_seconds: float = 1.0
+    # Weighted fair queuing across clients for the global cap
+    fair_scheduling: bool = True
+    client_weights: Dict[str, float] = field(default_factory=dict)
+    default_client_weight: float = 1.0
+    # Per-client bound on queued requests; None means only max_queue_size
+    client_queue_size: Optional[int] = None
+    # Client ids come from request headers, so per-client stats are kept for
+    # the most recently seen clients only; older ones fold into OTHER_CLIENTS
+    max_tracked_clients: int = 1000
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "AdmissionConfig":
+        """Build from an ``admission`` config section"""
+        defaults = cls()
+        return cls(
+            enabled=config.get("enabled", defaults.enabled),
+            max_concurrency=config.get("max_concurrency", defaults.max_concurrency),
+            function_concurrency=config.get(
+                "function_concurrency", defaults.function_concurrency
+            ),
+            function_limits=dict(config.get("function_limits", {})),
+            max_queue_size=config.get("max_queue_size", defaults.max_queue_size),
+            queue_timeout_seconds=config.get(
+                "queue_timeout_seconds", defaults.queue_timeout_seconds
+            ),
+            retry_after_seconds=config.get(
+                "retry_after_seconds", defaults.retry_after_seconds
+            ),
+            fair_scheduling=config.get("fair_scheduling", defaults.fair_scheduling),
+            client_weights=dict(config.get("client_weights", {})),
+            default_client_weight=config.get(
+                "default_client_weight", defaults.default_client_weight
+            ),
+            client_queue_size=config.get(
+                "client_queue_size", defaults.client_queue_size
+            ),
+            max_tracked_clients=config.get(
+                "max_tracked_clients", defaults.max_tracked_clients
+            ),
+        )
+
+    def weight_for(self, client_id: str) -> float:
+        """Scheduling weight of a client"""
+        return self.client_weights.get(client_id, self.default_client_weight)
+
+
+class _Limiter:
+    """Counting limit with a bounded FIFO wait queue"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiters: "List[asyncio.Future[None]]" = []
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def queued_for(self, client_id: str) -> int:
+        return 0
+
+    def try_acquire(self, client_id: str = DEFAULT_CLIENT) -> bool:
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return True
+        return False
+
+    async def wait(self, timeout: float, client_id: str = DEFAULT_CLIENT) -> bool:
+        """Queue for a slot; False if the timeout expires first"""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+            return True
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # Granted just as the deadline passed; hand the slot back
+                self.release()
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        # Hand the slot directly to the next waiter so it cannot be stolen
+        while self._waiters:
+            waiter = self._waiters.pop(0)
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class _FairLimiter:
+    """Counting limit whose waiters are served by weighted deficit round robin
+
+    Each client with waiters sits in a ring. Visiting a client adds its
+    weight to its deficit; every granted slot costs one unit. A client keeps
+    the turn while its deficit lasts, so over a busy period clients receive
+    slots in proportion to their weights, and a client with nothing queued
+    leaves the ring and forfeits its deficit.
+    """
+
+    def __init__(self, limit: int, config: "AdmissionConfig"):
+        self.limit = limit
+        self.active = 0
+        self._config = config
+        self._queues: "Dict[str, Deque[asyncio.Future[None]]]" = {}
+        self._ring: Deque[str] = deque()
+        self._deficit: Dict[str, float] = {}
+        # Whether the client at the head of the ring has had its quantum
+        self._head_credited = False
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def queued_for(self, client_id: str) -> int:
+        queue = self._queues.get(client_id)
+        return len(queue) if queue else 0
+
+    def try_acquire(self, client_id: str = DEFAULT_CLIENT) -> bool:
+        if self.active < self.limit and not self._ring:
+            self.active += 1
+            return True
+        return False
+
+    async def wait(self, timeout: float, client_id: str = DEFAULT_CLIENT) -> bool:
+        """Queue for a slot; False if the timeout expires first"""
+        waiter = asyncio.get_running_loop().create_future()
+        queue = self._queues.get(client_id)
+        if queue is None:
+            queue = self._queues[client_id] = deque()
+            self._ring.append(client_id)
+            self._deficit[client_id] = 0.0
+        queue.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), timeout)
+            return True
+        except asyncio.TimeoutError:
+            if waiter.done():
+                self.release()
+            return False
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in queue:
+                queue.remove(waiter)
+                if not queue:
+                    self._drop(client_id)
+
+    def _drop(self, client_id: str) -> None:
+        # An idle client leaves the ring and forfeits its deficit
+        if self._ring[0] == client_id:
+            self._head_credited = False
+        self._ring.remove(client_id)
+        del self._queues[client_id]
+        del self._deficit[client_id]
+
+    def _next_waiter(self) -> "Optional[asyncio.Future[None]]":
+        while self._ring:
+            client_id = self._ring[0]
+            if not self._head_credited:
+                self._deficit[client_id] += max(
+                    self._config.weight_for(client_id), 0.01
+                )
+                self._head_credited = True
+            if self._deficit[client_id] >= 1:
+                self._deficit[client_id] -= 1
+                queue = self._queues[client_id]
+                waiter = queue.popleft()
+                if not queue:
+                    self._drop(client_id)
+                return waiter
+            # Turn over to the next client
+            self._ring.rotate(-1)
+            self._head_credited = False
+        return None
+
+    def release(self) -> None:
+        # Hand the slot directly to the next waiter so it cannot be stolen
+        waiter = self._next_waiter()
+        if waiter is not None:
+            waiter.set_result(None)
+            return
+        self.active -= 1
+
+
+@dataclass
+class _ClientStats:
+    """Admission outcomes and latency for one client"""
+
+    admitted: int = 0
+    rejected: int = 0
+    completed: int = 0
+    total_wait_ms: float = 0.0
+    total_latency_ms: float = 0.0
+    # Recent samples for percentiles
+    latencies_ms: Deque[float] = field(default_factory=lambda: deque(maxlen=1024))
+
+    def merge(self, other: "_ClientStats") -> None:
+        self.admitted += other.admitted
+        self.rejected += other.rejected
+        self.completed += other.completed
+        self.total_wait_ms += other.total_wait_ms
+        self.total_latency_ms += other.total_latency_ms
+        self.latencies_ms.extend(other.latencies_ms)
+
+    def p99_latency_ms(self) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)]
+
+
+class AdmissionController:
+    """Global and per-function concurrency limits with bounded queues"""
+
+    def __init__(self, config: Optional[AdmissionConfig] = None, monitor=None):
+        self.config = config or AdmissionConfig()
+        self.monitor = monitor
+        self._global: Optional[Any] = None
+        if self.config.max_concurrency:
+            self._global = (
+                _FairLimiter(self.config.max_concurrency, self.config)
+                if self.config.fair_scheduling
+                else _Limiter(self.config.max_concurrency)
+            )
+        self._functions: Dict[str, _Limiter] = {}
+        # Least recently seen first
+        self._clients: "OrderedDict[str, _ClientStats]" = OrderedDict()
+        self._other_clients = _ClientStats()
+        self.admitted = 0
+        self.queued = 0
+        self.rejected: Dict[str, int] = {"queue_full": 0, "queue_timeout": 0}
+        self._total_wait_ms = 0.0
+        self._max_wait_ms = 0.0
+
+    @classmethod
+    def from_config(
+        cls, config: Optional[Dict[str, Any]] = None, monitor=None
+    ) -> "AdmissionController":
+        """Build from an ``admission`` config section"""
+        return cls(AdmissionConfig.from_config(config or {}), monitor)
+
+    def _function_limiter(self, function_id: str) -> Optional[_Limiter]:
+        limiter = self._functions.get(function_id)
+        if limiter is None:
+            limit = self.config.function_limits.get(
+                function_id, self.config.function_concurrency
+            )
+            if not limit:
+                return None
+            limiter = self._functions[function_id] = _Limiter(limit)
+        return limiter
+
+    def queue_depth(self) -> int:
+        """Requests currently waiting for a slot"""
+        depth = self._global.queued if self._global else 0
+        return depth + sum(limiter.queued for limiter in self._functions.values())
+
+    def _client_stats(self, client_id: str) -> _ClientStats:
+        stats = self._clients.get(client_id)
+        if stats is not None:
+            self._clients.move_to_end(client_id)
+            return stats
+        stats = self._clients[client_id] = _ClientStats()
+        while len(self._clients) > max(self.config.max_tracked_clients, 1):
+            _, evicted = self._clients.popitem(last=False)
+            self._other_clients.merge(evicted)
+        return stats
+
+    @asynccontextmanager
+    async def admit(
+        self, function_id: str, client_id: Optional[str] = None
+    ) -> AsyncIterator[None]:
+        """Hold an execution slot for function_id for the duration of the block
+
+        ``client_id`` (a client or tenant id) selects the fair-queuing lane
+        for the global cap; requests without one share a default lane.
+        """
+        if not self.config.enabled:
+            yield
+            return
+
+        client_id = client_id or DEFAULT_CLIENT
+
+        # Per-function before global, released in reverse, so a request
+        # blocked on its own function never holds a global slot
+        limiters = [
+            limiter
+            for limiter in (self._function_limiter(function_id), self._global)
+            if limiter is not None
+        ]
+        started = time.perf_counter()
+        deadline = started + self.config.queue_timeout_seconds
+        acquired: List[_Limiter] = []
+        waited = False
+        client_queue_size = self.config.client_queue_size
+        try:
+            for limiter in limiters:
+                if limiter.try_acquire(client_id):
+                    acquired.append(limiter)
+                    continue
+                if limiter.queued >= self.config.max_queue_size or (
+                    client_queue_size is not None
+                    and limiter.queued_for(client_id) >= client_queue_size
+                ):
+                    self._reject(function_id, client_id, "queue_full", started)
+                waited = True
+                remaining = max(deadline - time.perf_counter(), 0.0)
+                if not await limiter.wait(remaining, client_id):
+                    self._reject(function_id, client_id, "queue_timeout", started)
+                acquired.append(limiter)
+        except BaseException:
+            for limiter in reversed(acquired):
+                limiter.release()
+            raise
+
+        self._record_admitted(function_id, client_id, started, waited)
+        try:
+            yield
+        finally:
+            for limiter in reversed(acquired):
+                limiter.release()
+            self._record_latency(function_id, client_id, started)
+
+    def _record_admitted(
+        self, function_id: str, client_id: str, started: float, waited: bool
+    ):
+        wait_ms = (time.perf_counter() - started) * 1000
+        self.admitted += 1
+        if waited:
+            self.queued += 1
+        self._total_wait_ms += wait_ms
+        self._max_wait_ms = max(self._max_wait_ms, wait_ms)
+        client = self._client_stats(client_id)
+        client.admitted += 1
+        client.total_wait_ms += wait_ms
+        if self.monitor is not None:
+            self.monitor.record_admission(
+                function_id, True, wait_ms, self.queue_depth(), client_id=client_id
+            )
+
+    def _record_latency(self, function_id: str, client_id: str, started: float):
+        latency_ms = (time.perf_counter() - started) * 1000
+        client = self._client_stats(client_id)
+        client.completed += 1
+        client.total_latency_ms += latency_ms
+        client.latencies_ms.append(latency_ms)
+        if self.monitor is not None:
+            self.monitor.record_admission_latency(function_id, client_id, latency_ms)
+
+    def _reject(self, function_id: str, client_id: str, reason: str, started: float):
+        wait_ms = (time.perf_counter() - started) * 1000
+        self.rejected[reason] += 1
+        self._client_stats(client_id).rejected += 1
+        if self.monitor is not None:
+            self.monitor.record_admission(
+                function_id,
+                False,
+                wait_ms,
+                self.queue_depth(),
+                reason,
+                client_id=client_id,
+            )
+        raise AdmissionRejectedError(
+            function_id, reason, self.config.retry_after_seconds
+        )
+
+    def get_client_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-client admissions, queue share and latency"""
+        queued_for = self._global.queued_for if self._global else None
+        clients = list(self._clients.items())
+        if self._other_clients.admitted or self._other_clients.rejected:
+            clients.append((OTHER_CLIENTS, self._other_clients))
+        stats = {}
+        for client_id, client in clients:
+            stats[client_id] = {
+                "weight": self.config.weight_for(client_id),
+                "admitted": client.admitted,
+                "rejected": client.rejected,
+                "queued": queued_for(client_id) if queued_for else 0,
+                "share": client.admitted / self.admitted if self.admitted else 0.0,
+                "avg_wait_ms": (
+                    client.total_wait_ms / client.admitted if client.admitted else 0.0
+                ),
+                "avg_latency_ms": (
+                    client.total_latency_ms / client.completed
+                    if client.completed
+                    else 0.0
+                ),
+                "p99_latency_ms": client.p99_latency_ms(),
+            }
+        return stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get admission statistics"""
+        return {
+            "enabled": self.config.enabled,
+            "max_concurrency": self.config.max_concurrency,
+            "active": self._global.active if self._global else None,
+            "queue_depth": self.queue_depth(),
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected": dict(self.rejected),
+            "avg_wait_ms": (
+                self._total_wait_ms / self.admitted if self.admitted else 0.0
+            ),
+            "max_wait_ms": self._max_wait_ms,
+            "fair_scheduling": self.config.fair_scheduling,
+            "clients": self.get_client_stats(),
+            "functions": {
+                function_id: {
+                    "limit": limiter.limit,
+                    "active": limiter.active,
+                    "queued": limiter.queued,
+                }
+                for function_id, limiter in self._functions.items()
+            },
+        }
@@ -34,6 +34,7 @@ from ..validation.strict_models import (
 )
 from .types import DecisionFunction
 from .errors import ValidationError, ExecutionError
+from ..utils.canonical import canonical_hash
 
 
 class BulletproofDecisionFlow:
@@ -267,23 +268,7 @@ class BulletproofDecisionFlow:
 
     def _calculate_hash(self, data: Dict[str, Any]) -> str:
         """Calculate SHA-256 hash of data"""
-
-        # Convert various objects to JSON serializable format
-        def json_serializer(obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            elif hasattr(obj, "__str__") and (
-                "Url" in str(type(obj)) or "URL" in str(type(obj))
-            ):
-                return str(obj)
-            elif hasattr(obj, "url"):  # Pydantic URL objects
-                return str(obj.url)
-            raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
-
-        json_str = json.dumps(
-            data, sort_keys=True, separators=(",", ":"), default=json_serializer
-        )
-        return hashlib.sha256(json_str.encode()).hexdigest()
+        return canonical_hash(data)
 
     async def _create_trace_record(
         self, context: DecisionContext, result: DecisionResult, client_id: Optional[str]
@@ -0,0 +1,231 @@
+"""
+Circuit breakers for decision functions
+
+One breaker per ``function_id:version`` tracks call outcomes over a rolling
+time window. When the error or timeout rate crosses its threshold (after a
+minimum number of calls) the breaker opens and calls fail fast with
+:class:`CircuitOpenError`. After ``open_seconds`` it half-opens and lets a
+limited number of probe calls through: a successful probe closes it again, a
+failed one re-opens it.
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from .errors import DecisionLayerError
+
+
+class CircuitState(str, Enum):
+    """Breaker states"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(DecisionLayerError):
+    """Call rejected because the function's circuit breaker is open"""
+
+    retryable = True
+    http_status = 503
+
+    def __init__(self, key: str, retry_after_seconds: float):
+        self.key = key
+        self.retry_after_seconds = retry_after_seconds
+        super().__init__(f"Circuit open for {key}; retry in {retry_after_seconds:.1f}s")
+
+
+@dataclass
+class CircuitBreakerConfig:
+    """Rolling-window thresholds and recovery settings"""
+
+    enabled: bool = True
+    window_seconds: float = 30.0
+    minimum_calls: int = 10
+    failure_rate_threshold: float = 0.5  # errors and timeouts
+    timeout_rate_threshold: float = 0.2
+    open_seconds: float = 30.0
+    half_open_max_calls: int = 1
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "CircuitBreakerConfig":
+        """Build from a ``circuit_breaker`` config section"""
+        defaults = cls()
+        return cls(
+            **{
+                name: config.get(name, getattr(defaults, name))
+                for name in cls.__dataclass_fields__
+            }
+        )
+
+
+class CircuitBreaker:
+    """Rolling-window circuit breaker for one function version"""
+
+    def __init__(
+        self,
+        key: str,
+        config: CircuitBreakerConfig,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.key = key
+        self.config = config
+        self._clock = clock
+        self._lock = threading.Lock()
+        # One bucket per second: [second, calls, failures, timeouts]
+        self._buckets: Deque[List[float]] = deque()
+        self.state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self.rejected = 0
+        self.times_opened = 0
+
+    def allow(self) -> None:
+        """Admit a call or raise CircuitOpenError"""
+        if not self.config.enabled:
+            return
+        with self._lock:
+            if self.state == CircuitState.OPEN:
+                remaining = self._opened_at + self.config.open_seconds - self._clock()
+                if remaining > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.key, remaining)
+                self.state = CircuitState.HALF_OPEN
+                self._probes_in_flight = 0
+
+            if self.state == CircuitState.HALF_OPEN:
+                if self._probes_in_flight >= self.config.half_open_max_calls:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.key, self.config.open_seconds)
+                self._probes_in_flight += 1
+
+    def record_success(self) -> None:
+        """Record a successful call"""
+        self._record(failed=False, timed_out=False)
+
+    def record_failure(self, timed_out: bool = False) -> None:
+        """Record a failed or timed-out call"""
+        self._record(failed=True, timed_out=timed_out)
+
+    def release(self) -> None:
+        """Return a probe permit for a call that never ran"""
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN and self._probes_in_flight:
+                self._probes_in_flight -= 1
+
+    def _record(self, failed: bool, timed_out: bool) -> None:
+        if not self.config.enabled:
+            return
+        with self._lock:
+            now = self._clock()
+            if self.state == CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+                if failed:
+                    self._open(now)
+                else:
+                    self._close()
+                return
+
+            self._add(now, failed, timed_out)
+            if self.state == CircuitState.CLOSED and self._should_open(now):
+                self._open(now)
+
+    def _add(self, now: float, failed: bool, timed_out: bool) -> None:
+        second = int(now)
+        if not self._buckets or self._buckets[-1][0] != second:
+            self._buckets.append([second, 0, 0, 0])
+        bucket = self._buckets[-1]
+        bucket[1] += 1
+        bucket[2] += failed
+        bucket[3] += timed_out
+
+    def _window_counts(self, now: float):
+        horizon = now - self.config.window_seconds
+        while self._buckets and self._buckets[0][0] + 1 <= horizon:
+            self._buckets.popleft()
+        calls = sum(bucket[1] for bucket in self._buckets)
+        failures = sum(bucket[2] for bucket in self._buckets)
+        timeouts = sum(bucket[3] for bucket in self._buckets)
+        return calls, failures, timeouts
+
+    def _should_open(self, now: float) -> bool:
+        calls, failures, timeouts = self._window_counts(now)
+        if calls < self.config.minimum_calls:
+            return False
+        return (
+            failures / calls >= self.config.failure_rate_threshold
+            or timeouts / calls >= self.config.timeout_rate_threshold
+        )
+
+    def _open(self, now: float) -> None:
+        self.state = CircuitState.OPEN
+        self._opened_at = now
+        self._probes_in_flight = 0
+        self.times_opened += 1
+
+    def _close(self) -> None:
+        self.state = CircuitState.CLOSED
+        self._buckets.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get breaker state and window counts"""
+        with self._lock:
+            now = self._clock()
+            calls, failures, timeouts = self._window_counts(now)
+            state = self.state
+            if (
+                state == CircuitState.OPEN
+                and now >= self._opened_at + self.config.open_seconds
+            ):
+                state = CircuitState.HALF_OPEN
+            return {
+                "state": state.value,
+                "window_calls": calls,
+                "window_failures": failures,
+                "window_timeouts": timeouts,
+                "failure_rate": failures / calls if calls else 0.0,
+                "timeout_rate": timeouts / calls if calls else 0.0,
+                "rejected": self.rejected,
+                "times_opened": self.times_opened,
+            }
+
+
+class CircuitBreakerRegistry:
+    """Circuit breakers keyed by function_id and version"""
+
+    def __init__(
+        self,
+        config: Optional[CircuitBreakerConfig] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.config = config or CircuitBreakerConfig()
+        self._clock = clock
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, function_id: str, version: str) -> CircuitBreaker:
+        """Get or create the breaker for a function version"""
+        key = f"{function_id}:{version}"
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(
+                    key, CircuitBreaker(key, self.config, self._clock)
+                )
+        return breaker
+
+    def reset(self, function_id: str, version: Optional[str] = None) -> None:
+        """Drop breakers for a function, e.g. after a new deployment"""
+        with self._lock:
+            for key in list(self._breakers):
+                fid, _, ver = key.rpartition(":")
+                if fid == function_id and (version is None or ver == version):
+                    del self._breakers[key]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get state for every breaker"""
+        return {key: breaker.get_stats() for key, breaker in self._breakers.items()}
@@ -0,0 +1,495 @@
+"""
+Append-only decision log in size-rotated segment files
+
+Each segment ``NNNNNNNNNN.log`` holds length-prefixed JSON records (a
+4-byte length and a CRC32, then the payload), written sequentially. A
+sidecar ``NNNNNNNNNN.idx`` holds one compact JSON line per record with its
+offset, length, timestamp, function id, version and trace id. The sidecars
+are loaded into per-(function, version) timelines when the log is opened,
+so history and date-range queries seek straight to the records they return.
+"""
+
+import bisect
+import heapq
+import itertools
+import json
+import os
+import struct
+import threading
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+SEGMENT_SUFFIX = ".log"
+INDEX_SUFFIX = ".idx"
+RETENTION_FILE = "retention"
+
+_HEADER = struct.Struct(">II")
+# A location packs the segment number above a 40-bit byte offset
+_OFFSET_BITS = 40
+_OFFSET_MASK = (1 << _OFFSET_BITS) - 1
+
+
+def _location(segment: int, offset: int) -> int:
+    return (segment << _OFFSET_BITS) | offset
+
+
+@dataclass
+class _Timeline:
+    """Timestamps in ascending order with the location of each record"""
+
+    timestamps: List[str] = field(default_factory=list)
+    locations: List[int] = field(default_factory=list)
+
+    def add(self, timestamp: str, location: int) -> None:
+        if not self.timestamps or timestamp >= self.timestamps[-1]:
+            self.timestamps.append(timestamp)
+            self.locations.append(location)
+            return
+        position = bisect.bisect_right(self.timestamps, timestamp)
+        self.timestamps.insert(position, timestamp)
+        self.locations.insert(position, location)
+
+    def newest_first(
+        self, start: Optional[str] = None, end: Optional[str] = None
+    ) -> Iterator[Tuple[str, int]]:
+        low = 0 if start is None else bisect.bisect_left(self.timestamps, start)
+        high = (
+            len(self.timestamps)
+            if end is None
+            else bisect.bisect_right(self.timestamps, end)
+        )
+        for i in range(high - 1, low - 1, -1):
+            yield self.timestamps[i], self.locations[i]
+
+    def remove(self, timestamp: str, location: int) -> None:
+        position = bisect.bisect_left(self.timestamps, timestamp)
+        while (
+            position < len(self.timestamps) and self.timestamps[position] == timestamp
+        ):
+            if self.locations[position] == location:
+                del self.timestamps[position]
+                del self.locations[position]
+                return
+            position += 1
+
+    def trim(self, cutoff: str) -> None:
+        """Forget entries older than cutoff"""
+        position = bisect.bisect_left(self.timestamps, cutoff)
+        del self.timestamps[:position]
+        del self.locations[:position]
+
+
+@dataclass
+class _Segment:
+    size: int = 0
+    newest: str = ""
+
+
+class DecisionLog:
+    """Sequential decision store with an in-memory offset index
+
+    Records are dicts carrying ``trace_id``, ``function_id``, ``version``
+    and an ISO-8601 ``timestamp``; timestamps are ordered as strings, the
+    form ``DecisionContext.timestamp.isoformat()`` produces. A trace id
+    stored twice resolves to its latest record everywhere: appending it
+    again removes the earlier record from the index. ``drop_before`` hides older
+    records at once and deletes each segment when all of it has expired; a
+    segment that a read is still using is deleted when the read finishes.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = 64 * 1024 * 1024,
+        fsync: bool = False,
+    ):
+        if max_segment_bytes > _OFFSET_MASK:
+            raise ValueError("max_segment_bytes must be below 1 TiB")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+        self.fsync = fsync
+        self.recovered = 0
+        self._lock = threading.Lock()
+        self._segments: Dict[int, _Segment] = {}
+        # trace id -> (location, timestamp, function id, version)
+        self._traces: Dict[str, Tuple[int, str, str, str]] = {}
+        self._timelines: Dict[str, Dict[str, _Timeline]] = {}
+        self._all = _Timeline()
+        self._strings: Dict[str, str] = {}
+        # Reads in progress per segment, and expired segments waiting for them
+        self._readers: Dict[int, int] = {}
+        self._expired: Set[int] = set()
+        try:
+            self._watermark = (self.directory / RETENTION_FILE).read_text()
+        except FileNotFoundError:
+            self._watermark = ""
+        self._active = 0
+        self._log: Optional[BinaryIO] = None
+        self._index: Optional[BinaryIO] = None
+        self._load()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append a record to the active segment and index it"""
+        payload = json.dumps(record, separators=(",", ":"), default=str).encode()
+        entry_fields = (
+            record["timestamp"],
+            record["function_id"],
+            record["version"],
+            record["trace_id"],
+        )
+        with self._lock:
+            if self._log is None:
+                raise ValueError("decision log is closed")
+            segment = self._segments[self._active]
+            size = _HEADER.size + len(payload)
+            if segment.size and segment.size + size > self.max_segment_bytes:
+                self._rotate()
+                segment = self._segments[self._active]
+
+            offset = segment.size
+            log, index = self._log, self._index
+            assert log is not None and index is not None
+            log.write(_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+            index.write(self._index_line(offset, len(payload), *entry_fields))
+            if self.fsync:
+                os.fsync(log.fileno())
+                os.fsync(index.fileno())
+            segment.size += size
+            self._add(self._active, offset, *entry_fields)
+
+    def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """Return the record for a trace id, or None"""
+        with self._lock:
+            entry = self._traces.get(trace_id)
+            if entry is None:
+                return None
+            locations = [entry[0]]
+            self._pin(locations)
+        return self._read(locations)[0]
+
+    def history(
+        self,
+        function_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        version: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return a function's records, newest first"""
+        with self._lock:
+            versions = self._timelines.get(function_id, {})
+            if version is None:
+                timelines = list(versions.values())
+            else:
+                timelines = [versions[version]] if version in versions else []
+            locations = self._page(timelines, offset, limit)
+            self._pin(locations)
+        return self._read(locations)
+
+    def between(self, start: str, end: str, limit: int = 100) -> List[Dict[str, Any]]:
+        """Return records with start <= timestamp <= end, newest first"""
+        with self._lock:
+            locations = [
+                location
+                for _, location in itertools.islice(
+                    self._all.newest_first(start, end), limit
+                )
+            ]
+            self._pin(locations)
+        return self._read(locations)
+
+    def records(self, function_id: str) -> Iterator[Dict[str, Any]]:
+        """Yield every record of a function, oldest first"""
+        with self._lock:
+            locations = [
+                location
+                for _, location in heapq.merge(
+                    *(
+                        zip(timeline.timestamps, timeline.locations)
+                        for timeline in self._timelines.get(function_id, {}).values()
+                    )
+                )
+            ]
+            self._pin(locations)
+        yield from self._read(locations)
+
+    def drop_before(self, cutoff: str) -> int:
+        """Drop records older than cutoff, returning how many were dropped
+
+        The cutoff is persisted as a watermark that hides older records;
+        segments are deleted once their newest record is below it.
+        """
+        with self._lock:
+            dropped = bisect.bisect_left(self._all.timestamps, cutoff)
+            if cutoff > self._watermark:
+                self._watermark = cutoff
+                path = self.directory / RETENTION_FILE
+                temp = path.with_suffix(".tmp")
+                temp.write_text(cutoff)
+                os.replace(temp, path)
+
+            active = self._segments[self._active]
+            if active.newest and active.newest < cutoff:
+                self._rotate()
+            for number in [
+                number
+                for number, segment in self._segments.items()
+                if number != self._active and segment.newest < cutoff
+            ]:
+                del self._segments[number]
+                if number in self._readers:
+                    self._expired.add(number)
+                else:
+                    self._delete(number)
+
+            if dropped:
+                expired = set(self._all.locations[:dropped])
+                self._traces = {
+                    trace_id: entry
+                    for trace_id, entry in self._traces.items()
+                    if entry[0] not in expired
+                }
+                for function_id in list(self._timelines):
+                    versions = self._timelines[function_id]
+                    for version in list(versions):
+                        versions[version].trim(cutoff)
+                        if not versions[version].timestamps:
+                            del versions[version]
+                    if not versions:
+                        del self._timelines[function_id]
+                self._all.trim(cutoff)
+            return dropped
+
+    def function_ids(self) -> List[str]:
+        """Function ids with at least one record"""
+        with self._lock:
+            return list(self._timelines)
+
+    def __contains__(self, trace_id: str) -> bool:
+        return trace_id in self._traces
+
+    def __len__(self) -> int:
+        return len(self._all.timestamps)
+
+    def close(self) -> None:
+        """Close the active segment"""
+        with self._lock:
+            for handle in (self._log, self._index):
+                if handle is not None:
+                    handle.close()
+            self._log = self._index = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get log statistics"""
+        with self._lock:
+            return {
+                "records": len(self._all.timestamps),
+                "segments": len(self._segments),
+                "active_segment": self._active,
+                "bytes": sum(segment.size for segment in self._segments.values()),
+                "functions": len(self._timelines),
+                "recovered": self.recovered,
+            }
+
+    def _page(self, timelines: List[_Timeline], offset: int, limit: int) -> List[int]:
+        if len(timelines) == 1:
+            newest = timelines[0].newest_first()
+        else:
+            newest = heapq.merge(
+                *(timeline.newest_first() for timeline in timelines), reverse=True
+            )
+        return [
+            location for _, location in itertools.islice(newest, offset, offset + limit)
+        ]
+
+    def _pin(self, locations: List[int]) -> None:
+        """Keep the segments holding ``locations`` until ``_read`` is done"""
+        for number in {location >> _OFFSET_BITS for location in locations}:
+            self._readers[number] = self._readers.get(number, 0) + 1
+
+    def _unpin(self, locations: List[int]) -> None:
+        with self._lock:
+            for number in {location >> _OFFSET_BITS for location in locations}:
+                self._readers[number] -= 1
+                if not self._readers[number]:
+                    del self._readers[number]
+                    if number in self._expired:
+                        self._expired.discard(number)
+                        self._delete(number)
+
+    def _delete(self, number: int) -> None:
+        for suffix in (SEGMENT_SUFFIX, INDEX_SUFFIX):
+            self._path(number, suffix).unlink(missing_ok=True)
+
+    def _read(self, locations: List[int]) -> List[Dict[str, Any]]:
+        """Read records from pinned segments, then unpin them"""
+        handles: Dict[int, BinaryIO] = {}
+        try:
+            records = []
+            for location in locations:
+                number = location >> _OFFSET_BITS
+                handle = handles.get(number)
+                if handle is None:
+                    handle = handles[number] = open(
+                        self._path(number, SEGMENT_SUFFIX), "rb"
+                    )
+                handle.seek(location & _OFFSET_MASK)
+                length, _ = _HEADER.unpack(handle.read(_HEADER.size))
+                records.append(json.loads(handle.read(length)))
+            return records
+        finally:
+            for handle in handles.values():
+                handle.close()
+            self._unpin(locations)
+
+    def _add(
+        self,
+        number: int,
+        offset: int,
+        timestamp: str,
+        function_id: str,
+        version: str,
+        trace_id: str,
+    ) -> None:
+        location = _location(number, offset)
+        segment = self._segments[number]
+        if timestamp > segment.newest:
+            segment.newest = timestamp
+        previous = self._traces.pop(trace_id, None)
+        if previous is not None:
+            self._forget(*previous)
+        if timestamp < self._watermark:
+            return
+        version = self._strings.setdefault(version, version)
+        function_id = self._strings.setdefault(function_id, function_id)
+        self._traces[trace_id] = (location, timestamp, function_id, version)
+        self._timelines.setdefault(function_id, {}).setdefault(
+            version, _Timeline()
+        ).add(timestamp, location)
+        self._all.add(timestamp, location)
+
+    def _forget(
+        self, location: int, timestamp: str, function_id: str, version: str
+    ) -> None:
+        """Remove a superseded record from the timelines"""
+        versions = self._timelines.get(function_id, {})
+        timeline = versions.get(version)
+        if timeline is not None:
+            timeline.remove(timestamp, location)
+            if not timeline.timestamps:
+                del versions[version]
+                if not versions:
+                    del self._timelines[function_id]
+        self._all.remove(timestamp, location)
+
+    def _index_line(
+        self,
+        offset: int,
+        length: int,
+        timestamp: str,
+        function_id: str,
+        version: str,
+        trace_id: str,
+    ) -> bytes:
+        line = json.dumps(
+            [offset, length, timestamp, function_id, version, trace_id],
+            separators=(",", ":"),
+        )
+        return line.encode() + b"\n"
+
+    def _path(self, number: int, suffix: str) -> Path:
+        return self.directory / f"{number:010d}{suffix}"
+
+    def _rotate(self) -> None:
+        assert self._log is not None and self._index is not None
+        self._log.close()
+        self._index.close()
+        self._open(self._active + 1)
+
+    def _open(self, number: int) -> None:
+        self._active = number
+        self._segments.setdefault(number, _Segment())
+        self._log = open(self._path(number, SEGMENT_SUFFIX), "ab", buffering=0)
+        self._index = open(self._path(number, INDEX_SUFFIX), "ab", buffering=0)
+
+    def _load(self) -> None:
+        numbers = sorted(
+            int(path.stem)
+            for path in self.directory.glob(f"*{SEGMENT_SUFFIX}")
+            if path.stem.isdigit()
+        )
+        for number in numbers:
+            self._segments[number] = _Segment()
+            end = self._load_index(number)
+            size = self._path(number, SEGMENT_SUFFIX).stat().st_size
+            if end != size:
+                end = self._recover(number, end)
+            self._segments[number].size = end
+        self._open(numbers[-1] if numbers else 0)
+
+    def _load_index(self, number: int) -> int:
+        """Load a segment's sidecar, returning the end of its last record"""
+        path = self._path(number, INDEX_SUFFIX)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return 0
+
+        end = 0
+        valid = 0
+        segment_size = self._path(number, SEGMENT_SUFFIX).stat().st_size
+        for line in data.splitlines(keepends=True):
+            try:
+                offset, length, timestamp, function_id, version, trace_id = json.loads(
+                    line
+                )
+            except ValueError:
+                break
+            if not line.endswith(b"\n") or offset != end:
+                break
+            if offset + _HEADER.size + length > segment_size:
+                break
+            self._add(number, offset, timestamp, function_id, version, trace_id)
+            end = offset + _HEADER.size + length
+            valid += len(line)
+        if valid != len(data):
+            # Drop a torn or dangling tail; _recover re-indexes from the log
+            with open(path, "r+b") as f:
+                f.truncate(valid)
+        return end
+
+    def _recover(self, number: int, end: int) -> int:
+        """Index records past ``end`` and truncate a torn final record"""
+        log_path = self._path(number, SEGMENT_SUFFIX)
+        lines = []
+        with open(log_path, "r+b") as log:
+            log.seek(end)
+            while True:
+                header = log.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    break
+                length, checksum = _HEADER.unpack(header)
+                payload = log.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    break
+                try:
+                    record = json.loads(payload)
+                    fields = (
+                        record["timestamp"],
+                        record["function_id"],
+                        record["version"],
+                        record["trace_id"],
+                    )
+                except (ValueError, KeyError, TypeError):
+                    break
+                lines.append(self._index_line(end, length, *fields))
+                self._add(number, end, *fields)
+                end += _HEADER.size + length
+                self.recovered += 1
+            log.truncate(end)
+
+        with open(self._path(number, INDEX_SUFFIX), "ab") as index:
+            index.writelines(lines)
+        return end
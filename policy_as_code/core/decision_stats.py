@@ -0,0 +1,365 @@
+"""
+Incrementally maintained decision statistics
+
+Storage backends fold each stored decision into a per-function, per-day
+``DecisionRollup`` so ``get_decision_stats`` reads counters instead of
+scanning decisions. ``DecisionRollups`` persists the file backend's rollups
+as a JSON snapshot plus an append-only journal of the decisions recorded
+since; the snapshot is rewritten every ``snapshot_interval`` records.
+
+A re-stored decision is folded out of its old day and into its new one.
+Counters stay exact, but ``first_decision`` and ``last_decision`` only
+widen: recomputing them would mean rescanning the day. Until
+``rebuild_decision_stats`` recomputes them, a day can keep the bound of a
+decision that moved away; a dry-run rebuild reports such days.
+"""
+
+import json
+import math
+import os
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
+
+SNAPSHOT_FORMAT = 1
+
+Rollups = Dict[str, Dict[str, "DecisionRollup"]]
+# (function_id, timestamp, success, execution time in ms)
+Counters = Tuple[str, str, bool, Optional[float]]
+
+
+@dataclass
+class DecisionRollup:
+    """Counters for a set of decisions"""
+
+    total: int = 0
+    successes: int = 0
+    execution_time_sum: float = 0.0
+    execution_time_count: int = 0
+    first_decision: Optional[str] = None
+    last_decision: Optional[str] = None
+
+    def add(
+        self,
+        timestamp: str,
+        success: bool,
+        execution_time: Optional[float],
+        sign: int = 1,
+    ) -> None:
+        """Add (sign=1) or remove (sign=-1) a decision
+
+        Removing leaves ``first_decision`` and ``last_decision`` as they are.
+        """
+        self.total += sign
+        self.successes += sign * int(success)
+        if execution_time is not None:
+            self.execution_time_sum += sign * execution_time
+            self.execution_time_count += sign
+        if sign < 0:
+            return
+        if self.first_decision is None or timestamp < self.first_decision:
+            self.first_decision = timestamp
+        if self.last_decision is None or timestamp > self.last_decision:
+            self.last_decision = timestamp
+
+    def merge(self, other: "DecisionRollup") -> None:
+        self.total += other.total
+        self.successes += other.successes
+        self.execution_time_sum += other.execution_time_sum
+        self.execution_time_count += other.execution_time_count
+        for timestamp in (other.first_decision, other.last_decision):
+            if timestamp is not None:
+                if self.first_decision is None or timestamp < self.first_decision:
+                    self.first_decision = timestamp
+                if self.last_decision is None or timestamp > self.last_decision:
+                    self.last_decision = timestamp
+
+    def matches(self, other: "DecisionRollup") -> bool:
+        """Equal counters, allowing for float summation order"""
+        return (
+            self.total == other.total
+            and self.successes == other.successes
+            and self.execution_time_count == other.execution_time_count
+            and math.isclose(
+                self.execution_time_sum, other.execution_time_sum, abs_tol=1e-6
+            )
+            and self.first_decision == other.first_decision
+            and self.last_decision == other.last_decision
+        )
+
+    def to_stats(self) -> Dict[str, Any]:
+        """Render in the shape returned by ``get_decision_stats``"""
+        if not self.total:
+            return {
+                "total_decisions": 0,
+                "success_rate": 0.0,
+                "avg_execution_time": 0.0,
+            }
+        return {
+            "total_decisions": self.total,
+            "success_rate": self.successes / self.total,
+            "avg_execution_time": (
+                self.execution_time_sum / self.execution_time_count
+                if self.execution_time_count
+                else 0.0
+            ),
+            "first_decision": self.first_decision,
+            "last_decision": self.last_decision,
+        }
+
+
+def decision_counters(decision: Dict[str, Any]) -> Counters:
+    """(function_id, timestamp, success, execution time) of a stored decision
+
+    Mirrors the original file scan: a decision succeeded if its result has a
+    truthy ``success`` and only truthy ``execution_time_ms`` values count
+    towards the average.
+    """
+    result = decision.get("result") or {}
+    execution_time = result.get("execution_time_ms")
+    return (
+        decision["function_id"],
+        decision["timestamp"],
+        bool(result.get("success", False)),
+        float(execution_time) if execution_time else None,
+    )
+
+
+def aggregate(decisions: Iterable[Dict[str, Any]]) -> Rollups:
+    """Fold stored decisions into per-function, per-day rollups"""
+    rollups: Rollups = {}
+    for decision in decisions:
+        function_id, timestamp, success, execution_time = decision_counters(decision)
+        rollups.setdefault(function_id, {}).setdefault(
+            timestamp[:10], DecisionRollup()
+        ).add(timestamp, success, execution_time)
+    return rollups
+
+
+def compare_rollups(expected: Rollups, actual: Rollups) -> List[Dict[str, Any]]:
+    """List the (function, day) rollups that differ between two sets"""
+    mismatches = []
+    for function_id in sorted(set(expected) | set(actual)):
+        expected_days = expected.get(function_id, {})
+        actual_days = actual.get(function_id, {})
+        for day in sorted(set(expected_days) | set(actual_days)):
+            want = expected_days.get(day, DecisionRollup())
+            have = actual_days.get(day, DecisionRollup())
+            if not want.matches(have):
+                mismatches.append(
+                    {
+                        "function_id": function_id,
+                        "day": day,
+                        "expected": asdict(want),
+                        "actual": asdict(have),
+                    }
+                )
+    return mismatches
+
+
+def rebuild_report(expected: Rollups, actual: Rollups) -> Dict[str, Any]:
+    """Summarise a rebuild of ``actual`` from raw decisions in ``expected``"""
+    return {
+        "functions": len(expected),
+        "days": sum(len(days) for days in expected.values()),
+        "decisions": sum(
+            rollup.total for days in expected.values() for rollup in days.values()
+        ),
+        "mismatches": compare_rollups(expected, actual),
+    }
+
+
+class DecisionRollups:
+    """Per-function, per-day rollups persisted as snapshot plus journal
+
+    Each ``record`` appends one line to the current journal. Compaction
+    writes a snapshot naming the next journal, then deletes the older ones,
+    so a crash at any point replays each decision exactly once. A single
+    process is expected to write a given directory.
+    """
+
+    def __init__(self, directory: str, snapshot_interval: int = 1000):
+        self.directory = Path(directory)
+        self.snapshot_interval = snapshot_interval
+        self._lock = threading.Lock()
+        self._days: Rollups = {}
+        self._totals: Dict[str, DecisionRollup] = {}
+        self._journal_seq = 0
+        self._journal: Optional[TextIO] = None
+        self._pending = 0
+        self.exists = self._load()
+
+    def record(
+        self,
+        function_id: str,
+        timestamp: str,
+        success: bool,
+        execution_time: Optional[float],
+        sign: int = 1,
+    ) -> None:
+        """Fold one decision into (sign=1) or out of (sign=-1) the rollups"""
+        counters: Counters = (function_id, timestamp, success, execution_time)
+        # Journal lines carry the sign only for removals
+        line = json.dumps([*counters, sign] if sign != 1 else counters)
+        with self._lock:
+            self._apply(*counters, sign)
+            if self._journal is None:
+                self.directory.mkdir(parents=True, exist_ok=True)
+                self._journal = open(self._journal_path(self._journal_seq), "a")
+            self._journal.write(line + "\n")
+            self._journal.flush()
+            self._pending += 1
+            if self._pending >= self.snapshot_interval:
+                self._compact()
+
+    def stats(self, function_id: str) -> Dict[str, Any]:
+        """Totals for a function in ``get_decision_stats`` shape"""
+        with self._lock:
+            return self._totals.get(function_id, DecisionRollup()).to_stats()
+
+    def daily(self, function_id: str) -> Dict[str, Dict[str, Any]]:
+        """Per-day stats for a function, oldest day first"""
+        with self._lock:
+            days = self._days.get(function_id, {})
+            return {day: days[day].to_stats() for day in sorted(days)}
+
+    def rollups(self) -> Rollups:
+        """A copy of every per-day rollup"""
+        with self._lock:
+            return {
+                function_id: {
+                    day: DecisionRollup(**asdict(rollup))
+                    for day, rollup in days.items()
+                }
+                for function_id, days in self._days.items()
+            }
+
+    def replace(self, rollups: Rollups, through_day: Optional[str] = None) -> None:
+        """Swap in recomputed rollups, for every day or up to ``through_day``"""
+        with self._lock:
+            if through_day is None:
+                self._days = {}
+            else:
+                for days in self._days.values():
+                    for day in [day for day in days if day <= through_day]:
+                        del days[day]
+            for function_id, days in rollups.items():
+                for day, rollup in days.items():
+                    if through_day is None or day <= through_day:
+                        self._days.setdefault(function_id, {})[day] = rollup
+            self._days = {
+                function_id: days for function_id, days in self._days.items() if days
+            }
+            self._totals = {}
+            for function_id, days in self._days.items():
+                total = self._totals[function_id] = DecisionRollup()
+                for rollup in days.values():
+                    total.merge(rollup)
+            self._compact()
+
+    def flush(self) -> None:
+        """Write a snapshot and start a new journal"""
+        with self._lock:
+            self._compact()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pending:
+                self._compact()
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def _apply(
+        self,
+        function_id: str,
+        timestamp: str,
+        success: bool,
+        execution_time: Optional[float],
+        sign: int = 1,
+    ) -> None:
+        days = self._days.setdefault(function_id, {})
+        day = timestamp[:10]
+        rollup = days.setdefault(day, DecisionRollup())
+        rollup.add(timestamp, success, execution_time, sign)
+        if rollup.total <= 0:
+            # The day's last decision was removed
+            del days[day]
+            if not days:
+                del self._days[function_id]
+        self._totals.setdefault(function_id, DecisionRollup()).add(
+            timestamp, success, execution_time, sign
+        )
+
+    def _journal_path(self, seq: int) -> Path:
+        return self.directory / f"journal-{seq:08d}.jsonl"
+
+    def _journals(self) -> List[int]:
+        return sorted(
+            int(path.stem.split("-")[1])
+            for path in self.directory.glob("journal-*.jsonl")
+        )
+
+    def _compact(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        next_seq = self._journal_seq + 1
+        snapshot = {
+            "format": SNAPSHOT_FORMAT,
+            "journal": next_seq,
+            "functions": {
+                function_id: {day: asdict(rollup) for day, rollup in days.items()}
+                for function_id, days in self._days.items()
+            },
+        }
+        path = self.directory / "snapshot.json"
+        temp = path.with_suffix(".tmp")
+        with open(temp, "w") as f:
+            json.dump(snapshot, f, separators=(",", ":"))
+        os.replace(temp, path)
+        for seq in self._journals():
+            if seq < next_seq:
+                self._journal_path(seq).unlink(missing_ok=True)
+        self._journal_seq = next_seq
+        self._pending = 0
+
+    def _load(self) -> bool:
+        path = self.directory / "snapshot.json"
+        found = False
+        try:
+            with open(path, "r") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            snapshot = None
+        if snapshot is not None and snapshot.get("format") == SNAPSHOT_FORMAT:
+            found = True
+            self._journal_seq = snapshot["journal"]
+            for function_id, days in snapshot["functions"].items():
+                for day, counters in days.items():
+                    rollup = DecisionRollup(**counters)
+                    self._days.setdefault(function_id, {})[day] = rollup
+                    self._totals.setdefault(function_id, DecisionRollup()).merge(rollup)
+
+        journals = [seq for seq in self._journals() if seq >= self._journal_seq]
+        if journals and snapshot is None:
+            self._journal_seq = journals[0]
+        torn = False
+        for seq in journals:
+            found = True
+            with open(self._journal_path(seq), "r") as f:
+                for line in f:
+                    try:
+                        self._apply(*json.loads(line))
+                    except (ValueError, TypeError):
+                        # A torn final line from an interrupted write
+                        torn = True
+                        continue
+                    self._pending += 1
+        if torn or len(journals) > 1:
+            self._compact()
+        elif journals:
+            self._journal_seq = journals[0]
+        return found
@@ -7,12 +7,10 @@ PRODUCTION STATUS: ⚠️ PARTIAL IMPLEMENTATION
 - Basic security integration implemented
 
 MISSING PRODUCTION FEATURES:
-- Performance optimization and caching
 - Advanced plugin management
 - Multi-tenant support
 - Performance monitoring and metrics
 - Error recovery and resilience
-- Circuit breakers and timeouts
 - Resource management and limits
 - Advanced security controls
 - Audit logging for all operations
@@ -25,24 +23,42 @@ MISSING PRODUCTION FEATURES:
 """
 
 import asyncio
-import hashlib
 import json
 import uuid
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+)
 
 from .errors import (
     DecisionLayerError,
     DeploymentError,
     ExecutionError,
+    ExecutionTimeoutError,
     FunctionNotFoundError,
     ValidationError,
+    WorkerRestartedError,
 )
-from .security import SecurityConfig, SecurityManager
+from ..security.security import SecurityConfig, SecurityManager
+from .admission import AdmissionController, AdmissionRejectedError
+from .circuit_breaker import CircuitBreakerConfig, CircuitBreakerRegistry
+from .executors import DecisionExecutor, ExecutionConfig, ExecutionMode
+from .result_cache import ResultCache
+from .plugin_pipeline import PluginPipeline
+from .single_flight import SingleFlight
 from .storage import StorageBackend, create_storage_backend
+from .warmup import WarmUp, WarmUpReport, select_versions
+from ..utils.canonical import canonical_hash
 
 
 @dataclass(frozen=True)
@@ -56,6 +72,17 @@ class DecisionContext:
     trace_id: str
 
 
+@dataclass
+class BatchItemResult:
+    """Outcome of a single input in a batch execution"""
+
+    index: int
+    trace_id: str
+    success: bool
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
 class DecisionFunction(Protocol):
     """Protocol for decision functions - elegant abstraction"""
 
@@ -66,7 +93,16 @@ class DecisionFunction(Protocol):
 
 
 class DecisionPlugin(ABC):
-    """Base class for decision plugins"""
+    """Base class for decision plugins
+
+    Plugins that never await may also define ``process_sync(data, context)``;
+    the engine then calls it directly instead of awaiting ``process``. A
+    subclass that overrides ``process`` alone is awaited as usual. Set
+    ``mutates_data = False`` on plugins that do not modify ``data`` in place so
+    the engine can skip its defensive copy.
+    """
+
+    mutates_data: bool = True
 
     @abstractmethod
     async def process(
@@ -86,18 +122,38 @@ class DecisionPlugin(ABC):
 class ValidationPlugin(DecisionPlugin):
     """Schema validation plugin"""
 
+    mutates_data = False
+
     def __init__(self, schema: Optional[Dict[str, Any]] = None):
         self.schema = schema
 
+    @property
+    def schema(self) -> Optional[Dict[str, Any]]:
+        return self._schema
+
+    @schema.setter
+    def schema(self, schema: Optional[Dict[str, Any]]) -> None:
+        # Resolve required fields once rather than walking the schema per call
+        self._schema = schema
+        self._required = tuple(
+            field
+            for field, field_spec in (schema or {}).get("input", {}).items()
+            if field_spec.get("required", False)
+        )
+
     async def process(
         self, data: Dict[str, Any], context: DecisionContext
+    ) -> Dict[str, Any]:
+        return self.process_sync(data, context)
+
+    def process_sync(
+        self, data: Dict[str, Any], context: DecisionContext
     ) -> Dict[str, Any]:
         """Validate input data against schema"""
-        if self.schema:
-            # Simple validation - in production you'd want more sophisticated validation
-            for field, field_spec in self.schema.get("input", {}).items():
-                if field_spec.get("required", False) and field not in data:
-                    raise ValueError(f"Required field '{field}' is missing")
+        # Simple validation - in production you'd want more sophisticated validation
+        for field in self._required:
+            if field not in data:
+                raise ValueError(f"Required field '{field}' is missing")
         return data
 
     @property
@@ -106,7 +162,11 @@ class ValidationPlugin(DecisionPlugin):
 
 
 class TracingPlugin(DecisionPlugin):
-    """Structured tracing plugin"""
+    """Structured tracing plugin
+
+    Injects ``_trace`` metadata into the input in place, so it keeps
+    ``mutates_data`` and the engine runs it on a copy of the caller's input.
+    """
 
     def __init__(self, trace_dir: str = "./traces"):
         self.trace_dir = Path(trace_dir)
@@ -114,6 +174,11 @@ class TracingPlugin(DecisionPlugin):
 
     async def process(
         self, data: Dict[str, Any], context: DecisionContext
+    ) -> Dict[str, Any]:
+        return self.process_sync(data, context)
+
+    def process_sync(
+        self, data: Dict[str, Any], context: DecisionContext
     ) -> Dict[str, Any]:
         """Add trace metadata to data"""
         data["_trace"] = {
@@ -133,6 +198,38 @@ class TracingPlugin(DecisionPlugin):
         status: str,
     ):
         """Store trace to file"""
+        trace_line = self._trace_line(context, input_data, result, status)
+        with open(self._trace_file(context), "a") as f:
+            f.write(trace_line)
+
+    async def store_traces(
+        self,
+        traces: List[Tuple[DecisionContext, Dict[str, Any], Dict[str, Any], str]],
+    ):
+        """Store many traces with one buffered append per trace file"""
+        lines_by_file: Dict[Path, List[str]] = {}
+        for context, input_data, result, status in traces:
+            lines_by_file.setdefault(self._trace_file(context), []).append(
+                self._trace_line(context, input_data, result, status)
+            )
+
+        for trace_file, lines in lines_by_file.items():
+            with open(trace_file, "a") as f:
+                f.write("".join(lines))
+
+    def _trace_file(self, context: DecisionContext) -> Path:
+        return (
+            self.trace_dir
+            / f"{context.function_id}_{context.timestamp.strftime('%Y%m%d')}.jsonl"
+        )
+
+    def _trace_line(
+        self,
+        context: DecisionContext,
+        input_data: Dict[str, Any],
+        result: Dict[str, Any],
+        status: str,
+    ) -> str:
         trace_data = {
             "trace_id": context.trace_id,
             "function_id": context.function_id,
@@ -143,13 +240,7 @@ class TracingPlugin(DecisionPlugin):
             "output": result,
             "status": status,
         }
-
-        trace_file = (
-            self.trace_dir
-            / f"{context.function_id}_{context.timestamp.strftime('%Y%m%d')}.jsonl"
-        )
-        with open(trace_file, "a") as f:
-            f.write(json.dumps(trace_data) + "\n")
+        return json.dumps(trace_data) + "\n"
 
     @property
     def name(self) -> str:
@@ -157,24 +248,52 @@ class TracingPlugin(DecisionPlugin):
 
 
 class CachingPlugin(DecisionPlugin):
-    """Simple in-memory caching plugin"""
+    """Result caching stage consulted before a function is loaded
+
+    Results are stored as canonical JSON so every hit hands the caller a
+    fresh copy and the byte budget reflects the real payload size.
+    """
+
+    def __init__(self, cache: Optional[ResultCache] = None):
+        self.cache = cache or ResultCache()
 
-    def __init__(self):
-        self.cache = {}
+    mutates_data = False
 
     async def process(
         self, data: Dict[str, Any], context: DecisionContext
     ) -> Dict[str, Any]:
-        """Check cache for existing result"""
-        cache_key = f"{context.function_id}:{context.version}:{context.input_hash}"
-        if cache_key in self.cache:
-            return self.cache[cache_key]
+        return self.process_sync(data, context)
+
+    def process_sync(
+        self, data: Dict[str, Any], context: DecisionContext
+    ) -> Dict[str, Any]:
+        """Pass data through; lookups happen before execution in the engine"""
         return data
 
+    def lookup(self, context: DecisionContext) -> Optional[Dict[str, Any]]:
+        """Return a cached result for the context, if any"""
+        payload = self.cache.get(
+            context.function_id, context.version, context.input_hash
+        )
+        if payload is None:
+            return None
+        return json.loads(payload)
+
     async def cache_result(self, context: DecisionContext, result: Dict[str, Any]):
         """Cache the result"""
-        cache_key = f"{context.function_id}:{context.version}:{context.input_hash}"
-        self.cache[cache_key] = result
+        if not self.cache.is_cacheable(context.function_id):
+            return
+        try:
+            payload = json.dumps(result, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return
+        self.cache.put(
+            context.function_id,
+            context.version,
+            context.input_hash,
+            payload,
+            len(payload),
+        )
 
     @property
     def name(self) -> str:
@@ -190,6 +309,7 @@ class DecisionEngine:
         self.config = config or {}
         self.storage = self._create_storage(storage_backend)
         self.plugins: Dict[str, List[Any]] = {"pre_execute": [], "post_execute": []}
+        self._plugin_pipeline: Optional[PluginPipeline] = None
         self._load_default_plugins()
 
         # Initialize security manager
@@ -206,6 +326,29 @@ class DecisionEngine:
         )
         self.security_manager = SecurityManager(security_config)
 
+        # Identical concurrent executions share one run
+        self._single_flight = SingleFlight(
+            self.config.get("coalescing", {}).get("enabled", True)
+        )
+        self.admission = AdmissionController.from_config(
+            self.config.get("admission", {})
+        )
+
+        # Deadlines and circuit breakers
+        execution_config = self.config.get("execution", {})
+        self.execution_config = ExecutionConfig(
+            mode=ExecutionMode.INLINE,
+            timeout_seconds=execution_config.get("timeout_seconds"),
+            function_timeouts=dict(execution_config.get("function_timeouts", {})),
+        )
+        # Runs inline unless a deadline applies; deadline-bound sync calls go
+        # to the executor's own thread pool, which is replaced on timeout
+        self.executor = DecisionExecutor(self.execution_config)
+        self.circuit_breakers = CircuitBreakerRegistry(
+            CircuitBreakerConfig.from_config(self.config.get("circuit_breaker", {}))
+        )
+        self.warmup = WarmUp()
+
     def _create_storage(self, backend: str) -> StorageBackend:
         """Create storage backend"""
         storage_config = self.config.get("storage", {})
@@ -229,16 +372,16 @@ class DecisionEngine:
             self.plugins["pre_execute"].append(tracing_plugin)
             self._tracing_plugin = tracing_plugin  # Store reference for trace storage
 
-        # Add caching plugin if enabled
-        if self.config.get("plugins", {}).get("caching", {}).get("enabled", True):
-            caching_plugin = CachingPlugin()
-            self.plugins["post_execute"].append(caching_plugin)
+        # Add caching plugin if enabled; it runs before execution, not as a
+        # post_execute step, so hits skip loading and running the function
+        caching_config = self.config.get("plugins", {}).get("caching", {})
+        if caching_config.get("enabled", True):
+            caching_plugin = CachingPlugin(ResultCache.from_config(caching_config))
             self._caching_plugin = caching_plugin  # Store reference for cache storage
 
     def _hash_input(self, input_data: Dict[str, Any]) -> str:
         """Generate hash of input data"""
-        json_str = json.dumps(input_data, sort_keys=True, separators=(",", ":"))
-        return hashlib.sha256(json_str.encode()).hexdigest()[:16]
+        return canonical_hash(input_data)[:16]
 
     def _generate_trace_id(self) -> str:
         """Generate unique trace ID"""
@@ -265,10 +408,9 @@ class DecisionEngine:
 
         # Use latest version if not specified
         if version is None:
-            versions = await self.storage.list_versions(function_id)
-            if not versions:
+            version = await self.storage.get_latest_version(function_id)
+            if version is None:
                 raise FunctionNotFoundError(function_id, version)
-            version = versions[-1]  # Latest version
 
         # Create context
         context = DecisionContext(
@@ -279,13 +421,28 @@ class DecisionEngine:
             trace_id=self._generate_trace_id(),
         )
 
-        try:
-            # Load function
-            function = await self.storage.load_function_object(function_id, version)
+        # Serve from the result cache before touching storage
+        if hasattr(self, "_caching_plugin"):
+            cached_result = self._caching_plugin.lookup(context)
+            if cached_result is not None:
+                if hasattr(self, "_tracing_plugin"):
+                    trace_data = {"input": sanitized_input, "output": cached_result}
+                    sanitized_trace = self.security_manager.sanitize_trace(trace_data)
+                    await self._tracing_plugin.store_trace(
+                        context,
+                        sanitized_trace["input"],
+                        sanitized_trace["output"],
+                        "cached",
+                    )
+                return cached_result
 
-            # Execute with plugins
-            result = await self._execute_with_plugins(
-                function, sanitized_input, context
+        try:
+            # Load and execute, sharing the run with identical in-flight calls
+            result, _ = await self._single_flight.do(
+                (function_id, version, context.input_hash),
+                lambda: self._load_and_execute(
+                    function_id, version, sanitized_input, context, client_id
+                ),
             )
 
             # Store trace
@@ -325,6 +482,211 @@ class DecisionEngine:
             # Convert to ExecutionError
             raise ExecutionError(function_id, version, e)
 
+    async def _load_and_execute(
+        self,
+        function_id: str,
+        version: str,
+        input_data: Dict[str, Any],
+        context: DecisionContext,
+        client_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Load a function version and run it through the plugin pipeline"""
+        # Caller errors (an unknown version, input rejected by a pre-execute
+        # plugin) are raised before a breaker is taken, so they neither count
+        # as failures nor create breakers for arbitrary version strings
+        function = await self.storage.load_function_object(function_id, version)
+        processed_input = await self._pre_execute(input_data, context)
+
+        breaker = self.circuit_breakers.get(function_id, version)
+        breaker.allow()
+        try:
+            async with self.admission.admit(function_id, client_id):
+                result = await self._execute_processed(
+                    function, processed_input, context
+                )
+        except (
+            AdmissionRejectedError,
+            FunctionNotFoundError,
+            ValidationError,
+            WorkerRestartedError,
+        ):
+            # Not a sign of an unhealthy function
+            breaker.release()
+            raise
+        except ExecutionTimeoutError:
+            breaker.record_failure(timed_out=True)
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return result
+
+    async def execute_batch(
+        self,
+        function_id: str,
+        inputs: Iterable[Dict[str, Any]],
+        version: Optional[str] = None,
+        client_id: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> List[BatchItemResult]:
+        """Execute one function version over many inputs
+
+        Results are returned in input order; a failing input yields a
+        BatchItemResult with ``success=False`` instead of aborting the batch.
+        """
+        results: List[BatchItemResult] = []
+        async for chunk in self.iter_execute_batch(
+            function_id, inputs, version, client_id, chunk_size
+        ):
+            results.extend(chunk)
+        return results
+
+    async def iter_execute_batch(
+        self,
+        function_id: str,
+        inputs: Iterable[Dict[str, Any]],
+        version: Optional[str] = None,
+        client_id: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+    ) -> AsyncIterator[List[BatchItemResult]]:
+        """Execute a batch chunk by chunk, keeping memory bounded
+
+        ``inputs`` may be any iterable, including a generator over a large
+        file; at most ``chunk_size`` inputs and results are held at a time.
+        """
+        if chunk_size is None:
+            chunk_size = self.config.get("batch", {}).get("chunk_size", 1000)
+        if chunk_size < 1:
+            raise ValidationError("chunk_size", "Chunk size must be at least 1")
+
+        if client_id and not self.security_manager.check_rate_limit(client_id):
+            raise ValidationError("rate_limit", "Rate limit exceeded")
+
+        # Resolve and compile once for the whole batch
+        if version is None:
+            version = await self.storage.get_latest_version(function_id)
+            if version is None:
+                raise FunctionNotFoundError(function_id, version)
+        function = await self.storage.load_function_object(function_id, version)
+
+        chunk: List[Dict[str, Any]] = []
+        start_index = 0
+        for input_data in inputs:
+            chunk.append(input_data)
+            if len(chunk) >= chunk_size:
+                yield await self._execute_chunk(
+                    function, function_id, version, chunk, start_index, client_id
+                )
+                start_index += len(chunk)
+                chunk = []
+
+        if chunk:
+            yield await self._execute_chunk(
+                function, function_id, version, chunk, start_index, client_id
+            )
+
+    async def _execute_chunk(
+        self,
+        function: DecisionFunction,
+        function_id: str,
+        version: str,
+        inputs: List[Dict[str, Any]],
+        start_index: int,
+        client_id: Optional[str] = None,
+    ) -> List[BatchItemResult]:
+        """Execute a chunk of inputs and write their traces in one append"""
+        results: List[BatchItemResult] = []
+        traces: List[Tuple[DecisionContext, Dict[str, Any], Dict[str, Any], str]] = []
+        caching_plugin = getattr(self, "_caching_plugin", None)
+        tracing_plugin = getattr(self, "_tracing_plugin", None)
+
+        # One admission slot and breaker check cover the whole chunk
+        breaker = self.circuit_breakers.get(function_id, version)
+        async with self.admission.admit(function_id, client_id):
+            breaker.allow()
+            for offset, input_data in enumerate(inputs):
+                trace_id = self._generate_trace_id()
+
+                if not self.security_manager.validate_input_size(input_data):
+                    results.append(
+                        BatchItemResult(
+                            start_index + offset,
+                            trace_id,
+                            False,
+                            error="Input data too large",
+                        )
+                    )
+                    continue
+
+                sanitized_input = self.security_manager.sanitize_input(input_data)
+                context = DecisionContext(
+                    function_id=function_id,
+                    version=version,
+                    input_hash=self._hash_input(sanitized_input),
+                    timestamp=datetime.utcnow(),
+                    trace_id=trace_id,
+                )
+
+                cached_result = (
+                    caching_plugin.lookup(context) if caching_plugin else None
+                )
+                if cached_result is not None:
+                    item = BatchItemResult(
+                        start_index + offset, trace_id, True, result=cached_result
+                    )
+                    status = "cached"
+                else:
+                    try:
+                        processed_input = await self._pre_execute(
+                            sanitized_input, context
+                        )
+                        try:
+                            result = await self._execute_processed(
+                                function, processed_input, context
+                            )
+                        except (ValidationError, WorkerRestartedError):
+                            raise
+                        except Exception as e:
+                            breaker.record_failure(
+                                timed_out=isinstance(e, ExecutionTimeoutError)
+                            )
+                            raise
+                        breaker.record_success()
+                        if caching_plugin:
+                            await caching_plugin.cache_result(context, result)
+                        item = BatchItemResult(
+                            start_index + offset, trace_id, True, result=result
+                        )
+                        status = "success"
+                    except Exception as e:
+                        item = BatchItemResult(
+                            start_index + offset, trace_id, False, error=str(e)
+                        )
+                        status = "error"
+                results.append(item)
+
+                if tracing_plugin:
+                    output = item.result if item.success else {"error": item.error}
+                    sanitized_trace = self.security_manager.sanitize_trace(
+                        {"input": sanitized_input, "output": output}
+                    )
+                    traces.append(
+                        (
+                            context,
+                            sanitized_trace["input"],
+                            sanitized_trace["output"],
+                            status,
+                        )
+                    )
+            # Return an unused half-open probe permit (e.g. all items cached)
+            breaker.release()
+
+        if tracing_plugin and traces:
+            await tracing_plugin.store_traces(traces)
+
+        return results
+
     async def _execute_with_plugins(
         self,
         function: DecisionFunction,
@@ -332,25 +694,54 @@ class DecisionEngine:
         context: DecisionContext,
     ) -> Dict[str, Any]:
         """Execute with plugin pipeline"""
+        processed_input = await self._pre_execute(input_data, context)
+        return await self._execute_processed(function, processed_input, context)
 
-        # Pre-execution plugins
-        processed_input = input_data
-        for plugin in self.plugins["pre_execute"]:
-            processed_input = await plugin.process(processed_input, context)
-
-        # Execute (handle both sync and async functions)
-        if asyncio.iscoroutinefunction(function):
-            result = await function(processed_input, context)
-        else:
-            result = function(processed_input, context)
+    async def _pre_execute(
+        self, input_data: Dict[str, Any], context: DecisionContext
+    ) -> Dict[str, Any]:
+        """Run the pre-execution plugins"""
+        pipeline = self.plugin_pipeline
+        processed_input = pipeline.pre(input_data, context)
+        if pipeline.pre_is_async:
+            processed_input = await processed_input
+        return processed_input
+
+    async def _execute_processed(
+        self,
+        function: DecisionFunction,
+        processed_input: Dict[str, Any],
+        context: DecisionContext,
+    ) -> Dict[str, Any]:
+        """Run a function within its deadline, then the post-execution plugins"""
+        result = await self.executor.run(function, processed_input, context)
 
-        # Post-execution plugins
-        processed_result = result
-        for plugin in self.plugins["post_execute"]:
-            processed_result = await plugin.process(processed_result, context)
+        pipeline = self.plugin_pipeline
+        processed_result = pipeline.post(result, context)
+        if pipeline.post_is_async:
+            processed_result = await processed_result
 
         return processed_result
 
+    @property
+    def plugin_pipeline(self) -> PluginPipeline:
+        """Plugin chains resolved for the current plugin configuration"""
+        pipeline = self._plugin_pipeline
+        if pipeline is None:
+            pipeline = self._plugin_pipeline = PluginPipeline(self.plugins)
+        return pipeline
+
+    def add_plugin(self, stage: str, plugin: DecisionPlugin) -> None:
+        """Add a plugin to the ``pre_execute`` or ``post_execute`` chain"""
+        if stage not in self.plugins:
+            raise ValueError(f"Unknown plugin stage: {stage}")
+        self.plugins[stage].append(plugin)
+        self.rebuild_plugin_pipeline()
+
+    def rebuild_plugin_pipeline(self) -> None:
+        """Re-resolve plugin chains after editing ``plugins`` directly"""
+        self._plugin_pipeline = None
+
     async def deploy_function(self, function_id: str, version: str, function_code: str):
         """Deploy a new function version"""
         # Security validation
@@ -361,6 +752,108 @@ class DecisionEngine:
 
         await self.storage.save_function(function_id, version, function_code)
 
+        if hasattr(self, "_caching_plugin"):
+            self._caching_plugin.cache.invalidate(function_id, version)
+        self.circuit_breakers.reset(function_id, version)
+
+    async def warm_up(
+        self,
+        versions: str = "latest",
+        canary_inputs: Optional[Dict[str, Dict[str, Any]]] = None,
+        concurrency: int = 8,
+    ) -> WarmUpReport:
+        """Compile and prime functions before serving traffic
+
+        ``versions`` selects ``"latest"``, ``"all"`` or ``"active"`` (released)
+        versions. ``canary_inputs`` maps function IDs to an input that is run
+        once through the plugin pipeline without tracing or caching.
+        """
+        try:
+            targets = await select_versions(
+                self.list_functions,
+                self.list_versions,
+                versions,
+                self._active_versions,
+            )
+        except Exception as e:
+            self.warmup.fail(e)
+            raise
+        return await self.warmup.run(
+            targets, self._prime_function, self._run_canary, canary_inputs, concurrency
+        )
+
+    async def _active_versions(self, function_id: str) -> List[str]:
+        releases = await self.storage.get_releases(df_id=function_id, status="ACTIVE")
+        return [release["version"] for release in releases if "version" in release]
+
+    async def _prime_function(self, function_id: str, version: str) -> None:
+        """Load a function version into the compiled-function cache"""
+        function_cache = getattr(self.storage, "function_cache", None)
+        if function_cache is None:
+            await self.storage.load_function_object(function_id, version)
+            return
+        if function_cache.get_compiled(function_id, version) is None:
+            code = await self.storage.load_function(function_id, version)
+            # Compile off the event loop so versions warm in parallel
+            await asyncio.to_thread(function_cache.load, function_id, version, code)
+
+    async def _run_canary(
+        self, function_id: str, version: str, input_data: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        sanitized_input = self.security_manager.sanitize_input(input_data)
+        context = DecisionContext(
+            function_id=function_id,
+            version=version,
+            input_hash=self._hash_input(sanitized_input),
+            timestamp=datetime.utcnow(),
+            trace_id=self._generate_trace_id(),
+        )
+        function = await self.storage.load_function_object(function_id, version)
+        return await self._execute_with_plugins(function, sanitized_input, context)
+
+    @property
+    def ready(self) -> bool:
+        """True once warm-up has completed"""
+        return self.warmup.ready
+
+    def readiness_check(self) -> Dict[str, Any]:
+        """Get readiness and the last warm-up report"""
+        return self.warmup.get_stats()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get result and compiled-function cache statistics"""
+        stats: Dict[str, Any] = {}
+        if hasattr(self, "_caching_plugin"):
+            stats["results"] = self._caching_plugin.cache.get_stats()
+        function_cache = getattr(self.storage, "function_cache", None)
+        if function_cache is not None:
+            stats["functions"] = function_cache.get_stats()
+        return stats
+
+    def get_plugin_stats(self) -> Dict[str, Any]:
+        """Get plugin pipeline composition and per-execution overhead"""
+        return self.plugin_pipeline.get_stats()
+
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Get single-flight coalescing statistics"""
+        return self._single_flight.get_stats()
+
+    def get_admission_stats(self) -> Dict[str, Any]:
+        """Get admission control statistics"""
+        return self.admission.get_stats()
+
+    def get_circuit_breaker_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get circuit breaker state per function version"""
+        return self.circuit_breakers.get_stats()
+
+    def get_executor_stats(self) -> Dict[str, Any]:
+        """Get execution dispatch, timeout and abandoned-thread statistics"""
+        return self.executor.get_stats()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Release the execution thread pool"""
+        self.executor.shutdown(wait=wait)
+
     async def list_functions(self) -> List[str]:
         """List all available functions"""
         return await self.storage.list_functions()
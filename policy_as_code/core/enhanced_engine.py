@@ -3,20 +3,45 @@ Enhanced Decision Engine Implementation
 Complete the core DecisionEngine with production-ready features
 """
 
-import asyncio
-import hashlib
+import copy
 import json
 import uuid
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Protocol
-from dataclasses import dataclass
-
-from .errors import DecisionLayerError, ExecutionError, FunctionNotFoundError
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+)
+from dataclasses import dataclass, replace
+
+from .admission import AdmissionConfig, AdmissionController, AdmissionRejectedError
+from .circuit_breaker import (
+    CircuitBreakerConfig,
+    CircuitBreakerRegistry,
+    CircuitOpenError,
+)
+from .errors import (
+    DecisionLayerError,
+    ExecutionError,
+    ExecutionTimeoutError,
+    FunctionNotFoundError,
+    WorkerRestartedError,
+)
+from .executors import DeadlineExceeded, DecisionExecutor, ExecutionConfig
+from .result_cache import ResultCache
+from .single_flight import SingleFlight
+from .version_index import sort_versions
 from .security import SecurityConfig, SecurityManager
 from .storage import StorageBackend, create_storage_backend
 from .types import DecisionContext, DecisionResult
+from .warmup import WarmUp, WarmUpReport, select_versions
 from ..tracing.enhanced_ledger import ImmutableTraceLedger
 from ..monitoring.performance_monitor import PerformanceMonitor
+from ..utils.canonical import canonical_hash
 
 
 class DecisionFunction(Protocol):
@@ -55,22 +80,48 @@ class DecisionRegistry:
         """List all registered function IDs"""
         return list(self._versions.keys())
 
+    def list_versions(self, function_id: str) -> List[str]:
+        """List registered versions of a function in semantic-version order"""
+        return sort_versions(self._versions.get(function_id, []))
+
+    def latest_version(self, function_id: str) -> str:
+        """Get the highest registered version of a function"""
+        versions = self._versions.get(function_id)
+        if not versions:
+            raise FunctionNotFoundError(f"Function {function_id} not found")
+        return sort_versions(versions)[-1]
+
 
 class DecisionEngine:
     """Core decision execution engine"""
 
-    def __init__(self, security_config: Optional[SecurityConfig] = None):
+    def __init__(
+        self,
+        security_config: Optional[SecurityConfig] = None,
+        execution_config: Optional[ExecutionConfig] = None,
+        admission_config: Optional[AdmissionConfig] = None,
+        circuit_breaker_config: Optional[CircuitBreakerConfig] = None,
+    ):
         self.registry = DecisionRegistry()
         self.security_manager = SecurityManager(security_config or SecurityConfig())
         # Initialize with file storage by default
         self.storage_backend = create_storage_backend("file", {"path": "./functions"})
         self.trace_ledger = ImmutableTraceLedger(self.storage_backend)
         self.performance_monitor = PerformanceMonitor()
-        self._execution_cache: Dict[str, DecisionResult] = {}
+        self._execution_cache = ResultCache()
+        self.batch_chunk_size = 1000
+        self.executor = DecisionExecutor(execution_config, self.performance_monitor)
+        self._single_flight = SingleFlight()
+        self.admission = AdmissionController(admission_config, self.performance_monitor)
+        self.circuit_breakers = CircuitBreakerRegistry(circuit_breaker_config)
+        self.warmup = WarmUp()
 
     def register_function(self, function_id: str, version: str, func: DecisionFunction):
         """Register a decision function"""
         self.registry.register(function_id, version, func)
+        self.executor.register(function_id, version, func)
+        self.circuit_breakers.reset(function_id, version)
+        self._execution_cache.invalidate(function_id, version)
         # Note: Trace ledger entry will be added asynchronously
 
     async def execute_decision(
@@ -79,8 +130,13 @@ class DecisionEngine:
         version: str,
         input_data: Dict[str, Any],
         context: Optional[DecisionContext] = None,
+        client_id: Optional[str] = None,
     ) -> DecisionResult:
-        """Execute a decision function"""
+        """Execute a decision function
+
+        ``client_id`` identifies the calling client or tenant for fair
+        scheduling under the admission cap.
+        """
         start_time = datetime.now()
 
         try:
@@ -92,29 +148,30 @@ class DecisionEngine:
 
             # Create context if not provided
             if context is None:
-                input_hash = self._hash_input(input_data)
-                context = DecisionContext(
-                    function_id=function_id,
-                    version=version,
-                    input_hash=input_hash,
-                    timestamp=start_time,
-                    trace_id=str(uuid.uuid4()),
+                context = DecisionContext.for_input(
+                    function_id, version, input_data, start_time, str(uuid.uuid4())
                 )
 
             # Check cache
-            cache_key = f"{function_id}:{version}:{context.input_hash}"
-            if cache_key in self._execution_cache:
-                cached_result = self._execution_cache[cache_key]
+            cached_result = self._execution_cache.get(
+                function_id, version, context.input_hash
+            )
+            if cached_result is not None:
+                self.performance_monitor.record_cache_operation("result", True)
                 # Update timestamp for cached result
-                cached_result.timestamp = start_time
-                return cached_result
+                return replace(cached_result, timestamp=start_time)
+            self.performance_monitor.record_cache_operation("result", False)
 
             # Get and execute function
             decision_function = self.registry.get_function(function_id, version)
 
-            # Execute with monitoring
-            result_data = await self._execute_with_monitoring(
-                decision_function, input_data, context
+            # Execute with monitoring, sharing the run with identical
+            # in-flight requests; each caller still traces under its own id
+            result_data, _ = await self._single_flight.do(
+                (function_id, version, context.input_hash),
+                lambda: self._execute_admitted(
+                    decision_function, input_data, context, client_id
+                ),
             )
 
             # Calculate execution time
@@ -132,7 +189,13 @@ class DecisionEngine:
             )
 
             # Cache result
-            self._execution_cache[cache_key] = result
+            self._execution_cache.put(
+                function_id,
+                version,
+                context.input_hash,
+                result,
+                len(json.dumps(result_data, default=str)),
+            )
 
             # Store in persistent storage
             await self.storage_backend.store_decision(context, result_data)
@@ -157,6 +220,9 @@ class DecisionEngine:
 
             return result
 
+        except (AdmissionRejectedError, CircuitOpenError):
+            # Retryable; surfaced as-is so callers can back off
+            raise
         except Exception as e:
             execution_time = (datetime.now() - start_time).total_seconds() * 1000
 
@@ -178,8 +244,208 @@ class DecisionEngine:
                 {"trace_id": result.trace_id, "error": str(e)},
             )
 
+            if isinstance(e, ExecutionTimeoutError):
+                raise
             raise ExecutionError(f"Decision execution failed: {e}") from e
 
+    async def execute_batch(
+        self,
+        function_id: str,
+        inputs: Iterable[Dict[str, Any]],
+        version: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        client_id: Optional[str] = None,
+    ) -> List[DecisionResult]:
+        """Execute one function version over many inputs
+
+        Results are returned in input order. Failed inputs produce a
+        DecisionResult with ``success=False`` rather than aborting the batch.
+        """
+        results: List[DecisionResult] = []
+        async for chunk in self.iter_execute_batch(
+            function_id, inputs, version, chunk_size, client_id
+        ):
+            results.extend(chunk)
+        return results
+
+    async def iter_execute_batch(
+        self,
+        function_id: str,
+        inputs: Iterable[Dict[str, Any]],
+        version: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        client_id: Optional[str] = None,
+    ) -> AsyncIterator[List[DecisionResult]]:
+        """Execute a batch chunk by chunk, keeping memory bounded"""
+        chunk_size = chunk_size or self.batch_chunk_size
+        if chunk_size < 1:
+            raise ExecutionError("Batch chunk size must be at least 1")
+
+        if not self.security_manager.is_function_allowed(function_id):
+            raise ExecutionError(
+                f"Function {function_id} not allowed by security policy"
+            )
+
+        # Resolve once for the whole batch
+        if version is None:
+            version = self.registry.latest_version(function_id)
+        decision_function = self.registry.get_function(function_id, version)
+
+        chunk: List[Dict[str, Any]] = []
+        for input_data in inputs:
+            chunk.append(input_data)
+            if len(chunk) >= chunk_size:
+                yield await self._execute_chunk(
+                    decision_function, function_id, version, chunk, client_id
+                )
+                chunk = []
+
+        if chunk:
+            yield await self._execute_chunk(
+                decision_function, function_id, version, chunk, client_id
+            )
+
+    async def _execute_chunk(
+        self,
+        func: DecisionFunction,
+        function_id: str,
+        version: str,
+        inputs: List[Dict[str, Any]],
+        client_id: Optional[str] = None,
+    ) -> List[DecisionResult]:
+        """Execute a chunk of inputs with a single executor hop"""
+        start_time = datetime.now()
+        contexts = [
+            DecisionContext.for_input(
+                function_id, version, input_data, start_time, str(uuid.uuid4())
+            )
+            for input_data in inputs
+        ]
+
+        results: List[Optional[DecisionResult]] = [None] * len(inputs)
+        pending: List[int] = []
+        for i, context in enumerate(contexts):
+            cached_result = self._execution_cache.get(
+                function_id, version, context.input_hash
+            )
+            if cached_result is not None:
+                results[i] = replace(cached_result, timestamp=start_time)
+            else:
+                pending.append(i)
+
+        # Run each distinct input once; duplicates reuse its outcome
+        first_seen: Dict[str, int] = {}
+        for i in pending:
+            first_seen.setdefault(contexts[i].input_hash, i)
+        unique = list(first_seen.values())
+        self._single_flight.record_coalesced(len(pending) - len(unique))
+
+        breaker = self.circuit_breakers.get(function_id, version)
+        if unique:
+            breaker.allow()
+            try:
+                async with self.admission.admit(function_id, client_id):
+                    outcomes = await self.executor.run_chunk(
+                        function_id,
+                        version,
+                        func,
+                        [(inputs[i], contexts[i]) for i in unique],
+                    )
+            except (AdmissionRejectedError, WorkerRestartedError):
+                breaker.release()
+                raise
+            for _, error, _ in outcomes:
+                if error is None:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure(
+                        timed_out=isinstance(error, DeadlineExceeded)
+                    )
+        else:
+            outcomes = []
+        outcome_by_hash = {
+            contexts[i].input_hash: outcome for i, outcome in zip(unique, outcomes)
+        }
+
+        failures = 0
+        delivered = set()
+        for i in pending:
+            context = contexts[i]
+            result_data, error, execution_time_ms = outcome_by_hash[context.input_hash]
+            if context.input_hash in delivered:
+                # Duplicates get their own copy of the shared result
+                result_data = copy.deepcopy(result_data)
+            delivered.add(context.input_hash)
+            result = DecisionResult(
+                trace_id=context.trace_id,
+                function_id=function_id,
+                version=version,
+                result=result_data or {},
+                execution_time_ms=int(execution_time_ms),
+                timestamp=start_time,
+                success=error is None,
+                error_message=error,
+            )
+            results[i] = result
+
+            if result.success:
+                self._execution_cache.put(
+                    function_id,
+                    version,
+                    context.input_hash,
+                    result,
+                    len(json.dumps(result_data, default=str)),
+                )
+                await self.storage_backend.store_decision(context, result.result)
+            else:
+                failures += 1
+
+            await self.trace_ledger.append_decision_execution(context, result)
+            self.performance_monitor.record_decision_execution(
+                function_id,
+                result.execution_time_ms,
+                result.success,
+                result.error_message,
+            )
+
+        self.security_manager.audit_log(
+            function_id,
+            "decision_batch_executed",
+            {
+                "version": version,
+                "items": len(inputs),
+                "executed": len(unique),
+                "failed": failures,
+            },
+        )
+
+        return [result for result in results if result is not None]
+
+    async def _execute_admitted(
+        self,
+        func: DecisionFunction,
+        input_data: Dict[str, Any],
+        context: DecisionContext,
+        client_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Execute behind the circuit breaker once admission grants a slot"""
+        breaker = self.circuit_breakers.get(context.function_id, context.version)
+        breaker.allow()
+        try:
+            async with self.admission.admit(context.function_id, client_id):
+                result = await self._execute_with_monitoring(func, input_data, context)
+        except (AdmissionRejectedError, WorkerRestartedError):
+            breaker.release()
+            raise
+        except ExecutionTimeoutError:
+            breaker.record_failure(timed_out=True)
+            raise
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return result
+
     async def _execute_with_monitoring(
         self,
         func: DecisionFunction,
@@ -188,9 +454,8 @@ class DecisionEngine:
     ) -> Dict[str, Any]:
         """Execute function with monitoring and error handling"""
         try:
-            # Run in executor to prevent blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, func, input_data, context)
+            # Run on the configured backend (thread pool by default)
+            result = await self.executor.run(func, input_data, context)
 
             # Validate result
             if not isinstance(result, dict):
@@ -198,13 +463,14 @@ class DecisionEngine:
 
             return result
 
+        except (ExecutionTimeoutError, WorkerRestartedError):
+            raise
         except Exception as e:
             raise ExecutionError(f"Function execution error: {e}") from e
 
     def _hash_input(self, input_data: Dict[str, Any]) -> str:
         """Create hash of input data for caching"""
-        input_str = json.dumps(input_data, sort_keys=True)
-        return hashlib.sha256(input_str.encode()).hexdigest()
+        return canonical_hash(input_data)
 
     async def get_decision_history(
         self, function_id: str, limit: int = 100, offset: int = 0
@@ -270,13 +536,7 @@ class DecisionEngine:
             )
 
             # Also clean up cache
-            cache_keys_to_remove = []
-            for key, result in self._execution_cache.items():
-                if (datetime.now() - result.timestamp).days > retention_days:
-                    cache_keys_to_remove.append(key)
-
-            for key in cache_keys_to_remove:
-                del self._execution_cache[key]
+            self._execution_cache.evict_older_than(retention_days * 86400)
 
             return deleted_count
         except Exception as e:
@@ -294,10 +554,22 @@ class DecisionEngine:
         ledger_stats = self.trace_ledger.get_ledger_stats()
         performance_summary = self.performance_monitor.get_performance_summary()
 
+        circuit_breakers = self.circuit_breakers.get_stats()
+        open_circuits = [
+            key for key, stats in circuit_breakers.items() if stats["state"] == "open"
+        ]
+
         return {
-            "status": "healthy",
+            "status": "degraded" if open_circuits else "healthy",
+            "open_circuits": open_circuits,
             "registered_functions": len(self.registry.list_functions()),
             "cache_size": len(self._execution_cache),
+            "result_cache": self._execution_cache.get_stats(),
+            "executor": self.executor.get_stats(),
+            "coalescing": self._single_flight.get_stats(),
+            "admission": self.admission.get_stats(),
+            "circuit_breakers": circuit_breakers,
+            "warm_up": self.warmup.get_stats(),
             "trace_ledger": ledger_stats,
             "performance": performance_summary,
             "timestamp": datetime.now().isoformat(),
@@ -364,3 +636,72 @@ class DecisionEngine:
     def stop_monitoring(self):
         """Stop performance monitoring"""
         self.performance_monitor.stop_monitoring()
+
+    async def warm_up_executor(self):
+        """Start execution workers ahead of the first request"""
+        await self.executor.warm_up()
+
+    async def warm_up(
+        self,
+        versions: str = "latest",
+        canary_inputs: Optional[Dict[str, Dict[str, Any]]] = None,
+        concurrency: int = 8,
+    ) -> WarmUpReport:
+        """Start workers and prime registered functions before serving traffic
+
+        ``versions`` selects ``"latest"``, ``"all"`` or ``"active"`` (released)
+        versions. ``canary_inputs`` maps function IDs to an input that is run
+        once through the executor; canary runs are not traced or cached.
+        """
+        try:
+            await self.executor.warm_up()
+            targets = await select_versions(
+                self._list_registered_functions,
+                self._list_registered_versions,
+                versions,
+                self._active_versions,
+            )
+        except Exception as e:
+            self.warmup.fail(e)
+            raise
+        return await self.warmup.run(
+            targets, self._prime_function, self._run_canary, canary_inputs, concurrency
+        )
+
+    async def _list_registered_functions(self) -> List[str]:
+        return self.registry.list_functions()
+
+    async def _list_registered_versions(self, function_id: str) -> List[str]:
+        return self.registry.list_versions(function_id)
+
+    async def _active_versions(self, function_id: str) -> List[str]:
+        releases = await self.storage_backend.get_releases(
+            df_id=function_id, status="ACTIVE"
+        )
+        return [release["version"] for release in releases if "version" in release]
+
+    async def _prime_function(self, function_id: str, version: str) -> None:
+        """Check a registered version resolves; workers load it in warm_up"""
+        self.registry.get_function(function_id, version)
+
+    async def _run_canary(
+        self, function_id: str, version: str, input_data: Dict[str, Any]
+    ) -> Any:
+        func = self.registry.get_function(function_id, version)
+        context = DecisionContext.for_input(
+            function_id, version, input_data, datetime.now(), str(uuid.uuid4())
+        )
+        return await self.executor.run(func, input_data, context)
+
+    @property
+    def ready(self) -> bool:
+        """True once warm-up has completed"""
+        return self.warmup.ready
+
+    def readiness_check(self) -> Dict[str, Any]:
+        """Get readiness and the last warm-up report"""
+        return self.warmup.get_stats()
+
+    def shutdown(self, wait: bool = True):
+        """Release execution thread and process pools"""
+        self.executor.shutdown(wait=wait)
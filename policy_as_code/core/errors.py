@@ -21,6 +21,18 @@ class ExecutionError(DecisionLayerError):
     pass
 
 
+class ExecutionTimeoutError(ExecutionError):
+    """Decision execution exceeded its deadline"""
+
+    pass
+
+
+class WorkerRestartedError(ExecutionError):
+    """Decision execution lost its worker to a restart caused by another task"""
+
+    pass
+
+
 class FunctionNotFoundError(DecisionLayerError):
     """Function not found error"""
 
@@ -0,0 +1,721 @@
+"""
+Execution backends for decision functions
+
+Decision functions can run inline on the event loop, in a thread pool or in a
+pool of pre-warmed worker processes. Process workers keep decision functions
+resident between calls so only inputs and results cross the process boundary.
+In adaptive mode the backend is chosen per function version from a running
+estimate of its execution cost.
+
+Executions can carry a deadline. A timed-out coroutine is cancelled; a stuck
+thread is abandoned and the thread pool replaced so new work does not queue
+behind it; stuck worker processes are terminated and the pool restarted.
+Tasks of other functions running on the terminated pool are resubmitted to
+the new one rather than failed.
+"""
+
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .errors import ExecutionError, ExecutionTimeoutError, WorkerRestartedError
+from .types import DecisionContext
+
+# (result, error message, execution time in ms)
+ItemOutcome = Tuple[Optional[Dict[str, Any]], Optional[str], float]
+ContextFields = Tuple[str, str, str, Any, str]
+
+
+class DeadlineExceeded(str):
+    """Error message of an item abandoned at its deadline"""
+
+
+class ExecutionMode(str, Enum):
+    """Where decision functions are executed"""
+
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+    ADAPTIVE = "adaptive"
+
+
+@dataclass
+class ExecutionConfig:
+    """Execution backend configuration"""
+
+    mode: ExecutionMode = ExecutionMode.THREAD
+    max_workers: Optional[int] = None
+    recycle_after_tasks: Optional[int] = None  # process workers only
+    mp_start_method: Optional[str] = None  # "fork", "spawn", "forkserver"
+    # Adaptive routing: estimated cost below inline_threshold_ms runs on the
+    # event loop, at or above process_threshold_ms goes to worker processes
+    inline_threshold_ms: float = 0.5
+    process_threshold_ms: float = 20.0
+    ewma_alpha: float = 0.2
+    # Deadlines in seconds; function_timeouts is keyed by "function_id" or
+    # "function_id:version" and overrides timeout_seconds
+    timeout_seconds: Optional[float] = None
+    function_timeouts: Dict[str, float] = field(default_factory=dict)
+
+    def timeout_for(self, function_id: str, version: str) -> Optional[float]:
+        """Resolve the execution deadline for a function version"""
+        timeouts = self.function_timeouts
+        if timeouts:
+            timeout = timeouts.get(f"{function_id}:{version}")
+            if timeout is None:
+                timeout = timeouts.get(function_id)
+            if timeout is not None:
+                return timeout
+        return self.timeout_seconds
+
+
+def _context_fields(context: DecisionContext) -> ContextFields:
+    """Flatten a context into a tuple for compact pickling"""
+    return (
+        context.function_id,
+        context.version,
+        context.input_hash,
+        context.timestamp,
+        context.trace_id,
+    )
+
+
+def _timed_call(
+    func: Callable[..., Any], input_data: Dict[str, Any], context: DecisionContext
+) -> Tuple[Any, float]:
+    """Call a decision function and measure its execution time in ms"""
+    started = time.perf_counter()
+    result = func(input_data, context)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def run_decision_items(
+    func: Callable[..., Any],
+    items: List[Tuple[Dict[str, Any], DecisionContext]],
+) -> List[ItemOutcome]:
+    """Run a decision function over many inputs, capturing per-item errors"""
+    outcomes: List[ItemOutcome] = []
+    for input_data, context in items:
+        started = time.perf_counter()
+        try:
+            result = func(input_data, context)
+            if not isinstance(result, dict):
+                raise ExecutionError("Decision function must return a dictionary")
+            outcomes.append((result, None, (time.perf_counter() - started) * 1000))
+        except Exception as e:
+            outcomes.append((None, str(e), (time.perf_counter() - started) * 1000))
+    return outcomes
+
+
+# Worker-process state: decision functions resident in this worker
+_RESIDENT_FUNCTIONS: Dict[str, Callable[..., Any]] = {}
+
+
+def _worker_initialize(specs: Dict[str, bytes]) -> None:
+    """Load every known decision function when a worker starts"""
+    for spec_id, payload in specs.items():
+        _RESIDENT_FUNCTIONS[spec_id] = pickle.loads(payload)
+
+
+def _worker_resolve(spec_id: str, payload: Optional[bytes]) -> Callable[..., Any]:
+    func = _RESIDENT_FUNCTIONS.get(spec_id)
+    if func is None:
+        if payload is None:
+            raise ExecutionError(f"Decision function {spec_id} is not resident")
+        func = pickle.loads(payload)
+        _RESIDENT_FUNCTIONS[spec_id] = func
+    return func
+
+
+def _worker_ping() -> int:
+    return os.getpid()
+
+
+def _worker_execute(
+    spec_id: str,
+    payload: Optional[bytes],
+    input_data: Dict[str, Any],
+    context_fields: ContextFields,
+) -> Tuple[Any, float]:
+    func = _worker_resolve(spec_id, payload)
+    return _timed_call(func, input_data, DecisionContext(*context_fields))
+
+
+def _worker_execute_chunk(
+    spec_id: str,
+    payload: Optional[bytes],
+    items: List[Tuple[Dict[str, Any], ContextFields]],
+) -> List[ItemOutcome]:
+    func = _worker_resolve(spec_id, payload)
+    return run_decision_items(
+        func,
+        [(input_data, DecisionContext(*fields)) for input_data, fields in items],
+    )
+
+
+class ProcessPoolBackend:
+    """Pool of pre-warmed worker processes with resident decision functions
+
+    Functions are shipped to workers as pickled references. Functions known
+    when the pool starts are loaded by the worker initializer; functions
+    registered later travel with their tasks until the next recycle. The pool
+    is replaced after ``recycle_after_tasks`` tasks so long-running workers do
+    not accumulate state.
+
+    Terminating a pool fails every task still running on it. Those tasks
+    did not cause the termination, so they are resubmitted up to
+    ``max_resubmits`` times and then fail with ``WorkerRestartedError``.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        recycle_after_tasks: Optional[int] = None,
+        mp_start_method: Optional[str] = None,
+        max_resubmits: int = 2,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_resubmits = max_resubmits
+        self.recycle_after_tasks = recycle_after_tasks
+        self.mp_start_method = mp_start_method
+        self._specs: Dict[str, Tuple[str, bytes]] = {}  # key -> (spec_id, payload)
+        self._preloaded: Set[str] = set()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # Pools killed by recycle(terminate=True), to tell their broken tasks
+        # apart from workers that died on their own
+        self._terminated: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._tasks_since_start = 0
+
+        self.tasks = 0
+        self.recycles = 0
+        self.broken_pools = 0
+        self.terminations = 0
+        self.resubmits = 0
+
+    def register(self, key: str, func: Callable[..., Any]) -> bool:
+        """Make a function available to workers; False if it cannot be shipped"""
+        try:
+            payload = pickle.dumps(func, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.loads(payload)
+        except Exception:
+            return False
+
+        spec_id = f"{key}#{hashlib.sha256(payload).hexdigest()[:16]}"
+        with self._lock:
+            self._specs[key] = (spec_id, payload)
+        return True
+
+    def supports(self, key: str) -> bool:
+        """Check whether a function can run in worker processes"""
+        return key in self._specs
+
+    async def warm_up(self) -> int:
+        """Start every worker and load resident functions; returns worker count"""
+        pool = self._ensure_pool()
+        loop = asyncio.get_running_loop()
+        pids = await asyncio.gather(
+            *[loop.run_in_executor(pool, _worker_ping) for _ in range(self.max_workers)]
+        )
+        return len(set(pids))
+
+    async def run(
+        self, key: str, input_data: Dict[str, Any], context: DecisionContext
+    ) -> Any:
+        """Execute one decision in a worker process"""
+        result, _ = await self.run_timed(key, input_data, context)
+        return result
+
+    async def run_timed(
+        self, key: str, input_data: Dict[str, Any], context: DecisionContext
+    ) -> Tuple[Any, float]:
+        """Execute one decision and return it with the in-worker time in ms"""
+        spec_id, payload = self._task_spec(key)
+        return await self._submit(
+            _worker_execute, spec_id, payload, input_data, _context_fields(context)
+        )
+
+    async def run_chunk(
+        self, key: str, items: List[Tuple[Dict[str, Any], DecisionContext]]
+    ) -> List[ItemOutcome]:
+        """Execute many decisions, spread evenly over the workers"""
+        if not items:
+            return []
+
+        spec_id, payload = self._task_spec(key)
+        slice_size = -(-len(items) // self.max_workers)
+        slices = [
+            [
+                (input_data, _context_fields(context))
+                for input_data, context in items[i : i + slice_size]
+            ]
+            for i in range(0, len(items), slice_size)
+        ]
+        results = await asyncio.gather(
+            *[
+                self._submit(_worker_execute_chunk, spec_id, payload, part)
+                for part in slices
+            ]
+        )
+        return [outcome for part in results for outcome in part]
+
+    def recycle(self, terminate: bool = False) -> None:
+        """Replace the pool; terminate=True kills the old workers immediately
+
+        Killing workers also breaks any other task still running on them;
+        those are resubmitted to the new pool.
+        """
+        with self._lock:
+            pool, self._pool = self._pool, None
+            if pool is None:
+                return
+            self.recycles += 1
+            if terminate:
+                self._terminated.add(pool)
+        if terminate:
+            # ProcessPoolExecutor has no public API to stop a running task
+            for process in list(getattr(pool, "_processes", {}).values()):
+                process.terminate()
+            self.terminations += 1
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop all worker processes"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get process pool statistics"""
+        return {
+            "max_workers": self.max_workers,
+            "running": self._pool is not None,
+            "registered_functions": len(self._specs),
+            "tasks": self.tasks,
+            "recycles": self.recycles,
+            "broken_pools": self.broken_pools,
+            "terminations": self.terminations,
+            "resubmits": self.resubmits,
+            "recycle_after_tasks": self.recycle_after_tasks,
+        }
+
+    def _task_spec(self, key: str) -> Tuple[str, Optional[bytes]]:
+        spec = self._specs.get(key)
+        if spec is None:
+            raise ExecutionError(f"Function {key} is not registered for processes")
+        spec_id, payload = spec
+        # Workers started after registration already hold the function
+        return spec_id, None if spec_id in self._preloaded else payload
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._start_locked()
+            assert self._pool is not None
+            return self._pool
+
+    def _start_locked(self) -> None:
+        mp_context = (
+            multiprocessing.get_context(self.mp_start_method)
+            if self.mp_start_method
+            else None
+        )
+        specs = {spec_id: payload for spec_id, payload in self._specs.values()}
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=mp_context,
+            initializer=_worker_initialize,
+            initargs=(specs,),
+        )
+        self._preloaded = set(specs)
+        self._tasks_since_start = 0
+
+    async def _submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_resubmits + 1):
+            pool = self._acquire(resubmit=attempt > 0)
+            try:
+                return await loop.run_in_executor(pool, fn, *args)
+            except BrokenProcessPool as e:
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None
+                    terminated = pool in self._terminated
+                    if not terminated:
+                        self.broken_pools += 1
+                if not terminated:
+                    raise ExecutionError(f"Worker process died: {e}") from e
+        raise WorkerRestartedError(
+            f"Worker pool was restarted {self.max_resubmits + 1} times under the task"
+        )
+
+    def _acquire(self, resubmit: bool) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._start_locked()
+            elif (
+                self.recycle_after_tasks
+                and self._tasks_since_start >= self.recycle_after_tasks
+            ):
+                # Let in-flight tasks finish on the old pool
+                old_pool = self._pool
+                self._start_locked()
+                old_pool.shutdown(wait=False)
+                self.recycles += 1
+            pool = self._pool
+            assert pool is not None
+            self._tasks_since_start += 1
+            if resubmit:
+                self.resubmits += 1
+            else:
+                self.tasks += 1
+            return pool
+
+
+class CostEstimator:
+    """Exponentially weighted moving average of execution time per key"""
+
+    def __init__(self, alpha: float = 0.2):
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        self._estimates: Dict[str, float] = {}
+        self._samples: Dict[str, int] = {}
+
+    def observe(self, key: str, duration_ms: float) -> float:
+        """Fold a measurement into the estimate and return the new value"""
+        previous = self._estimates.get(key)
+        estimate = (
+            duration_ms
+            if previous is None
+            else previous + self.alpha * (duration_ms - previous)
+        )
+        self._estimates[key] = estimate
+        self._samples[key] = self._samples.get(key, 0) + 1
+        return estimate
+
+    def estimate(self, key: str) -> Optional[float]:
+        """Current estimate in ms, or None if never measured"""
+        return self._estimates.get(key)
+
+    def get_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get estimates and sample counts per key"""
+        return {
+            key: {"ewma_ms": value, "samples": self._samples[key]}
+            for key, value in self._estimates.items()
+        }
+
+
+class DecisionExecutor:
+    """Dispatches decision functions to the configured execution backend"""
+
+    def __init__(
+        self, config: Optional[ExecutionConfig] = None, monitor: Optional[Any] = None
+    ):
+        self.config = config or ExecutionConfig()
+        self.mode = ExecutionMode(self.config.mode)
+        self.monitor = monitor
+        self.cost_estimator = CostEstimator(self.config.ewma_alpha)
+        # Created on first use; never the loop's default executor, which
+        # could not be replaced when a stuck thread has to be abandoned
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self.process_backend: Optional[ProcessPoolBackend] = (
+            ProcessPoolBackend(
+                max_workers=self.config.max_workers,
+                recycle_after_tasks=self.config.recycle_after_tasks,
+                mp_start_method=self.config.mp_start_method,
+            )
+            if self.mode in (ExecutionMode.PROCESS, ExecutionMode.ADAPTIVE)
+            else None
+        )
+        self.dispatch_counts: Dict[str, int] = {mode.value: 0 for mode in ExecutionMode}
+        self.timeouts = 0
+        self.abandoned_threads = 0
+
+    @staticmethod
+    def function_key(function_id: str, version: str) -> str:
+        return f"{function_id}:{version}"
+
+    def register(self, function_id: str, version: str, func: Callable[..., Any]):
+        """Prepare a function for execution (ships it to process workers)"""
+        if self.process_backend is not None:
+            self.process_backend.register(self.function_key(function_id, version), func)
+
+    def mode_for(
+        self, function_id: str, version: str, func: Callable[..., Any]
+    ) -> ExecutionMode:
+        """Resolve the backend a function will actually run on"""
+        if asyncio.iscoroutinefunction(func):
+            return ExecutionMode.INLINE
+
+        key = self.function_key(function_id, version)
+        mode = self.mode
+        if mode == ExecutionMode.ADAPTIVE:
+            estimate = self.cost_estimator.estimate(key)
+            if estimate is None:
+                # Unmeasured functions run on threads until we know their cost
+                mode = ExecutionMode.THREAD
+            elif estimate < self.config.inline_threshold_ms:
+                mode = ExecutionMode.INLINE
+            elif estimate >= self.config.process_threshold_ms:
+                mode = ExecutionMode.PROCESS
+            else:
+                mode = ExecutionMode.THREAD
+
+        if mode == ExecutionMode.PROCESS and not (
+            self.process_backend and self.process_backend.supports(key)
+        ):
+            # Closures and other unpicklable callables cannot leave the process
+            return ExecutionMode.THREAD
+        if (
+            mode == ExecutionMode.INLINE
+            and self.config.timeout_for(function_id, version) is not None
+        ):
+            # A deadline cannot interrupt synchronous code on the event loop
+            return ExecutionMode.THREAD
+        return mode
+
+    async def run(
+        self,
+        func: Callable[..., Any],
+        input_data: Dict[str, Any],
+        context: DecisionContext,
+    ) -> Any:
+        """Execute a single decision"""
+        key = self.function_key(context.function_id, context.version)
+        mode = self.mode_for(context.function_id, context.version, func)
+        self._record_dispatch(context.function_id, key, mode, 1)
+        timeout = self.config.timeout_for(context.function_id, context.version)
+
+        try:
+            result, duration_ms = await asyncio.wait_for(
+                self._run_on(mode, key, func, input_data, context), timeout
+            )
+        except asyncio.TimeoutError:
+            assert timeout is not None
+            self._abandon(mode, key, timeout)
+            raise ExecutionTimeoutError(
+                f"Decision function {key} exceeded its {timeout}s deadline"
+            ) from None
+
+        self.cost_estimator.observe(key, duration_ms)
+        return result
+
+    async def _run_on(
+        self,
+        mode: ExecutionMode,
+        key: str,
+        func: Callable[..., Any],
+        input_data: Dict[str, Any],
+        context: DecisionContext,
+    ) -> Tuple[Any, float]:
+        if mode == ExecutionMode.INLINE:
+            started = time.perf_counter()
+            result = func(input_data, context)
+            if asyncio.iscoroutine(result):
+                result = await result
+            return result, (time.perf_counter() - started) * 1000
+        if mode == ExecutionMode.PROCESS:
+            assert self.process_backend is not None
+            return await self.process_backend.run_timed(key, input_data, context)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._threads(), _timed_call, func, input_data, context
+        )
+
+    def _threads(self) -> ThreadPoolExecutor:
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.config.max_workers)
+        return self._thread_pool
+
+    def _abandon(self, mode: ExecutionMode, key: str, timeout: float) -> None:
+        """Free capacity held by a timed-out execution"""
+        self.timeouts += 1
+        # Timed-out functions look expensive, so adaptive routing moves them
+        # to processes, which unlike threads can be killed
+        self.cost_estimator.observe(key, timeout * 1000)
+        if mode == ExecutionMode.PROCESS:
+            assert self.process_backend is not None
+            self.process_backend.recycle(terminate=True)
+        elif mode == ExecutionMode.THREAD:
+            # Python threads cannot be killed: leave the stuck one to finish
+            # on the old pool and route new work to a fresh pool
+            self.abandoned_threads += 1
+            old_pool = self._thread_pool
+            self._thread_pool = None
+            if old_pool is not None:
+                old_pool.shutdown(wait=False)
+
+    async def run_chunk(
+        self,
+        function_id: str,
+        version: str,
+        func: Callable[..., Any],
+        items: List[Tuple[Dict[str, Any], DecisionContext]],
+    ) -> List[ItemOutcome]:
+        """Execute many decisions of one function version"""
+        if not items:
+            return []
+
+        key = self.function_key(function_id, version)
+        mode = self.mode_for(function_id, version, func)
+        self._record_dispatch(function_id, key, mode, len(items))
+        timeout = self.config.timeout_for(function_id, version)
+        if timeout is None:
+            outcomes = await self._run_chunk_on(mode, key, func, items)
+            measured = [duration for _, _, duration in outcomes]
+        else:
+            outcomes, measured = await self._run_chunk_with_deadline(
+                mode, key, func, items, timeout
+            )
+
+        if measured:
+            self.cost_estimator.observe(key, sum(measured) / len(measured))
+        return outcomes
+
+    async def _run_chunk_with_deadline(
+        self,
+        mode: ExecutionMode,
+        key: str,
+        func: Callable[..., Any],
+        items: List[Tuple[Dict[str, Any], DecisionContext]],
+        timeout: float,
+    ) -> Tuple[List[ItemOutcome], List[float]]:
+        """Run items one at a time per thread or worker, each within the deadline
+
+        The item that overruns and the rest of its slice get a
+        ``DeadlineExceeded`` error; outcomes that completed are kept. Returns
+        the outcomes and the execution times of the items that ran.
+        """
+        lanes = (
+            self.process_backend.max_workers
+            if mode == ExecutionMode.PROCESS and self.process_backend
+            else 1
+        )
+        slice_size = -(-len(items) // lanes)
+        outcomes: List[Optional[ItemOutcome]] = [None] * len(items)
+        measured: List[float] = []
+
+        async def run_slice(start: int, stop: int) -> None:
+            for i in range(start, stop):
+                input_data, context = items[i]
+                started = time.perf_counter()
+                try:
+                    result, duration_ms = await asyncio.wait_for(
+                        self._run_on(mode, key, func, input_data, context), timeout
+                    )
+                    if not isinstance(result, dict):
+                        raise ExecutionError(
+                            "Decision function must return a dictionary"
+                        )
+                    outcomes[i] = (result, None, duration_ms)
+                except asyncio.TimeoutError:
+                    self._abandon(mode, key, timeout)
+                    error = DeadlineExceeded(
+                        f"Decision function {key} exceeded its {timeout}s deadline"
+                    )
+                    outcomes[i] = (None, error, timeout * 1000)
+                    for j in range(i + 1, stop):
+                        outcomes[j] = (None, error, 0.0)
+                    return
+                except WorkerRestartedError:
+                    raise
+                except Exception as e:
+                    duration_ms = (time.perf_counter() - started) * 1000
+                    outcomes[i] = (None, str(e), duration_ms)
+                measured.append(duration_ms)
+
+        await asyncio.gather(
+            *[
+                run_slice(start, min(start + slice_size, len(items)))
+                for start in range(0, len(items), slice_size)
+            ]
+        )
+        return [outcome for outcome in outcomes if outcome is not None], measured
+
+    async def _run_chunk_on(
+        self,
+        mode: ExecutionMode,
+        key: str,
+        func: Callable[..., Any],
+        items: List[Tuple[Dict[str, Any], DecisionContext]],
+    ) -> List[ItemOutcome]:
+        if mode == ExecutionMode.INLINE:
+            if not asyncio.iscoroutinefunction(func):
+                return run_decision_items(func, items)
+            outcomes: List[ItemOutcome] = []
+            for input_data, context in items:
+                started = time.perf_counter()
+                try:
+                    result = await func(input_data, context)
+                    if not isinstance(result, dict):
+                        raise ExecutionError(
+                            "Decision function must return a dictionary"
+                        )
+                    outcomes.append(
+                        (result, None, (time.perf_counter() - started) * 1000)
+                    )
+                except Exception as e:
+                    outcomes.append(
+                        (None, str(e), (time.perf_counter() - started) * 1000)
+                    )
+            return outcomes
+        if mode == ExecutionMode.PROCESS:
+            assert self.process_backend is not None
+            return await self.process_backend.run_chunk(key, items)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._threads(), run_decision_items, func, items
+        )
+
+    def _record_dispatch(
+        self, function_id: str, key: str, mode: ExecutionMode, count: int
+    ) -> None:
+        self.dispatch_counts[mode.value] += count
+        if self.monitor is not None:
+            self.monitor.record_execution_dispatch(
+                function_id, mode.value, self.cost_estimator.estimate(key), count
+            )
+
+    async def warm_up(self) -> None:
+        """Pre-start worker processes so the first request does not pay for it"""
+        if self.process_backend is not None:
+            await self.process_backend.warm_up()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Release thread and process pools"""
+        if self._thread_pool is not None:
+            self._thread_pool.shutdown(wait=wait)
+        if self.process_backend is not None:
+            self.process_backend.shutdown(wait=wait)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get dispatch statistics"""
+        stats: Dict[str, Any] = {
+            "mode": self.mode.value,
+            "dispatch_counts": dict(self.dispatch_counts),
+            "timeouts": self.timeouts,
+            "abandoned_threads": self.abandoned_threads,
+            "cost_estimates": self.cost_estimator.get_stats(),
+        }
+        if self.mode == ExecutionMode.ADAPTIVE:
+            stats["thresholds_ms"] = {
+                "inline": self.config.inline_threshold_ms,
+                "process": self.config.process_threshold_ms,
+            }
+        if self.process_backend is not None:
+            stats["process_pool"] = self.process_backend.get_stats()
+        return stats
@@ -0,0 +1,206 @@
+"""
+Compiled decision function cache
+
+Keeps compiled code objects and resolved ``decision_function`` callables in
+memory so storage backends do not re-read and re-exec function source on every
+execution.
+"""
+
+import hashlib
+import importlib.util
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from .errors import StorageError
+
+
+@dataclass(frozen=True)
+class CompiledFunction:
+    """A compiled decision function and the source it was built from"""
+
+    content_hash: str
+    code: Any  # types.CodeType
+    function: Callable[..., Any]
+    compile_time_ms: float
+
+
+class CompiledFunctionCache:
+    """Content-hash keyed LRU cache of compiled decision functions
+
+    Entries are keyed by the SHA-256 of the function source, so identical
+    source deployed under several versions is compiled once. A second map from
+    ``(function_id, version)`` to content hash lets a hot function be served
+    with a single dict lookup, without touching the storage backend at all.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        enabled: bool = True,
+        artifact_cache: Optional[Any] = None,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.enabled = enabled
+        # Optional on-disk ArtifactCache of code objects shared across restarts
+        self.artifact_cache = artifact_cache
+        self._entries: "OrderedDict[str, CompiledFunction]" = OrderedDict()
+        self._versions: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.compilations = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.total_compile_time_ms = 0.0
+
+    @staticmethod
+    def hash_source(code: str) -> str:
+        """Hash function source code"""
+        return hashlib.sha256(code.encode()).hexdigest()
+
+    def get(self, function_id: str, version: str) -> Optional[Callable[..., Any]]:
+        """Return the cached callable for a function version, if present"""
+        if not self.enabled:
+            return None
+
+        with self._lock:
+            content_hash = self._versions.get((function_id, version))
+            entry = self._entries.get(content_hash) if content_hash else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(content_hash)
+            self.hits += 1
+            return entry.function
+
+    def load(self, function_id: str, version: str, code: str) -> Callable[..., Any]:
+        """Resolve ``decision_function`` from source, compiling only if needed"""
+        content_hash = self.hash_source(code)
+
+        if self.enabled:
+            with self._lock:
+                entry = self._entries.get(content_hash)
+                if entry is not None:
+                    self._entries.move_to_end(content_hash)
+                    self._versions[(function_id, version)] = content_hash
+                    return entry.function
+
+        entry = self._compile(function_id, version, code, content_hash)
+
+        if self.enabled:
+            with self._lock:
+                self._entries[content_hash] = entry
+                self._entries.move_to_end(content_hash)
+                self._versions[(function_id, version)] = content_hash
+                while len(self._entries) > self.max_entries:
+                    evicted_hash, _ = self._entries.popitem(last=False)
+                    self._drop_version_refs(evicted_hash)
+                    self.evictions += 1
+
+        return entry.function
+
+    def get_compiled(
+        self, function_id: str, version: str
+    ) -> Optional[CompiledFunction]:
+        """Return the full cache entry for a function version, if present"""
+        with self._lock:
+            content_hash = self._versions.get((function_id, version))
+            return self._entries.get(content_hash) if content_hash else None
+
+    def invalidate(self, function_id: str, version: Optional[str] = None) -> None:
+        """Forget cached versions of a function
+
+        The compiled entry itself stays cached while other versions still
+        reference the same source.
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._versions
+                if key[0] == function_id and (version is None or key[1] == version)
+            ]
+            for key in keys:
+                content_hash = self._versions.pop(key)
+                self.invalidations += 1
+                if content_hash not in self._versions.values():
+                    self._entries.pop(content_hash, None)
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "cached_versions": len(self._versions),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "compilations": self.compilations,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "total_compile_time_ms": self.total_compile_time_ms,
+            "avg_compile_time_ms": (
+                self.total_compile_time_ms / self.compilations
+                if self.compilations
+                else 0.0
+            ),
+        }
+
+    def _compile(
+        self, function_id: str, version: str, code: str, content_hash: str
+    ) -> CompiledFunction:
+        """Compile source and resolve its decision_function"""
+        start = time.perf_counter()
+
+        spec = importlib.util.spec_from_loader(
+            f"decision_function_{content_hash[:16]}", loader=None
+        )
+        if spec is None:
+            raise StorageError(
+                "read", f"Failed to create module spec for {function_id} v{version}"
+            )
+        module = importlib.util.module_from_spec(spec)
+
+        filename = f"<{function_id}:{version}>"
+        code_object = None
+        if self.artifact_cache is not None:
+            code_object = self.artifact_cache.compile_source(code, filename).code
+        if code_object is None:
+            code_object = compile(code, filename, "exec")
+        exec(code_object, module.__dict__)
+
+        if not hasattr(module, "decision_function"):
+            raise StorageError(
+                "read", f"No decision_function found in {function_id} v{version}"
+            )
+
+        compile_time_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.compilations += 1
+            self.total_compile_time_ms += compile_time_ms
+
+        return CompiledFunction(
+            content_hash=content_hash,
+            code=code_object,
+            function=module.decision_function,
+            compile_time_ms=compile_time_ms,
+        )
+
+    def _drop_version_refs(self, content_hash: str) -> None:
+        """Remove version mappings that point at an evicted entry"""
+        stale = [key for key, value in self._versions.items() if value == content_hash]
+        for key in stale:
+            del self._versions[key]
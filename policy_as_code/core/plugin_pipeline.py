@@ -0,0 +1,140 @@
+"""
+Fused plugin pipeline
+
+The pre- and post-execution plugin chains are resolved once per engine
+configuration instead of on every execution. Plugins that implement
+``process_sync`` are called directly, unless a subclass overrides ``process``
+without also overriding ``process_sync``; only plugins that are genuinely
+async are awaited. When a whole chain is synchronous it runs without creating a
+coroutine at all.
+
+Plugins declare ``mutates_data = False`` when they never modify ``data`` in
+place. For the rest, the pipeline hands the chain a private shallow copy, made
+at most once per execution, so callers' input dicts are never changed.
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+Stage = Tuple[Callable[..., Any], bool, bool]  # (call, is_async, mutates_data)
+
+
+def _has_sync_path(plugin: Any) -> bool:
+    """Whether ``process_sync`` does the same work as the plugin's ``process``"""
+    if not callable(getattr(plugin, "process_sync", None)):
+        return False
+    cls = type(plugin)
+    owner = next(
+        (klass for klass in cls.__mro__ if "process_sync" in vars(klass)), None
+    )
+    if owner is None:
+        # Set on the instance
+        return True
+    # A subclass overriding only ``process`` would be skipped otherwise
+    return getattr(cls, "process", None) is getattr(owner, "process", None)
+
+
+def _stage(plugin: Any) -> Stage:
+    mutates = getattr(plugin, "mutates_data", True)
+    if _has_sync_path(plugin):
+        return plugin.process_sync, False, mutates
+    return plugin.process, True, mutates
+
+
+class _Chain:
+    """One resolved plugin chain
+
+    Overhead is timed on one execution in ``SAMPLE_EVERY`` to keep the
+    measurement itself off the hot path.
+    """
+
+    SAMPLE_EVERY = 16
+
+    def __init__(self, plugins: Sequence[Any]):
+        stages = tuple(_stage(p) for p in plugins)
+        self.plugins = len(stages)
+        self.async_plugins = sum(1 for _, is_async, _ in stages if is_async)
+        self.is_async = self.async_plugins > 0
+        self.mutates = any(mutates for _, _, mutates in stages)
+        self._calls = tuple(call for call, _, _ in stages)
+        self._stages = tuple((call, is_async) for call, is_async, _ in stages)
+        self.calls = 0
+        self._sampled = 0
+        self._sampled_ns = 0
+        if not stages:
+            self.run = self._passthrough
+        elif self.is_async:
+            self.run = self._run_async
+        else:
+            self.run = self._run_sync
+
+    def _passthrough(self, data: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        return data
+
+    def _run_sync(self, data: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        self.calls += 1
+        sampled = self.calls % self.SAMPLE_EVERY == 1
+        if sampled:
+            started = time.perf_counter_ns()
+        if self.mutates:
+            data = dict(data)
+        for call in self._calls:
+            data = call(data, context)
+        if sampled:
+            self._record(started)
+        return data
+
+    async def _run_async(self, data: Dict[str, Any], context: Any) -> Dict[str, Any]:
+        self.calls += 1
+        sampled = self.calls % self.SAMPLE_EVERY == 1
+        if sampled:
+            started = time.perf_counter_ns()
+        if self.mutates:
+            data = dict(data)
+        for call, is_async in self._stages:
+            data = await call(data, context) if is_async else call(data, context)
+        if sampled:
+            self._record(started)
+        return data
+
+    def _record(self, started: int) -> None:
+        self._sampled += 1
+        self._sampled_ns += time.perf_counter_ns() - started
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "plugins": self.plugins,
+            "async_plugins": self.async_plugins,
+            "copies_input": self.mutates,
+            "calls": self.calls,
+            "avg_overhead_us": (
+                self._sampled_ns / self._sampled / 1000 if self._sampled else 0.0
+            ),
+        }
+
+
+class PluginPipeline:
+    """Pre- and post-execution plugin chains compiled for one configuration
+
+    ``pre`` and ``post`` return the processed data directly when their chain
+    is fully synchronous, and an awaitable otherwise; check ``pre_is_async``
+    and ``post_is_async`` before awaiting.
+    """
+
+    def __init__(self, plugins: Dict[str, List[Any]]):
+        self._pre = _Chain(plugins.get("pre_execute", ()))
+        self._post = _Chain(plugins.get("post_execute", ()))
+        self.pre = self._pre.run
+        self.post = self._post.run
+        self.pre_is_async = self._pre.is_async
+        self.post_is_async = self._post.is_async
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-chain plugin counts and measured overhead"""
+        pre = self._pre.get_stats()
+        post = self._post.get_stats()
+        return {
+            "pre_execute": pre,
+            "post_execute": post,
+            "avg_overhead_us": pre["avg_overhead_us"] + post["avg_overhead_us"],
+        }
@@ -0,0 +1,198 @@
+"""
+Bounded decision result cache
+
+LRU cache with entry-count and byte budgets, per-function TTLs and per-function
+opt-out. Entries are keyed on ``(function_id, version, input_hash)`` so the
+engine can consult it before a function is loaded or executed.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+CacheKey = Tuple[str, str, str]
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    size_bytes: int
+    expires_at: Optional[float]
+    stored_at: float
+
+
+class ResultCache:
+    """LRU result cache with TTL and memory bounds"""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        default_ttl_seconds: Optional[float] = 300.0,
+        function_ttls: Optional[Dict[str, float]] = None,
+        non_cacheable: Optional[Iterable[str]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be at least 1")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl_seconds = default_ttl_seconds
+        self.function_ttls: Dict[str, float] = dict(function_ttls or {})
+        self.non_cacheable = set(non_cacheable or [])
+        self._clock = clock
+        self._entries: "OrderedDict[CacheKey, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ResultCache":
+        """Build a cache from a plugin configuration dictionary"""
+        return cls(
+            max_entries=config.get("max_entries", 10000),
+            max_bytes=config.get("max_bytes", 64 * 1024 * 1024),
+            default_ttl_seconds=config.get("ttl_seconds", 300.0),
+            function_ttls=config.get("function_ttls"),
+            non_cacheable=config.get("non_cacheable"),
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_cacheable(self, function_id: str) -> bool:
+        """Check whether results of a function may be cached"""
+        if function_id in self.non_cacheable:
+            return False
+        ttl = self.function_ttls.get(function_id, self.default_ttl_seconds)
+        return ttl is None or ttl > 0
+
+    def set_function_policy(
+        self,
+        function_id: str,
+        ttl_seconds: Optional[float] = None,
+        cacheable: bool = True,
+    ) -> None:
+        """Configure TTL or opt-out for a single function"""
+        if cacheable:
+            self.non_cacheable.discard(function_id)
+        else:
+            self.non_cacheable.add(function_id)
+            self.invalidate(function_id)
+        if ttl_seconds is not None:
+            self.function_ttls[function_id] = ttl_seconds
+
+    def get(self, function_id: str, version: str, input_hash: str) -> Optional[Any]:
+        """Look up a cached value, honouring TTL"""
+        key = (function_id, version, input_hash)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry.expires_at is not None and entry.expires_at <= self._clock():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def put(
+        self,
+        function_id: str,
+        version: str,
+        input_hash: str,
+        value: Any,
+        size_bytes: int,
+    ) -> bool:
+        """Store a value; returns False if it was not cacheable"""
+        if not self.is_cacheable(function_id) or size_bytes > self.max_bytes:
+            self.rejected += 1
+            return False
+
+        ttl = self.function_ttls.get(function_id, self.default_ttl_seconds)
+        now = self._clock()
+        key = (function_id, version, input_hash)
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _CacheEntry(
+                value=value,
+                size_bytes=size_bytes,
+                expires_at=now + ttl if ttl is not None else None,
+                stored_at=now,
+            )
+            self.current_bytes += size_bytes
+            self.stores += 1
+
+            while (
+                len(self._entries) > self.max_entries
+                or self.current_bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+        return True
+
+    def invalidate(self, function_id: str, version: Optional[str] = None) -> int:
+        """Drop cached results for a function (or one of its versions)"""
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if key[0] == function_id and (version is None or key[1] == version)
+            ]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def evict_older_than(self, max_age_seconds: float) -> int:
+        """Drop entries stored more than ``max_age_seconds`` ago"""
+        cutoff = self._clock() - max_age_seconds
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if e.stored_at < cutoff]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "rejected": self.rejected,
+        }
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key)
+        self.current_bytes -= entry.size_bytes
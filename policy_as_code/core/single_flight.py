@@ -0,0 +1,88 @@
+"""
+Single-flight coalescing of identical in-flight executions
+
+While an execution for a key is running, further callers with the same key
+await its outcome instead of starting their own. Keys are typically
+``(function_id, version, input_hash)``. Only the work is shared: each caller
+keeps its own context, trace id and trace record, and a value that reached
+more than one caller is deep-copied so callers cannot see each other's
+mutations.
+"""
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _Flight:
+    """One in-flight execution and the number of callers waiting on it"""
+
+    __slots__ = ("future", "followers")
+
+    def __init__(self, future: "asyncio.Future[Any]"):
+        self.future = future
+        self.followers = 0
+
+
+class SingleFlight:
+    """Registry of in-flight executions keyed on their inputs"""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._in_flight: Dict[Hashable, _Flight] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(
+        self, key: Hashable, func: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """Run func once per key among concurrent callers
+
+        Returns ``(value, shared)`` where ``shared`` is True when the value
+        came from another caller's execution. Exceptions propagate to every
+        caller of the flight.
+        """
+        if not self.enabled:
+            self.executions += 1
+            return await func(), False
+
+        flight = self._in_flight.get(key)
+        if flight is not None:
+            self.coalesced += 1
+            flight.followers += 1
+            # shield: a cancelled follower must not cancel the shared work
+            return copy.deepcopy(await asyncio.shield(flight.future)), True
+
+        flight = _Flight(asyncio.ensure_future(func()))
+        self._in_flight[key] = flight
+        self.executions += 1
+        flight.future.add_done_callback(lambda f, key=key: self._finish(key, f))
+        value = await asyncio.shield(flight.future)
+        # Followers may resume after the leader; keep the shared value intact
+        return (copy.deepcopy(value) if flight.followers else value), False
+
+    def record_coalesced(self, count: int = 1) -> None:
+        """Count duplicates coalesced outside do(), e.g. within a batch"""
+        self.coalesced += count
+
+    def _finish(self, key: Hashable, future: "asyncio.Future[Any]") -> None:
+        flight = self._in_flight.get(key)
+        if flight is not None and flight.future is future:
+            del self._in_flight[key]
+        # Mark the exception retrieved when every caller was cancelled
+        if not future.cancelled():
+            future.exception()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        requests = self.executions + self.coalesced
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._in_flight),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesce_ratio": self.coalesced / requests if requests else 0.0,
+        }
@@ -2,16 +2,30 @@
 Storage backends for Decision Layer
 """
 
-import importlib.util
+import asyncio
 import json
+import sqlite3
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import asyncpg
 
+from .decision_log import DecisionLog
+from .decision_stats import (
+    DecisionRollup,
+    DecisionRollups,
+    aggregate,
+    decision_counters,
+    rebuild_report,
+)
 from .errors import StorageError
+from .function_cache import CompiledFunctionCache
+from .version_index import VersionIndex, sort_versions
+from .write_behind import WriteBehindBuffer, WriteBehindConfig
 
 
 class StorageBackend(ABC):
@@ -42,6 +56,11 @@ class StorageBackend(ABC):
         """List all versions for a function"""
         pass
 
+    async def get_latest_version(self, function_id: str) -> Optional[str]:
+        """Get the latest version of a function, or None if it has none"""
+        versions = await self.list_versions(function_id)
+        return versions[-1] if versions else None
+
     @abstractmethod
     async def store_decision(self, context, result_data: Dict[str, Any]) -> str:
         """Store decision result"""
@@ -76,6 +95,23 @@ class StorageBackend(ABC):
         """Get decision statistics for a function"""
         pass
 
+    @abstractmethod
+    async def get_daily_decision_stats(
+        self, function_id: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get per-day decision statistics for a function, keyed by ISO date"""
+        pass
+
+    @abstractmethod
+    async def rebuild_decision_stats(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Recompute decision statistics from stored decisions
+
+        Returns the number of functions, days and decisions seen and the
+        rollups that did not match the maintained ones. With ``dry_run`` the
+        maintained rollups are only checked, not replaced.
+        """
+        pass
+
     @abstractmethod
     async def store_release(self, release_data: Dict[str, Any]) -> None:
         """Store a release record"""
@@ -116,11 +152,35 @@ class StorageBackend(ABC):
 
 
 class FileStorage(StorageBackend):
-    """File-based storage backend"""
-
-    def __init__(self, base_path: str = "./functions"):
+    """File-based storage backend
+
+    Decisions are written one JSON file each under ``decisions/`` unless a
+    ``DecisionLog`` is given, in which case they are appended to its
+    segments. Per-file decisions left from before the switch stay readable
+    until ``migrate_decisions`` moves them into the log. Decision statistics
+    are kept as rollups under ``decisions/stats``, built from the stored
+    decisions the first time they are needed.
+    """
+
+    def __init__(
+        self,
+        base_path: str = "./functions",
+        function_cache: Optional[CompiledFunctionCache] = None,
+        version_index: Optional[VersionIndex] = None,
+        decision_log: Optional[DecisionLog] = None,
+        decision_rollups: Optional[DecisionRollups] = None,
+    ):
         self.base_path = Path(base_path)
         self.base_path.mkdir(exist_ok=True)
+        self.function_cache = function_cache or CompiledFunctionCache()
+        self.version_index = version_index or VersionIndex()
+        self.decision_log = decision_log
+        self.decision_rollups = decision_rollups or DecisionRollups(
+            str(self.base_path / "decisions" / "stats")
+        )
+        self._legacy_decisions = decision_log is not None and any(
+            (self.base_path / "decisions").glob("*.json")
+        )
 
     async def save_function(self, function_id: str, version: str, code: str) -> None:
         """Save function to file"""
@@ -133,6 +193,10 @@ class FileStorage(StorageBackend):
                 f.write(code)
         except Exception as e:
             raise StorageError("write", f"Failed to save function: {e}")
+        finally:
+            self.function_cache.invalidate(function_id, version)
+
+        self.version_index.add(function_id, version, function_dir.stat().st_mtime_ns)
 
     async def load_function(self, function_id: str, version: str) -> str:
         """Load function from file"""
@@ -150,23 +214,12 @@ class FileStorage(StorageBackend):
 
     async def load_function_object(self, function_id: str, version: str):
         """Load function as callable object"""
-        code = await self.load_function(function_id, version)
+        function = self.function_cache.get(function_id, version)
+        if function is not None:
+            return function
 
-        # Create module and execute
-        spec = importlib.util.spec_from_loader("temp_module", loader=None)
-        if spec is None:
-            raise StorageError(
-                "read", f"Failed to create module spec for {function_id} v{version}"
-            )
-        module = importlib.util.module_from_spec(spec)
-        exec(code, module.__dict__)
-
-        if not hasattr(module, "decision_function"):
-            raise StorageError(
-                "read", f"No decision_function found in {function_id} v{version}"
-            )
-
-        return module.decision_function
+        code = await self.load_function(function_id, version)
+        return self.function_cache.load(function_id, version, code)
 
     async def list_functions(self) -> List[str]:
         """List all function IDs"""
@@ -183,48 +236,92 @@ class FileStorage(StorageBackend):
             raise StorageError("list", f"Failed to list functions: {e}")
 
     async def list_versions(self, function_id: str) -> List[str]:
-        """List all versions for a function"""
+        """List all versions for a function in semantic-version order"""
+        if not self.version_index.is_fresh(function_id):
+            self._refresh_version_index(function_id)
+        return self.version_index.versions(function_id) or []
+
+    async def get_latest_version(self, function_id: str) -> Optional[str]:
+        """Get the latest version from the in-memory version index"""
+        if not self.version_index.is_fresh(function_id):
+            self._refresh_version_index(function_id)
+        return self.version_index.latest(function_id)
+
+    def _refresh_version_index(self, function_id: str) -> None:
+        """Rescan a function directory only if its mtime changed"""
         function_dir = self.base_path / function_id
 
         try:
-            if not function_dir.exists():
-                return []
+            try:
+                mtime = function_dir.stat().st_mtime_ns
+            except FileNotFoundError:
+                self.version_index.set(function_id, [], None)
+                return
+
+            if (
+                self.version_index.versions(function_id) is not None
+                and self.version_index.token(function_id) == mtime
+            ):
+                self.version_index.touch(function_id)
+                return
 
             versions = [
                 f.stem
                 for f in function_dir.glob("*.py")
                 if f.is_file() and not f.name.startswith(".")
             ]
-            return sorted(versions)
+            self.version_index.set(function_id, versions, mtime)
         except Exception as e:
             raise StorageError("list", f"Failed to list versions: {e}")
 
     async def store_decision(self, context, result_data: Dict[str, Any]) -> str:
         """Store decision result to file"""
-        decisions_dir = self.base_path / "decisions"
-        decisions_dir.mkdir(exist_ok=True)
-
-        file_path = decisions_dir / f"{context.trace_id}.json"
+        decision = {
+            "trace_id": context.trace_id,
+            "function_id": context.function_id,
+            "version": context.version,
+            "timestamp": context.timestamp.isoformat(),
+            "result": result_data,
+        }
         try:
-            import json
-
-            with open(file_path, "w") as f:
-                json.dump(
-                    {
-                        "trace_id": context.trace_id,
-                        "function_id": context.function_id,
-                        "version": context.version,
-                        "timestamp": context.timestamp.isoformat(),
-                        "result": result_data,
-                    },
-                    f,
-                )
+            self._ensure_decision_rollups()
+            previous = self._previous_decision(context.trace_id)
+            if self.decision_log is not None:
+                self.decision_log.append(decision)
+            else:
+                decisions_dir = self.base_path / "decisions"
+                decisions_dir.mkdir(exist_ok=True)
+                with open(decisions_dir / f"{context.trace_id}.json", "w") as f:
+                    json.dump(decision, f)
+            if previous is not None:
+                self.decision_rollups.record(*decision_counters(previous), sign=-1)
+            self.decision_rollups.record(*decision_counters(decision))
             return context.trace_id
         except Exception as e:
             raise StorageError("write", f"Failed to store decision: {e}")
 
+    def _previous_decision(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """The stored decision a re-stored trace id replaces, if any"""
+        if self.decision_log is not None:
+            previous = self.decision_log.get(trace_id)
+            if previous is not None or not self._legacy_decisions:
+                return previous
+        try:
+            with open(self.base_path / "decisions" / f"{trace_id}.json", "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
     async def retrieve_decision(self, trace_id: str) -> Dict[str, Any]:
         """Retrieve decision result from file"""
+        if self.decision_log is not None:
+            try:
+                decision = self.decision_log.get(trace_id)
+            except Exception as e:
+                raise StorageError("read", f"Failed to retrieve decision: {e}")
+            if decision is not None:
+                return decision
+
         file_path = self.base_path / "decisions" / f"{trace_id}.json"
         try:
             import json
@@ -240,6 +337,18 @@ class FileStorage(StorageBackend):
         self, function_id: str, limit: int = 100, offset: int = 0
     ) -> List[Dict[str, Any]]:
         """Get decision history for a function from files"""
+        if self.decision_log is not None:
+            try:
+                if not self._legacy_decisions:
+                    return self.decision_log.history(function_id, limit, offset)
+                decisions = self._merge_legacy_decisions(
+                    self.decision_log.history(function_id, offset + limit),
+                    lambda d: d.get("function_id") == function_id,
+                )
+                return decisions[offset : offset + limit]
+            except Exception as e:
+                raise StorageError("read", f"Failed to get decision history: {e}")
+
         decisions_dir = self.base_path / "decisions"
         if not decisions_dir.exists():
             return []
@@ -264,6 +373,24 @@ class FileStorage(StorageBackend):
         self, start_date: datetime, end_date: datetime, limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Get decisions within a date range from files"""
+        if self.decision_log is not None:
+            try:
+                decisions = self.decision_log.between(
+                    start_date.isoformat(), end_date.isoformat(), limit
+                )
+                if self._legacy_decisions:
+                    decisions = self._merge_legacy_decisions(
+                        decisions,
+                        lambda d: start_date
+                        <= datetime.fromisoformat(d["timestamp"])
+                        <= end_date,
+                    )[:limit]
+                return decisions
+            except Exception as e:
+                raise StorageError(
+                    "read", f"Failed to get decisions by date range: {e}"
+                )
+
         decisions_dir = self.base_path / "decisions"
         if not decisions_dir.exists():
             return []
@@ -286,15 +413,18 @@ class FileStorage(StorageBackend):
 
     async def cleanup_old_decisions(self, retention_days: int) -> int:
         """Clean up decisions older than retention_days from files"""
-        decisions_dir = self.base_path / "decisions"
-        if not decisions_dir.exists():
-            return 0
-
         cutoff_date = datetime.now() - timedelta(days=retention_days)
+        cutoff_day = cutoff_date.date().isoformat()
         deleted_count = 0
+        # Surviving decisions up to the cutoff day, to recount those days
+        survivors = []
 
         try:
-            for file_path in decisions_dir.glob("*.json"):
+            self._ensure_decision_rollups()
+            if self.decision_log is not None:
+                deleted_count = self.decision_log.drop_before(cutoff_date.isoformat())
+
+            for file_path in (self.base_path / "decisions").glob("*.json"):
                 with open(file_path, "r") as f:
                     decision = json.load(f)
                     decision_time = datetime.fromisoformat(decision["timestamp"])
@@ -302,67 +432,108 @@ class FileStorage(StorageBackend):
                     if decision_time < cutoff_date:
                         file_path.unlink()
                         deleted_count += 1
-
+                    elif decision["timestamp"][:10] <= cutoff_day:
+                        survivors.append(decision)
+
+            if deleted_count:
+                if self.decision_log is not None:
+                    survivors.extend(
+                        self.decision_log.between(
+                            "", cutoff_day + "\uffff", len(self.decision_log)
+                        )
+                    )
+                self.decision_rollups.replace(
+                    aggregate(survivors), through_day=cutoff_day
+                )
             return deleted_count
         except Exception as e:
             raise StorageError("delete", f"Failed to cleanup old decisions: {e}")
 
     async def get_decision_stats(self, function_id: str) -> Dict[str, Any]:
-        """Get decision statistics for a function from files"""
-        decisions_dir = self.base_path / "decisions"
-        if not decisions_dir.exists():
-            return {
-                "total_decisions": 0,
-                "success_rate": 0.0,
-                "avg_execution_time": 0.0,
-            }
-
+        """Get decision statistics for a function from its rollups"""
         try:
-            decisions = []
-            for file_path in decisions_dir.glob("*.json"):
-                with open(file_path, "r") as f:
-                    decision = json.load(f)
-                    if decision.get("function_id") == function_id:
-                        decisions.append(decision)
+            self._ensure_decision_rollups()
+            return self.decision_rollups.stats(function_id)
+        except Exception as e:
+            raise StorageError("read", f"Failed to get decision stats: {e}")
 
-            if not decisions:
-                return {
-                    "total_decisions": 0,
-                    "success_rate": 0.0,
-                    "avg_execution_time": 0.0,
-                }
+    async def get_daily_decision_stats(
+        self, function_id: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get per-day decision statistics for a function from its rollups"""
+        try:
+            self._ensure_decision_rollups()
+            return self.decision_rollups.daily(function_id)
+        except Exception as e:
+            raise StorageError("read", f"Failed to get decision stats: {e}")
 
-            total_decisions = len(decisions)
-            successful_decisions = sum(
-                1 for d in decisions if d.get("result", {}).get("success", False)
-            )
-            success_rate = (
-                successful_decisions / total_decisions if total_decisions > 0 else 0.0
-            )
+    async def rebuild_decision_stats(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Recompute the rollups from every stored decision"""
+        try:
+            expected = aggregate(self._stored_decisions())
+            report = rebuild_report(expected, self.decision_rollups.rollups())
+            if not dry_run:
+                self.decision_rollups.replace(expected)
+                self.decision_rollups.exists = True
+            return report
+        except Exception as e:
+            raise StorageError("read", f"Failed to rebuild decision stats: {e}")
+
+    def _ensure_decision_rollups(self) -> None:
+        """Build the rollups once for decisions stored before they existed"""
+        if self.decision_rollups.exists:
+            return
+        self.decision_rollups.replace(aggregate(self._stored_decisions()))
+        self.decision_rollups.exists = True
+
+    def _stored_decisions(self):
+        """Yield every stored decision, from the log and per-file layout"""
+        if self.decision_log is not None:
+            for function_id in self.decision_log.function_ids():
+                yield from self.decision_log.records(function_id)
+        for file_path in (self.base_path / "decisions").glob("*.json"):
+            with open(file_path, "r") as f:
+                decision = json.load(f)
+            if self.decision_log is None or decision["trace_id"] not in (
+                self.decision_log
+            ):
+                yield decision
 
-            # Calculate average execution time if available
-            execution_times = [
-                d.get("result", {}).get("execution_time_ms", 0)
-                for d in decisions
-                if d.get("result", {}).get("execution_time_ms")
-            ]
-            avg_execution_time = (
-                sum(execution_times) / len(execution_times) if execution_times else 0.0
-            )
+    async def migrate_decisions(self, remove: bool = True) -> int:
+        """Move per-file decisions into the decision log, oldest first"""
+        if self.decision_log is None:
+            raise StorageError("write", "No decision log configured")
 
-            return {
-                "total_decisions": total_decisions,
-                "success_rate": success_rate,
-                "avg_execution_time": avg_execution_time,
-                "first_decision": min(decisions, key=lambda x: x["timestamp"])[
-                    "timestamp"
-                ],
-                "last_decision": max(decisions, key=lambda x: x["timestamp"])[
-                    "timestamp"
-                ],
-            }
+        decisions_dir = self.base_path / "decisions"
+        migrated = 0
+        try:
+            files = []
+            for file_path in decisions_dir.glob("*.json"):
+                with open(file_path, "r") as f:
+                    files.append((json.load(f), file_path))
+            files.sort(key=lambda item: item[0]["timestamp"])
+
+            for decision, file_path in files:
+                if decision["trace_id"] not in self.decision_log:
+                    self.decision_log.append(decision)
+                    migrated += 1
+                if remove:
+                    file_path.unlink()
         except Exception as e:
-            raise StorageError("read", f"Failed to get decision stats: {e}")
+            raise StorageError("write", f"Failed to migrate decisions: {e}")
+
+        self._legacy_decisions = not remove and bool(files)
+        return migrated
+
+    def _merge_legacy_decisions(self, decisions, predicate) -> List[Dict[str, Any]]:
+        """Add matching per-file decisions to log results, newest first"""
+        for file_path in (self.base_path / "decisions").glob("*.json"):
+            with open(file_path, "r") as f:
+                decision = json.load(f)
+            if predicate(decision) and decision["trace_id"] not in self.decision_log:
+                decisions.append(decision)
+        decisions.sort(key=lambda x: x["timestamp"], reverse=True)
+        return decisions
 
     async def store_release(self, release_data: Dict[str, Any]) -> None:
         """Store a release record to file"""
@@ -465,12 +636,199 @@ class FileStorage(StorageBackend):
             raise StorageError("read", f"Failed to retrieve function spec: {e}")
 
 
-class PostgreSQLStorage(StorageBackend):
-    """PostgreSQL-based storage backend"""
+# Per-function, per-day rollup of the decisions table; {where} narrows it
+_DAILY_ROLLUP_SELECT = """
+    SELECT
+        function_id,
+        timestamp::date AS day,
+        COUNT(*) AS total,
+        COUNT(*) FILTER (WHERE result_data->>'success' = 'true') AS successes,
+        COALESCE(
+            SUM((result_data->>'execution_time_ms')::double precision), 0
+        ) AS execution_time_sum,
+        COUNT(result_data->>'execution_time_ms') AS execution_time_count,
+        MIN(timestamp) AS first_decision,
+        MAX(timestamp) AS last_decision
+    FROM decisions
+    {where}
+    GROUP BY function_id, timestamp::date
+"""
+
+_DAILY_ROLLUP_COLUMNS = """
+    function_id, day, total, successes, execution_time_sum,
+    execution_time_count, first_decision, last_decision
+"""
+
+
+# Folds the signed rows of a ``changes`` CTE into decision_daily_stats: +1 for
+# each stored decision, -1 for the row it replaced
+_FOLD_DECISION_CHANGES = """
+    INSERT INTO decision_daily_stats AS s (
+        function_id, day, total, successes, execution_time_sum,
+        execution_time_count, first_decision, last_decision
+    )
+    SELECT
+        function_id,
+        timestamp::date,
+        SUM(sign),
+        COALESCE(
+            SUM(sign) FILTER (WHERE result_data->>'success' = 'true'),
+            0
+        ),
+        COALESCE(
+            SUM(sign * (result_data->>'execution_time_ms')::double precision),
+            0
+        ),
+        COALESCE(
+            SUM(sign) FILTER (WHERE result_data->>'execution_time_ms' IS NOT NULL),
+            0
+        ),
+        MIN(timestamp) FILTER (WHERE sign = 1),
+        MAX(timestamp) FILTER (WHERE sign = 1)
+    FROM changes
+    GROUP BY function_id, timestamp::date
+    ON CONFLICT (function_id, day) DO UPDATE SET
+        total = s.total + EXCLUDED.total,
+        successes = s.successes + EXCLUDED.successes,
+        execution_time_sum = s.execution_time_sum + EXCLUDED.execution_time_sum,
+        execution_time_count = s.execution_time_count + EXCLUDED.execution_time_count,
+        first_decision = LEAST(s.first_decision, EXCLUDED.first_decision),
+        last_decision = GREATEST(s.last_decision, EXCLUDED.last_decision)
+"""
+
+_STORE_DECISION = f"""
+    WITH previous AS (
+        SELECT function_id, timestamp, result_data
+        FROM decisions WHERE trace_id = $1
+    ), stored AS (
+        INSERT INTO decisions (trace_id, function_id, version, timestamp, result_data)
+        VALUES ($1, $2, $3, $4, $5)
+        ON CONFLICT (trace_id)
+        DO UPDATE SET result_data = $5, timestamp = $4
+        RETURNING function_id, timestamp, result_data
+    ), changes AS (
+        SELECT function_id, timestamp, result_data, 1 AS sign
+        FROM stored
+        UNION ALL
+        SELECT function_id, timestamp, result_data, -1 AS sign
+        FROM previous
+    )
+{_FOLD_DECISION_CHANGES}"""
+
+# Per-transaction staging table that write-behind batches are copied into
+_DECISION_STAGING = """
+    CREATE TEMP TABLE IF NOT EXISTS decision_staging (
+        seq INTEGER NOT NULL,
+        trace_id TEXT NOT NULL,
+        function_id TEXT NOT NULL,
+        version TEXT NOT NULL,
+        timestamp TIMESTAMP NOT NULL,
+        result_data JSONB NOT NULL
+    ) ON COMMIT DELETE ROWS
+"""
 
-    def __init__(self, connection_string: str):
+_DECISION_STAGING_COLUMNS = [
+    "seq",
+    "trace_id",
+    "function_id",
+    "version",
+    "timestamp",
+    "result_data",
+]
+
+# Moves a staged batch into decisions; the last copy of a repeated trace id wins
+_STORE_STAGED_DECISIONS = f"""
+    WITH incoming AS (
+        SELECT DISTINCT ON (trace_id)
+            trace_id, function_id, version, timestamp, result_data
+        FROM decision_staging
+        ORDER BY trace_id, seq DESC
+    ), previous AS (
+        SELECT d.function_id, d.timestamp, d.result_data
+        FROM decisions d JOIN incoming USING (trace_id)
+    ), stored AS (
+        INSERT INTO decisions (trace_id, function_id, version, timestamp, result_data)
+        SELECT trace_id, function_id, version, timestamp, result_data
+        FROM incoming
+        ON CONFLICT (trace_id)
+        DO UPDATE SET result_data = EXCLUDED.result_data, timestamp = EXCLUDED.timestamp
+        RETURNING function_id, timestamp, result_data
+    ), changes AS (
+        SELECT function_id, timestamp, result_data, 1 AS sign
+        FROM stored
+        UNION ALL
+        SELECT function_id, timestamp, result_data, -1 AS sign
+        FROM previous
+    )
+{_FOLD_DECISION_CHANGES}"""
+
+
+def _rollups_from_rows(rows) -> Dict[str, Dict[str, DecisionRollup]]:
+    """Rollups keyed by function and ISO day from decision_daily_stats rows"""
+    rollups: Dict[str, Dict[str, DecisionRollup]] = {}
+    for row in rows:
+        days = rollups.setdefault(row["function_id"], {})
+        days[row["day"].isoformat()] = DecisionRollup(
+            total=row["total"],
+            successes=row["successes"],
+            execution_time_sum=float(row["execution_time_sum"]),
+            execution_time_count=row["execution_time_count"],
+            first_decision=(
+                row["first_decision"].isoformat() if row["first_decision"] else None
+            ),
+            last_decision=(
+                row["last_decision"].isoformat() if row["last_decision"] else None
+            ),
+        )
+    return rollups
+
+
+def _decision_from_record(record: Tuple) -> Dict[str, Any]:
+    """A decision as reads return it, from a write-behind record or row"""
+    trace_id, function_id, version, timestamp, result_data = record
+    return {
+        "trace_id": trace_id,
+        "function_id": function_id,
+        "version": version,
+        "timestamp": timestamp.isoformat(),
+        "result": json.loads(result_data),
+    }
+
+
+class PostgreSQLStorage(StorageBackend):
+    """PostgreSQL-based storage backend
+
+    ``store_decision`` folds each decision into ``decision_daily_stats`` in
+    the same statement that writes it, so stats read a function's day rows
+    rather than aggregating the decisions table. A re-stored trace id moves
+    its counters to the new values; first and last decision times only
+    widen until ``rebuild_decision_stats`` recomputes them.
+
+    With ``write_behind`` enabled, decisions are buffered and written in
+    batches: each batch is COPYed into a temporary staging table and moved
+    into ``decisions`` and ``decision_daily_stats`` by one statement, in
+    one transaction. Lookups, history and stats merge the buffered
+    decisions into what the database returns, so they see every decision
+    stored before them without forcing a flush; date-range queries and
+    retention flush first.
+    """
+
+    def __init__(
+        self,
+        connection_string: str,
+        function_cache: Optional[CompiledFunctionCache] = None,
+        version_index: Optional[VersionIndex] = None,
+        write_behind: Optional[WriteBehindConfig] = None,
+    ):
         self.connection_string = connection_string
         self.pool = None
+        self.function_cache = function_cache or CompiledFunctionCache()
+        self.version_index = version_index or VersionIndex()
+        self.write_behind = (
+            WriteBehindBuffer(self._copy_decisions, write_behind)
+            if write_behind is not None and write_behind.enabled
+            else None
+        )
 
     async def connect(self):
         """Initialize connection pool and create tables"""
@@ -566,6 +924,38 @@ class PostgreSQLStorage(StorageBackend):
                 ON decisions(function_id, timestamp)
             """
             )
+            await conn.execute(
+                """
+                CREATE INDEX IF NOT EXISTS idx_decisions_timestamp
+                ON decisions(timestamp)
+            """
+            )
+
+            # Create decision statistics rollups
+            await conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS decision_daily_stats (
+                    function_id TEXT NOT NULL,
+                    day DATE NOT NULL,
+                    total BIGINT NOT NULL,
+                    successes BIGINT NOT NULL,
+                    execution_time_sum DOUBLE PRECISION NOT NULL,
+                    execution_time_count BIGINT NOT NULL,
+                    first_decision TIMESTAMP,
+                    last_decision TIMESTAMP,
+                    PRIMARY KEY (function_id, day)
+                )
+            """
+            )
+
+            # Backfill rollups for decisions stored before they existed
+            if await conn.fetchval(
+                "SELECT NOT EXISTS (SELECT 1 FROM decision_daily_stats)"
+            ):
+                await conn.execute(
+                    f"INSERT INTO decision_daily_stats ({_DAILY_ROLLUP_COLUMNS})"
+                    + _DAILY_ROLLUP_SELECT.format(where="")
+                )
 
     async def save_function(self, function_id: str, version: str, code: str) -> None:
         """Save function to PostgreSQL"""
@@ -592,6 +982,10 @@ class PostgreSQLStorage(StorageBackend):
                 )
         except Exception as e:
             raise StorageError("write", f"Failed to save function: {e}")
+        finally:
+            self.function_cache.invalidate(function_id, version)
+
+        self.version_index.add(function_id, version)
 
     async def load_function(self, function_id: str, version: str) -> str:
         """Load function from PostgreSQL"""
@@ -624,25 +1018,12 @@ class PostgreSQLStorage(StorageBackend):
 
     async def load_function_object(self, function_id: str, version: str):
         """Load function as callable object"""
-        code = await self.load_function(function_id, version)
+        function = self.function_cache.get(function_id, version)
+        if function is not None:
+            return function
 
-        # Create module and execute
-        import importlib.util
-
-        spec = importlib.util.spec_from_loader("temp_module", loader=None)
-        if spec is None:
-            raise StorageError(
-                "read", f"Failed to create module spec for {function_id} v{version}"
-            )
-        module = importlib.util.module_from_spec(spec)
-        exec(code, module.__dict__)
-
-        if not hasattr(module, "decision_function"):
-            raise StorageError(
-                "read", f"No decision_function found in {function_id} v{version}"
-            )
-
-        return module.decision_function
+        code = await self.load_function(function_id, version)
+        return self.function_cache.load(function_id, version, code)
 
     async def list_functions(self) -> List[str]:
         """List all function IDs"""
@@ -676,30 +1057,44 @@ class PostgreSQLStorage(StorageBackend):
                     """
                     SELECT version FROM functions
                     WHERE function_id = $1
-                    ORDER BY version
                 """,
                     function_id,
                 )
-                return [row["version"] for row in rows]
+                versions = [row["version"] for row in rows]
         except Exception as e:
             raise StorageError("list", f"Failed to list versions: {e}")
 
+        self.version_index.set(function_id, versions)
+        return sort_versions(versions)
+
+    async def get_latest_version(self, function_id: str) -> Optional[str]:
+        """Get the latest version, querying only when the index is stale"""
+        if not self.version_index.is_fresh(function_id):
+            await self.list_versions(function_id)
+        return self.version_index.latest(function_id)
+
     async def store_decision(self, context, result_data: Dict[str, Any]) -> str:
         """Store decision result to PostgreSQL"""
         if not self.pool:
             await self.connect()
 
         try:
+            if self.write_behind is not None:
+                await self.write_behind.put(
+                    (
+                        context.trace_id,
+                        context.function_id,
+                        context.version,
+                        context.timestamp,
+                        json.dumps(result_data),
+                    )
+                )
+                return context.trace_id
             if self.pool is None:
                 raise StorageError("operation", "Database pool not initialized")
             async with self.pool.acquire() as conn:
                 await conn.execute(
-                    """
-                    INSERT INTO decisions (trace_id, function_id, version, timestamp, result_data)
-                    VALUES ($1, $2, $3, $4, $5)
-                    ON CONFLICT (trace_id)
-                    DO UPDATE SET result_data = $5, timestamp = $4
-                """,
+                    _STORE_DECISION,
                     context.trace_id,
                     context.function_id,
                     context.version,
@@ -710,10 +1105,38 @@ class PostgreSQLStorage(StorageBackend):
         except Exception as e:
             raise StorageError("write", f"Failed to store decision: {e}")
 
+    async def _copy_decisions(self, records: List[Tuple]) -> None:
+        """Write a write-behind batch through the staging table"""
+        if self.pool is None:
+            raise StorageError("write", "Database pool not initialized")
+        async with self.pool.acquire() as conn, conn.transaction():
+            await conn.execute(_DECISION_STAGING)
+            await conn.copy_records_to_table(
+                "decision_staging",
+                records=[(seq, *record) for seq, record in enumerate(records)],
+                columns=_DECISION_STAGING_COLUMNS,
+            )
+            await conn.execute(_STORE_STAGED_DECISIONS)
+
+    async def flush_decisions(self) -> None:
+        """Wait for buffered write-behind decisions to reach the database"""
+        if self.write_behind is not None:
+            await self.write_behind.flush()
+
+    def get_write_behind_stats(self) -> Dict[str, Any]:
+        """Get write-behind buffer statistics"""
+        if self.write_behind is None:
+            return {"enabled": False}
+        return self.write_behind.get_stats()
+
     async def retrieve_decision(self, trace_id: str) -> Dict[str, Any]:
         """Retrieve decision result from PostgreSQL"""
         if not self.pool:
             await self.connect()
+        if self.write_behind is not None:
+            for record in reversed(self.write_behind.buffered()):
+                if record[0] == trace_id:
+                    return _decision_from_record(record)
 
         try:
             if self.pool is None:
@@ -748,6 +1171,7 @@ class PostgreSQLStorage(StorageBackend):
         """Get decision history for a function from PostgreSQL"""
         if not self.pool:
             await self.connect()
+        buffered = self._buffered()
 
         try:
             if self.pool is None:
@@ -762,20 +1186,30 @@ class PostgreSQLStorage(StorageBackend):
                     LIMIT $2 OFFSET $3
                 """,
                     function_id,
-                    limit,
-                    offset,
+                    # Rows superseded by buffered decisions are dropped below
+                    offset + limit + len(buffered) if buffered else limit,
+                    0 if buffered else offset,
                 )
 
-                return [
-                    {
-                        "trace_id": row["trace_id"],
-                        "function_id": row["function_id"],
-                        "version": row["version"],
-                        "timestamp": row["timestamp"].isoformat(),
-                        "result": json.loads(row["result_data"]),
-                    }
-                    for row in rows
-                ]
+            decisions = [
+                {
+                    "trace_id": row["trace_id"],
+                    "function_id": row["function_id"],
+                    "version": row["version"],
+                    "timestamp": row["timestamp"].isoformat(),
+                    "result": json.loads(row["result_data"]),
+                }
+                for row in rows
+            ]
+            if not buffered:
+                return decisions
+            decisions = [d for d in decisions if d["trace_id"] not in buffered] + [
+                _decision_from_record(record)
+                for record in buffered.values()
+                if record[1] == function_id
+            ]
+            decisions.sort(key=lambda d: d["timestamp"], reverse=True)
+            return decisions[offset : offset + limit]
         except Exception as e:
             raise StorageError("read", f"Failed to get decision history: {e}")
 
@@ -785,6 +1219,7 @@ class PostgreSQLStorage(StorageBackend):
         """Get decisions within a date range from PostgreSQL"""
         if not self.pool:
             await self.connect()
+        await self.flush_decisions()
 
         try:
             if self.pool is None:
@@ -820,13 +1255,15 @@ class PostgreSQLStorage(StorageBackend):
         """Clean up decisions older than retention_days from PostgreSQL"""
         if not self.pool:
             await self.connect()
+        await self.flush_decisions()
 
         cutoff_date = datetime.now() - timedelta(days=retention_days)
+        cutoff_day = datetime.combine(cutoff_date.date(), datetime.min.time())
 
         try:
             if self.pool is None:
                 raise StorageError("operation", "Database pool not initialized")
-            async with self.pool.acquire() as conn:
+            async with self.pool.acquire() as conn, conn.transaction():
                 result = await conn.execute(
                     """
                     DELETE FROM decisions
@@ -834,6 +1271,19 @@ class PostgreSQLStorage(StorageBackend):
                 """,
                     cutoff_date,
                 )
+                # Earlier days are now empty; the cutoff day is recounted
+                await conn.execute(
+                    "DELETE FROM decision_daily_stats WHERE day <= $1",
+                    cutoff_day.date(),
+                )
+                await conn.execute(
+                    f"INSERT INTO decision_daily_stats ({_DAILY_ROLLUP_COLUMNS})"
+                    + _DAILY_ROLLUP_SELECT.format(
+                        where="WHERE timestamp >= $1 AND timestamp < $2"
+                    ),
+                    cutoff_day,
+                    cutoff_day + timedelta(days=1),
+                )
                 # Extract number of deleted rows from result
                 deleted_count = (
                     int(result.split()[-1]) if result.split()[-1].isdigit() else 0
@@ -843,64 +1293,130 @@ class PostgreSQLStorage(StorageBackend):
             raise StorageError("delete", f"Failed to cleanup old decisions: {e}")
 
     async def get_decision_stats(self, function_id: str) -> Dict[str, Any]:
-        """Get decision statistics for a function from PostgreSQL"""
+        """Get decision statistics for a function from its daily rollups"""
         if not self.pool:
             await self.connect()
 
         try:
-            if self.pool is None:
-                raise StorageError("operation", "Database pool not initialized")
-            async with self.pool.acquire() as conn:
-                # Get basic stats
-                stats_row = await conn.fetchrow(
+            total = DecisionRollup()
+            for rollup in (await self._daily_rollups(function_id)).values():
+                total.merge(rollup)
+            if not total.total:
+                return {
+                    "total_decisions": 0,
+                    "success_rate": 0.0,
+                    "avg_execution_time": 0.0,
+                    "first_decision": None,
+                    "last_decision": None,
+                }
+            return total.to_stats()
+        except Exception as e:
+            raise StorageError("read", f"Failed to get decision stats: {e}")
+
+    async def get_daily_decision_stats(
+        self, function_id: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get per-day decision statistics for a function from PostgreSQL"""
+        if not self.pool:
+            await self.connect()
+
+        try:
+            days = await self._daily_rollups(function_id)
+            return {day: days[day].to_stats() for day in sorted(days)}
+        except Exception as e:
+            raise StorageError("read", f"Failed to get decision stats: {e}")
+
+    def _buffered(self) -> Dict[str, Tuple]:
+        """Buffered write-behind records, the latest per trace id"""
+        if self.write_behind is None:
+            return {}
+        return {record[0]: record for record in self.write_behind.buffered()}
+
+    async def _daily_rollups(self, function_id: str) -> Dict[str, DecisionRollup]:
+        """A function's day rollups with buffered decisions folded in
+
+        The buffer is read first. A buffered decision replaces the stored
+        row with its trace id, which is folded out again. Both are read in
+        one snapshot, so a batch that commits in between is not counted
+        twice.
+        """
+        buffered = self._buffered()
+        if self.pool is None:
+            raise StorageError("operation", "Database pool not initialized")
+        async with self.pool.acquire() as conn, conn.transaction(
+            isolation="repeatable_read", readonly=True
+        ):
+            rows = await conn.fetch(
+                f"""
+                SELECT {_DAILY_ROLLUP_COLUMNS}
+                FROM decision_daily_stats
+                WHERE function_id = $1 AND total > 0
+            """,
+                function_id,
+            )
+            replaced = (
+                await conn.fetch(
                     """
-                    SELECT
-                        COUNT(*) as total_decisions,
-                        COUNT(CASE WHEN result_data->>'success' = 'true' THEN 1 END) as successful_decisions,
-                        AVG((result_data->>'execution_time_ms')::numeric) as avg_execution_time,
-                        MIN(timestamp) as first_decision,
-                        MAX(timestamp) as last_decision
+                    SELECT trace_id, function_id, version, timestamp, result_data
                     FROM decisions
-                    WHERE function_id = $1
+                    WHERE function_id = $1 AND trace_id = ANY($2::text[])
                 """,
                     function_id,
+                    list(buffered),
                 )
+                if buffered
+                else []
+            )
 
-                if not stats_row or stats_row["total_decisions"] == 0:
-                    return {
-                        "total_decisions": 0,
-                        "success_rate": 0.0,
-                        "avg_execution_time": 0.0,
-                        "first_decision": None,
-                        "last_decision": None,
-                    }
+        days = _rollups_from_rows(rows).get(function_id, {})
+        changes = [(_decision_from_record(tuple(row)), -1) for row in replaced] + [
+            (_decision_from_record(record), 1)
+            for record in buffered.values()
+            if record[1] == function_id
+        ]
+        for decision, sign in changes:
+            _, timestamp, success, execution_time = decision_counters(decision)
+            days.setdefault(timestamp[:10], DecisionRollup()).add(
+                timestamp, success, execution_time, sign
+            )
+        return {day: rollup for day, rollup in days.items() if rollup.total > 0}
 
-                success_rate = (
-                    stats_row["successful_decisions"] / stats_row["total_decisions"]
-                    if stats_row["total_decisions"] > 0
-                    else 0.0
-                )
+    async def rebuild_decision_stats(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Recompute decision_daily_stats from the decisions table
 
-                return {
-                    "total_decisions": stats_row["total_decisions"],
-                    "success_rate": success_rate,
-                    "avg_execution_time": float(stats_row["avg_execution_time"] or 0),
-                    "first_decision": (
-                        stats_row["first_decision"].isoformat()
-                        if stats_row["first_decision"]
-                        else None
-                    ),
-                    "last_decision": (
-                        stats_row["last_decision"].isoformat()
-                        if stats_row["last_decision"]
-                        else None
-                    ),
-                }
+        Buffered decisions are in neither table yet, and each batch updates
+        both in one transaction, so the buffer need not be flushed first.
+        """
+        if not self.pool:
+            await self.connect()
+
+        try:
+            if self.pool is None:
+                raise StorageError("operation", "Database pool not initialized")
+            async with self.pool.acquire() as conn, conn.transaction():
+                # Hold off store_decision so the recount sees a stable table
+                await conn.execute("LOCK TABLE decision_daily_stats IN EXCLUSIVE MODE")
+                expected = await conn.fetch(_DAILY_ROLLUP_SELECT.format(where=""))
+                actual = await conn.fetch(
+                    f"SELECT {_DAILY_ROLLUP_COLUMNS} FROM decision_daily_stats"
+                )
+                report = rebuild_report(
+                    _rollups_from_rows(expected), _rollups_from_rows(actual)
+                )
+                if not dry_run:
+                    await conn.execute("DELETE FROM decision_daily_stats")
+                    await conn.execute(
+                        f"INSERT INTO decision_daily_stats ({_DAILY_ROLLUP_COLUMNS})"
+                        + _DAILY_ROLLUP_SELECT.format(where="")
+                    )
+                return report
         except Exception as e:
-            raise StorageError("read", f"Failed to get decision stats: {e}")
+            raise StorageError("read", f"Failed to rebuild decision stats: {e}")
 
     async def close(self):
-        """Close the connection pool"""
+        """Flush buffered decisions and close the connection pool"""
+        if self.write_behind is not None:
+            await self.write_behind.close()
         if self.pool:
             await self.pool.close()
 
@@ -1077,15 +1593,786 @@ class PostgreSQLStorage(StorageBackend):
             raise StorageError("read", f"Failed to retrieve function spec: {e}")
 
 
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS functions (
+    function_id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    code TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    PRIMARY KEY (function_id, version)
+);
+CREATE TABLE IF NOT EXISTS decisions (
+    trace_id TEXT PRIMARY KEY,
+    function_id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    result_data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_decisions_function_version
+    ON decisions(function_id, version, timestamp);
+CREATE INDEX IF NOT EXISTS idx_decisions_function_id
+    ON decisions(function_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_decisions_timestamp
+    ON decisions(timestamp);
+CREATE TABLE IF NOT EXISTS decision_daily_stats (
+    function_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    total INTEGER NOT NULL,
+    successes INTEGER NOT NULL,
+    execution_time_sum REAL NOT NULL,
+    execution_time_count INTEGER NOT NULL,
+    first_decision TEXT,
+    last_decision TEXT,
+    PRIMARY KEY (function_id, day)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS releases (
+    release_id TEXT PRIMARY KEY,
+    df_id TEXT,
+    status TEXT,
+    created_at TEXT NOT NULL,
+    release_data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_releases_df_id
+    ON releases(df_id, created_at);
+CREATE TABLE IF NOT EXISTS function_specs (
+    df_id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    spec_data TEXT NOT NULL,
+    PRIMARY KEY (df_id, version)
+);
+"""
+
+_SQLITE_DECISION_COLUMNS = "trace_id, function_id, version, timestamp, result_data"
+
+_SQLITE_STORE_DECISION = f"""
+    INSERT INTO decisions ({_SQLITE_DECISION_COLUMNS})
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (trace_id) DO UPDATE SET
+        result_data = excluded.result_data,
+        timestamp = excluded.timestamp
+"""
+
+# SQLite's scalar min/max return NULL if any argument is NULL
+_SQLITE_FOLD_DECISION = """
+    INSERT INTO decision_daily_stats (
+        function_id, day, total, successes, execution_time_sum,
+        execution_time_count, first_decision, last_decision
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (function_id, day) DO UPDATE SET
+        total = total + excluded.total,
+        successes = successes + excluded.successes,
+        execution_time_sum = execution_time_sum + excluded.execution_time_sum,
+        execution_time_count = execution_time_count + excluded.execution_time_count,
+        first_decision = min(
+            coalesce(first_decision, excluded.first_decision),
+            coalesce(excluded.first_decision, first_decision)
+        ),
+        last_decision = max(
+            coalesce(last_decision, excluded.last_decision),
+            coalesce(excluded.last_decision, last_decision)
+        )
+"""
+
+_SQLITE_ROLLUP_COLUMNS = (
+    "function_id, day, total, successes, execution_time_sum, "
+    "execution_time_count, first_decision, last_decision"
+)
+
+
+def _sqlite_decision(row) -> Dict[str, Any]:
+    return {
+        "trace_id": row[0],
+        "function_id": row[1],
+        "version": row[2],
+        "timestamp": row[3],
+        "result": json.loads(row[4]),
+    }
+
+
+def _sqlite_fold(conn, decision: Dict[str, Any], sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) a decision from its day's rollup"""
+    function_id, timestamp, success, execution_time = decision_counters(decision)
+    conn.execute(
+        _SQLITE_FOLD_DECISION,
+        (
+            function_id,
+            timestamp[:10],
+            sign,
+            sign * int(success),
+            sign * (execution_time or 0.0),
+            sign * int(execution_time is not None),
+            timestamp if sign > 0 else None,
+            timestamp if sign > 0 else None,
+        ),
+    )
+
+
+def _sqlite_rollups(rows) -> Dict[str, Dict[str, DecisionRollup]]:
+    rollups: Dict[str, Dict[str, DecisionRollup]] = {}
+    for function_id, day, *counters in rows:
+        rollups.setdefault(function_id, {})[day] = DecisionRollup(*counters)
+    return rollups
+
+
+def _sqlite_insert_rollups(conn, rollups) -> None:
+    conn.executemany(
+        f"INSERT INTO decision_daily_stats ({_SQLITE_ROLLUP_COLUMNS}) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                function_id,
+                day,
+                rollup.total,
+                rollup.successes,
+                rollup.execution_time_sum,
+                rollup.execution_time_count,
+                rollup.first_decision,
+                rollup.last_decision,
+            )
+            for function_id, days in rollups.items()
+            for day, rollup in days.items()
+        ],
+    )
+
+
+class SQLiteStorage(StorageBackend):
+    """Embedded SQLite storage backend for single-node deployments
+
+    The database runs in WAL mode so readers never block the writer. Reads
+    check out one of ``readers`` connections and run on a thread pool; all
+    writes are queued to a single writer task, which applies whatever has
+    queued up (at most ``batch_size`` operations) in one transaction, each
+    in its own savepoint so a failing write does not affect its batch.
+    Statements are constant SQL text, so each connection's statement cache
+    keeps them prepared. Decision statistics are kept as per-day rollups
+    in the same transaction as the decision.
+    """
+
+    def __init__(
+        self,
+        path: str = "./policy_as_code.db",
+        function_cache: Optional[CompiledFunctionCache] = None,
+        version_index: Optional[VersionIndex] = None,
+        readers: int = 4,
+        batch_size: int = 256,
+        busy_timeout_ms: int = 5000,
+    ):
+        if path == ":memory:" or path.startswith("file::memory:"):
+            raise ValueError("SQLiteStorage needs a database file for WAL mode")
+        self.path = path
+        self.function_cache = function_cache or CompiledFunctionCache()
+        self.version_index = version_index or VersionIndex()
+        self.readers = readers
+        self.batch_size = batch_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.batches = 0
+        self.batched_writes = 0
+        self._writer: Optional[sqlite3.Connection] = None
+        self._reader_connections: List[sqlite3.Connection] = []
+        self._writer_executor: Optional[ThreadPoolExecutor] = None
+        self._reader_executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._reader_pool: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._connect_lock = threading.Lock()
+
+    async def connect(self):
+        """Open the connections, create tables and start the writer task"""
+        try:
+            with self._connect_lock:
+                if self._writer is None:
+                    self._open()
+        except Exception as e:
+            raise StorageError("connect", f"Failed to open SQLite database: {e}")
+
+        loop = asyncio.get_running_loop()
+        if (
+            self._loop is not loop
+            or self._writer_task is None
+            or self._writer_task.done()
+        ):
+            # Queues and the writer task belong to the loop that made them
+            self._loop = loop
+            self._write_queue = asyncio.Queue()
+            self._reader_pool = asyncio.Queue()
+            for conn in self._reader_connections:
+                self._reader_pool.put_nowait(conn)
+            self._writer_task = loop.create_task(self._run_writer())
+
+    def _open(self) -> None:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        writer = self._connection()
+        writer.execute("PRAGMA journal_mode = WAL")
+        writer.execute("PRAGMA synchronous = NORMAL")
+        writer.executescript(_SQLITE_SCHEMA)
+        self._reader_connections = [self._connection() for _ in range(self.readers)]
+        for conn in self._reader_connections:
+            conn.execute("PRAGMA query_only = ON")
+        self._writer_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sqlite-writer"
+        )
+        self._reader_executor = ThreadPoolExecutor(
+            max_workers=self.readers, thread_name_prefix="sqlite-reader"
+        )
+        self._writer = writer
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        return conn
+
+    async def _read(self, operation):
+        """Run operation(conn) on a pooled reader connection"""
+        if self._loop is not asyncio.get_running_loop() or self._writer is None:
+            await self.connect()
+        conn = await self._reader_pool.get()
+        try:
+            return await self._loop.run_in_executor(
+                self._reader_executor, operation, conn
+            )
+        finally:
+            self._reader_pool.put_nowait(conn)
+
+    async def _write(self, operation):
+        """Queue operation(conn) for the writer and wait for its commit"""
+        if self._loop is not asyncio.get_running_loop() or self._writer is None:
+            await self.connect()
+        future = self._loop.create_future()
+        self._write_queue.put_nowait((operation, future))
+        return await future
+
+    async def _run_writer(self) -> None:
+        queue = self._write_queue
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.batch_size and not queue.empty():
+                item = queue.get_nowait()
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            try:
+                outcomes = await self._loop.run_in_executor(
+                    self._writer_executor,
+                    self._commit,
+                    [operation for operation, _ in batch],
+                )
+            except Exception as e:
+                outcomes = [(False, e)] * len(batch)
+            for (_, future), (ok, value) in zip(batch, outcomes):
+                if future.done():
+                    continue
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+            if stop:
+                return
+
+    def _commit(self, operations) -> List[Tuple[bool, Any]]:
+        """Apply a batch of writes in one transaction (writer thread)"""
+        conn = self._writer
+        outcomes: List[Tuple[bool, Any]] = []
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for operation in operations:
+                conn.execute("SAVEPOINT write")
+                try:
+                    outcomes.append((True, operation(conn)))
+                except Exception as e:
+                    conn.execute("ROLLBACK TO write")
+                    outcomes.append((False, e))
+                conn.execute("RELEASE write")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.batches += 1
+        self.batched_writes += len(operations)
+        return outcomes
+
+    async def close(self):
+        """Drain queued writes and close the connections"""
+        if self._writer_task is not None and not self._writer_task.done():
+            if self._loop is asyncio.get_running_loop():
+                self._write_queue.put_nowait(None)
+                await self._writer_task
+        for executor in (self._writer_executor, self._reader_executor):
+            if executor is not None:
+                executor.shutdown(wait=True)
+        for conn in [self._writer, *self._reader_connections]:
+            if conn is not None:
+                conn.close()
+        self._writer = None
+        self._reader_connections = []
+        self._loop = None
+
+    async def save_function(self, function_id: str, version: str, code: str) -> None:
+        """Save function to SQLite"""
+
+        def save(conn):
+            conn.execute(
+                """
+                INSERT INTO functions (function_id, version, code, created_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (function_id, version) DO UPDATE SET
+                    code = excluded.code,
+                    created_at = excluded.created_at
+                """,
+                (function_id, version, code, datetime.utcnow().isoformat()),
+            )
+
+        try:
+            await self._write(save)
+        except Exception as e:
+            raise StorageError("write", f"Failed to save function: {e}")
+        finally:
+            self.function_cache.invalidate(function_id, version)
+
+        self.version_index.add(function_id, version)
+
+    async def load_function(self, function_id: str, version: str) -> str:
+        """Load function from SQLite"""
+        try:
+            row = await self._read(
+                lambda conn: conn.execute(
+                    "SELECT code FROM functions WHERE function_id = ? AND version = ?",
+                    (function_id, version),
+                ).fetchone()
+            )
+        except Exception as e:
+            raise StorageError("read", f"Failed to load function: {e}")
+
+        if row is None:
+            raise StorageError(
+                "read", f"Function {function_id} version {version} not found"
+            )
+        return row[0]
+
+    async def load_function_object(self, function_id: str, version: str):
+        """Load function as callable object"""
+        function = self.function_cache.get(function_id, version)
+        if function is not None:
+            return function
+
+        code = await self.load_function(function_id, version)
+        return self.function_cache.load(function_id, version, code)
+
+    async def list_functions(self) -> List[str]:
+        """List all function IDs"""
+        try:
+            rows = await self._read(
+                lambda conn: conn.execute(
+                    "SELECT DISTINCT function_id FROM functions ORDER BY function_id"
+                ).fetchall()
+            )
+            return [row[0] for row in rows]
+        except Exception as e:
+            raise StorageError("list", f"Failed to list functions: {e}")
+
+    async def list_versions(self, function_id: str) -> List[str]:
+        """List all versions for a function"""
+        try:
+            rows = await self._read(
+                lambda conn: conn.execute(
+                    "SELECT version FROM functions WHERE function_id = ?",
+                    (function_id,),
+                ).fetchall()
+            )
+            versions = [row[0] for row in rows]
+        except Exception as e:
+            raise StorageError("list", f"Failed to list versions: {e}")
+
+        self.version_index.set(function_id, versions)
+        return sort_versions(versions)
+
+    async def get_latest_version(self, function_id: str) -> Optional[str]:
+        """Get the latest version, querying only when the index is stale"""
+        if not self.version_index.is_fresh(function_id):
+            await self.list_versions(function_id)
+        return self.version_index.latest(function_id)
+
+    async def store_decision(self, context, result_data: Dict[str, Any]) -> str:
+        """Store decision result to SQLite"""
+        decision = {
+            "trace_id": context.trace_id,
+            "function_id": context.function_id,
+            "version": context.version,
+            "timestamp": context.timestamp.isoformat(),
+            "result": result_data,
+        }
+        result_json = json.dumps(result_data, default=str)
+
+        def store(conn):
+            previous = conn.execute(
+                f"SELECT {_SQLITE_DECISION_COLUMNS} FROM decisions WHERE trace_id = ?",
+                (context.trace_id,),
+            ).fetchone()
+            conn.execute(
+                _SQLITE_STORE_DECISION,
+                (
+                    decision["trace_id"],
+                    decision["function_id"],
+                    decision["version"],
+                    decision["timestamp"],
+                    result_json,
+                ),
+            )
+            if previous is not None:
+                _sqlite_fold(conn, _sqlite_decision(previous), -1)
+            _sqlite_fold(conn, decision, 1)
+
+        try:
+            await self._write(store)
+            return context.trace_id
+        except Exception as e:
+            raise StorageError("write", f"Failed to store decision: {e}")
+
+    async def retrieve_decision(self, trace_id: str) -> Dict[str, Any]:
+        """Retrieve decision result from SQLite"""
+        try:
+            row = await self._read(
+                lambda conn: conn.execute(
+                    f"SELECT {_SQLITE_DECISION_COLUMNS} FROM decisions "
+                    "WHERE trace_id = ?",
+                    (trace_id,),
+                ).fetchone()
+            )
+        except Exception as e:
+            raise StorageError("read", f"Failed to retrieve decision: {e}")
+
+        if row is None:
+            raise StorageError("read", f"Decision {trace_id} not found")
+        return _sqlite_decision(row)
+
+    async def get_decision_history(
+        self, function_id: str, limit: int = 100, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """Get decision history for a function from SQLite"""
+        try:
+            rows = await self._read(
+                lambda conn: conn.execute(
+                    f"""
+                    SELECT {_SQLITE_DECISION_COLUMNS} FROM decisions
+                    WHERE function_id = ?
+                    ORDER BY timestamp DESC
+                    LIMIT ? OFFSET ?
+                    """,
+                    (function_id, limit, offset),
+                ).fetchall()
+            )
+            return [_sqlite_decision(row) for row in rows]
+        except Exception as e:
+            raise StorageError("read", f"Failed to get decision history: {e}")
+
+    async def get_decisions_by_date_range(
+        self, start_date: datetime, end_date: datetime, limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Get decisions within a date range from SQLite"""
+        try:
+            rows = await self._read(
+                lambda conn: conn.execute(
+                    f"""
+                    SELECT {_SQLITE_DECISION_COLUMNS} FROM decisions
+                    WHERE timestamp BETWEEN ? AND ?
+                    ORDER BY timestamp DESC
+                    LIMIT ?
+                    """,
+                    (start_date.isoformat(), end_date.isoformat(), limit),
+                ).fetchall()
+            )
+            return [_sqlite_decision(row) for row in rows]
+        except Exception as e:
+            raise StorageError("read", f"Failed to get decisions by date range: {e}")
+
+    async def cleanup_old_decisions(self, retention_days: int) -> int:
+        """Clean up decisions older than retention_days from SQLite"""
+        cutoff_date = datetime.now() - timedelta(days=retention_days)
+        cutoff_day = cutoff_date.date()
+
+        def cleanup(conn):
+            deleted = conn.execute(
+                "DELETE FROM decisions WHERE timestamp < ?",
+                (cutoff_date.isoformat(),),
+            ).rowcount
+            # Earlier days are now empty; the cutoff day is recounted
+            conn.execute(
+                "DELETE FROM decision_daily_stats WHERE day <= ?",
+                (cutoff_day.isoformat(),),
+            )
+            rows = conn.execute(
+                f"SELECT {_SQLITE_DECISION_COLUMNS} FROM decisions "
+                "WHERE timestamp >= ? AND timestamp < ?",
+                (
+                    cutoff_day.isoformat(),
+                    (cutoff_day + timedelta(days=1)).isoformat(),
+                ),
+            )
+            _sqlite_insert_rollups(conn, aggregate(map(_sqlite_decision, rows)))
+            return deleted
+
+        try:
+            return await self._write(cleanup)
+        except Exception as e:
+            raise StorageError("delete", f"Failed to cleanup old decisions: {e}")
+
+    async def get_decision_stats(self, function_id: str) -> Dict[str, Any]:
+        """Get decision statistics for a function from its daily rollups"""
+        try:
+            rows = await self._read(
+                lambda conn: conn.execute(
+                    f"SELECT {_SQLITE_ROLLUP_COLUMNS} FROM decision_daily_stats "
+                    "WHERE function_id = ?",
+                    (function_id,),
+                ).fetchall()
+            )
+        except Exception as e:
+            raise StorageError("read", f"Failed to get decision stats: {e}")
+
+        total = DecisionRollup()
+        for rollup in _sqlite_rollups(rows).get(function_id, {}).values():
+            total.merge(rollup)
+        return total.to_stats()
+
+    async def get_daily_decision_stats(
+        self, function_id: str
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get per-day decision statistics for a function from SQLite"""
+        try:
+            rows = await self._read(
+                lambda conn: conn.execute(
+                    f"SELECT {_SQLITE_ROLLUP_COLUMNS} FROM decision_daily_stats "
+                    "WHERE function_id = ? AND total > 0 ORDER BY day",
+                    (function_id,),
+                ).fetchall()
+            )
+        except Exception as e:
+            raise StorageError("read", f"Failed to get decision stats: {e}")
+
+        days = _sqlite_rollups(rows).get(function_id, {})
+        return {day: rollup.to_stats() for day, rollup in days.items()}
+
+    async def rebuild_decision_stats(self, dry_run: bool = False) -> Dict[str, Any]:
+        """Recompute decision_daily_stats from the decisions table"""
+
+        def rebuild(conn):
+            # Runs on the writer, so no decision lands mid-recount
+            expected = aggregate(
+                map(
+                    _sqlite_decision,
+                    conn.execute(f"SELECT {_SQLITE_DECISION_COLUMNS} FROM decisions"),
+                )
+            )
+            actual = _sqlite_rollups(
+                conn.execute(
+                    f"SELECT {_SQLITE_ROLLUP_COLUMNS} FROM decision_daily_stats"
+                )
+            )
+            report = rebuild_report(expected, actual)
+            if not dry_run:
+                conn.execute("DELETE FROM decision_daily_stats")
+                _sqlite_insert_rollups(conn, expected)
+            return report
+
+        try:
+            return await self._write(rebuild)
+        except Exception as e:
+            raise StorageError("read", f"Failed to rebuild decision stats: {e}")
+
+    async def store_release(self, release_data: Dict[str, Any]) -> None:
+        """Store a release record to SQLite"""
+        data = json.dumps(release_data, default=str)
+
+        def store(conn):
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO releases
+                    (release_id, df_id, status, created_at, release_data)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    release_data["release_id"],
+                    release_data.get("df_id"),
+                    release_data.get("status"),
+                    str(release_data.get("created_at", "")),
+                    data,
+                ),
+            )
+
+        try:
+            await self._write(store)
+        except Exception as e:
+            raise StorageError("write", f"Failed to store release: {e}")
+
+    async def get_release(self, release_id: str) -> Optional[Dict[str, Any]]:
+        """Get a specific release record from SQLite"""
+        try:
+            row = await self._read(
+                lambda conn: conn.execute(
+                    "SELECT release_data FROM releases WHERE release_id = ?",
+                    (release_id,),
+                ).fetchone()
+            )
+        except Exception as e:
+            raise StorageError("read", f"Failed to get release: {e}")
+
+        return json.loads(row[0]) if row else None
+
+    async def get_releases(
+        self, df_id: Optional[str] = None, status: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get releases with optional filtering from SQLite"""
+        query = "SELECT release_data FROM releases WHERE 1=1"
+        params: List[Any] = []
+        if df_id:
+            query += " AND df_id = ?"
+            params.append(df_id)
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        query += " ORDER BY created_at DESC"
+
+        try:
+            rows = await self._read(lambda conn: conn.execute(query, params).fetchall())
+            return [json.loads(row[0]) for row in rows]
+        except Exception as e:
+            raise StorageError("read", f"Failed to get releases: {e}")
+
+    async def update_release(
+        self, release_id: str, release_data: Dict[str, Any]
+    ) -> None:
+        """Update a release record in SQLite"""
+        data = json.dumps(release_data, default=str)
+
+        def update(conn):
+            return conn.execute(
+                """
+                UPDATE releases SET df_id = ?, status = ?, release_data = ?
+                WHERE release_id = ?
+                """,
+                (
+                    release_data.get("df_id"),
+                    release_data.get("status"),
+                    data,
+                    release_id,
+                ),
+            ).rowcount
+
+        try:
+            updated = await self._write(update)
+        except Exception as e:
+            raise StorageError("write", f"Failed to update release: {e}")
+
+        if not updated:
+            raise StorageError("not_found", f"Release {release_id} not found")
+
+    async def store_function_spec(
+        self, df_id: str, version: str, spec: Dict[str, Any]
+    ) -> None:
+        """Store decision function specification to SQLite"""
+        data = json.dumps(spec, default=str)
+
+        def store(conn):
+            conn.execute(
+                """
+                INSERT INTO function_specs (df_id, version, spec_data)
+                VALUES (?, ?, ?)
+                ON CONFLICT (df_id, version) DO UPDATE SET
+                    spec_data = excluded.spec_data
+                """,
+                (df_id, version, data),
+            )
+
+        try:
+            await self._write(store)
+        except Exception as e:
+            raise StorageError("write", f"Failed to store function spec: {e}")
+
+    async def retrieve_function_spec(
+        self, df_id: str, version: str
+    ) -> Optional[Dict[str, Any]]:
+        """Retrieve decision function specification from SQLite"""
+        try:
+            row = await self._read(
+                lambda conn: conn.execute(
+                    "SELECT spec_data FROM function_specs "
+                    "WHERE df_id = ? AND version = ?",
+                    (df_id, version),
+                ).fetchone()
+            )
+        except Exception as e:
+            raise StorageError("read", f"Failed to retrieve function spec: {e}")
+
+        return json.loads(row[0]) if row else None
+
+
 def create_storage_backend(backend_type: str, config: Dict[str, Any]) -> StorageBackend:
     """Factory function to create storage backend"""
+    cache_config = config.get("function_cache", {})
+    artifact_cache = None
+    if cache_config.get("artifact_dir"):
+        # Imported here: features.constraints imports core, which imports us
+        from ..features.artifact_cache import ArtifactCache
+
+        artifact_cache = ArtifactCache(
+            cache_config["artifact_dir"],
+            max_memory_entries=cache_config.get("max_entries", 256),
+        )
+    function_cache = CompiledFunctionCache(
+        max_entries=cache_config.get("max_entries", 256),
+        enabled=cache_config.get("enabled", True),
+        artifact_cache=artifact_cache,
+    )
+    version_index = VersionIndex(
+        refresh_interval_seconds=config.get("version_index", {}).get(
+            "refresh_interval_seconds", 5.0
+        )
+    )
+
     if backend_type == "file":
         path = config.get("path", "./functions")
-        return FileStorage(path)
+        log_config = config.get("decision_log", {})
+        decision_log = None
+        if log_config.get("enabled", False):
+            decision_log = DecisionLog(
+                log_config.get("path", str(Path(path) / "decisions" / "log")),
+                max_segment_bytes=log_config.get("max_segment_bytes", 64 * 1024 * 1024),
+                fsync=log_config.get("fsync", False),
+            )
+        return FileStorage(
+            path,
+            function_cache=function_cache,
+            version_index=version_index,
+            decision_log=decision_log,
+        )
     elif backend_type == "postgresql":
         connection_string = config.get("connection_string")
         if not connection_string:
             raise ValueError("PostgreSQL connection_string is required")
-        return PostgreSQLStorage(connection_string)
+        return PostgreSQLStorage(
+            connection_string,
+            function_cache=function_cache,
+            version_index=version_index,
+            write_behind=WriteBehindConfig.from_config(config.get("write_behind", {})),
+        )
+    elif backend_type == "sqlite":
+        return SQLiteStorage(
+            config.get("path", "./policy_as_code.db"),
+            function_cache=function_cache,
+            version_index=version_index,
+            readers=config.get("readers", 4),
+            batch_size=config.get("batch_size", 256),
+        )
     else:
         raise ValueError(f"Unsupported storage backend: {backend_type}")
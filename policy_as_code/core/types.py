@@ -3,10 +3,12 @@ Core data structures for Policy as Code Platform
 Separated to avoid circular imports
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, Optional, Callable
 
+from ..utils.canonical import CanonicalPayload
+
 
 @dataclass(frozen=True)
 class DecisionContext:
@@ -17,6 +19,31 @@ class DecisionContext:
     input_hash: str
     timestamp: datetime
     trace_id: str
+    # Canonical encoding of the input, computed once by whoever builds the
+    # context; input_hash is its digest
+    canonical_input: Optional[CanonicalPayload] = field(
+        default=None, compare=False, repr=False
+    )
+
+    @classmethod
+    def for_input(
+        cls,
+        function_id: str,
+        version: str,
+        input_data: Any,
+        timestamp: datetime,
+        trace_id: str,
+    ) -> "DecisionContext":
+        """Build a context, hashing the input exactly once"""
+        payload = CanonicalPayload.of(input_data)
+        return cls(
+            function_id=function_id,
+            version=version,
+            input_hash=payload.digest,
+            timestamp=timestamp,
+            trace_id=trace_id,
+            canonical_input=payload,
+        )
 
 
 @dataclass
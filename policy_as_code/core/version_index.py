@@ -0,0 +1,155 @@
+"""
+In-memory index of deployed function versions
+
+Keeps each function's versions in semantic-version order so the latest
+version can be resolved without listing storage on every request.
+"""
+
+import bisect
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_SEMVER_RE = re.compile(
+    r"^v?(?P<release>\d+(?:\.\d+)*)"
+    r"(?:-(?P<prerelease>[0-9A-Za-z.-]+))?"
+    r"(?:\+[0-9A-Za-z.-]+)?$"
+)
+
+
+def version_sort_key(version: str) -> Tuple[Any, ...]:
+    """Sort key implementing semantic-version precedence
+
+    ``1.10.0`` sorts after ``1.9.0``, ``2.0`` equals ``2.0.0`` for ordering,
+    pre-releases sort before their release and build metadata is ignored.
+    Versions that are not semver-like sort before all semver versions, in
+    lexical order.
+    """
+    match = _SEMVER_RE.match(version)
+    if match is None:
+        return (0, version)
+
+    release = [int(part) for part in match.group("release").split(".")]
+    while len(release) > 1 and release[-1] == 0:
+        release.pop()
+
+    prerelease = match.group("prerelease")
+    if prerelease is None:
+        # A release outranks any of its pre-releases
+        return (1, tuple(release), 1, (), version)
+
+    identifiers = tuple(
+        (0, int(part), "") if part.isdigit() else (1, 0, part)
+        for part in prerelease.split(".")
+    )
+    return (1, tuple(release), 0, identifiers, version)
+
+
+def sort_versions(versions: List[str]) -> List[str]:
+    """Return versions in semantic-version order"""
+    return sorted(versions, key=version_sort_key)
+
+
+@dataclass
+class _IndexEntry:
+    versions: List[str] = field(default_factory=list)
+    keys: List[Tuple[Any, ...]] = field(default_factory=list)
+    token: Any = None
+    checked_at: float = 0.0
+
+
+class VersionIndex:
+    """Per-function sorted version lists with cheap freshness checks
+
+    Each entry carries a backend-defined ``token`` (a directory mtime, a
+    generation number) and the time it was last validated. Backends only
+    re-validate an entry once ``refresh_interval_seconds`` have elapsed.
+    """
+
+    def __init__(
+        self,
+        refresh_interval_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self._clock = clock
+        self._entries: Dict[str, _IndexEntry] = {}
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def is_fresh(self, function_id: str) -> bool:
+        """Check whether an entry exists and does not need re-validation"""
+        entry = self._entries.get(function_id)
+        if entry is None:
+            return False
+        return self._clock() - entry.checked_at < self.refresh_interval_seconds
+
+    def token(self, function_id: str) -> Any:
+        """Return the validation token stored for a function"""
+        entry = self._entries.get(function_id)
+        return entry.token if entry else None
+
+    def versions(self, function_id: str) -> Optional[List[str]]:
+        """Return a copy of the indexed versions, or None if not indexed"""
+        entry = self._entries.get(function_id)
+        return list(entry.versions) if entry else None
+
+    def latest(self, function_id: str) -> Optional[str]:
+        """Return the highest indexed version"""
+        entry = self._entries.get(function_id)
+        if entry is None or not entry.versions:
+            return None
+        return entry.versions[-1]
+
+    def set(self, function_id: str, versions: List[str], token: Any = None) -> None:
+        """Replace the indexed versions of a function"""
+        ordered = sort_versions(list(set(versions)))
+        with self._lock:
+            self._entries[function_id] = _IndexEntry(
+                versions=ordered,
+                keys=[version_sort_key(v) for v in ordered],
+                token=token,
+                checked_at=self._clock(),
+            )
+            self.generation += 1
+
+    def add(self, function_id: str, version: str, token: Any = None) -> None:
+        """Insert a single version, keeping order"""
+        key = version_sort_key(version)
+        with self._lock:
+            entry = self._entries.get(function_id)
+            if entry is None:
+                return
+            position = bisect.bisect_left(entry.keys, key)
+            if position == len(entry.keys) or entry.keys[position] != key:
+                entry.keys.insert(position, key)
+                entry.versions.insert(position, version)
+            entry.token = token
+            entry.checked_at = self._clock()
+            self.generation += 1
+
+    def touch(self, function_id: str) -> None:
+        """Mark an entry as validated now"""
+        entry = self._entries.get(function_id)
+        if entry is not None:
+            entry.checked_at = self._clock()
+
+    def invalidate(self, function_id: Optional[str] = None) -> None:
+        """Forget one function or the whole index"""
+        with self._lock:
+            if function_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(function_id, None)
+            self.generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics"""
+        return {
+            "indexed_functions": len(self._entries),
+            "indexed_versions": sum(len(e.versions) for e in self._entries.values()),
+            "generation": self.generation,
+            "refresh_interval_seconds": self.refresh_interval_seconds,
+        }
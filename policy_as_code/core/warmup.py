@@ -0,0 +1,193 @@
+"""
+Startup warm-up for decision functions
+
+After a deploy or restart the first request to every function pays for file
+reads, compilation and cold caches. Warm-up does that work up front: it
+enumerates functions, compiles the selected versions in parallel, primes the
+version index and function cache, and optionally runs a canary input per
+function. Engines report ready only once warm-up has finished.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+
+class WarmUpStatus(str, Enum):
+    """Warm-up lifecycle"""
+
+    PENDING = "pending"
+    WARMING = "warming"
+    READY = "ready"
+    FAILED = "failed"
+
+
+@dataclass
+class FunctionWarmUp:
+    """Warm-up outcome for one function version"""
+
+    function_id: str
+    version: str
+    load_ms: float = 0.0
+    canary_ms: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class WarmUpReport:
+    """Summary of one warm-up run"""
+
+    started_at: datetime
+    duration_ms: float = 0.0
+    functions: List[FunctionWarmUp] = field(default_factory=list)
+
+    @property
+    def warmed(self) -> int:
+        return sum(1 for item in self.functions if item.ok)
+
+    @property
+    def failed(self) -> List[FunctionWarmUp]:
+        return [item for item in self.functions if not item.ok]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "warmed": self.warmed,
+            "canaries": sum(1 for item in self.functions if item.canary_ms is not None),
+            "failed": {
+                f"{item.function_id}:{item.version}": item.error for item in self.failed
+            },
+        }
+
+
+ListFunctions = Callable[[], Awaitable[List[str]]]
+ListVersions = Callable[[str], Awaitable[List[str]]]
+PrimeFunction = Callable[[str, str], Awaitable[None]]
+RunCanary = Callable[[str, str, Dict[str, Any]], Awaitable[Any]]
+
+
+async def select_versions(
+    list_functions: ListFunctions,
+    list_versions: ListVersions,
+    versions: str = "latest",
+    active_versions: Optional[Callable[[str], Awaitable[List[str]]]] = None,
+) -> List[Tuple[str, str]]:
+    """Pick the function versions to warm
+
+    ``versions`` is ``"latest"``, ``"all"`` or ``"active"``. Active mode uses
+    ``active_versions`` and falls back to the latest version for functions
+    without an active release.
+    """
+    if versions not in ("latest", "all", "active"):
+        raise ValueError(f"Unknown warm-up version selection: {versions}")
+
+    targets: List[Tuple[str, str]] = []
+    for function_id in await list_functions():
+        known = await list_versions(function_id)
+        if not known:
+            continue
+        if versions == "all":
+            selected = list(known)
+        elif versions == "active" and active_versions is not None:
+            selected = [
+                version
+                for version in await active_versions(function_id)
+                if version in known
+            ] or [known[-1]]
+        else:
+            selected = [known[-1]]
+        targets.extend((function_id, version) for version in selected)
+    return targets
+
+
+class WarmUp:
+    """Runs warm-up for an engine and tracks readiness"""
+
+    def __init__(self):
+        self.status = WarmUpStatus.PENDING
+        self.report: Optional[WarmUpReport] = None
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status == WarmUpStatus.READY
+
+    async def run(
+        self,
+        targets: Sequence[Tuple[str, str]],
+        prime: PrimeFunction,
+        canary: Optional[RunCanary] = None,
+        canary_inputs: Optional[Mapping[str, Dict[str, Any]]] = None,
+        concurrency: int = 8,
+    ) -> WarmUpReport:
+        """Prime every target, at most ``concurrency`` at a time
+
+        A function that fails to load or whose canary fails is reported but
+        does not block readiness; an error enumerating functions does.
+        """
+        self.status = WarmUpStatus.WARMING
+        report = WarmUpReport(started_at=datetime.now())
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+        canary_inputs = canary_inputs or {}
+
+        async def warm(function_id: str, version: str) -> FunctionWarmUp:
+            outcome = FunctionWarmUp(function_id, version)
+            async with semaphore:
+                step = time.perf_counter()
+                try:
+                    await prime(function_id, version)
+                    outcome.load_ms = (time.perf_counter() - step) * 1000
+                    canary_input = canary_inputs.get(function_id)
+                    if canary is not None and canary_input is not None:
+                        step = time.perf_counter()
+                        await canary(function_id, version, canary_input)
+                        outcome.canary_ms = (time.perf_counter() - step) * 1000
+                except Exception as e:
+                    outcome.error = f"{type(e).__name__}: {e}"
+            return outcome
+
+        try:
+            report.functions = list(
+                await asyncio.gather(*(warm(fid, ver) for fid, ver in targets))
+            )
+        except BaseException as e:
+            self.status = WarmUpStatus.FAILED
+            self.error = str(e)
+            raise
+        report.duration_ms = (time.perf_counter() - started) * 1000
+        self.report = report
+        self.status = WarmUpStatus.READY
+        return report
+
+    def fail(self, error: Exception) -> None:
+        """Mark warm-up as failed before it could run"""
+        self.status = WarmUpStatus.FAILED
+        self.error = str(error)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get readiness and the last warm-up report"""
+        stats: Dict[str, Any] = {"status": self.status.value, "ready": self.ready}
+        if self.report is not None:
+            stats.update(self.report.to_dict())
+        if self.error is not None:
+            stats["error"] = self.error
+        return stats
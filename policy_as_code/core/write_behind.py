@@ -0,0 +1,277 @@
+"""
+Write-behind batching for decision writes
+
+``WriteBehindBuffer`` holds records in a bounded in-memory buffer and hands
+them to a flush coroutine in batches, once ``max_batch`` records are waiting
+or the oldest has waited ``max_delay_ms``. With ``ack="enqueue"`` callers
+return as soon as their record is buffered, so a crash loses whatever has not
+been flushed yet; with ``ack="flush"`` they wait for the batch carrying their
+record and see its error. Enqueueing waits while the buffer is full, so a
+slow database pushes back on writers instead of growing memory.
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional
+
+ACK_MODES = ("enqueue", "flush")
+
+
+@dataclass
+class WriteBehindConfig:
+    """Batch thresholds, buffer bound and acknowledgement mode"""
+
+    enabled: bool = False
+    max_batch: int = 500
+    max_delay_ms: float = 50.0
+    capacity: int = 10000
+    # "enqueue" acknowledges buffered records, "flush" written ones
+    ack: str = "enqueue"
+    # Retries of a failed batch before it is dropped; "flush" mode never
+    # retries since the callers see the error
+    max_retries: int = 3
+    retry_delay_ms: float = 100.0
+
+    def __post_init__(self):
+        if self.ack not in ACK_MODES:
+            raise ValueError(f"ack must be one of {ACK_MODES}, got {self.ack!r}")
+        if self.max_batch < 1 or self.capacity < self.max_batch:
+            raise ValueError("need 1 <= max_batch <= capacity")
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "WriteBehindConfig":
+        """Build from a ``write_behind`` config section"""
+        defaults = cls()
+        return cls(
+            enabled=config.get("enabled", defaults.enabled),
+            max_batch=config.get("max_batch", defaults.max_batch),
+            max_delay_ms=config.get("max_delay_ms", defaults.max_delay_ms),
+            capacity=config.get("capacity", defaults.capacity),
+            ack=config.get("ack", defaults.ack),
+            max_retries=config.get("max_retries", defaults.max_retries),
+            retry_delay_ms=config.get("retry_delay_ms", defaults.retry_delay_ms),
+        )
+
+
+class _Entry:
+    __slots__ = ("record", "enqueued_at", "future")
+
+    def __init__(self, record: Any, enqueued_at: float, future):
+        self.record = record
+        self.enqueued_at = enqueued_at
+        self.future = future
+
+
+class WriteBehindBuffer:
+    """Bounded buffer flushed in batches by a background task
+
+    The task starts on the first ``put`` and is bound to that event loop;
+    a ``put`` from a different loop starts a new one. ``close`` drains the
+    buffer before returning.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[Any]], Awaitable[None]],
+        config: Optional[WriteBehindConfig] = None,
+    ):
+        self.config = config or WriteBehindConfig(enabled=True)
+        self._flush = flush
+        self._pending: Deque[_Entry] = deque()
+        self._writing: List[_Entry] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._closing = False
+        self._flush_waiters = 0
+
+        self.enqueued = 0
+        self.completed = 0
+        self.flushes = 0
+        self.flushed = 0
+        self.failures = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.last_error: Optional[str] = None
+        self._last_flush_size = 0
+        self._max_flush_size = 0
+        self._total_flush_ms = 0.0
+        self._last_lag_ms = 0.0
+        self._max_lag_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def buffered(self) -> List[Any]:
+        """Records not yet written, oldest first, including the batch in flight
+
+        Readers can merge these with what the database returns instead of
+        flushing first; a record may appear here and in the database while
+        its batch commits.
+        """
+        return [entry.record for entry in self._writing] + [
+            entry.record for entry in self._pending
+        ]
+
+    async def put(self, record: Any) -> None:
+        """Buffer a record, waiting for space; in "flush" mode, for its write"""
+        self._start()
+        if len(self._pending) >= self.config.capacity:
+            self.blocked += 1
+            while len(self._pending) >= self.config.capacity:
+                self._space.clear()
+                await self._space.wait()
+
+        future = self._loop.create_future() if self.config.ack == "flush" else None
+        self._pending.append(_Entry(record, time.monotonic(), future))
+        self.enqueued += 1
+        # Wake the flusher to start the delay timer or write a full batch
+        if len(self._pending) == 1 or len(self._pending) >= self.config.max_batch:
+            self._wake.set()
+        if future is not None:
+            await future
+
+    async def flush(self) -> None:
+        """Wait until every record buffered so far is written or dropped"""
+        if self.completed >= self.enqueued:
+            return
+        self._start()
+        target = self.enqueued
+        self._flush_waiters += 1
+        self._wake.set()
+        try:
+            async with self._progress:
+                await self._progress.wait_for(lambda: self.completed >= target)
+        finally:
+            self._flush_waiters -= 1
+
+    async def close(self) -> None:
+        """Flush everything buffered and stop the background task"""
+        if self._task is None or self._task.done():
+            return
+        self._closing = True
+        self._wake.set()
+        try:
+            await self._task
+        finally:
+            self._closing = False
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get write-behind statistics"""
+        lag_ms = (
+            (time.monotonic() - self._pending[0].enqueued_at) * 1000
+            if self._pending
+            else 0.0
+        )
+        return {
+            "enabled": True,
+            "ack": self.config.ack,
+            "buffered": len(self._pending),
+            "capacity": self.config.capacity,
+            "oldest_buffered_ms": lag_ms,
+            "enqueued": self.enqueued,
+            "flushes": self.flushes,
+            "flushed": self.flushed,
+            "last_flush_size": self._last_flush_size,
+            "max_flush_size": self._max_flush_size,
+            "avg_flush_size": self.flushed / self.flushes if self.flushes else 0.0,
+            "avg_flush_ms": (
+                self._total_flush_ms / self.flushes if self.flushes else 0.0
+            ),
+            "last_lag_ms": self._last_lag_ms,
+            "max_lag_ms": self._max_lag_ms,
+            "failures": self.failures,
+            "dropped": self.dropped,
+            "blocked": self.blocked,
+            "last_error": self.last_error,
+        }
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._task is not None and not self._task.done():
+            return
+        if self._loop is not loop:
+            self._loop = loop
+            self._wake = asyncio.Event()
+            self._space = asyncio.Event()
+            self._progress = asyncio.Condition()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        config = self.config
+        while True:
+            if not self._pending:
+                if self._closing:
+                    return
+                self._wake.clear()
+                await self._wake.wait()
+                continue
+
+            wait = config.max_delay_ms / 1000 - (
+                time.monotonic() - self._pending[0].enqueued_at
+            )
+            if (
+                wait > 0
+                and len(self._pending) < config.max_batch
+                and not self._closing
+                and not self._flush_waiters
+            ):
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), wait)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            size = min(config.max_batch, len(self._pending))
+            batch = [self._pending.popleft() for _ in range(size)]
+            self._space.set()
+            self._writing = batch
+            try:
+                await self._write(batch)
+            finally:
+                self._writing = []
+
+    async def _write(self, batch: List[_Entry]) -> None:
+        records = [entry.record for entry in batch]
+        attempts = 0
+        while True:
+            started = time.monotonic()
+            try:
+                await self._flush(records)
+                break
+            except Exception as e:
+                self.failures += 1
+                self.last_error = str(e)
+                if self.config.ack == "enqueue" and attempts < self.config.max_retries:
+                    attempts += 1
+                    await asyncio.sleep(self.config.retry_delay_ms / 1000)
+                    continue
+                if self.config.ack == "enqueue":
+                    self.dropped += len(batch)
+                for entry in batch:
+                    if entry.future is not None and not entry.future.done():
+                        entry.future.set_exception(e)
+                await self._completed(len(batch))
+                return
+
+        now = time.monotonic()
+        lag_ms = (now - batch[0].enqueued_at) * 1000
+        self.flushes += 1
+        self.flushed += len(batch)
+        self._last_flush_size = len(batch)
+        self._max_flush_size = max(self._max_flush_size, len(batch))
+        self._total_flush_ms += (now - started) * 1000
+        self._last_lag_ms = lag_ms
+        self._max_lag_ms = max(self._max_lag_ms, lag_ms)
+        for entry in batch:
+            if entry.future is not None and not entry.future.done():
+                entry.future.set_result(None)
+        await self._completed(len(batch))
+
+    async def _completed(self, count: int) -> None:
+        self.completed += count
+        async with self._progress:
+            self._progress.notify_all()
@@ -0,0 +1,333 @@
+"""
+Ahead-of-time compilation artifacts for decision functions
+
+Stores the constraint-check verdict and the marshalled code object for
+transpiled or hand-written decision function source on disk, so process start
+and deploy can load precompiled functions without re-parsing or re-checking.
+"""
+
+import hashlib
+import importlib.util
+import json
+import marshal
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from types import CodeType
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .constraints import (
+    ConstraintViolation,
+    ConstraintViolationType,
+    DFConstraintChecker,
+    DSLTranspiler,
+)
+
+# Bump when the artifact file layout changes
+ARTIFACT_FORMAT = 1
+ARTIFACT_SUFFIX = ".artifact"
+
+
+@dataclass(frozen=True)
+class CompiledArtifact:
+    """Checked and compiled decision function source"""
+
+    key: str
+    source: str
+    filename: str
+    violations: Tuple[ConstraintViolation, ...]
+    code: Optional[CodeType]  # None when the source does not compile
+
+    @property
+    def error_violations(self) -> Tuple[ConstraintViolation, ...]:
+        """Violations that prevent the function from being compiled"""
+        return tuple(v for v in self.violations if v.severity == "error")
+
+
+class ArtifactCache:
+    """On-disk cache of compiled decision function artifacts
+
+    Artifacts are keyed by the SHA-256 of the source (or canonical YAML rules)
+    together with a fingerprint of everything that can change the result: the
+    artifact format, the interpreter's bytecode magic number, the constraint
+    checker and, for YAML, the transpiler version. Upgrading any of them
+    changes every key, so stale artifacts are never read; ``prune`` removes
+    them from disk.
+
+    Each file is a JSON header line followed by the marshalled code object.
+    The header repeats the key and fingerprint and carries a digest of the
+    payload; a file that fails any of these checks is treated as a miss and
+    deleted. Files are written to a temporary name and renamed into place, so
+    concurrent readers never see a partial artifact.
+
+    The most recently used ``max_memory_entries`` artifacts are also kept in
+    memory; older ones are read back from disk when needed.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_memory_entries: int = 256):
+        if max_memory_entries < 1:
+            raise ValueError("max_memory_entries must be at least 1")
+        self.directory = Path(directory)
+        self.max_memory_entries = max_memory_entries
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fingerprint = hashlib.sha256(
+            "|".join(
+                [
+                    str(ARTIFACT_FORMAT),
+                    importlib.util.MAGIC_NUMBER.hex(),
+                    DFConstraintChecker.fingerprint(),
+                ]
+            ).encode()
+        ).hexdigest()[:16]
+        self._memory: "OrderedDict[str, CompiledArtifact]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.invalid = 0
+        self.write_errors = 0
+
+    def source_key(self, source: str, filename: str) -> str:
+        """Key for decision function source compiled under a filename"""
+        digest = hashlib.sha256()
+        for part in (self.fingerprint, "source", filename, source):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def yaml_key(self, yaml_rules: Dict[str, Any]) -> str:
+        """Key for DSL rules transpiled by the current transpiler"""
+        canonical = json.dumps(
+            yaml_rules, sort_keys=True, separators=(",", ":"), default=str
+        )
+        digest = hashlib.sha256()
+        for part in (
+            self.fingerprint,
+            "yaml",
+            str(DSLTranspiler.VERSION),
+            canonical,
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def compile_source(self, source: str, filename: str) -> CompiledArtifact:
+        """Return the artifact for source, checking and compiling on a miss"""
+        key = self.source_key(source, filename)
+        artifact = self.get(key)
+        if artifact is None or artifact.source != source:
+            artifact = self._build(key, source, filename)
+            self.put(artifact)
+        return artifact
+
+    def compile_yaml(
+        self,
+        yaml_rules: Dict[str, Any],
+        transpiler: Optional[DSLTranspiler] = None,
+    ) -> CompiledArtifact:
+        """Return the artifact for DSL rules, transpiling on a miss"""
+        key = self.yaml_key(yaml_rules)
+        artifact = self.get(key)
+        if artifact is None:
+            source = (transpiler or DSLTranspiler()).transpile_yaml_rules(yaml_rules)
+            filename = f"<{yaml_rules.get('name', 'decision_function')}>"
+            artifact = self._build(key, source, filename)
+            self.put(artifact)
+            # Later loads of the same source by text share the artifact
+            self.put(
+                CompiledArtifact(
+                    key=self.source_key(source, filename),
+                    source=source,
+                    filename=filename,
+                    violations=artifact.violations,
+                    code=artifact.code,
+                )
+            )
+        return artifact
+
+    def get(self, key: str) -> Optional[CompiledArtifact]:
+        """Load an artifact by key, or None if absent, stale or corrupt"""
+        with self._lock:
+            artifact = self._memory.get(key)
+            if artifact is not None:
+                self._memory.move_to_end(key)
+        if artifact is None:
+            artifact = self._read(key)
+            if artifact is not None:
+                self._remember(artifact)
+
+        with self._lock:
+            if artifact is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return artifact
+
+    def put(self, artifact: CompiledArtifact) -> None:
+        """Write an artifact to disk
+
+        The artifact is also kept in memory while recently used. Write failures
+        are counted, not raised: the cache is an optimization and the caller
+        already holds the compiled result.
+        """
+        header = {
+            "format": ARTIFACT_FORMAT,
+            "fingerprint": self.fingerprint,
+            "key": artifact.key,
+            "filename": artifact.filename,
+            "source": artifact.source,
+            "violations": [v.to_dict() for v in artifact.violations],
+        }
+        payload = marshal.dumps(artifact.code) if artifact.code is not None else b""
+        header["payload_sha256"] = hashlib.sha256(payload).hexdigest()
+
+        self._remember(artifact)
+
+        path = self._path(artifact.key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(json.dumps(header).encode() + b"\n")
+                    f.write(payload)
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+        except OSError:
+            with self._lock:
+                self.write_errors += 1
+            return
+
+        with self._lock:
+            self.stores += 1
+
+    def invalidate(self, key: str) -> bool:
+        """Remove one artifact; returns whether it existed on disk"""
+        with self._lock:
+            self._memory.pop(key, None)
+        try:
+            self._path(key).unlink()
+            return True
+        except FileNotFoundError:
+            return False
+
+    def prune(self) -> int:
+        """Delete artifacts written under another fingerprint or unreadable"""
+        removed = 0
+        for path in self.directory.glob(f"*/*{ARTIFACT_SUFFIX}"):
+            header = self._read_header(path)
+            if header is None or header.get("fingerprint") != self.fingerprint:
+                path.unlink(missing_ok=True)
+                removed += 1
+        for path in self.directory.glob("*/*.tmp"):
+            # Left behind by writers that died before the rename
+            path.unlink(missing_ok=True)
+        return removed
+
+    def clear(self) -> None:
+        """Delete every artifact"""
+        with self._lock:
+            self._memory.clear()
+        for path in self.directory.glob(f"*/*{ARTIFACT_SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "directory": str(self.directory),
+            "fingerprint": self.fingerprint,
+            "loaded": len(self._memory),
+            "max_memory_entries": self.max_memory_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "invalid": self.invalid,
+            "write_errors": self.write_errors,
+        }
+
+    def _remember(self, artifact: CompiledArtifact) -> None:
+        """Keep an artifact in memory, evicting the least recently used"""
+        with self._lock:
+            self._memory[artifact.key] = artifact
+            self._memory.move_to_end(artifact.key)
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _build(self, key: str, source: str, filename: str) -> CompiledArtifact:
+        """Check and compile source"""
+        violations = tuple(DFConstraintChecker().check_function(source))
+        try:
+            code = compile(source, filename, "exec")
+        except (SyntaxError, ValueError):
+            code = None
+        return CompiledArtifact(
+            key=key,
+            source=source,
+            filename=filename,
+            violations=violations,
+            code=code,
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}{ARTIFACT_SUFFIX}"
+
+    def _read_header(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "rb") as f:
+                return json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+
+    def _read(self, key: str) -> Optional[CompiledArtifact]:
+        """Read and verify an artifact file, deleting it if it is bad"""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+
+        try:
+            line, _, payload = data.partition(b"\n")
+            header = json.loads(line)
+            if (
+                header.get("format") != ARTIFACT_FORMAT
+                or header.get("fingerprint") != self.fingerprint
+                or header.get("key") != key
+                or header.get("payload_sha256") != hashlib.sha256(payload).hexdigest()
+            ):
+                raise ValueError("artifact header does not match")
+            code = marshal.loads(payload) if payload else None
+            if code is not None and not isinstance(code, CodeType):
+                raise ValueError("artifact payload is not a code object")
+            violations = tuple(
+                ConstraintViolation(
+                    violation_type=ConstraintViolationType(v["violation_type"]),
+                    line_number=v["line_number"],
+                    code_snippet=v["code_snippet"],
+                    message=v["message"],
+                    severity=v["severity"],
+                )
+                for v in header["violations"]
+            )
+            artifact = CompiledArtifact(
+                key=key,
+                source=header["source"],
+                filename=header["filename"],
+                violations=violations,
+                code=code,
+            )
+        except (ValueError, KeyError, TypeError, AttributeError, EOFError):
+            with self._lock:
+                self.invalid += 1
+            path.unlink(missing_ok=True)
+            return None
+
+        return artifact
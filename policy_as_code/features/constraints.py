@@ -4,12 +4,29 @@ Formal DSL constraints and banned side-effects for auditable functions
 """
 
 import ast
+import hashlib
 import inspect
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set, Union
-
-from .errors import DecisionLayerError
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+from ..core.errors import DecisionLayerError
 
 
 class ConstraintViolationType(str, Enum):
@@ -59,9 +76,168 @@ class DeterminismError(DecisionLayerError):
         self.violations = violations or []
 
 
+class VerdictCache:
+    """LRU cache of constraint-check verdicts keyed by source hash"""
+
+    def __init__(self, max_entries: int = 4096):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[ConstraintViolation, ...]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def hash_source(code: str) -> str:
+        """Hash function source code"""
+        return hashlib.sha256(code.encode()).hexdigest()
+
+    def get(self, code_hash: str) -> Optional[Tuple[ConstraintViolation, ...]]:
+        """Return the cached verdict for a source hash, if present"""
+        with self._lock:
+            verdict = self._entries.get(code_hash)
+            if verdict is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(code_hash)
+            self.hits += 1
+            return verdict
+
+    def put(self, code_hash: str, verdict: Tuple[ConstraintViolation, ...]) -> None:
+        """Cache a verdict, evicting the least recently used"""
+        with self._lock:
+            self._entries[code_hash] = verdict
+            self._entries.move_to_end(code_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached verdicts"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class _ConstraintVisitor(ast.NodeVisitor):
+    """Collects every constraint violation in one walk of the tree
+
+    Violations are grouped by check and returned in the order the checks
+    have always been reported: imports, calls, side effects, time.
+    """
+
+    TIME_FUNCTIONS = {"time.time", "datetime.now", "datetime.utcnow"}
+    FILE_FUNCTIONS = {"open", "file"}
+
+    def __init__(self, checker: "DFConstraintChecker"):
+        self.checker = checker
+        self.imports: List[ConstraintViolation] = []
+        self.calls: List[ConstraintViolation] = []
+        self.side_effects: List[ConstraintViolation] = []
+        self.time_dependencies: List[ConstraintViolation] = []
+
+    def violations(self) -> List[ConstraintViolation]:
+        return self.imports + self.calls + self.side_effects + self.time_dependencies
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            if alias.name in self.checker.BANNED_IMPORTS:
+                self.imports.append(
+                    ConstraintViolation(
+                        violation_type=ConstraintViolationType.BANNED_IMPORT,
+                        line_number=node.lineno,
+                        code_snippet=f"import {alias.name}",
+                        message=f"Banned import: {alias.name}",
+                        severity="error",
+                    )
+                )
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module and node.module in self.checker.BANNED_IMPORTS:
+            self.imports.append(
+                ConstraintViolation(
+                    violation_type=ConstraintViolationType.BANNED_IMPORT,
+                    line_number=node.lineno,
+                    code_snippet=f"from {node.module} import ...",
+                    message=f"Banned import from: {node.module}",
+                    severity="error",
+                )
+            )
+
+    def visit_Call(self, node: ast.Call) -> None:
+        func_name = self.checker._get_function_name(node.func)
+        banned = func_name in self.checker.BANNED_FUNCTIONS
+        file_io = func_name in self.FILE_FUNCTIONS
+        time_dependent = func_name in self.TIME_FUNCTIONS
+
+        if banned or file_io or time_dependent:
+            snippet = ast.unparse(node)
+            if banned:
+                self.calls.append(
+                    ConstraintViolation(
+                        violation_type=ConstraintViolationType.EXTERNAL_CALL,
+                        line_number=node.lineno,
+                        code_snippet=snippet,
+                        message=f"Banned function call: {func_name}",
+                        severity="error",
+                    )
+                )
+            if file_io:
+                self.side_effects.append(
+                    ConstraintViolation(
+                        violation_type=ConstraintViolationType.FILE_IO,
+                        line_number=node.lineno,
+                        code_snippet=snippet,
+                        message="File I/O operations not allowed",
+                        severity="error",
+                    )
+                )
+            if time_dependent:
+                self.time_dependencies.append(
+                    ConstraintViolation(
+                        violation_type=ConstraintViolationType.TIME_DEPENDENT,
+                        line_number=node.lineno,
+                        code_snippet=snippet,
+                        message="Time-dependent operations not allowed",
+                        severity="error",
+                    )
+                )
+        self.generic_visit(node)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        for target in node.targets:
+            if isinstance(target, ast.Attribute):
+                self.side_effects.append(
+                    ConstraintViolation(
+                        violation_type=ConstraintViolationType.SIDE_EFFECTS,
+                        line_number=node.lineno,
+                        code_snippet=ast.unparse(node),
+                        message="Attribute assignment may cause side effects",
+                        severity="warning",
+                    )
+                )
+        self.generic_visit(node)
+
+
 class DFConstraintChecker:
     """Static analysis checker for decision function constraints"""
 
+    # Bump when the checks change in a way that can alter a verdict
+    VERSION = 2
+
     # Banned imports that could cause non-deterministic behavior
     BANNED_IMPORTS = {
         "random",
@@ -128,25 +304,47 @@ class DFConstraintChecker:
         "dir",
     }
 
+    # Shared by all instances; see __init_subclass__
+    verdicts = VerdictCache()
+
     def __init__(self):
         self.violations: List[ConstraintViolation] = []
 
+    @classmethod
+    def fingerprint(cls) -> str:
+        """Hash of the checker version and its banned names
+
+        Cached verdicts are only valid for the checker that produced them.
+        """
+        parts = [str(cls.VERSION), *sorted(cls.BANNED_IMPORTS)]
+        parts += ["|", *sorted(cls.BANNED_FUNCTIONS)]
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()[:16]
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        # Subclasses may ban different names, so they keep their own verdicts
+        cls.verdicts = VerdictCache()
+
     def check_function(self, function_code: str) -> List[ConstraintViolation]:
-        """Check a function for constraint violations"""
-        self.violations = []
+        """Check a function for constraint violations
+
+        Verdicts are cached by source hash, so re-validating unchanged code
+        does not parse it again.
+        """
+        code_hash = VerdictCache.hash_source(function_code)
+        cached = self.verdicts.get(code_hash)
+        if cached is None:
+            cached = tuple(self._check(function_code))
+            self.verdicts.put(code_hash, cached)
+        self.violations = list(cached)
+        return self.violations
 
+    def _check(self, function_code: str) -> List[ConstraintViolation]:
+        """Parse and check source in a single pass over the tree"""
         try:
-            # Parse the function code
             tree = ast.parse(function_code)
-
-            # Check for violations
-            self._check_imports(tree)
-            self._check_function_calls(tree)
-            self._check_side_effects(tree)
-            self._check_time_dependencies(tree)
-
         except SyntaxError as e:
-            self.violations.append(
+            return [
                 ConstraintViolation(
                     violation_type=ConstraintViolationType.SIDE_EFFECTS,
                     line_number=e.lineno or 0,
@@ -154,100 +352,11 @@ class DFConstraintChecker:
                     message=f"Syntax error: {str(e)}",
                     severity="error",
                 )
-            )
-
-        return self.violations
-
-    def _check_imports(self, tree: ast.AST) -> None:
-        """Check for banned imports"""
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    if alias.name in self.BANNED_IMPORTS:
-                        self.violations.append(
-                            ConstraintViolation(
-                                violation_type=ConstraintViolationType.BANNED_IMPORT,
-                                line_number=node.lineno,
-                                code_snippet=f"import {alias.name}",
-                                message=f"Banned import: {alias.name}",
-                                severity="error",
-                            )
-                        )
-
-            elif isinstance(node, ast.ImportFrom):
-                if node.module and node.module in self.BANNED_IMPORTS:
-                    self.violations.append(
-                        ConstraintViolation(
-                            violation_type=ConstraintViolationType.BANNED_IMPORT,
-                            line_number=node.lineno,
-                            code_snippet=f"from {node.module} import ...",
-                            message=f"Banned import from: {node.module}",
-                            severity="error",
-                        )
-                    )
-
-    def _check_function_calls(self, tree: ast.AST) -> None:
-        """Check for banned function calls"""
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                func_name = self._get_function_name(node.func)
-                if func_name in self.BANNED_FUNCTIONS:
-                    self.violations.append(
-                        ConstraintViolation(
-                            violation_type=ConstraintViolationType.EXTERNAL_CALL,
-                            line_number=node.lineno,
-                            code_snippet=ast.unparse(node),
-                            message=f"Banned function call: {func_name}",
-                            severity="error",
-                        )
-                    )
+            ]
 
-    def _check_side_effects(self, tree: ast.AST) -> None:
-        """Check for side effects"""
-        for node in ast.walk(tree):
-            # Check for file operations
-            if isinstance(node, ast.Call):
-                func_name = self._get_function_name(node.func)
-                if func_name in {"open", "file"}:
-                    self.violations.append(
-                        ConstraintViolation(
-                            violation_type=ConstraintViolationType.FILE_IO,
-                            line_number=node.lineno,
-                            code_snippet=ast.unparse(node),
-                            message="File I/O operations not allowed",
-                            severity="error",
-                        )
-                    )
-
-            # Check for attribute assignment (potential side effects)
-            elif isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Attribute):
-                        self.violations.append(
-                            ConstraintViolation(
-                                violation_type=ConstraintViolationType.SIDE_EFFECTS,
-                                line_number=node.lineno,
-                                code_snippet=ast.unparse(node),
-                                message="Attribute assignment may cause side effects",
-                                severity="warning",
-                            )
-                        )
-
-    def _check_time_dependencies(self, tree: ast.AST) -> None:
-        """Check for time-dependent operations"""
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                func_name = self._get_function_name(node.func)
-                if func_name in {"time.time", "datetime.now", "datetime.utcnow"}:
-                    self.violations.append(
-                        ConstraintViolation(
-                            violation_type=ConstraintViolationType.TIME_DEPENDENT,
-                            line_number=node.lineno,
-                            code_snippet=ast.unparse(node),
-                            message="Time-dependent operations not allowed",
-                            severity="error",
-                        )
-                    )
+        visitor = _ConstraintVisitor(self)
+        visitor.visit(tree)
+        return visitor.violations()
 
     def _get_function_name(self, node: ast.AST) -> str:
         """Extract function name from AST node"""
@@ -286,12 +395,34 @@ def df_pure(func: Callable) -> Callable:
 class DeterministicFunction:
     """Wrapper for deterministic function execution"""
 
-    def __init__(self, function_code: str, function_name: str = "decision_function"):
+    def __init__(
+        self,
+        function_code: str,
+        function_name: str = "decision_function",
+        artifact_cache: Optional[Any] = None,
+    ):
         self.function_code = function_code
         self.function_name = function_name
         self.checker = DFConstraintChecker()
         self.compiled_function: Optional[Callable] = None
         self.violations: List[ConstraintViolation] = []
+        # Optional ArtifactCache holding precompiled code and verdicts
+        self.artifact_cache = artifact_cache
+
+    @classmethod
+    def from_yaml(
+        cls,
+        yaml_rules: Dict[str, Any],
+        artifact_cache: Optional[Any] = None,
+        transpiler: Optional["DSLTranspiler"] = None,
+    ) -> "DeterministicFunction":
+        """Create a function from DSL rules, reusing a cached transpilation"""
+        function_name = yaml_rules.get("name", "decision_function")
+        if artifact_cache is not None:
+            artifact = artifact_cache.compile_yaml(yaml_rules, transpiler)
+            return cls(artifact.source, function_name, artifact_cache)
+        source = (transpiler or DSLTranspiler()).transpile_yaml_rules(yaml_rules)
+        return cls(source, function_name)
 
     def validate(self) -> List[ConstraintViolation]:
         """Validate the function for determinism constraints"""
@@ -299,9 +430,21 @@ class DeterministicFunction:
         return self.violations
 
     def compile(self) -> None:
-        """Compile the function if valid"""
-        violations = self.validate()
-        error_violations = [v for v in violations if v.severity == "error"]
+        """Compile the function if valid
+
+        With an artifact cache, the constraint verdict and code object are
+        loaded from disk when this source has been compiled before.
+        """
+        compiled_code = None
+        if self.artifact_cache is not None:
+            artifact = self.artifact_cache.compile_source(
+                self.function_code, f"<{self.function_name}>"
+            )
+            self.violations = list(artifact.violations)
+            compiled_code = artifact.code
+        else:
+            self.validate()
+        error_violations = [v for v in self.violations if v.severity == "error"]
 
         if error_violations:
             raise DeterminismError(
@@ -312,9 +455,10 @@ class DeterministicFunction:
 
         try:
             # Compile the function
-            compiled_code = compile(
-                self.function_code, f"<{self.function_name}>", "exec"
-            )
+            if compiled_code is None:
+                compiled_code = compile(
+                    self.function_code, f"<{self.function_name}>", "exec"
+                )
 
             # Create a namespace for the function
             namespace = {
@@ -399,6 +543,9 @@ class DeterministicFunction:
 class DSLTranspiler:
     """Simple DSL transpiler for rule-based decision functions"""
 
+    # Bump when the generated source changes for the same rules
+    VERSION = 1
+
     def __init__(self):
         self.rule_templates = {
             "if_then": self._transpile_if_then,
@@ -474,6 +621,70 @@ def create_dsl_transpiler() -> DSLTranspiler:
     return DSLTranspiler()
 
 
+def _check_sources(
+    checker_class: Type[DFConstraintChecker], sources: List[str]
+) -> List[Tuple[ConstraintViolation, ...]]:
+    """Worker entry point for check_functions"""
+    checker = checker_class()
+    return [tuple(checker._check(source)) for source in sources]
+
+
+def check_functions(
+    functions: Mapping[str, str],
+    max_workers: Optional[int] = None,
+    checker_class: Type[DFConstraintChecker] = DFConstraintChecker,
+    min_parallel: int = 64,
+    mp_start_method: Optional[str] = None,
+) -> Dict[str, List[ConstraintViolation]]:
+    """Check a registry of decision functions, keyed by name
+
+    Identical sources are checked once and cached verdicts are reused. The
+    remaining sources are spread over a process pool when there are at least
+    ``min_parallel`` of them; below that, starting the pool costs more than
+    it saves. Verdicts computed by workers are added to the checker's cache.
+    """
+    hashes = {name: VerdictCache.hash_source(code) for name, code in functions.items()}
+    verdicts: Dict[str, Tuple[ConstraintViolation, ...]] = {}
+    pending: Dict[str, str] = {}  # source hash -> source
+    for name, code in functions.items():
+        code_hash = hashes[name]
+        if code_hash in verdicts or code_hash in pending:
+            continue
+        cached = checker_class.verdicts.get(code_hash)
+        if cached is None:
+            pending[code_hash] = code
+        else:
+            verdicts[code_hash] = cached
+
+    sources = list(pending.values())
+    workers = min(max_workers or os.cpu_count() or 1, len(sources))
+    if workers > 1 and len(sources) >= min_parallel:
+        # A few chunks per worker keeps them busy when sources vary in size
+        chunk_size = -(-len(sources) // (workers * 4))
+        chunks = [
+            sources[i : i + chunk_size] for i in range(0, len(sources), chunk_size)
+        ]
+        mp_context = (
+            multiprocessing.get_context(mp_start_method) if mp_start_method else None
+        )
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as pool:
+            results = [
+                verdict
+                for part in pool.map(
+                    _check_sources, [checker_class] * len(chunks), chunks
+                )
+                for verdict in part
+            ]
+    else:
+        results = _check_sources(checker_class, sources)
+
+    for code_hash, verdict in zip(pending, results):
+        checker_class.verdicts.put(code_hash, verdict)
+        verdicts[code_hash] = verdict
+
+    return {name: list(verdicts[hashes[name]]) for name in functions}
+
+
 # Example DSL rule definition
 EXAMPLE_DSL_RULES = {
     "name": "approval_decision",
@@ -3,9 +3,11 @@ Formal DSL Grammar with Conflict Detection
 Production-grade rule DSL with priorities, static analysis, and conflict detection
 """
 
+import heapq
+from collections import Counter
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
 
 
 class RuleType(str, Enum):
@@ -337,15 +339,368 @@ class DSLGrammar:
         return errors
 
 
+_NEG_INF = (float("-inf"), False)
+_POS_INF = (float("inf"), False)
+
+_NEGATED_OPERATORS = {
+    Operator.EQ: Operator.NE,
+    Operator.NE: Operator.EQ,
+    Operator.IN: Operator.NOT_IN,
+    Operator.NOT_IN: Operator.IN,
+    Operator.LT: Operator.GE,
+    Operator.LE: Operator.GT,
+    Operator.GT: Operator.LE,
+    Operator.GE: Operator.LT,
+}
+
+
+def is_number(value: Any) -> bool:
+    """Whether a value is an int or float other than NaN"""
+    return isinstance(value, (int, float)) and value == value
+
+
+def frozen_values(value: Any) -> Any:
+    """Freeze an in/not_in operand into a set, or a tuple if unhashable"""
+    items = value if isinstance(value, (list, tuple, set, frozenset)) else [value]
+    try:
+        return frozenset(items)
+    except TypeError:
+        return tuple(items)
+
+
+@dataclass(frozen=True)
+class FieldSpace:
+    """The values of one field that satisfy a rule's conditions on it
+
+    Either a finite set of ``values``, or a (possibly unbounded) numeric
+    interval when ``numeric``, or any value; ``excluded`` values are removed
+    from the last two. ``opaque`` conditions (contains, regex, ...) are not
+    modelled and are assumed satisfiable. Numbers are treated as reals, so
+    NaN inputs are ignored.
+    """
+
+    values: Optional[frozenset] = None
+    lower: Tuple[Any, bool] = _NEG_INF  # (bound, inclusive)
+    upper: Tuple[Any, bool] = _POS_INF
+    numeric: bool = False
+    excluded: frozenset = frozenset()
+    opaque: Tuple[RuleCondition, ...] = ()
+
+    @classmethod
+    def from_conditions(cls, conditions: List[RuleCondition]) -> "FieldSpace":
+        """Space of a conjunction of conditions on the same field"""
+        space = cls()
+        for condition in conditions:
+            space = space.intersect(cls._from_condition(condition))
+        return space
+
+    @classmethod
+    def _from_condition(cls, condition: RuleCondition) -> "FieldSpace":
+        op = condition.operator
+        if condition.negated:
+            op = _NEGATED_OPERATORS.get(op, op)
+        value = condition.value
+
+        if op in (Operator.EQ, Operator.IN, Operator.NE, Operator.NOT_IN):
+            members = (
+                frozen_values([value])
+                if op in (Operator.EQ, Operator.NE)
+                else frozen_values(value)
+            )
+            if isinstance(members, frozenset):
+                if op in (Operator.EQ, Operator.IN):
+                    return cls(values=members)
+                return cls(excluded=members)
+        elif op in _NEGATED_OPERATORS and is_number(value):
+            if op == Operator.LT:
+                return cls(upper=(value, False), numeric=True)
+            if op == Operator.LE:
+                return cls(upper=(value, True), numeric=True)
+            if op == Operator.GT:
+                return cls(lower=(value, False), numeric=True)
+            return cls(lower=(value, True), numeric=True)
+        return cls(opaque=(condition,))
+
+    def _in_range(self, value: Any) -> bool:
+        """Whether a single value lies inside the interval and exclusions"""
+        if value in self.excluded:
+            return False
+        if not self.numeric:
+            return True
+        if not is_number(value):
+            return False
+        (lo, lo_inclusive), (hi, hi_inclusive) = self.lower, self.upper
+        if value < lo or (value == lo and not lo_inclusive):
+            return False
+        return value < hi or (value == hi and hi_inclusive)
+
+    def intersect(self, other: "FieldSpace") -> "FieldSpace":
+        """Values satisfying both spaces"""
+        # On equal bounds the exclusive one is tighter
+        lower = max(self.lower, other.lower, key=lambda b: (b[0], not b[1]))
+        upper = min(self.upper, other.upper)
+        merged = FieldSpace(
+            lower=lower,
+            upper=upper,
+            numeric=self.numeric or other.numeric,
+            excluded=self.excluded | other.excluded,
+            opaque=self.opaque + other.opaque,
+        )
+        if self.values is None and other.values is None:
+            return merged
+        if self.values is None:
+            values = other.values
+        elif other.values is None:
+            values = self.values
+        else:
+            values = self.values & other.values
+        return FieldSpace(
+            values=frozenset(v for v in values if merged._in_range(v)),
+            opaque=merged.opaque,
+        )
+
+    def is_empty(self) -> bool:
+        """Whether no value can satisfy the space"""
+        if self.values is not None:
+            return not self.values
+        if not self.numeric:
+            return False
+        (lo, lo_inclusive), (hi, hi_inclusive) = self.lower, self.upper
+        if lo < hi:
+            return False
+        return lo > hi or not (lo_inclusive and hi_inclusive) or lo in self.excluded
+
+    def contains(self, other: "FieldSpace") -> bool:
+        """Whether every value satisfying a non-empty ``other`` satisfies self"""
+        if any(condition not in other.opaque for condition in self.opaque):
+            return False
+        if self.values is not None:
+            return other.values is not None and other.values <= self.values
+        if other.values is not None:
+            return all(self._in_range(v) for v in other.values)
+        if any(other._in_range(v) for v in self.excluded):
+            return False
+        if not self.numeric:
+            return True
+        return (
+            other.numeric
+            and (other.lower[0], not other.lower[1])
+            >= (self.lower[0], not self.lower[1])
+            and (other.upper[0], other.upper[1]) <= (self.upper[0], self.upper[1])
+        )
+
+
+def condition_spaces(conditions: List[RuleCondition]) -> Dict[str, FieldSpace]:
+    """A conjunction of conditions as one FieldSpace per field"""
+    by_field: Dict[str, List[RuleCondition]] = {}
+    for condition in conditions:
+        by_field.setdefault(condition.field_name, []).append(condition)
+    return {
+        field_name: FieldSpace.from_conditions(conditions)
+        for field_name, conditions in by_field.items()
+    }
+
+
+def _spaces_overlap(a: Dict[str, FieldSpace], b: Dict[str, FieldSpace]) -> bool:
+    return all(
+        not space.intersect(b[field_name]).is_empty()
+        for field_name, space in a.items()
+        if field_name in b
+    )
+
+
+def _spaces_contain(outer: Dict[str, FieldSpace], inner: Dict[str, FieldSpace]) -> bool:
+    return all(
+        field_name in inner and space.contains(inner[field_name])
+        for field_name, space in outer.items()
+    )
+
+
+def _space_kind(space: FieldSpace) -> str:
+    if space.values is not None:
+        return "values"
+    return "numeric" if space.numeric else "open"
+
+
+def _sweep_join(
+    spaces: List[Dict[str, FieldSpace]],
+    field_name: str,
+    left: List[int],
+    right: Optional[List[int]],
+    pairs: Set[Tuple[int, int]],
+) -> None:
+    """Pair rules whose numeric ranges or values on a field intersect
+
+    ``right`` is None for a self-join of ``left``. Ranges are swept by lower
+    bound with a heap of active ranges per side ordered by upper bound.
+    """
+    items = []  # (lower, upper, side, position)
+    for side, positions in enumerate((left, right or [])):
+        for position in positions:
+            space = spaces[position][field_name]
+            if space.values is None:
+                items.append((space.lower, space.upper, side, position))
+                continue
+            for value in space.values:
+                if is_number(value):
+                    items.append(((value, True), (value, True), side, position))
+    # Inclusive lower bounds sort first
+    items.sort(key=lambda item: (item[0][0], not item[0][1]))
+
+    active: Tuple[list, list] = ([], [])
+    for counter, (lower, upper, side, position) in enumerate(items):
+        partner = active[side if right is None else 1 - side]
+        # Drop ranges ending before this one starts
+        while partner and (
+            partner[0][0] < lower[0]
+            or (partner[0][0] == lower[0] and not (partner[0][1][1] and lower[1]))
+        ):
+            heapq.heappop(partner)
+        for _, _, _, other in partner:
+            if other != position:
+                pairs.add((other, position) if other < position else (position, other))
+        heapq.heappush(active[side], (upper[0], upper, counter, position))
+
+
+def _join(
+    spaces: List[Dict[str, FieldSpace]],
+    left: List[int],
+    right: Optional[List[int]],
+    fields: List[Tuple[str, str, str]],
+    pairs: Set[Tuple[int, int]],
+) -> None:
+    """Collect candidate pairs compatible on the given shared fields
+
+    ``fields`` holds (field, left kind, right kind); every rule in a side
+    has that kind on the field. Fields pinned to values on both sides are
+    hash-joined value by value, then one numeric field is swept. Pairs are
+    verified on all fields afterwards.
+    """
+    for i, (field_name, left_kind, right_kind) in enumerate(fields):
+        if left_kind == right_kind == "values":
+            rest = fields[:i] + fields[i + 1 :]
+            left_buckets: Dict[Any, List[int]] = {}
+            for position in left:
+                for value in spaces[position][field_name].values:
+                    left_buckets.setdefault(value, []).append(position)
+            if right is None:
+                for bucket in left_buckets.values():
+                    _join(spaces, bucket, None, rest, pairs)
+                return
+            right_buckets: Dict[Any, List[int]] = {}
+            for position in right:
+                for value in spaces[position][field_name].values:
+                    right_buckets.setdefault(value, []).append(position)
+            for value, bucket in left_buckets.items():
+                if value in right_buckets:
+                    _join(spaces, bucket, right_buckets[value], rest, pairs)
+            return
+
+    # Sweep the numeric field whose ranges are the most varied
+    sweepable = [
+        field_name
+        for field_name, left_kind, right_kind in fields
+        if "open" not in (left_kind, right_kind)
+    ]
+    if sweepable:
+        members = left + (right or [])
+
+        def distinct_ranges(field_name: str) -> int:
+            return len(
+                {
+                    (space.values, space.lower, space.upper)
+                    for space in (spaces[p][field_name] for p in members)
+                }
+            )
+
+        _sweep_join(spaces, max(sweepable, key=distinct_ranges), left, right, pairs)
+        return
+
+    # Nothing to filter on: every pair is a candidate
+    for a_index, a in enumerate(left):
+        for b in right if right is not None else left[a_index + 1 :]:
+            if a != b:
+                pairs.add((a, b) if a < b else (b, a))
+
+
+def _signature_groups(
+    spaces: List[Dict[str, FieldSpace]], positions: Iterable[int]
+) -> Dict[Tuple[Tuple[str, str], ...], List[int]]:
+    groups: Dict[Tuple[Tuple[str, str], ...], List[int]] = {}
+    for position in positions:
+        signature = tuple(
+            sorted(
+                (name, _space_kind(space)) for name, space in spaces[position].items()
+            )
+        )
+        if signature:
+            groups.setdefault(signature, []).append(position)
+    return groups
+
+
+def _overlap_candidates(
+    spaces: List[Dict[str, FieldSpace]], changed: Optional[Set[int]] = None
+) -> Set[Tuple[int, int]]:
+    """Pairs of rules that share a field and may be compatible on all of them
+
+    Rules are grouped by which fields they constrain and how (value set,
+    numeric range or only exclusions). Each pair of groups that shares a
+    field is joined on those fields, so the work grows with the number of
+    candidate pairs rather than with the square of the rule count. With
+    ``changed``, only pairs involving one of those positions are collected.
+    """
+    groups = _signature_groups(spaces, range(len(spaces)))
+    pairs: Set[Tuple[int, int]] = set()
+
+    if changed is not None:
+        for left_signature, left in _signature_groups(spaces, changed).items():
+            left_kinds = dict(left_signature)
+            for right_signature, right in groups.items():
+                shared = [
+                    (name, left_kinds[name], kind)
+                    for name, kind in right_signature
+                    if name in left_kinds
+                ]
+                if shared:
+                    _join(spaces, left, right, shared, pairs)
+        return pairs
+
+    signatures = list(groups)
+    for i, left_signature in enumerate(signatures):
+        left_kinds = dict(left_signature)
+        for right_signature in signatures[i:]:
+            shared = [
+                (name, left_kinds[name], kind)
+                for name, kind in right_signature
+                if name in left_kinds
+            ]
+            if not shared:
+                continue
+            same = right_signature == left_signature
+            _join(
+                spaces,
+                groups[left_signature],
+                None if same else groups[right_signature],
+                shared,
+                pairs,
+            )
+    return pairs
+
+
 class RuleConflictDetector:
     """Detects conflicts between rules"""
 
     def __init__(self):
         self.conflicts: List[RuleConflict] = []
+        self._pairs: Optional[List[Tuple[int, int]]] = None
+        self._enabled: List[DSLRule] = []
+        self._spaces: List[Dict[str, FieldSpace]] = []
+        self._unsatisfiable: Set[int] = set()
 
     def detect_conflicts(self, schema: DSLSchema) -> List[RuleConflict]:
         """Detect all conflicts in a schema"""
         self.conflicts = []
+        self._pairs = None
 
         # Sort rules by priority for analysis
         sorted_rules = sorted(schema.rules, key=lambda r: r.priority, reverse=True)
@@ -361,21 +716,20 @@ class RuleConflictDetector:
         return self.conflicts.copy()
 
     def _detect_overlapping_conditions(self, rules: List[DSLRule]) -> None:
-        """Detect rules with overlapping conditions"""
-        for i, rule1 in enumerate(rules):
-            for j, rule2 in enumerate(rules[i + 1 :], i + 1):
-                if self._conditions_overlap(rule1.conditions, rule2.conditions):
-                    conflict = RuleConflict(
-                        conflict_type=ConflictType.OVERLAPPING_CONDITIONS,
-                        rule_ids=[rule1.rule_id, rule2.rule_id],
-                        message=f"Rules have overlapping conditions: {rule1.rule_id} and {rule2.rule_id}",
-                        severity="warning",
-                        details={
-                            "rule1_conditions": [c.to_dict() for c in rule1.conditions],
-                            "rule2_conditions": [c.to_dict() for c in rule2.conditions],
-                        },
-                    )
-                    self.conflicts.append(conflict)
+        """Detect rules on shared fields that some input satisfies together"""
+        for i, j in self._overlapping_pairs(rules):
+            rule1, rule2 = self._enabled[i], self._enabled[j]
+            conflict = RuleConflict(
+                conflict_type=ConflictType.OVERLAPPING_CONDITIONS,
+                rule_ids=[rule1.rule_id, rule2.rule_id],
+                message=f"Rules have overlapping conditions: {rule1.rule_id} and {rule2.rule_id}",
+                severity="warning",
+                details={
+                    "rule1_conditions": [c.to_dict() for c in rule1.conditions],
+                    "rule2_conditions": [c.to_dict() for c in rule2.conditions],
+                },
+            )
+            self.conflicts.append(conflict)
 
     def _detect_ambiguous_priorities(self, rules: List[DSLRule]) -> None:
         """Detect rules with ambiguous priorities"""
@@ -397,104 +751,169 @@ class RuleConflictDetector:
                 self.conflicts.append(conflict)
 
     def _detect_unreachable_rules(self, rules: List[DSLRule]) -> None:
-        """Detect unreachable rules"""
-        # Rules with lower priority that are always shadowed by higher priority rules
-        for i, rule in enumerate(rules):
-            if i > 0:  # Skip first rule (highest priority)
-                higher_priority_rules = rules[:i]
-                if self._rule_is_shadowed(rule, higher_priority_rules):
-                    conflict = RuleConflict(
-                        conflict_type=ConflictType.UNREACHABLE_RULE,
-                        rule_ids=[rule.rule_id],
-                        message=f"Rule {rule.rule_id} is unreachable due to higher priority rules",
-                        severity="warning",
-                        details={
-                            "shadowing_rules": [
-                                r.rule_id for r in higher_priority_rules
-                            ]
-                        },
-                    )
-                    self.conflicts.append(conflict)
+        """Detect rules that no input can reach"""
+        self._overlapping_pairs(rules)
+        enabled, spaces = self._enabled, self._spaces
+
+        shadowing: Dict[int, List[int]] = {}
+        for i, j in self._pairs:
+            if _spaces_contain(spaces[i], spaces[j]):
+                shadowing.setdefault(j, []).append(i)
+        # A rule without conditions shadows every rule after it
+        catch_all = next(
+            (i for i, rule in enumerate(enabled) if not rule.conditions), None
+        )
+        if catch_all is not None:
+            for j in range(catch_all + 1, len(enabled)):
+                shadowing.setdefault(j, []).insert(0, catch_all)
+
+        for j, rule in enumerate(enabled):
+            if j in self._unsatisfiable:
+                message = f"Rule {rule.rule_id} is unreachable: its conditions contradict each other"
+                shadowing_rules: List[str] = []
+            elif j in shadowing:
+                message = (
+                    f"Rule {rule.rule_id} is unreachable due to higher priority rules"
+                )
+                shadowing_rules = [enabled[i].rule_id for i in sorted(shadowing[j])]
+            else:
+                continue
+            conflict = RuleConflict(
+                conflict_type=ConflictType.UNREACHABLE_RULE,
+                rule_ids=[rule.rule_id],
+                message=message,
+                severity="warning",
+                details={"shadowing_rules": shadowing_rules},
+            )
+            self.conflicts.append(conflict)
+
+    def _overlapping_pairs(self, rules: List[DSLRule]) -> List[Tuple[int, int]]:
+        """Positions in evaluation order of enabled rules that overlap
+
+        Computed once per detect_conflicts call and shared by the overlap
+        and shadowing checks.
+        """
+        if self._pairs is not None:
+            return self._pairs
+        self._enabled = [rule for rule in rules if rule.enabled]
+        self._spaces = [condition_spaces(rule.conditions) for rule in self._enabled]
+        self._unsatisfiable = {
+            i
+            for i, rule_space in enumerate(self._spaces)
+            if any(space.is_empty() for space in rule_space.values())
+        }
+        # Satisfiable rules only, so the candidate sweep skips dead rules
+        live = [
+            space if i not in self._unsatisfiable else {}
+            for i, space in enumerate(self._spaces)
+        ]
+        self._pairs = sorted(
+            (i, j)
+            for i, j in _overlap_candidates(live)
+            if _spaces_overlap(live[i], live[j])
+        )
+        return self._pairs
 
     def _detect_circular_dependencies(self, rules: List[DSLRule]) -> None:
         """Detect circular dependencies between rules"""
-        # This is a simplified check - in practice, you'd need more sophisticated analysis
         for rule in rules:
-            for action in rule.actions:
-                if action.action_type == "set" and action.field_name in [
-                    c.field_name for c in rule.conditions
-                ]:
-                    # Rule sets a field it also conditions on
-                    conflict = RuleConflict(
-                        conflict_type=ConflictType.CIRCULAR_DEPENDENCY,
-                        rule_ids=[rule.rule_id],
-                        message=f"Rule {rule.rule_id} has circular dependency on field {action.field_name}",
-                        severity="error",
-                        details={"field": action.field_name},
-                    )
-                    self.conflicts.append(conflict)
+            self.conflicts.extend(self._circular_dependencies(rule))
 
     def _detect_type_mismatches(
         self, rules: List[DSLRule], input_schema: Dict[str, Any]
     ) -> None:
         """Detect type mismatches between rules and schema"""
         for rule in rules:
-            for condition in rule.conditions:
-                field_type = self._get_field_type(condition.field_name, input_schema)
-                if field_type and not self._is_type_compatible(
-                    condition.value, field_type, condition.operator
-                ):
-                    conflict = RuleConflict(
-                        conflict_type=ConflictType.TYPE_MISMATCH,
-                        rule_ids=[rule.rule_id],
-                        message=f"Type mismatch in rule {rule.rule_id}: field {condition.field_name} expects {field_type}",
-                        severity="error",
-                        details={
-                            "field": condition.field_name,
-                            "expected_type": field_type,
-                            "actual_value": condition.value,
-                        },
-                    )
-                    self.conflicts.append(conflict)
+            self.conflicts.extend(self._type_mismatches(rule, input_schema))
 
     def _detect_missing_fields(
         self, rules: List[DSLRule], input_schema: Dict[str, Any]
     ) -> None:
         """Detect references to missing fields"""
-        schema_fields = set(input_schema.keys())
-
         for rule in rules:
-            for condition in rule.conditions:
-                if condition.field_name not in schema_fields:
-                    conflict = RuleConflict(
-                        conflict_type=ConflictType.MISSING_FIELD,
-                        rule_ids=[rule.rule_id],
-                        message=f"Rule {rule.rule_id} references missing field: {condition.field_name}",
-                        severity="error",
-                        details={"field": condition.field_name},
-                    )
-                    self.conflicts.append(conflict)
+            self.conflicts.extend(self._missing_fields(rule, input_schema))
+
+    def _circular_dependencies(self, rule: DSLRule) -> List[RuleConflict]:
+        """Circular dependency conflicts of one rule"""
+        # This is a simplified check - in practice, you'd need more sophisticated analysis
+        conflicts = []
+        for action in rule.actions:
+            if action.action_type == "set" and action.field_name in [
+                c.field_name for c in rule.conditions
+            ]:
+                # Rule sets a field it also conditions on
+                conflict = RuleConflict(
+                    conflict_type=ConflictType.CIRCULAR_DEPENDENCY,
+                    rule_ids=[rule.rule_id],
+                    message=f"Rule {rule.rule_id} has circular dependency on field {action.field_name}",
+                    severity="error",
+                    details={"field": action.field_name},
+                )
+                conflicts.append(conflict)
+        return conflicts
+
+    def _type_mismatches(
+        self, rule: DSLRule, input_schema: Dict[str, Any]
+    ) -> List[RuleConflict]:
+        """Type mismatch conflicts of one rule"""
+        conflicts = []
+        for condition in rule.conditions:
+            field_type = self._get_field_type(condition.field_name, input_schema)
+            if field_type and not self._is_type_compatible(
+                condition.value, field_type, condition.operator
+            ):
+                conflict = RuleConflict(
+                    conflict_type=ConflictType.TYPE_MISMATCH,
+                    rule_ids=[rule.rule_id],
+                    message=f"Type mismatch in rule {rule.rule_id}: field {condition.field_name} expects {field_type}",
+                    severity="error",
+                    details={
+                        "field": condition.field_name,
+                        "expected_type": field_type,
+                        "actual_value": condition.value,
+                    },
+                )
+                conflicts.append(conflict)
+        return conflicts
+
+    def _missing_fields(
+        self, rule: DSLRule, input_schema: Dict[str, Any]
+    ) -> List[RuleConflict]:
+        """Missing field conflicts of one rule"""
+        conflicts = []
+        for condition in rule.conditions:
+            if condition.field_name not in input_schema:
+                conflict = RuleConflict(
+                    conflict_type=ConflictType.MISSING_FIELD,
+                    rule_ids=[rule.rule_id],
+                    message=f"Rule {rule.rule_id} references missing field: {condition.field_name}",
+                    severity="error",
+                    details={"field": condition.field_name},
+                )
+                conflicts.append(conflict)
+        return conflicts
 
     def _conditions_overlap(
         self, conditions1: List[RuleCondition], conditions2: List[RuleCondition]
     ) -> bool:
-        """Check if two sets of conditions overlap"""
-        # Simplified overlap detection - in practice, this would be more sophisticated
-        fields1 = {c.field_name for c in conditions1}
-        fields2 = {c.field_name for c in conditions2}
-        return bool(fields1.intersection(fields2))
+        """Check if two sets of conditions share a field and can hold together"""
+        spaces1 = condition_spaces(conditions1)
+        spaces2 = condition_spaces(conditions2)
+        if any(space.is_empty() for space in (*spaces1.values(), *spaces2.values())):
+            return False
+        return bool(spaces1.keys() & spaces2.keys()) and _spaces_overlap(
+            spaces1, spaces2
+        )
 
     def _rule_is_shadowed(
         self, rule: DSLRule, higher_priority_rules: List[DSLRule]
     ) -> bool:
-        """Check if a rule is shadowed by higher priority rules"""
-        # Simplified shadowing detection
-        rule_fields = {c.field_name for c in rule.conditions}
-        for higher_rule in higher_priority_rules:
-            higher_fields = {c.field_name for c in higher_rule.conditions}
-            if rule_fields.issubset(higher_fields):
-                return True
-        return False
+        """Check if every input matching a rule matches a higher priority rule"""
+        spaces = condition_spaces(rule.conditions)
+        return any(
+            _spaces_contain(condition_spaces(higher_rule.conditions), spaces)
+            for higher_rule in higher_priority_rules
+        )
 
     def _get_field_type(self, field: str, schema: Dict[str, Any]) -> Optional[str]:
         """Get the type of a field from the schema"""
@@ -534,7 +953,7 @@ class DSLStaticAnalyzer:
         }
 
         # Syntax validation
-        syntax_errors = DSLGrammar.validate_syntax(schema_data)
+        syntax_errors = self._validate_syntax(schema_data)
         analysis_result["syntax_errors"] = syntax_errors
 
         if syntax_errors:
@@ -542,7 +961,7 @@ class DSLStaticAnalyzer:
 
         # Parse schema
         try:
-            schema = DSLSchema.from_dict(schema_data)
+            schema = self._parse_schema(schema_data)
         except Exception as e:
             analysis_result["syntax_errors"].append(f"Schema parsing failed: {str(e)}")
             return analysis_result
@@ -565,6 +984,14 @@ class DSLStaticAnalyzer:
 
         return analysis_result
 
+    def _validate_syntax(self, schema_data: Dict[str, Any]) -> List[str]:
+        """Syntax errors of a schema dictionary"""
+        return DSLGrammar.validate_syntax(schema_data)
+
+    def _parse_schema(self, schema_data: Dict[str, Any]) -> DSLSchema:
+        """Parse a syntactically valid schema dictionary"""
+        return DSLSchema.from_dict(schema_data)
+
     def _generate_warnings(self, schema: DSLSchema) -> List[str]:
         """Generate warnings for the schema"""
         warnings = []
@@ -635,6 +1062,263 @@ class DSLStaticAnalyzer:
         return recommendations
 
 
+@dataclass
+class _RuleEntry:
+    """Cached analysis of one rule revision"""
+
+    key: str
+    rule: DSLRule
+    spaces: Dict[str, FieldSpace]
+    unsatisfiable: bool
+    checks: Dict[str, List[RuleConflict]] = field(default_factory=dict)
+
+    @property
+    def live(self) -> Dict[str, FieldSpace]:
+        """Spaces taking part in overlap detection"""
+        return self.spaces if self.rule.enabled and not self.unsatisfiable else {}
+
+
+class _IncrementalConflictDetector(RuleConflictDetector):
+    """Conflict detector reading per-rule results from an analysis session"""
+
+    def __init__(self, session: "DSLAnalysisSession"):
+        super().__init__()
+        self.session = session
+
+    def _overlapping_pairs(self, rules: List[DSLRule]) -> List[Tuple[int, int]]:
+        if self._pairs is not None or not self.session.incremental:
+            return super()._overlapping_pairs(rules)
+        entries = self.session.entries
+        self._enabled = [rule for rule in rules if rule.enabled]
+        self._spaces = [entries[rule.rule_id].spaces for rule in self._enabled]
+        self._unsatisfiable = {
+            i
+            for i, rule in enumerate(self._enabled)
+            if entries[rule.rule_id].unsatisfiable
+        }
+        position = {rule.rule_id: i for i, rule in enumerate(self._enabled)}
+        self._pairs = sorted(
+            (position[a], position[b])
+            for a, others in self.session.overlaps.items()
+            for b in others
+            if position[a] < position[b]
+        )
+        return self._pairs
+
+    def _cached(self, name: str, rule: DSLRule, compute) -> List[RuleConflict]:
+        if not self.session.incremental:
+            return compute()
+        checks = self.session.entries[rule.rule_id].checks
+        if name not in checks:
+            checks[name] = compute()
+        return checks[name]
+
+    def _circular_dependencies(self, rule: DSLRule) -> List[RuleConflict]:
+        compute = super()._circular_dependencies
+        return self._cached("circular", rule, lambda: compute(rule))
+
+    def _type_mismatches(
+        self, rule: DSLRule, input_schema: Dict[str, Any]
+    ) -> List[RuleConflict]:
+        compute = super()._type_mismatches
+        return self._cached("types", rule, lambda: compute(rule, input_schema))
+
+    def _missing_fields(
+        self, rule: DSLRule, input_schema: Dict[str, Any]
+    ) -> List[RuleConflict]:
+        compute = super()._missing_fields
+        return self._cached("fields", rule, lambda: compute(rule, input_schema))
+
+
+class DSLAnalysisSession(DSLStaticAnalyzer):
+    """Static analysis that carries results across schema revisions
+
+    Rules are matched by rule_id between revisions. Unchanged rules keep
+    their parsed form, condition spaces, per-rule checks and overlap
+    relations; only pairs involving added or edited rules are recomputed.
+    The result of ``analyze`` is identical to a full analysis. A revision
+    with duplicate rule_ids is analyzed in full and resets the session.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.conflict_detector = _IncrementalConflictDetector(self)
+        self.entries: Dict[str, _RuleEntry] = {}
+        self.overlaps: Dict[str, Set[str]] = {}
+        self.incremental = True
+        self._syntax: Dict[int, Tuple[str, List[str]]] = {}
+        self._keys: List[str] = []
+        self._input_schema_key: Optional[str] = None
+        self._totals: Dict[str, Counter] = {}
+        self._reset()
+
+    def _reset(self) -> None:
+        self.entries = {}
+        self.overlaps = {}
+        self._input_schema_key = None
+        self._totals = {
+            "counts": Counter(),
+            "rule_types": Counter(),
+            "priorities": Counter(),
+        }
+
+    @staticmethod
+    def _rule_key(rule_data: Any) -> str:
+        # repr keeps 1, 1.0, True and "1" apart, unlike JSON
+        return repr(rule_data)
+
+    def _validate_syntax(self, schema_data: Dict[str, Any]) -> List[str]:
+        errors = []
+        required_fields = ["name", "version", "rules", "input_schema", "output_schema"]
+        for field_name in required_fields:
+            if field_name not in schema_data:
+                errors.append(f"Missing required field: {field_name}")
+
+        self._keys = []
+        if "rules" in schema_data:
+            cache: Dict[int, Tuple[str, List[str]]] = {}
+            for i, rule in enumerate(schema_data["rules"]):
+                key = self._rule_key(rule)
+                self._keys.append(key)
+                cached = self._syntax.get(i)
+                if cached is None or cached[0] != key:
+                    cached = (key, DSLGrammar._validate_rule_syntax(rule, i))
+                cache[i] = cached
+                errors.extend(cached[1])
+            self._syntax = cache
+        return errors
+
+    def _parse_schema(self, schema_data: Dict[str, Any]) -> DSLSchema:
+        # Keys were computed by _validate_syntax, which analyze runs first
+        keys = self._keys
+        rules = []
+        for rule_data, key in zip(schema_data["rules"], keys):
+            entry = self.entries.get(rule_data["rule_id"])
+            if entry is not None and entry.key == key:
+                rules.append(entry.rule)
+            else:
+                rules.append(DSLRule.from_dict(rule_data))
+        schema = DSLSchema(
+            name=schema_data["name"],
+            version=schema_data["version"],
+            rules=rules,
+            input_schema=schema_data["input_schema"],
+            output_schema=schema_data["output_schema"],
+            metadata=schema_data.get("metadata", {}),
+        )
+        self._update(schema, keys)
+        return schema
+
+    def _update(self, schema: DSLSchema, keys: List[str]) -> None:
+        """Bring the cached per-rule results up to date with a revision"""
+        rule_ids = [rule.rule_id for rule in schema.rules]
+        if len(set(rule_ids)) != len(rule_ids):
+            self._reset()
+            self.incremental = False
+            return
+        if not self.incremental:
+            self.incremental = True
+
+        input_schema_key = repr(schema.input_schema)
+        if input_schema_key != self._input_schema_key:
+            for entry in self.entries.values():
+                entry.checks.clear()
+            self._input_schema_key = input_schema_key
+
+        changed = []
+        current = set(rule_ids)
+        stale = [rule_id for rule_id in self.entries if rule_id not in current]
+        for position, (rule, key) in enumerate(zip(schema.rules, keys)):
+            entry = self.entries.get(rule.rule_id)
+            if entry is None or entry.key != key:
+                if entry is not None:
+                    stale.append(rule.rule_id)
+                changed.append(position)
+
+        for rule_id in stale:
+            for other in self.overlaps.pop(rule_id, ()):
+                if other in self.overlaps:
+                    self.overlaps[other].discard(rule_id)
+            self._count(self.entries.pop(rule_id).rule, -1)
+
+        for position in changed:
+            rule = schema.rules[position]
+            spaces = condition_spaces(rule.conditions)
+            self.entries[rule.rule_id] = _RuleEntry(
+                key=keys[position],
+                rule=rule,
+                spaces=spaces,
+                unsatisfiable=any(space.is_empty() for space in spaces.values()),
+            )
+            self.overlaps[rule.rule_id] = set()
+            self._count(rule, 1)
+
+        if changed:
+            live = [self.entries[rule_id].live for rule_id in rule_ids]
+            for i, j in _overlap_candidates(live, set(changed)):
+                if _spaces_overlap(live[i], live[j]):
+                    self.overlaps[rule_ids[i]].add(rule_ids[j])
+                    self.overlaps[rule_ids[j]].add(rule_ids[i])
+
+    def _count(self, rule: DSLRule, sign: int) -> None:
+        """Add or remove a rule's contribution to the metric totals"""
+        counts = self._totals["counts"]
+        counts["rules"] += sign
+        counts["enabled"] += sign if rule.enabled else 0
+        counts["conditions"] += sign * len(rule.conditions)
+        counts["actions"] += sign * len(rule.actions)
+        counts["many_conditions"] += sign if len(rule.conditions) > 5 else 0
+        self._totals["rule_types"][rule.rule_type] += sign
+        self._totals["priorities"][rule.priority] += sign
+        if not self._totals["priorities"][rule.priority]:
+            del self._totals["priorities"][rule.priority]
+
+    def _calculate_metrics(self, schema: DSLSchema) -> Dict[str, Any]:
+        if not self.incremental:
+            return super()._calculate_metrics(schema)
+        counts = self._totals["counts"]
+        priorities = self._totals["priorities"]
+        total = counts["rules"]
+        return {
+            "total_rules": total,
+            "enabled_rules": counts["enabled"],
+            "disabled_rules": total - counts["enabled"],
+            "rule_types": {t.value: self._totals["rule_types"][t] for t in RuleType},
+            "priority_range": {
+                "min": min(priorities) if priorities else 0,
+                "max": max(priorities) if priorities else 0,
+            },
+            "average_conditions_per_rule": counts["conditions"] / max(total, 1),
+            "average_actions_per_rule": counts["actions"] / max(total, 1),
+        }
+
+    def _generate_recommendations(
+        self, schema: DSLSchema, conflicts: List[RuleConflict]
+    ) -> List[str]:
+        if not self.incremental:
+            return super()._generate_recommendations(schema, conflicts)
+        recommendations = []
+        conflict_types = {c.conflict_type for c in conflicts}
+
+        if ConflictType.AMBIGUOUS_PRIORITY in conflict_types:
+            recommendations.append("Consider using unique priorities for all rules")
+
+        if ConflictType.UNREACHABLE_RULE in conflict_types:
+            recommendations.append(
+                "Review rule priorities to ensure all rules are reachable"
+            )
+
+        if len(schema.rules) > 20:
+            recommendations.append(
+                "Consider splitting large rule sets into multiple schemas"
+            )
+
+        if self._totals["counts"]["many_conditions"]:
+            recommendations.append("Consider simplifying rules with many conditions")
+
+        return recommendations
+
+
 # Example DSL schema with conflicts
 EXAMPLE_CONFLICTED_SCHEMA = {
     "name": "loan_approval",
@@ -666,7 +1350,10 @@ EXAMPLE_CONFLICTED_SCHEMA = {
             "rule_id": "unreachable_rule",
             "rule_type": "threshold",
             "priority": 50,  # Lower priority - will be unreachable
-            "conditions": [{"field": "amount", "operator": ">=", "value": 100000}],
+            "conditions": [
+                {"field": "amount", "operator": ">=", "value": 150000},
+                {"field": "credit_score", "operator": ">=", "value": 800},
+            ],
             "actions": [{"action_type": "set", "field": "approved", "value": True}],
             "description": "This rule will never be reached",
         },
@@ -0,0 +1,536 @@
+"""
+DSL Rule Compiler
+Compiles DSLSchema rules into priority-ordered chains of native closures
+
+Evaluation semantics:
+- Enabled rules are tried in descending priority; rules with equal priority
+  keep their declaration order.
+- The first rule whose conditions all hold fires. Its actions are applied to
+  the output, which starts from the ``default`` values in ``output_schema``.
+- Field names address nested input with dots (``applicant.age``).
+- A condition on a missing field, or one whose comparison raises a type
+  error, does not hold, with or without ``negated``.
+
+Everything that can be decided from the schema alone is decided at compile
+time: operators are bound to comparison closures, regexes are compiled,
+``in``/``not_in`` values are frozen into sets and field paths are resolved
+into accessors, so evaluating a rule never dispatches on operator strings.
+Large rule sets also get a RuleIndex, so an input is only checked against
+the rules whose hash-bucketed or numeric key condition can hold.
+"""
+
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .dsl import (
+    DSLRule,
+    DSLSchema,
+    Operator,
+    RuleAction,
+    RuleCondition,
+    frozen_values,
+    is_number,
+)
+from ..utils.canonical import canonical_hash
+
+Predicate = Callable[[Dict[str, Any]], bool]
+Accessor = Callable[[Dict[str, Any]], Any]
+Apply = Callable[[Dict[str, Any]], None]
+
+MISSING = object()
+
+# Below this many rules a linear scan beats the index lookup
+INDEX_MIN_RULES = 32
+
+
+class DSLCompileError(ValueError):
+    """A schema that cannot be compiled"""
+
+    def __init__(self, rule_id: str, message: str):
+        self.rule_id = rule_id
+        super().__init__(f"Rule {rule_id}: {message}")
+
+
+def schema_hash(schema: DSLSchema) -> str:
+    """Content hash of a schema, used as its compilation cache key"""
+    return canonical_hash(schema.to_dict())
+
+
+def ordered_rules(schema: DSLSchema) -> List[DSLRule]:
+    """Enabled rules in evaluation order"""
+    # sorted() is stable, so equal priorities keep declaration order
+    return sorted(
+        (rule for rule in schema.rules if rule.enabled),
+        key=lambda rule: rule.priority,
+        reverse=True,
+    )
+
+
+def compile_accessor(field_name: str) -> Accessor:
+    """Resolve a (dotted) field name into a getter returning MISSING if absent"""
+    path = tuple(field_name.split("."))
+    if len(path) == 1:
+        key = path[0]
+        return lambda data: data.get(key, MISSING)
+
+    def get_nested(data: Dict[str, Any]) -> Any:
+        value: Any = data
+        for key in path:
+            if not isinstance(value, dict):
+                return MISSING
+            value = value.get(key, MISSING)
+            if value is MISSING:
+                return MISSING
+        return value
+
+    return get_nested
+
+
+def compile_test(condition: RuleCondition, rule_id: str) -> Callable[[Any], bool]:
+    """Bind a condition's operator and operand into a one-argument test"""
+    operand = condition.value
+    op = condition.operator
+
+    if op == Operator.EQ:
+        return lambda v: v == operand
+    if op == Operator.NE:
+        return lambda v: v != operand
+    if op == Operator.LT:
+        return lambda v: v < operand
+    if op == Operator.LE:
+        return lambda v: v <= operand
+    if op == Operator.GT:
+        return lambda v: v > operand
+    if op == Operator.GE:
+        return lambda v: v >= operand
+    if op in (Operator.IN, Operator.NOT_IN):
+        members = frozen_values(operand)
+        if op == Operator.IN:
+            return lambda v: v in members
+        return lambda v: v not in members
+    if op == Operator.CONTAINS:
+        return lambda v: operand in v
+    if op == Operator.NOT_CONTAINS:
+        return lambda v: operand not in v
+    if op in (Operator.REGEX, Operator.NOT_REGEX):
+        try:
+            search = re.compile(operand).search
+        except (re.error, TypeError) as e:
+            raise DSLCompileError(rule_id, f"invalid regex {operand!r}: {e}")
+        if op == Operator.REGEX:
+            return lambda v: isinstance(v, str) and search(v) is not None
+        return lambda v: isinstance(v, str) and search(v) is None
+    raise DSLCompileError(rule_id, f"unsupported operator {op!r}")
+
+
+def compile_condition(condition: RuleCondition, rule_id: str = "?") -> Predicate:
+    """Compile one condition into a predicate over the input dict"""
+    get = compile_accessor(condition.field_name)
+    test = compile_test(condition, rule_id)
+    negated = condition.negated
+
+    def predicate(data: Dict[str, Any]) -> bool:
+        value = get(data)
+        if value is MISSING:
+            return False
+        try:
+            return bool(test(value)) is not negated
+        except TypeError:
+            return False
+
+    return predicate
+
+
+def compile_conditions(rule: DSLRule) -> Predicate:
+    """Compile a rule's conjunction of conditions"""
+    predicates = tuple(compile_condition(c, rule.rule_id) for c in rule.conditions)
+    if not predicates:
+        return lambda data: True
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def all_hold(data: Dict[str, Any]) -> bool:
+        for predicate in predicates:
+            if not predicate(data):
+                return False
+        return True
+
+    return all_hold
+
+
+def compile_action(action: RuleAction, rule_id: str = "?") -> Apply:
+    """Compile one action into a function that updates the output dict"""
+    field_name = action.field_name
+    value = action.value
+    action_type = action.action_type
+
+    if action_type == "set":
+
+        def apply(output: Dict[str, Any]) -> None:
+            output[field_name] = value
+
+    elif action_type == "increment":
+
+        def apply(output: Dict[str, Any]) -> None:
+            output[field_name] = output.get(field_name, 0) + value
+
+    elif action_type == "decrement":
+
+        def apply(output: Dict[str, Any]) -> None:
+            output[field_name] = output.get(field_name, 0) - value
+
+    elif action_type == "append":
+
+        def apply(output: Dict[str, Any]) -> None:
+            output[field_name] = list(output.get(field_name, ())) + [value]
+
+    elif action_type == "remove":
+
+        def apply(output: Dict[str, Any]) -> None:
+            current = output.get(field_name)
+            if isinstance(current, list):
+                output[field_name] = [item for item in current if item != value]
+            elif current == value:
+                output.pop(field_name, None)
+
+    else:
+        raise DSLCompileError(rule_id, f"unsupported action type {action_type!r}")
+
+    return apply
+
+
+class _NumericBounds:
+    """Rules keyed on a numeric field, looked up with bisect
+
+    One-sided rules sit in a sorted list per operator, so a lookup returns a
+    slice. Rules bounded on both sides are stabbed through precomputed
+    elementary segments between the distinct endpoints.
+    """
+
+    def __init__(self, rules: List[Tuple[int, Optional[Tuple], Optional[Tuple]]]):
+        # rules: (position, (lower, strict) or None, (upper, strict) or None)
+        self.positions = [position for position, _, _ in rules]
+        one_sided: Dict[Operator, List[Tuple[float, int]]] = {
+            Operator.LT: [],
+            Operator.LE: [],
+            Operator.GT: [],
+            Operator.GE: [],
+        }
+        intervals = []
+        for position, lower, upper in rules:
+            if lower is not None and upper is not None:
+                intervals.append((position, lower, upper))
+            elif upper is not None:
+                op = Operator.LT if upper[1] else Operator.LE
+                one_sided[op].append((upper[0], position))
+            else:
+                op = Operator.GT if lower[1] else Operator.GE
+                one_sided[op].append((lower[0], position))
+
+        self.bounds: Dict[Operator, Tuple[List[float], List[int]]] = {}
+        for op, entries in one_sided.items():
+            entries.sort(key=lambda entry: entry[0])
+            self.bounds[op] = (
+                [bound for bound, _ in entries],
+                [position for _, position in entries],
+            )
+
+        # Region 2i + 1 is the point points[i]; region 2i lies just below it
+        self.points = sorted({b for _, lo, hi in intervals for b in (lo[0], hi[0])})
+        regions: List[List[int]] = [[] for _ in range(2 * len(self.points) + 1)]
+        for position, (lo, lo_strict), (hi, hi_strict) in intervals:
+            first = self._region(lo) + (1 if lo_strict else 0)
+            last = self._region(hi) - (1 if hi_strict else 0)
+            for region in range(first, last + 1):
+                regions[region].append(position)
+        self.regions = [tuple(region) for region in regions]
+
+    def _region(self, value: float) -> int:
+        i = bisect_left(self.points, value)
+        if i < len(self.points) and self.points[i] == value:
+            return 2 * i + 1
+        return 2 * i
+
+    def candidates(self, value: Any) -> List[int]:
+        if not is_number(value):
+            # Comparisons with other types are left to the predicates
+            return self.positions
+        bounds, positions = self.bounds[Operator.LT]
+        found = positions[bisect_right(bounds, value) :]
+        bounds, positions = self.bounds[Operator.LE]
+        found += positions[bisect_left(bounds, value) :]
+        bounds, positions = self.bounds[Operator.GT]
+        found += positions[: bisect_left(bounds, value)]
+        bounds, positions = self.bounds[Operator.GE]
+        found += positions[: bisect_right(bounds, value)]
+        if self.points:
+            found += self.regions[self._region(value)]
+        return found
+
+
+class _FieldIndex:
+    """Candidate rules for one input field"""
+
+    def __init__(self, field_name: str):
+        self.get = compile_accessor(field_name)
+        self.buckets: Dict[Any, List[int]] = {}
+        self.bucketed: List[int] = []
+        self.numeric: List[Tuple[int, Optional[Tuple], Optional[Tuple]]] = []
+        self.bounds: Optional[_NumericBounds] = None
+
+    def add_members(self, position: int, members: Any) -> None:
+        for member in members:
+            self.buckets.setdefault(member, []).append(position)
+        self.bucketed.append(position)
+
+    def freeze(self) -> None:
+        if self.numeric:
+            self.bounds = _NumericBounds(self.numeric)
+
+    def candidates(self, input_data: Dict[str, Any]) -> List[int]:
+        value = self.get(input_data)
+        if value is MISSING:
+            return []
+        found: List[int] = []
+        if self.buckets:
+            try:
+                found += self.buckets.get(value, ())
+            except TypeError:
+                found += self.bucketed
+        if self.bounds is not None:
+            found += self.bounds.candidates(value)
+        return found
+
+
+def _hash_key(condition: RuleCondition) -> Optional[frozenset]:
+    """Operand values a rule needs its field to equal, if hashable"""
+    if condition.negated:
+        return None
+    if condition.operator == Operator.EQ:
+        try:
+            return frozenset([condition.value])
+        except TypeError:
+            return None
+    if condition.operator == Operator.IN:
+        members = frozen_values(condition.value)
+        return members if isinstance(members, frozenset) else None
+    return None
+
+
+def _numeric_bounds(
+    conditions: List[RuleCondition],
+) -> Dict[str, Tuple[Optional[Tuple], Optional[Tuple]]]:
+    """Tightest (bound, strict) lower and upper limits per field"""
+    limits: Dict[str, Tuple[Optional[Tuple], Optional[Tuple]]] = {}
+    for condition in conditions:
+        op = condition.operator
+        if condition.negated or not is_number(condition.value):
+            continue
+        if op not in (Operator.LT, Operator.LE, Operator.GT, Operator.GE):
+            continue
+        lower, upper = limits.get(condition.field_name, (None, None))
+        bound = (condition.value, op in (Operator.LT, Operator.GT))
+        if op in (Operator.GT, Operator.GE):
+            # On equal bounds the strict one is tighter
+            if lower is None or bound > lower:
+                lower = bound
+        elif upper is None or (bound[0], not bound[1]) < (upper[0], not upper[1]):
+            upper = bound
+        limits[condition.field_name] = (lower, upper)
+    return limits
+
+
+class RuleIndex:
+    """Candidate lookup for first-match evaluation of large rule sets
+
+    Each rule is keyed on one of its non-negated conditions, which must hold
+    for the rule to fire: an ``==``/``in`` condition goes into a hash bucket,
+    otherwise its numeric bounds on one field go into a bisect structure.
+    Rules with no such condition are always candidates. ``candidates``
+    returns the positions of rules whose key condition may hold, in
+    evaluation order, so checking them in turn gives the linear scan's
+    result.
+    """
+
+    def __init__(self, rules: List[DSLRule]):
+        fields: Dict[str, _FieldIndex] = {}
+        self.unindexed: List[int] = []
+
+        def field_index(field_name: str) -> _FieldIndex:
+            if field_name not in fields:
+                fields[field_name] = _FieldIndex(field_name)
+            return fields[field_name]
+
+        for position, rule in enumerate(rules):
+            for condition in rule.conditions:
+                members = _hash_key(condition)
+                if members is not None:
+                    field_index(condition.field_name).add_members(position, members)
+                    break
+            else:
+                limits = _numeric_bounds(rule.conditions)
+                if not limits:
+                    self.unindexed.append(position)
+                    continue
+                # Prefer a field bounded on both sides
+                field_name = max(
+                    limits, key=lambda name: sum(b is not None for b in limits[name])
+                )
+                lower, upper = limits[field_name]
+                field_index(field_name).numeric.append((position, lower, upper))
+
+        for index in fields.values():
+            index.freeze()
+        self.fields = tuple(fields.values())
+
+    def candidates(self, input_data: Dict[str, Any]) -> List[int]:
+        """Positions of the rules that may match, in evaluation order"""
+        found = list(self.unindexed)
+        for index in self.fields:
+            found += index.candidates(input_data)
+        found.sort()
+        return found
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    """A rule bound to its compiled predicate and actions"""
+
+    rule_id: str
+    priority: int
+    matches: Predicate
+    actions: Tuple[Apply, ...]
+
+
+class CompiledSchema:
+    """A DSLSchema compiled into a first-match chain of closures
+
+    Instances are decision functions: ``compiled(input_data, context)``
+    returns the output fields plus ``matched_rule``, so a compiled schema can
+    be registered with ``DecisionEngine.register_function`` directly.
+    """
+
+    def __init__(self, schema: DSLSchema, digest: Optional[str] = None):
+        self.schema = schema
+        self.name = schema.name
+        self.version = schema.version
+        self.digest = digest or schema_hash(schema)
+        rules = ordered_rules(schema)
+        self.rules: Tuple[CompiledRule, ...] = tuple(
+            CompiledRule(
+                rule_id=rule.rule_id,
+                priority=rule.priority,
+                matches=compile_conditions(rule),
+                actions=tuple(compile_action(a, rule.rule_id) for a in rule.actions),
+            )
+            for rule in rules
+        )
+        self.index = RuleIndex(rules) if len(rules) >= INDEX_MIN_RULES else None
+        self.defaults: Dict[str, Any] = {
+            field_name: spec["default"]
+            for field_name, spec in schema.output_schema.items()
+            if isinstance(spec, dict) and "default" in spec
+        }
+
+    def match(self, input_data: Dict[str, Any]) -> Optional[CompiledRule]:
+        """The first rule, in priority order, whose conditions all hold"""
+        if self.index is not None:
+            rules = self.rules
+            for position in self.index.candidates(input_data):
+                if rules[position].matches(input_data):
+                    return rules[position]
+            return None
+        for rule in self.rules:
+            if rule.matches(input_data):
+                return rule
+        return None
+
+    def evaluate(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply the first matching rule's actions to the default output"""
+        output = dict(self.defaults)
+        rule = self.match(input_data)
+        for apply in rule.actions if rule is not None else ():
+            apply(output)
+        output["matched_rule"] = rule.rule_id if rule is not None else None
+        return output
+
+    def __call__(
+        self, input_data: Dict[str, Any], context: Any = None
+    ) -> Dict[str, Any]:
+        return self.evaluate(input_data)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+
+class DSLCompiler:
+    """Compiles schemas, caching compiled evaluators by schema hash"""
+
+    def __init__(self, max_entries: int = 128):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CompiledSchema]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, schema: DSLSchema) -> CompiledSchema:
+        """Compile a schema, reusing an earlier compilation of identical rules"""
+        digest = schema_hash(schema)
+        with self._lock:
+            compiled = self._entries.get(digest)
+            if compiled is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        compiled = CompiledSchema(schema, digest)
+        with self._lock:
+            self._entries[digest] = compiled
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return compiled
+
+    def compile_dict(self, schema_data: Dict[str, Any]) -> CompiledSchema:
+        """Parse and compile a schema given as a dictionary"""
+        return self.compile(DSLSchema.from_dict(schema_data))
+
+    def clear(self) -> None:
+        """Drop all compiled schemas"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get compilation cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_default_compiler = DSLCompiler()
+
+
+def compile_schema(schema: DSLSchema) -> CompiledSchema:
+    """Compile a schema with the shared, hash-keyed compiler cache"""
+    return _default_compiler.compile(schema)
+
+
+def register_dsl_schema(engine: Any, schema: DSLSchema) -> CompiledSchema:
+    """Compile a schema and register it with a DecisionEngine
+
+    The schema's name and version become the function id and version.
+    """
+    compiled = compile_schema(schema)
+    engine.register_function(schema.name, schema.version, compiled)
+    return compiled
@@ -0,0 +1,303 @@
+"""
+Vectorized DSL Evaluation
+Evaluates DSLSchema rules over columnar batches with NumPy masks
+
+Inputs are columns: a mapping of field name to array, or a structured
+(record) array. Dotted field names are looked up as flat column names first
+(``columns["applicant.income"]``) and then through nested mappings or nested
+record fields. A field with no column is missing for every row; a masked
+entry of a ``numpy.ma`` array is missing for that row.
+
+Results match ``CompiledSchema.evaluate`` row for row:
+
+- Each condition becomes a boolean mask. Plain comparisons of numeric or
+  string columns against a scalar of the same kind run as NumPy operations.
+  Every other condition runs the row-wise test once per distinct column
+  value, or once per row for object columns. This keeps Python semantics
+  for mixed types, ``in`` sets, ``contains`` and regexes.
+- First match by priority is resolved with mask arithmetic. Rows claimed by
+  a higher-priority rule are removed before the next rule is tried.
+- Rule actions only combine constants with the schema defaults. The output
+  of each rule is therefore computed once, and output columns are gathered
+  from those outputs by matched rule.
+
+NumPy is required for this module only; install the ``production`` extra.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .dsl import DSLSchema, Operator, RuleCondition
+from .dsl_compiler import (
+    MISSING,
+    CompiledSchema,
+    compile_schema,
+    compile_test,
+    ordered_rules,
+)
+
+Columns = Union[Mapping, np.ndarray]
+ColumnPredicate = Callable[[Columns, int], np.ndarray]
+
+_COMPARISONS = {
+    Operator.EQ: np.equal,
+    Operator.NE: np.not_equal,
+    Operator.LT: np.less,
+    Operator.LE: np.less_equal,
+    Operator.GT: np.greater,
+    Operator.GE: np.greater_equal,
+}
+
+# Dtype kinds whose elements are hashable Python scalars after tolist()
+_SCALAR_KINDS = "biufUS"
+
+
+def _has_field(columns: Any, key: str) -> bool:
+    if isinstance(columns, np.ndarray):
+        names = columns.dtype.names
+        return names is not None and key in names
+    return isinstance(columns, Mapping) and key in columns
+
+
+def compile_column_accessor(field_name: str) -> Callable[[Columns], Any]:
+    """Resolve a (dotted) field name into a getter returning None if absent"""
+    path = tuple(field_name.split("."))
+
+    def get_column(columns: Columns) -> Any:
+        if _has_field(columns, field_name):
+            return columns[field_name]
+        value: Any = columns
+        for key in path:
+            if not _has_field(value, key):
+                return None
+            value = value[key]
+        return value
+
+    return get_column
+
+
+def row_count(columns: Columns) -> int:
+    """Number of rows in a batch, checking that all columns agree"""
+    if isinstance(columns, np.ndarray):
+        return len(columns)
+
+    lengths = set()
+    pending: List[Any] = [columns]
+    while pending:
+        current = pending.pop()
+        for value in current.values():
+            if isinstance(value, Mapping):
+                pending.append(value)
+            else:
+                lengths.add(len(value))
+    if len(lengths) > 1:
+        raise ValueError(f"Columns have different lengths: {sorted(lengths)}")
+    return lengths.pop() if lengths else 0
+
+
+def _native_comparison(
+    condition: RuleCondition,
+) -> Optional[Callable[[np.ndarray], Optional[np.ndarray]]]:
+    """A NumPy comparison for the operator, if its operand allows one
+
+    The returned function gives None for columns whose dtype does not match
+    the operand, so that the caller falls back to the row-wise test.
+    """
+    ufunc = _COMPARISONS.get(condition.operator)
+    operand = condition.value
+    if ufunc is None:
+        return None
+    if isinstance(operand, str):
+        kinds = "U"
+    elif isinstance(operand, (bool, int, float)):
+        kinds = "biuf"
+    else:
+        return None
+
+    def compare(column: np.ndarray) -> Optional[np.ndarray]:
+        if column.dtype.kind not in kinds:
+            return None
+        return ufunc(column, operand)
+
+    return compare
+
+
+def _holds(test: Callable[[Any], bool], negated: bool, value: Any) -> bool:
+    try:
+        return bool(test(value)) is not negated
+    except TypeError:
+        return False
+
+
+def compile_column_condition(
+    condition: RuleCondition, rule_id: str = "?"
+) -> ColumnPredicate:
+    """Compile one condition into a mask builder over a columnar batch"""
+    get_column = compile_column_accessor(condition.field_name)
+    test = compile_test(condition, rule_id)
+    compare = _native_comparison(condition)
+    negated = condition.negated
+
+    def by_value(column: np.ndarray) -> np.ndarray:
+        if column.dtype.kind in _SCALAR_KINDS:
+            distinct, inverse = np.unique(column, return_inverse=True)
+            outcomes = np.fromiter(
+                (_holds(test, negated, v) for v in distinct.tolist()),
+                dtype=bool,
+                count=len(distinct),
+            )
+            return outcomes[inverse.reshape(-1)]
+        return np.fromiter(
+            (_holds(test, negated, v) for v in column.tolist()),
+            dtype=bool,
+            count=len(column),
+        )
+
+    def predicate(columns: Columns, size: int) -> np.ndarray:
+        column = get_column(columns)
+        if column is None:
+            return np.zeros(size, dtype=bool)
+
+        missing = None
+        if isinstance(column, np.ma.MaskedArray):
+            missing = np.ma.getmaskarray(column)
+            column = column.data
+        column = np.asarray(column)
+        if column.shape != (size,):
+            raise ValueError(
+                f"Column {condition.field_name!r} has shape {column.shape}, "
+                f"expected ({size},)"
+            )
+
+        holds = compare(column) if compare is not None else None
+        if holds is None:
+            holds = by_value(column)
+        elif negated:
+            holds = ~holds
+        if missing is not None:
+            holds &= ~missing
+        return holds
+
+    return predicate
+
+
+class ColumnarResult:
+    """Output columns of a vectorized evaluation
+
+    ``rule_index`` holds, per row, the position of the matched rule in
+    ``rule_ids`` or -1. ``columns`` holds one array per output field,
+    including ``matched_rule``. A field that the matched rule's output lacks
+    is masked.
+    """
+
+    def __init__(
+        self,
+        rule_ids: Tuple[str, ...],
+        rule_index: np.ndarray,
+        outputs: List[Dict[str, Any]],
+    ):
+        self.rule_ids = rule_ids
+        self.rule_index = rule_index
+        # outputs[-1] is the no-match output, so rule_index -1 gathers it
+        self._outputs = outputs
+        self.columns: Dict[str, np.ndarray] = {
+            field_name: self._gather(field_name)
+            for field_name in dict.fromkeys(
+                field_name for output in outputs for field_name in output
+            )
+        }
+
+    def _gather(self, field_name: str) -> np.ndarray:
+        values = [output.get(field_name, MISSING) for output in self._outputs]
+        present = np.array([value is not MISSING for value in values])
+        known = [value for value in values if value is not MISSING]
+
+        kinds = {type(value) for value in known}
+        if len(kinds) == 1 and kinds <= {bool, int, float, str}:
+            filler = known[0]
+            table = np.array([filler if v is MISSING else v for v in values])
+        else:
+            table = np.empty(len(values), dtype=object)
+            for i, value in enumerate(values):
+                table[i] = None if value is MISSING else value
+
+        column = table[self.rule_index]
+        if present.all():
+            return column
+        return np.ma.masked_array(column, mask=~present[self.rule_index])
+
+    def rows(self) -> List[Dict[str, Any]]:
+        """Per-row outputs in the form CompiledSchema.evaluate returns"""
+        outputs = self._outputs
+        return [dict(outputs[i]) for i in self.rule_index.tolist()]
+
+    def __getitem__(self, field_name: str) -> np.ndarray:
+        return self.columns[field_name]
+
+    def __len__(self) -> int:
+        return len(self.rule_index)
+
+
+class VectorizedSchema:
+    """A DSLSchema compiled into mask builders for columnar batches"""
+
+    def __init__(self, schema: Union[DSLSchema, CompiledSchema]):
+        compiled = schema if isinstance(schema, CompiledSchema) else None
+        if compiled is None:
+            compiled = compile_schema(schema)
+        self.compiled = compiled
+        self.name = compiled.name
+        self.version = compiled.version
+
+        rules = ordered_rules(compiled.schema)
+        self.rule_ids: Tuple[str, ...] = tuple(rule.rule_id for rule in rules)
+        self.conditions: Tuple[Tuple[ColumnPredicate, ...], ...] = tuple(
+            tuple(compile_column_condition(c, rule.rule_id) for c in rule.conditions)
+            for rule in rules
+        )
+
+        # Each rule's output depends only on the defaults and its actions
+        self._outputs: List[Dict[str, Any]] = []
+        self._failures: Dict[int, Exception] = {}
+        for index, rule in enumerate(compiled.rules):
+            output = dict(compiled.defaults)
+            try:
+                for apply in rule.actions:
+                    apply(output)
+            except Exception as e:
+                # Row-wise evaluation fails only when the rule matches
+                self._failures[index] = e
+            output["matched_rule"] = rule.rule_id
+            self._outputs.append(output)
+        self._outputs.append({**compiled.defaults, "matched_rule": None})
+
+    def match(self, columns: Columns) -> np.ndarray:
+        """Per-row index into rule_ids of the first matching rule, or -1"""
+        size = row_count(columns)
+        rule_index = np.full(size, -1, dtype=np.intp)
+        remaining = np.ones(size, dtype=bool)
+
+        for index, predicates in enumerate(self.conditions):
+            if not remaining.any():
+                break
+            hit = remaining.copy()
+            for predicate in predicates:
+                hit &= predicate(columns, size)
+                if not hit.any():
+                    break
+            rule_index[hit] = index
+            remaining &= ~hit
+        return rule_index
+
+    def evaluate(self, columns: Columns) -> ColumnarResult:
+        """Evaluate every row of a batch, first match by priority"""
+        rule_index = self.match(columns)
+        for index, error in self._failures.items():
+            if (rule_index == index).any():
+                raise error
+        return ColumnarResult(self.rule_ids, rule_index, self._outputs)
+
+    def __call__(self, columns: Columns) -> ColumnarResult:
+        return self.evaluate(columns)
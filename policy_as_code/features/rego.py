@@ -0,0 +1,1339 @@
+"""
+Rego Policy Compiler
+Evaluates the Rego subset used under policies/rego/ in-process
+
+Policies are parsed once and compiled into Python closures, so evaluation
+needs neither the ``opa`` binary nor a subprocess and JSON round trip.
+
+Supported subset:
+- ``package``, and ``import rego.v1`` / ``import future.keywords...``
+- ``default name := value``
+- Complete rules: ``name if { ... }``, ``name := value if { ... }``,
+  ``name := value if expr``, ``name := value`` and the older ``name { ... }``
+- Partial set rules: ``name contains value if { ... }``
+- Body expressions: bare terms, ``not``, ``==  !=  <  <=  >  >=``, ``in``,
+  ``:=`` and ``=`` assignment, ``some x in coll`` / ``some k, v in coll``,
+  and ``with input as ...``
+- Terms: scalars, arrays, objects, sets, ``input``/``data``/rule/variable
+  references with ``.field`` and ``[expr]`` lookups, ``+ - * / %`` and the
+  builtins in BUILTINS
+
+Semantics follow OPA: a reference to a missing field is undefined and makes
+its expression fail, values of different types compare by type order
+(null < boolean < number < string < array < object), a rule defined with
+two different values is a conflict error, and rule values are computed at
+most once per evaluation.
+"""
+
+import functools
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NoReturn,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+UNDEFINED: Any = object()
+_NOT_CONST: Any = object()
+_UNCACHED: Any = object()
+
+Term = Callable[["_Evaluation", Dict[str, Any]], Any]
+Filter = Callable[["_Evaluation", Dict[str, Any]], bool]
+Solve = Callable[["_Evaluation", Dict[str, Any]], Iterable[Dict[str, Any]]]
+
+
+class RegoCompileError(ValueError):
+    """A policy outside the supported subset, or with a compile-time error"""
+
+    def __init__(self, line: int, message: str):
+        self.line = line
+        super().__init__(f"line {line}: {message}")
+
+
+class RegoEvalError(ValueError):
+    """An evaluation error, such as a rule producing conflicting values"""
+
+
+# ---------------------------------------------------------------------------
+# Values
+
+
+_RANK = {type(None): 0, bool: 1, int: 2, float: 2, str: 3, list: 4, dict: 5}
+
+
+def _rank(value: Any) -> int:
+    rank = _RANK.get(type(value))
+    if rank is None:
+        if isinstance(value, (list, tuple)):
+            return 4
+        if isinstance(value, dict):
+            return 5
+        raise RegoEvalError(f"unsupported value type {type(value).__name__}")
+    return rank
+
+
+def rego_compare(a: Any, b: Any) -> int:
+    """Order two values the way OPA does; returns -1, 0 or 1"""
+    rank_a, rank_b = _rank(a), _rank(b)
+    if rank_a != rank_b:
+        return -1 if rank_a < rank_b else 1
+    if rank_a == 4:
+        for x, y in zip(a, b):
+            order = rego_compare(x, y)
+            if order:
+                return order
+        return (len(a) > len(b)) - (len(a) < len(b))
+    if rank_a == 5:
+        keys_a = sorted(a, key=_sort_key)
+        keys_b = sorted(b, key=_sort_key)
+        order = rego_compare(keys_a, keys_b)
+        if order:
+            return order
+        return rego_compare([a[k] for k in keys_a], [b[k] for k in keys_b])
+    if rank_a == 0:
+        return 0
+    return (a > b) - (a < b)
+
+
+_sort_key = functools.cmp_to_key(rego_compare)
+
+
+def rego_equal(a: Any, b: Any) -> bool:
+    """Equality without Python's bool/int coercion"""
+    if type(a) is type(b) and type(a) in (str, int, float, type(None), bool):
+        return a == b
+    return rego_compare(a, b) == 0
+
+
+def _freeze(value: Any) -> Any:
+    """A hashable key that is equal exactly when values are rego_equal"""
+    rank = _rank(value)
+    if rank == 4:
+        return (4, tuple(_freeze(v) for v in value))
+    if rank == 5:
+        return (5, frozenset((_freeze(k), _freeze(v)) for k, v in value.items()))
+    return (rank, value)
+
+
+def _set_value(values: Iterable[Any]) -> List[Any]:
+    """Deduplicate and order values, as OPA renders a set"""
+    unique: Dict[Any, Any] = {}
+    for value in values:
+        unique.setdefault(_freeze(value), value)
+    return sorted(unique.values(), key=_sort_key)
+
+
+def _is_number(value: Any) -> bool:
+    return type(value) is int or type(value) is float
+
+
+# ---------------------------------------------------------------------------
+# Builtins
+
+
+def _count(value: Any) -> Any:
+    if isinstance(value, (list, dict, str)):
+        return len(value)
+    return UNDEFINED
+
+
+def _numbers(value: Any) -> Optional[List[Any]]:
+    if isinstance(value, list) and all(_is_number(v) for v in value):
+        return value
+    return None
+
+
+def _sum(value: Any) -> Any:
+    numbers = _numbers(value)
+    return sum(numbers) if numbers is not None else UNDEFINED
+
+
+def _max(value: Any) -> Any:
+    numbers = _numbers(value)
+    return max(numbers) if numbers else UNDEFINED
+
+
+def _min(value: Any) -> Any:
+    numbers = _numbers(value)
+    return min(numbers) if numbers else UNDEFINED
+
+
+def _string_builtin(function: Callable[..., Any]) -> Callable[..., Any]:
+    def builtin(*args: Any) -> Any:
+        if all(type(arg) is str for arg in args):
+            return function(*args)
+        return UNDEFINED
+
+    return builtin
+
+
+BUILTINS: Dict[str, Callable[..., Any]] = {
+    "count": _count,
+    "sum": _sum,
+    "max": _max,
+    "min": _min,
+    "abs": lambda x: abs(x) if _is_number(x) else UNDEFINED,
+    "lower": _string_builtin(str.lower),
+    "upper": _string_builtin(str.upper),
+    "startswith": _string_builtin(str.startswith),
+    "endswith": _string_builtin(str.endswith),
+    "contains": _string_builtin(lambda s, sub: sub in s),
+}
+
+
+def _arithmetic(op: str, a: Any, b: Any) -> Any:
+    if not (_is_number(a) and _is_number(b)):
+        return UNDEFINED
+    if op == "+":
+        return a + b
+    if op == "-":
+        return a - b
+    if op == "*":
+        return a * b
+    if b == 0:
+        return UNDEFINED
+    if op == "%":
+        return a % b if type(a) is int and type(b) is int else UNDEFINED
+    quotient = a / b
+    if type(a) is int and type(b) is int and quotient.is_integer():
+        return int(quotient)
+    return quotient
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+
+_TOKEN = re.compile(
+    r"""
+    (?P<ws>[ \t\r]+)
+  | (?P<comment>\#[^\n]*)
+  | (?P<nl>\n)
+  | (?P<number>\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<string>"(?:[^"\\\n]|\\.)*")
+  | (?P<raw>`[^`]*`)
+  | (?P<ident>[A-Za-z_][A-Za-z0-9_]*)
+  | (?P<op>:=|==|!=|<=|>=|[<>=+\-*/%{}\[\]().,;:|&])
+    """,
+    re.VERBOSE,
+)
+
+COMPARISONS = {"==", "!=", "<", "<=", ">", ">="}
+
+
+@dataclass
+class _Token:
+    kind: str
+    text: str
+    line: int
+
+
+def _tokenize(source: str) -> List[_Token]:
+    tokens = []
+    line = 1
+    pos = 0
+    while pos < len(source):
+        match = _TOKEN.match(source, pos)
+        if match is None:
+            raise RegoCompileError(line, f"unexpected character {source[pos]!r}")
+        kind = match.lastgroup
+        assert kind is not None  # every alternative is a named group
+        text = match.group()
+        if kind not in ("ws", "comment"):
+            tokens.append(_Token(kind, text, line))
+        line += text.count("\n")
+        pos = match.end()
+    tokens.append(_Token("eof", "", line))
+    return tokens
+
+
+@dataclass
+class _Rule:
+    name: str
+    kind: str  # "complete", "default" or "set"
+    value: Optional[tuple]  # term; None means true
+    body: Optional[List[tuple]]  # expressions; None for constant rules
+    line: int
+
+
+@dataclass
+class _Module:
+    package: str
+    rules: List[_Rule] = field(default_factory=list)
+
+
+class _Parser:
+    """Recursive-descent parser producing tuple-based terms and expressions"""
+
+    def __init__(self, source: str):
+        self.tokens = _tokenize(source)
+        self.pos = 0
+
+    # Token helpers
+
+    @property
+    def token(self) -> _Token:
+        return self.tokens[self.pos]
+
+    def advance(self) -> _Token:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def at(self, text: str) -> bool:
+        token = self.token
+        return token.kind in ("op", "ident") and token.text == text
+
+    def accept(self, text: str) -> bool:
+        if self.at(text):
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, text: str) -> _Token:
+        if not self.at(text):
+            self.error(f"expected {text!r}")
+        return self.advance()
+
+    def ident(self) -> str:
+        if self.token.kind != "ident":
+            self.error("expected a name")
+        return self.advance().text
+
+    def skip_newlines(self) -> None:
+        while self.token.kind == "nl":
+            self.pos += 1
+
+    def error(self, message: str) -> NoReturn:
+        token = self.token
+        found = token.text if token.kind not in ("nl", "eof") else token.kind
+        raise RegoCompileError(token.line, f"{message}, found {found!r}")
+
+    def end_of_statement(self) -> None:
+        if self.token.kind not in ("nl", "eof"):
+            self.error("expected end of line")
+
+    # Module structure
+
+    def module(self) -> _Module:
+        self.skip_newlines()
+        self.expect("package")
+        module = _Module(self.dotted_name())
+        self.end_of_statement()
+
+        while True:
+            self.skip_newlines()
+            if self.token.kind == "eof":
+                return module
+            if self.accept("import"):
+                line = self.token.line
+                name = self.dotted_name()
+                if name != "rego.v1" and not name.startswith("future.keywords"):
+                    raise RegoCompileError(line, f"unsupported import {name}")
+                self.end_of_statement()
+            elif self.accept("default"):
+                line = self.token.line
+                name = self.ident()
+                if not (self.accept(":=") or self.accept("=")):
+                    self.error("expected ':=' after default rule name")
+                module.rules.append(_Rule(name, "default", self.term(), None, line))
+                self.end_of_statement()
+            else:
+                module.rules.append(self.rule())
+
+    def dotted_name(self) -> str:
+        parts = [self.ident()]
+        while self.accept("."):
+            parts.append(self.ident())
+        return ".".join(parts)
+
+    def rule(self) -> _Rule:
+        line = self.token.line
+        name = self.ident()
+        if self.at("(") or self.at("["):
+            raise RegoCompileError(
+                line, f"rule {name}: functions and v0 partial rules are not supported"
+            )
+
+        kind = "complete"
+        value = None
+        if self.accept("contains"):
+            kind = "set"
+            value = self.term()
+        elif self.accept(":=") or self.accept("="):
+            value = self.term()
+
+        body = None
+        if self.accept("if"):
+            body = self.body() if self.at("{") else [self.expression()]
+        elif self.at("{"):
+            body = self.body()
+        elif value is None or kind == "set":
+            self.error(f"expected a body for rule {name}")
+
+        if self.at("else"):
+            raise RegoCompileError(
+                self.token.line, f"rule {name}: else is not supported"
+            )
+        self.end_of_statement()
+        return _Rule(name, kind, value, body, line)
+
+    def body(self) -> List[tuple]:
+        self.expect("{")
+        expressions: List[tuple] = []
+        while True:
+            while self.token.kind == "nl" or self.at(";"):
+                self.pos += 1
+            if self.accept("}"):
+                return expressions
+            expressions.append(self.expression())
+            if not (self.token.kind == "nl" or self.at(";") or self.at("}")):
+                self.error("expected end of expression")
+
+    # Expressions
+
+    def expression(self) -> tuple:
+        line = self.token.line
+        expression: tuple
+        if self.accept("not"):
+            expression = ("not", self.simple_expression(), line)
+        elif self.accept("some"):
+            names = [self.ident()]
+            if self.accept(","):
+                names.append(self.ident())
+            if not self.accept("in"):
+                raise RegoCompileError(line, "only 'some ... in ...' is supported")
+            key, value = (None, names[0]) if len(names) == 1 else names
+            return ("some_in", key, value, self.term(), line)
+        else:
+            expression = self.simple_expression()
+
+        while self.accept("with"):
+            target = self.term()
+            if target != ("var", "input"):
+                raise RegoCompileError(line, "only 'with input as ...' is supported")
+            self.expect("as")
+            expression = ("with", expression, self.term(), line)
+        return expression
+
+    def simple_expression(self) -> tuple:
+        line = self.token.line
+        left = self.term()
+        token = self.token
+        if token.kind == "op" and token.text in (":=", "="):
+            self.pos += 1
+            kind = "assign" if token.text == ":=" else "unify"
+            return (kind, left, self.term(), line)
+        if token.kind == "op" and token.text in COMPARISONS:
+            self.pos += 1
+            return ("compare", token.text, left, self.term(), line)
+        if self.accept("in"):
+            return ("member", left, self.term(), line)
+        return ("term", left, line)
+
+    # Terms
+
+    def term(self) -> tuple:
+        left = self.product()
+        while self.token.kind == "op" and self.token.text in ("+", "-"):
+            op = self.advance().text
+            left = ("arith", op, left, self.product())
+        return left
+
+    def product(self) -> tuple:
+        left = self.unary()
+        while self.token.kind == "op" and self.token.text in ("*", "/", "%"):
+            op = self.advance().text
+            left = ("arith", op, left, self.unary())
+        return left
+
+    def unary(self) -> tuple:
+        if self.accept("-"):
+            operand = self.unary()
+            if operand[0] == "scalar" and _is_number(operand[1]):
+                return ("scalar", -operand[1])
+            return ("arith", "-", ("scalar", 0), operand)
+        return self.postfix()
+
+    def postfix(self) -> tuple:
+        term = self.primary()
+        path: List[tuple] = []
+        while True:
+            if self.accept("."):
+                path.append(("scalar", self.ident()))
+            elif self.at("["):
+                self.advance()
+                path.append(self.term())
+                self.expect("]")
+            else:
+                break
+        return ("ref", term, path) if path else term
+
+    def primary(self) -> tuple:
+        token = self.token
+        if token.kind == "number":
+            self.advance()
+            number = float(token.text)
+            is_int = number.is_integer() and not re.search("[.eE]", token.text)
+            return ("scalar", int(token.text) if is_int else number)
+        if token.kind == "string":
+            self.advance()
+            return ("scalar", _decode_string(token))
+        if token.kind == "raw":
+            self.advance()
+            return ("scalar", token.text[1:-1])
+        if token.kind == "ident":
+            self.advance()
+            if token.text in ("true", "false", "null"):
+                return (
+                    "scalar",
+                    {"true": True, "false": False, "null": None}[token.text],
+                )
+            if self.at("("):
+                return ("call", token.text, self.items("(", ")"), token.line)
+            return ("var", token.text)
+        if self.at("("):
+            self.advance()
+            term = self.term()
+            self.expect(")")
+            return term
+        if self.at("["):
+            return ("array", self.items("[", "]"))
+        if self.at("{"):
+            return self.collection()
+        self.error("expected a term")
+
+    def items(self, open_: str, close: str) -> List[tuple]:
+        self.expect(open_)
+        items: List[tuple] = []
+        while True:
+            self.skip_newlines()
+            if self.accept(close):
+                return items
+            items.append(self.term())
+            self.skip_newlines()
+            if not self.accept(","):
+                self.skip_newlines()
+                self.expect(close)
+                return items
+
+    def collection(self) -> tuple:
+        self.expect("{")
+        self.skip_newlines()
+        if self.accept("}"):
+            return ("object", [])
+        first = self.term()
+        self.skip_newlines()
+        if not self.accept(":"):
+            elements = [first]
+            while self.accept(","):
+                self.skip_newlines()
+                if self.at("}"):
+                    break
+                elements.append(self.term())
+                self.skip_newlines()
+            self.skip_newlines()
+            self.expect("}")
+            return ("set", elements)
+
+        pairs = [(first, self.term())]
+        while True:
+            self.skip_newlines()
+            if self.accept("}"):
+                return ("object", pairs)
+            self.expect(",")
+            self.skip_newlines()
+            if self.accept("}"):
+                return ("object", pairs)
+            key = self.term()
+            self.skip_newlines()
+            self.expect(":")
+            pairs.append((key, self.term()))
+
+
+def _decode_string(token: _Token) -> str:
+    try:
+        return json.loads(token.text)
+    except ValueError:
+        raise RegoCompileError(token.line, f"invalid string {token.text}")
+
+
+# ---------------------------------------------------------------------------
+# Compilation
+
+
+class _Evaluation:
+    """Per-evaluation state: the input document and memoized rule values"""
+
+    __slots__ = ("input", "data", "cache")
+
+    def __init__(self, input_data: Any, data: Dict[str, Any]):
+        self.input = input_data
+        self.data = data
+        self.cache: Dict[str, Any] = {}
+
+
+def _lookup(value: Any, key: Any) -> Any:
+    if type(value) is dict:
+        return value.get(key, UNDEFINED) if type(key) is str else UNDEFINED
+    if type(value) is list and type(key) is int and 0 <= key < len(value):
+        return value[key]
+    return UNDEFINED
+
+
+def _walk(base: Term, path: List[Tuple[Term, Any]]) -> Term:
+    """Reference closure following constant or computed keys from a base"""
+    if all(const is not _NOT_CONST for _, const in path):
+        keys = tuple(const for _, const in path)
+        if len(keys) == 1 and type(keys[0]) is str:
+            key = keys[0]
+
+            def get_one(ctx, env):
+                value = base(ctx, env)
+                if type(value) is dict:
+                    return value.get(key, UNDEFINED)
+                return UNDEFINED
+
+            return get_one
+
+        def get_const(ctx, env):
+            value = base(ctx, env)
+            for key in keys:
+                value = _lookup(value, key)
+                if value is UNDEFINED:
+                    return UNDEFINED
+            return value
+
+        return get_const
+
+    key_fns = tuple(fn for fn, _ in path)
+
+    def get(ctx, env):
+        value = base(ctx, env)
+        for key_fn in key_fns:
+            key = key_fn(ctx, env)
+            if key is UNDEFINED:
+                return UNDEFINED
+            value = _lookup(value, key)
+            if value is UNDEFINED:
+                return UNDEFINED
+        return value
+
+    return get
+
+
+def _compare_closure(op: str, left: Term, right: Term, lc: Any, rc: Any) -> Filter:
+    """Comparison filter, specialized when one side is a number constant"""
+    if op == "==":
+        if rc is not _NOT_CONST and type(rc) in (str, int, float, type(None)):
+            numeric = _is_number(rc)
+
+            def eq_const(ctx, env):
+                value = left(ctx, env)
+                if numeric:
+                    return _is_number(value) and value == rc
+                return type(value) is type(rc) and value == rc
+
+            return eq_const
+
+        def eq(ctx, env):
+            a = left(ctx, env)
+            if a is UNDEFINED:
+                return False
+            b = right(ctx, env)
+            return b is not UNDEFINED and rego_equal(a, b)
+
+        return eq
+
+    if op == "!=":
+
+        def ne(ctx, env):
+            a = left(ctx, env)
+            if a is UNDEFINED:
+                return False
+            b = right(ctx, env)
+            return b is not UNDEFINED and not rego_equal(a, b)
+
+        return ne
+
+    test = {
+        "<": lambda order: order < 0,
+        "<=": lambda order: order <= 0,
+        ">": lambda order: order > 0,
+        ">=": lambda order: order >= 0,
+    }[op]
+    native = {
+        "<": lambda a, b: a < b,
+        "<=": lambda a, b: a <= b,
+        ">": lambda a, b: a > b,
+        ">=": lambda a, b: a >= b,
+    }[op]
+
+    if rc is not _NOT_CONST and _is_number(rc):
+        # Anything ranked below numbers is less than rc, anything above greater
+        below = op in ("<", "<=")
+
+        def cmp_number(ctx, env):
+            a = left(ctx, env)
+            if type(a) is int or type(a) is float:
+                return native(a, rc)
+            if a is UNDEFINED:
+                return False
+            return below == (_rank(a) < 2)
+
+        return cmp_number
+
+    def cmp(ctx, env):
+        a = left(ctx, env)
+        if a is UNDEFINED:
+            return False
+        b = right(ctx, env)
+        if b is UNDEFINED:
+            return False
+        if _is_number(a) and _is_number(b):
+            return native(a, b)
+        return test(rego_compare(a, b))
+
+    return cmp
+
+
+class _Compiler:
+    """Compiles parsed modules sharing one package into rule closures"""
+
+    def __init__(self, modules: List[_Module]):
+        packages = {module.package for module in modules}
+        if len(packages) != 1:
+            raise RegoCompileError(0, f"expected one package, got {sorted(packages)}")
+        self.package = packages.pop()
+        self.package_path = self.package.split(".")
+
+        self.definitions: Dict[str, List[_Rule]] = {}
+        self.defaults: Dict[str, _Rule] = {}
+        self.order: List[str] = []
+        for module in modules:
+            for rule in module.rules:
+                if rule.name not in self.order:
+                    self.order.append(rule.name)
+                if rule.kind == "default":
+                    if rule.name in self.defaults:
+                        raise RegoCompileError(
+                            rule.line, f"multiple defaults for {rule.name}"
+                        )
+                    self.defaults[rule.name] = rule
+                else:
+                    self.definitions.setdefault(rule.name, []).append(rule)
+        for name, rules in self.definitions.items():
+            if len({rule.kind for rule in rules}) > 1:
+                raise RegoCompileError(
+                    rules[0].line, f"{name} is both a set and a complete rule"
+                )
+
+        self.rules: Dict[str, Callable[[_Evaluation], Any]] = {}
+        self.dependencies: Dict[str, Set[str]] = {}
+        self._current: Optional[str] = None
+
+    def compile(self) -> Dict[str, Callable[[_Evaluation], Any]]:
+        for name in self.order:
+            self._current = name
+            self.dependencies[name] = set()
+            self.rules[name] = self.compile_rule(name)
+        self.check_recursion()
+        return self.rules
+
+    def check_recursion(self) -> None:
+        done: Set[str] = set()
+
+        def visit(name: str, stack: List[str]) -> None:
+            if name in stack:
+                cycle = " -> ".join(stack[stack.index(name) :] + [name])
+                line = self.first_line(name)
+                raise RegoCompileError(line, f"recursive rules: {cycle}")
+            if name in done:
+                return
+            for dependency in sorted(self.dependencies.get(name, ())):
+                visit(dependency, stack + [name])
+            done.add(name)
+
+        for name in self.order:
+            visit(name, [])
+
+    def first_line(self, name: str) -> int:
+        rules = self.definitions.get(name) or [self.defaults[name]]
+        return rules[0].line
+
+    # Rules
+
+    def compile_rule(self, name: str) -> Callable[[_Evaluation], Any]:
+        default = UNDEFINED
+        if name in self.defaults:
+            rule = self.defaults[name]
+            assert rule.value is not None  # the parser requires a default value
+            _, const = self.term(rule.value, set(), rule.line)
+            if const is _NOT_CONST:
+                raise RegoCompileError(
+                    rule.line, f"default value of {name} must be constant"
+                )
+            default = const
+
+        definitions: List[Tuple[Solve, Optional[Term]]] = []
+        bodies = []
+        for rule in self.definitions.get(name, []):
+            scope: Set[str] = set()
+            solve, filters = self.body(rule.body or [], scope)
+            value = None
+            if rule.value is not None:
+                value, const = self.term(rule.value, scope, rule.line)
+                if const is True and rule.kind == "complete":
+                    value = None
+            definitions.append((solve, value))
+            bodies.append(filters)
+
+        if definitions and self.definitions[name][0].kind == "set":
+            # The parser requires a value for every partial set rule
+            return self.set_rule(
+                [(solve, value) for solve, value in definitions if value is not None]
+            )
+
+        if all(value is None for _, value in definitions) and None not in bodies:
+            # Every definition yields true, so the first body that holds decides
+            filter_bodies = tuple(bodies)
+
+            def boolean_filter_rule(ctx):
+                env = {}
+                for filters in filter_bodies:
+                    for test in filters:
+                        if not test(ctx, env):
+                            break
+                    else:
+                        return True
+                return default
+
+            return boolean_filter_rule
+
+        if all(value is None for _, value in definitions):
+            solvers = tuple(solve for solve, _ in definitions)
+
+            def boolean_rule(ctx):
+                for solve in solvers:
+                    for _ in solve(ctx, {}):
+                        return True
+                return default
+
+            return boolean_rule
+
+        def complete_rule(ctx):
+            result = UNDEFINED
+            for solve, value in definitions:
+                for env in solve(ctx, {}):
+                    current = True if value is None else value(ctx, env)
+                    if current is UNDEFINED:
+                        continue
+                    if result is UNDEFINED:
+                        result = current
+                    elif not rego_equal(result, current):
+                        raise RegoEvalError(
+                            f"rule {name} produced conflicting values "
+                            f"{result!r} and {current!r}"
+                        )
+            return default if result is UNDEFINED else result
+
+        return complete_rule
+
+    def set_rule(
+        self, definitions: List[Tuple[Solve, Term]]
+    ) -> Callable[[_Evaluation], Any]:
+        def rule(ctx):
+            values = []
+            for solve, value in definitions:
+                for env in solve(ctx, {}):
+                    current = value(ctx, env)
+                    if current is not UNDEFINED:
+                        values.append(current)
+            return _set_value(values)
+
+        return rule
+
+    # Bodies
+
+    def body(
+        self, expressions: List[tuple], scope: Set[str]
+    ) -> Tuple[Solve, Optional[Tuple[Filter, ...]]]:
+        """Compile a body into a solver, plus its filters if none iterate"""
+        steps = [self.expression(expression, scope) for expression in expressions]
+        if all(not is_generator for is_generator, _ in steps):
+            filters = tuple(fn for _, fn in steps)
+
+            def solve_filters(ctx, env):
+                for test in filters:
+                    if not test(ctx, env):
+                        return ()
+                return (env,)
+
+            return solve_filters, filters
+
+        steps_tuple = tuple(steps)
+
+        def solve(ctx, env):
+            return _solve(steps_tuple, 0, ctx, env)
+
+        return solve, None
+
+    def expression(self, expression: tuple, scope: Set[str]) -> Tuple[bool, Any]:
+        """Compile one body expression into (is_generator, closure)"""
+        kind = expression[0]
+        line = expression[-1]
+
+        if kind == "term":
+            fn, const = self.term(expression[1], scope, line)
+            if const is not _NOT_CONST:
+                constant = const is not False
+                return False, lambda ctx, env: constant
+
+            def truthy(ctx, env):
+                value = fn(ctx, env)
+                return value is not UNDEFINED and value is not False
+
+            return False, truthy
+
+        if kind == "not":
+            is_generator, inner = self.expression(expression[1], set(scope))
+            if is_generator:
+                return False, lambda ctx, env: not any(True for _ in inner(ctx, env))
+            return False, lambda ctx, env: not inner(ctx, env)
+
+        if kind == "compare":
+            _, op, left_term, right_term, _ = expression
+            left, lc = self.term(left_term, scope, line)
+            right, rc = self.term(right_term, scope, line)
+            if lc is not _NOT_CONST and rc is _NOT_CONST:
+                # Put the constant on the right
+                flipped = {"<": ">", "<=": ">=", ">": "<", ">=": "<="}.get(op, op)
+                return False, _compare_closure(flipped, right, left, rc, lc)
+            return False, _compare_closure(op, left, right, lc, rc)
+
+        if kind == "member":
+            return False, self.member(expression[1], expression[2], scope, line)
+
+        if kind == "assign":
+            target = expression[1]
+            if target[0] != "var" or target[1] in ("input", "data", "_"):
+                raise RegoCompileError(line, "':=' needs a variable on the left")
+            if target[1] in scope:
+                raise RegoCompileError(line, f"variable {target[1]} assigned twice")
+            return False, self.bind(target[1], expression[2], scope, line)
+
+        if kind == "unify":
+            left, right = expression[1], expression[2]
+            for target, source in ((left, right), (right, left)):
+                if target[0] == "var" and self.is_unbound(target[1], scope):
+                    return False, self.bind(target[1], source, scope, line)
+            return self.expression(("compare", "==", left, right, line), scope)
+
+        if kind == "some_in":
+            return True, self.some_in(expression, scope, line)
+
+        if kind == "with":
+            return self.with_input(expression, scope, line)
+
+        raise RegoCompileError(line, f"unsupported expression {kind}")
+
+    def is_unbound(self, name: str, scope: Set[str]) -> bool:
+        return (
+            name not in scope
+            and name not in ("input", "data", "_")
+            and name not in self.definitions
+            and name not in self.defaults
+        )
+
+    def bind(self, name: str, source: tuple, scope: Set[str], line: int) -> Filter:
+        value, _ = self.term(source, scope, line)
+        scope.add(name)
+
+        def assign(ctx, env):
+            result = value(ctx, env)
+            if result is UNDEFINED:
+                return False
+            env[name] = result
+            return True
+
+        return assign
+
+    def member(
+        self, element: tuple, collection: tuple, scope: Set[str], line: int
+    ) -> Filter:
+        value, _ = self.term(element, scope, line)
+        items, const = self.term(collection, scope, line)
+
+        if const is not _NOT_CONST:
+            members = const.values() if type(const) is dict else const
+            keys = frozenset(_freeze(member) for member in members)
+
+            def member_const(ctx, env):
+                current = value(ctx, env)
+                return current is not UNDEFINED and _freeze(current) in keys
+
+            return member_const
+
+        def member(ctx, env):
+            current = value(ctx, env)
+            if current is UNDEFINED:
+                return False
+            found = items(ctx, env)
+            if type(found) is dict:
+                found = found.values()
+            elif type(found) is not list:
+                return False
+            return any(rego_equal(current, candidate) for candidate in found)
+
+        return member
+
+    def some_in(self, expression: tuple, scope: Set[str], line: int) -> Solve:
+        _, key_name, value_name, collection, _ = expression
+        items, _ = self.term(collection, scope, line)
+        names = [n for n in (key_name, value_name) if n is not None and n != "_"]
+        for name in names:
+            if name in scope:
+                raise RegoCompileError(line, f"variable {name} assigned twice")
+            scope.add(name)
+        key_name = key_name if key_name != "_" else None
+        value_name = value_name if value_name != "_" else None
+
+        def iterate(ctx, env):
+            found = items(ctx, env)
+            if type(found) is dict:
+                pairs: Iterable[Tuple[Any, Any]] = found.items()
+            elif type(found) is list:
+                pairs = enumerate(found)
+            else:
+                return
+            for key, value in pairs:
+                if key_name is not None:
+                    env[key_name] = key
+                if value_name is not None:
+                    env[value_name] = value
+                yield env
+
+        return iterate
+
+    def with_input(
+        self, expression: tuple, scope: Set[str], line: int
+    ) -> Tuple[bool, Any]:
+        _, inner_expression, replacement, _ = expression
+        new_input, _ = self.term(replacement, scope, line)
+        is_generator, inner = self.expression(inner_expression, scope)
+
+        if is_generator:
+
+            def with_generator(ctx, env):
+                return inner(_Evaluation(new_input(ctx, env), ctx.data), env)
+
+            return True, with_generator
+
+        def with_filter(ctx, env):
+            return inner(_Evaluation(new_input(ctx, env), ctx.data), env)
+
+        return False, with_filter
+
+    # Terms
+
+    def term(self, term: tuple, scope: Set[str], line: int) -> Tuple[Term, Any]:
+        """Compile a term into (closure, constant value or _NOT_CONST)"""
+        kind = term[0]
+
+        if kind == "scalar":
+            value = term[1]
+            return (lambda ctx, env: value), value
+
+        if kind == "var":
+            return self.var(term[1], scope, line), _NOT_CONST
+
+        if kind == "ref":
+            return self.ref(term[1], term[2], scope, line), _NOT_CONST
+
+        if kind in ("array", "set"):
+            compiled = [self.term(item, scope, line) for item in term[1]]
+            if all(const is not _NOT_CONST for _, const in compiled):
+                values = [const for _, const in compiled]
+                if kind == "set":
+                    values = _set_value(values)
+                return (lambda ctx, env: values), values
+            fns = tuple(fn for fn, _ in compiled)
+            is_set = kind == "set"
+
+            def build_array(ctx, env):
+                values = []
+                for fn in fns:
+                    value = fn(ctx, env)
+                    if value is UNDEFINED:
+                        return UNDEFINED
+                    values.append(value)
+                return _set_value(values) if is_set else values
+
+            return build_array, _NOT_CONST
+
+        if kind == "object":
+            compiled_pairs = [
+                (self.term(key, scope, line), self.term(value, scope, line))
+                for key, value in term[1]
+            ]
+            if all(
+                kc is not _NOT_CONST and vc is not _NOT_CONST
+                for (_, kc), (_, vc) in compiled_pairs
+            ):
+                obj = {kc: vc for (_, kc), (_, vc) in compiled_pairs}
+                return (lambda ctx, env: obj), obj
+            fn_pairs = tuple((kf, vf) for (kf, _), (vf, _) in compiled_pairs)
+
+            def build_object(ctx, env):
+                obj = {}
+                for key_fn, value_fn in fn_pairs:
+                    key = key_fn(ctx, env)
+                    value = value_fn(ctx, env)
+                    if key is UNDEFINED or value is UNDEFINED:
+                        return UNDEFINED
+                    obj[key] = value
+                return obj
+
+            return build_object, _NOT_CONST
+
+        if kind == "call":
+            _, name, args, call_line = term
+            builtin = BUILTINS.get(name)
+            if builtin is None:
+                raise RegoCompileError(call_line, f"unsupported function {name}")
+            arg_fns = tuple(self.term(arg, scope, line)[0] for arg in args)
+
+            def call(ctx, env):
+                values = [fn(ctx, env) for fn in arg_fns]
+                if UNDEFINED in values:
+                    return UNDEFINED
+                try:
+                    return builtin(*values)
+                except TypeError:
+                    return UNDEFINED
+
+            return call, _NOT_CONST
+
+        if kind == "arith":
+            _, op, left_term, right_term = term
+            left, lc = self.term(left_term, scope, line)
+            right, rc = self.term(right_term, scope, line)
+            if lc is not _NOT_CONST and rc is not _NOT_CONST:
+                value = _arithmetic(op, lc, rc)
+                return (lambda ctx, env: value), value
+
+            def arith(ctx, env):
+                a = left(ctx, env)
+                if a is UNDEFINED:
+                    return UNDEFINED
+                b = right(ctx, env)
+                if b is UNDEFINED:
+                    return UNDEFINED
+                return _arithmetic(op, a, b)
+
+            return arith, _NOT_CONST
+
+        raise RegoCompileError(line, f"unsupported term {kind}")
+
+    def var(self, name: str, scope: Set[str], line: int) -> Term:
+        if name in scope:
+            return lambda ctx, env: env[name]
+        if name == "input":
+            return lambda ctx, env: ctx.input
+        if name == "data":
+            return lambda ctx, env: ctx.data
+        if name in self.definitions or name in self.defaults:
+            return self.rule_ref(name)
+        raise RegoCompileError(line, f"undefined variable {name}")
+
+    def rule_ref(self, name: str) -> Term:
+        assert self._current is not None  # set by compile() for each rule
+        self.dependencies[self._current].add(name)
+        rules = self.rules
+
+        def value(ctx, env):
+            result = ctx.cache.get(name, _UNCACHED)
+            if result is _UNCACHED:
+                result = ctx.cache[name] = rules[name](ctx)
+            return result
+
+        return value
+
+    def ref(self, head: tuple, path: List[tuple], scope: Set[str], line: int) -> Term:
+        if head == ("var", "data"):
+            constant = []
+            for element in path:
+                if element[0] != "scalar":
+                    break
+                constant.append(element[1])
+            depth = len(self.package_path)
+            if constant[:depth] == self.package_path and len(constant) > depth:
+                name = constant[depth]
+                if name in self.definitions or name in self.defaults:
+                    return self.ref(("var", name), path[depth + 1 :], scope, line)
+        base, _ = self.term(head, scope, line)
+        if not path:
+            return base
+        return _walk(base, [self.term(element, scope, line) for element in path])
+
+
+def _solve(
+    steps: Tuple[Tuple[bool, Any], ...],
+    index: int,
+    ctx: _Evaluation,
+    env: Dict[str, Any],
+):
+    """Depth-first search over body expressions that can iterate"""
+    count = len(steps)
+    while index < count:
+        is_generator, fn = steps[index]
+        if is_generator:
+            for solution in fn(ctx, env):
+                yield from _solve(steps, index + 1, ctx, solution)
+            return
+        if not fn(ctx, env):
+            return
+        index += 1
+    yield env
+
+
+# ---------------------------------------------------------------------------
+# Public API
+
+
+class RegoPolicy:
+    """A compiled Rego package
+
+    ``evaluate`` returns the package document OPA would return for
+    ``data.<package>``: every rule with a defined value.
+    """
+
+    def __init__(self, *sources: str):
+        if not sources:
+            raise ValueError("at least one Rego source is required")
+        modules = [_Parser(source).module() for source in sources]
+        compiler = _Compiler(modules)
+        self.package = compiler.package
+        self.rule_names = list(compiler.order)
+        self._rules = compiler.compile()
+
+    def evaluate(
+        self, input_data: Any = UNDEFINED, data: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Evaluate every rule for an input"""
+        ctx = _Evaluation(input_data, data or {})
+        rules = self._rules
+        cache = ctx.cache
+        document = {}
+        for name in self.rule_names:
+            if name in cache:
+                value = cache[name]
+            else:
+                value = cache[name] = rules[name](ctx)
+            if value is not UNDEFINED:
+                document[name] = value
+        return document
+
+    def query(
+        self,
+        rule: str,
+        input_data: Any = UNDEFINED,
+        data: Optional[Dict[str, Any]] = None,
+        default: Any = None,
+    ) -> Any:
+        """Evaluate one rule; returns ``default`` when it is undefined"""
+        if rule not in self._rules:
+            raise KeyError(f"{self.package} has no rule {rule}")
+        ctx = _Evaluation(input_data, data or {})
+        value = ctx.cache[rule] = self._rules[rule](ctx)
+        return default if value is UNDEFINED else value
+
+    def run_tests(self) -> Dict[str, bool]:
+        """Evaluate the ``test_`` rules loaded with the policy"""
+        return {
+            name: self.query(name, default=False) is True
+            for name in self.rule_names
+            if name.startswith("test_")
+        }
+
+
+def policy_sources(path: Union[str, Path], include_tests: bool = False) -> List[str]:
+    """Read a .rego file, or every .rego file in a directory, in name order"""
+    path = Path(path)
+    files = sorted(path.glob("*.rego")) if path.is_dir() else [path]
+    if not include_tests:
+        files = [f for f in files if not f.name.endswith("_test.rego")]
+    if not files:
+        raise FileNotFoundError(f"no Rego files in {path}")
+    return [f.read_text() for f in files]
+
+
+class RegoCompiler:
+    """Compiles policies, caching compiled packages by source hash"""
+
+    def __init__(self, max_entries: int = 64):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, RegoPolicy]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def compile(self, *sources: str) -> RegoPolicy:
+        """Compile sources, reusing an earlier compilation of identical text"""
+        digest = hashlib.sha256("\0".join(sources).encode()).hexdigest()
+        with self._lock:
+            policy = self._entries.get(digest)
+            if policy is not None:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return policy
+            self.misses += 1
+
+        policy = RegoPolicy(*sources)
+        with self._lock:
+            self._entries[digest] = policy
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return policy
+
+    def load(self, path: Union[str, Path], include_tests: bool = False) -> RegoPolicy:
+        """Compile a policy file or directory"""
+        return self.compile(*policy_sources(path, include_tests))
+
+    def clear(self) -> None:
+        """Drop all compiled policies"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get compilation cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_default_compiler = RegoCompiler()
+
+
+def load_rego_policy(path: Union[str, Path], include_tests: bool = False) -> RegoPolicy:
+    """Compile a policy with the shared, hash-keyed compiler cache"""
+    return _default_compiler.load(path, include_tests)
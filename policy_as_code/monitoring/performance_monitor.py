@@ -99,6 +99,15 @@ class MetricsCollector:
         self.timers[name].append(duration)
         self._record_metric(name, duration, MetricType.TIMER, tags)
 
+    def record_sample(
+        self, name: str, duration: float, tags: Optional[Dict[str, str]] = None
+    ):
+        """Record a timer point in the bounded history only
+
+        For per-request series, which would grow ``timers`` without limit.
+        """
+        self._record_metric(name, duration, MetricType.TIMER, tags)
+
     def _record_metric(
         self,
         name: str,
@@ -353,6 +362,52 @@ class PerformanceMonitor:
         tags = {"operation": operation, "hit": str(hit)}
         self.metrics_collector.record_counter("cache_operations", 1, tags)
 
+    def record_execution_dispatch(
+        self,
+        function_id: str,
+        mode: str,
+        estimated_cost_ms: Optional[float] = None,
+        count: int = 1,
+    ):
+        """Record which execution backend a decision was routed to"""
+        tags = {"function_id": function_id, "mode": mode}
+        self.metrics_collector.record_counter(f"execution_dispatch_{mode}", count, tags)
+        if estimated_cost_ms is not None:
+            self.metrics_collector.record_gauge(
+                "execution_cost_estimate_ms", estimated_cost_ms, tags
+            )
+
+    def record_admission(
+        self,
+        function_id: str,
+        admitted: bool,
+        wait_ms: float,
+        queue_depth: int,
+        reason: Optional[str] = None,
+        client_id: Optional[str] = None,
+    ):
+        """Record an admission control decision and its queue wait"""
+        tags = {"function_id": function_id}
+        if client_id is not None:
+            tags["client_id"] = client_id
+        if admitted:
+            self.metrics_collector.record_counter("admission_admitted", 1, tags)
+            self.metrics_collector.record_sample("admission_wait_ms", wait_ms, tags)
+        else:
+            tags["reason"] = reason or "rejected"
+            self.metrics_collector.record_counter("admission_rejected", 1, tags)
+        self.metrics_collector.record_gauge("admission_queue_depth", queue_depth)
+
+    def record_admission_latency(
+        self, function_id: str, client_id: str, latency_ms: float
+    ):
+        """Record queue wait plus execution time for an admitted request"""
+        self.metrics_collector.record_sample(
+            "admission_latency_ms",
+            latency_ms,
+            {"function_id": function_id, "client_id": client_id},
+        )
+
     def record_storage_operation(self, operation: str, duration_ms: float):
         """Record storage operation metrics"""
         tags = {"operation": operation}
@@ -434,6 +489,25 @@ class PerformanceMonitor:
             "p95_execution_time_ms": decision_summary.get("p95", 0),
             "p99_execution_time_ms": decision_summary.get("p99", 0),
             "active_alerts": len(self.alert_manager.get_active_alerts()),
+            "execution_dispatch": {
+                name[len("execution_dispatch_") :]: count
+                for name, count in self.metrics_collector.counters.items()
+                if name.startswith("execution_dispatch_")
+            },
+            "admission": {
+                "admitted": self.metrics_collector.counters.get(
+                    "admission_admitted", 0
+                ),
+                "rejected": self.metrics_collector.counters.get(
+                    "admission_rejected", 0
+                ),
+                "queue_depth": self.metrics_collector.gauges.get(
+                    "admission_queue_depth", 0
+                ),
+                "p99_wait_ms": self.metrics_collector.get_metric_summary(
+                    "admission_wait_ms", 60
+                ).get("p99", 0),
+            },
             "registered_functions": self.metrics_collector.counters.get(
                 "functions_registered", 0
             ),
@@ -24,14 +24,14 @@ MISSING PRODUCTION FEATURES:
 
 import hashlib
 import hmac
-import json
 import time
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Union
 from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from enum import Enum
 
 from .errors import DecisionLayerError
+from ..utils.canonical import CanonicalPayload, canonical_hash, canonical_json
 
 
 class NonceType(str, Enum):
@@ -187,7 +187,10 @@ class ReplayProtector:
         return nonce
 
     def validate_nonce(
-        self, nonce: str, caller_id: str, request_data: Optional[Dict[str, Any]] = None
+        self,
+        nonce: str,
+        caller_id: str,
+        request_data: Optional[Union[Dict[str, Any], CanonicalPayload]] = None,
     ) -> bool:
         """Validate nonce and prevent replay attacks"""
 
@@ -242,11 +245,13 @@ class ReplayProtector:
 
         return True
 
-    def _calculate_request_hash(self, request_data: Dict[str, Any]) -> str:
-        """Calculate hash of request data"""
-        # Sort keys for consistent hashing
-        sorted_data = json.dumps(request_data, sort_keys=True, separators=(",", ":"))
-        return hashlib.sha256(sorted_data.encode("utf-8")).hexdigest()
+    def _calculate_request_hash(
+        self, request_data: Union[Dict[str, Any], CanonicalPayload]
+    ) -> str:
+        """Calculate hash of request data, reusing a precomputed digest"""
+        if isinstance(request_data, CanonicalPayload):
+            return request_data.digest
+        return canonical_hash(request_data)
 
     def _cleanup_expired_nonces(self) -> None:
         """Clean up expired nonces"""
@@ -314,7 +319,7 @@ class RequestSigner:
             nonce,
             caller_id,
             timestamp.isoformat(),
-            json.dumps(request_data, sort_keys=True, separators=(",", ":")),
+            canonical_json(request_data),
         ]
 
         message = "|".join(message_parts)
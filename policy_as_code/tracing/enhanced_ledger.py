@@ -11,6 +11,7 @@ from dataclasses import dataclass, asdict
 from enum import Enum
 
 from policy_as_code.core.types import DecisionContext, DecisionResult
+from policy_as_code.utils.canonical import canonical_hash
 
 
 class TraceEntryType(Enum):
@@ -55,10 +56,27 @@ class ImmutableTraceLedger:
         return self._hash_data(genesis_data)
 
     def _hash_data(self, data: Dict[str, Any]) -> str:
-        """Create SHA-256 hash of data"""
+        """Create SHA-256 hash of data; unknown types are hashed as str()"""
+        return canonical_hash(data, lenient=True)
+
+    def _legacy_hash_data(self, data: Dict[str, Any]) -> str:
+        """Hash format used before canonical encoding, for persisted entries"""
         data_str = json.dumps(data, sort_keys=True, default=str)
         return hashlib.sha256(data_str.encode()).hexdigest()
 
+    def _entry_hash_matches(
+        self, entry: TraceEntry, previous_hash: Optional[str]
+    ) -> bool:
+        """Check an entry hash against the canonical and legacy formats"""
+        if entry.hash == self._create_entry_hash(entry.data, previous_hash):
+            return True
+        legacy_data = {
+            "entry_data": entry.data,
+            "previous_hash": previous_hash,
+            "timestamp": entry.data.get("timestamp"),
+        }
+        return entry.hash == self._legacy_hash_data(legacy_data)
+
     def _create_entry_hash(
         self, entry_data: Dict[str, Any], previous_hash: Optional[str]
     ) -> str:
@@ -220,8 +238,8 @@ class ImmutableTraceLedger:
                 )
 
             # Verify entry hash
-            expected_hash = self._create_entry_hash(entry.data, entry.previous_hash)
-            if entry.hash != expected_hash:
+            if not self._entry_hash_matches(entry, entry.previous_hash):
+                expected_hash = self._create_entry_hash(entry.data, entry.previous_hash)
                 verification_result["is_valid"] = False
                 verification_result["errors"].append(
                     f"Invalid hash at entry {i}: expected {expected_hash}, got {entry.hash}"
@@ -308,8 +326,7 @@ class ImmutableTraceLedger:
         for entry in self._entries:
             if entry.previous_hash != self._last_hash:
                 # Hash chain is broken, need to recalculate
-                expected_hash = self._create_entry_hash(entry.data, self._last_hash)
-                if entry.hash != expected_hash:
+                if not self._entry_hash_matches(entry, self._last_hash):
                     print(
                         f"Warning: Hash chain integrity issue at entry {entry.entry_id}"
                     )
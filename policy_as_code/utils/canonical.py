@@ -0,0 +1,116 @@
+"""
+Canonical JSON encoding and hashing
+
+Every component that fingerprints a payload (engine cache keys, trace ledger,
+idempotency keys, replay protection, bulletproof flow) goes through this
+module so the same input always produces the same bytes and the same digest.
+
+The encoding is sorted-key, compact JSON (``separators=(",", ":")``) with
+ASCII escaping. Values the standard encoder rejects are normalised:
+
+- ``datetime``/``date``/``time`` -> ISO 8601 string
+- ``Decimal`` -> its exact string form (no float rounding)
+- ``UUID``, URL objects (pydantic ``Url``/``AnyUrl``, ``yarl.URL``, ...) -> ``str``
+- ``Enum`` -> its value
+- ``set``/``frozenset`` -> sorted list
+- ``bytes`` -> hex string
+
+Anything else raises ``TypeError``, except with ``lenient=True``, where it is
+encoded as ``str(value)`` the way ``json.dumps(default=str)`` did. The trace
+ledger hashes with ``lenient=True`` because it accepts arbitrary event data.
+
+A :class:`CanonicalPayload` is built once per request and carried on the
+decision context so downstream consumers reuse the digest instead of
+re-serialising the input.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any
+from uuid import UUID
+
+
+def _default(obj: Any) -> Any:
+    """Normalise values the JSON encoder does not handle natively"""
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=canonical_json)
+    if isinstance(obj, (bytes, bytearray)):
+        return obj.hex()
+    type_name = type(obj).__name__
+    if "Url" in type_name or "URL" in type_name:
+        return str(obj)
+    if hasattr(obj, "url"):  # Pydantic URL wrappers
+        return str(obj.url)
+    raise TypeError(f"Object of type {type_name} is not JSON serializable")
+
+
+def _lenient_default(obj: Any) -> Any:
+    try:
+        return _default(obj)
+    except TypeError:
+        return str(obj)
+
+
+# A single pre-configured encoder avoids rebuilding a JSONEncoder on every
+# json.dumps() call with non-default arguments; encode() still takes the C
+# fast path because indent is None.
+_ENCODER = json.JSONEncoder(
+    sort_keys=True,
+    separators=(",", ":"),
+    default=_default,
+)
+_LENIENT_ENCODER = json.JSONEncoder(
+    sort_keys=True,
+    separators=(",", ":"),
+    default=_lenient_default,
+)
+
+
+def canonical_json(data: Any) -> str:
+    """Serialise data to its canonical JSON text"""
+    return _ENCODER.encode(data)
+
+
+def canonical_bytes(data: Any, lenient: bool = False) -> bytes:
+    """Serialise data to canonical UTF-8 encoded JSON"""
+    encoder = _LENIENT_ENCODER if lenient else _ENCODER
+    return encoder.encode(data).encode("utf-8")
+
+
+def canonical_hash(data: Any, lenient: bool = False) -> str:
+    """SHA-256 hex digest of the canonical encoding of data"""
+    return hashlib.sha256(canonical_bytes(data, lenient)).hexdigest()
+
+
+@dataclass(frozen=True)
+class CanonicalPayload:
+    """Canonical bytes of a payload together with their SHA-256 digest"""
+
+    data: bytes
+    digest: str
+
+    @classmethod
+    def of(cls, data: Any) -> "CanonicalPayload":
+        """Serialise and hash data exactly once"""
+        encoded = canonical_bytes(data)
+        return cls(data=encoded, digest=hashlib.sha256(encoded).hexdigest())
+
+    @property
+    def text(self) -> str:
+        """Canonical JSON text"""
+        return self.data.decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.data)
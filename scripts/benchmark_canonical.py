@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Canonical JSON Micro-benchmark
+
+Compares the per-request hashing done before the shared canonical encoder
+(each of REST, idempotency, engine, replay and bulletproof flow serialising
+and hashing the input on its own) with hashing the input once into a
+CanonicalPayload that downstream consumers reuse.
+
+Usage: python scripts/benchmark_canonical.py [--iterations N]
+"""
+
+import argparse
+import hashlib
+import json
+import sys
+import timeit
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from policy_as_code.utils.canonical import (  # noqa: E402
+    CanonicalPayload,
+    canonical_bytes,
+)
+
+SAMPLE_INPUT = {
+    "applicant_id": "FI-123456-789A",
+    "income": 28450,
+    "household_size": 3,
+    "dependants": [{"age": 4}, {"age": 9}],
+    "address": {"city": "Helsinki", "postal_code": "00100"},
+    "employment": {"status": "part_time", "hours_per_week": 24},
+    "flags": ["student", "resident"],
+}
+
+RICH_INPUT = {
+    **SAMPLE_INPUT,
+    "submitted_at": datetime(2024, 5, 1, 12, 30),
+    "benefit_rate": Decimal("0.4250"),
+}
+
+
+def legacy_request_hashes(data):
+    """Hashing performed per request before the shared encoder"""
+    client = "xroad:FI/ORG/1234567-8"
+    # enhanced_rest.execute_decision
+    hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    # enhanced_rest.get_idempotency_key
+    digest = hashlib.sha256(str(data).encode()).hexdigest()
+    hashlib.sha256(f"{client}:f:1.0:{digest}".encode()).hexdigest()
+    # DecisionEngine._hash_input
+    hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+    # ReplayProtector._calculate_request_hash
+    text = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    hashlib.sha256(text.encode("utf-8")).hexdigest()
+    # BulletproofDecisionFlow._calculate_hash
+    text = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    hashlib.sha256(text.encode()).hexdigest()
+
+
+def hash_once(data):
+    """Hashing performed per request with a shared CanonicalPayload"""
+    client = "xroad:FI/ORG/1234567-8"
+    payload = CanonicalPayload.of(data)
+    hashlib.sha256(f"{client}:f:1.0:{payload.digest}".encode()).hexdigest()
+    return payload
+
+
+def run(label, func, iterations):
+    seconds = min(timeit.repeat(func, number=iterations, repeat=5))
+    per_call_us = seconds / iterations * 1e6
+    print(f"  {label:<38} {per_call_us:8.2f} µs/request")
+    return per_call_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    print("🔎 Encoder only")
+    run(
+        "json.dumps(sort_keys, separators)",
+        lambda: json.dumps(
+            SAMPLE_INPUT, sort_keys=True, separators=(",", ":")
+        ).encode(),
+        args.iterations,
+    )
+    run("canonical_bytes", lambda: canonical_bytes(SAMPLE_INPUT), args.iterations)
+
+    print("\n🔎 Full request path")
+    legacy = run(
+        "legacy (5 independent hashes)",
+        lambda: legacy_request_hashes(SAMPLE_INPUT),
+        args.iterations,
+    )
+    shared = run("hash once", lambda: hash_once(SAMPLE_INPUT), args.iterations)
+    run(
+        "hash once (datetime + Decimal)", lambda: hash_once(RICH_INPUT), args.iterations
+    )
+
+    print(f"\n✅ Hash-once path is {legacy / shared:.1f}x faster per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Rule Conflict Detection Benchmark
+
+Times RuleConflictDetector on synthetic benefit-bracket schemas: disjoint
+income bands per municipality, some also bounded by household size, with a
+few deliberately shadowed and overlapping brackets.
+
+Usage: python scripts/benchmark_conflicts.py [--rules N ...]
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from policy_as_code.features.dsl import (  # noqa: E402
+    DSLRule,
+    DSLSchema,
+    Operator,
+    RuleAction,
+    RuleCondition,
+    RuleConflictDetector,
+    RuleType,
+)
+
+MUNICIPALITIES = [f"M{i:03d}" for i in range(100)]
+
+
+def bracket(rule_id: str, priority: int, municipality: str, low: int, high: int):
+    return DSLRule(
+        rule_id=rule_id,
+        rule_type=RuleType.RANGE,
+        priority=priority,
+        conditions=[
+            RuleCondition("municipality", Operator.EQ, municipality),
+            RuleCondition("income", Operator.GE, low),
+            RuleCondition("income", Operator.LT, high),
+        ],
+        actions=[RuleAction("set", "bracket", rule_id)],
+        description=f"Bracket {rule_id}",
+    )
+
+
+def make_schema(rule_count: int) -> DSLSchema:
+    rules = []
+    for i in range(rule_count):
+        municipality = MUNICIPALITIES[i % len(MUNICIPALITIES)]
+        band = i // len(MUNICIPALITIES)
+        low = band * 1000
+        rules.append(bracket(f"b{i}", rule_count - i, municipality, low, low + 1000))
+        if i % 10 == 0:
+            rules[-1].conditions.append(RuleCondition("household_size", Operator.GE, 3))
+        if i % 100 == 55:
+            # A narrower bracket below the same one: shadowed
+            rules.append(bracket(f"s{i}", -i, municipality, low + 200, low + 800))
+        if i % 100 == 85:
+            # A bracket straddling two bands: overlaps both
+            rules.append(bracket(f"o{i}", -i, municipality, low + 500, low + 1500))
+    return DSLSchema(
+        name="benefit_brackets",
+        version="1.0.0",
+        rules=rules[:rule_count],
+        input_schema={
+            "municipality": {"type": "string"},
+            "income": {"type": "number"},
+            "household_size": {"type": "number"},
+        },
+        output_schema={"bracket": {"type": "number"}},
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rules", type=int, nargs="+", default=[1_000, 10_000])
+    args = parser.parse_args()
+
+    for rule_count in args.rules:
+        schema = make_schema(rule_count)
+        started = time.perf_counter()
+        conflicts = RuleConflictDetector().detect_conflicts(schema)
+        elapsed = time.perf_counter() - started
+        counts = Counter(c.conflict_type.value for c in conflicts)
+        print(f"{rule_count:>6} rules: {elapsed:6.2f} s  {dict(counts)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Constraint Checker Benchmark
+
+Times checking a synthetic release of decision functions with
+DFConstraintChecker in-process, with check_functions over a process pool, and
+again once every verdict is cached.
+
+Usage: python scripts/benchmark_constraints.py [--functions N] [--workers N]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from policy_as_code.features.constraints import (  # noqa: E402
+    DFConstraintChecker,
+    check_functions,
+)
+
+
+def make_function(n: int, rules: int) -> str:
+    lines = [
+        "def decision_function(input_data, context):",
+        f'    """Generated function {n}"""',
+        "    result = {}",
+    ]
+    for i in range(rules):
+        lines.append(f"    if input_data.get('field_{i}', 0) >= {n * rules + i}:")
+        lines.append(f"        result['rule_{i}'] = min({i}, len(result))")
+    lines.append("    return result")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--functions", type=int, default=500)
+    parser.add_argument("--rules", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    registry = {f"fn_{n}": make_function(n, args.rules) for n in range(args.functions)}
+
+    DFConstraintChecker.verdicts.clear()
+    started = time.perf_counter()
+    checker = DFConstraintChecker()
+    serial = {name: checker.check_function(code) for name, code in registry.items()}
+    serial_time = time.perf_counter() - started
+
+    DFConstraintChecker.verdicts.clear()
+    started = time.perf_counter()
+    pooled = check_functions(registry, max_workers=args.workers, min_parallel=1)
+    pooled_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    cached = check_functions(registry, max_workers=args.workers)
+    cached_time = time.perf_counter() - started
+
+    if not serial == pooled == cached:
+        raise SystemExit("bulk verdicts differ from single checks")
+
+    print(f"functions: {args.functions}, rules per function: {args.rules}")
+    print(f"in-process:   {serial_time * 1e3:8.1f} ms")
+    print(f"process pool: {pooled_time * 1e3:8.1f} ms")
+    print(f"cached:       {cached_time * 1e3:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Plugin Pipeline Micro-benchmark
+
+Compares the per-execution plugin overhead of awaiting every plugin's
+``process()`` in turn with the fused pipeline, which calls synchronous
+plugins directly and copies the input once for the mutating tracing plugin.
+
+Usage: python scripts/benchmark_plugins.py [--iterations N]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from policy_as_code.core.engine import (  # noqa: E402
+    DecisionContext,
+    TracingPlugin,
+    ValidationPlugin,
+)
+from policy_as_code.core.plugin_pipeline import PluginPipeline  # noqa: E402
+
+SAMPLE_INPUT = {
+    "applicant_id": "FI-123456-789A",
+    "income": 28450,
+    "household_size": 3,
+}
+
+SCHEMA = {
+    "input": {
+        "applicant_id": {"required": True},
+        "income": {"required": True},
+    }
+}
+
+
+def decision_function(input_data, context):
+    return {"eligible": input_data["income"] < 30000}
+
+
+async def awaited_loop(plugins, context, iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        data = dict(SAMPLE_INPUT)
+        for plugin in plugins["pre_execute"]:
+            data = await plugin.process(data, context)
+        result = decision_function(data, context)
+        for plugin in plugins["post_execute"]:
+            result = await plugin.process(result, context)
+    return time.perf_counter() - started
+
+
+async def fused(plugins, context, iterations: int) -> float:
+    pipeline = PluginPipeline(plugins)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        data = pipeline.pre(SAMPLE_INPUT, context)
+        if pipeline.pre_is_async:
+            data = await data
+        result = decision_function(data, context)
+        result = pipeline.post(result, context)
+        if pipeline.post_is_async:
+            result = await result
+    return time.perf_counter() - started
+
+
+async def compare(plugins, context, iterations: int, repeats: int):
+    # Interleave the runs and keep the best of each to damp scheduler noise
+    baseline, optimised = [], []
+    for _ in range(repeats):
+        baseline.append(await awaited_loop(plugins, context, iterations))
+        optimised.append(await fused(plugins, context, iterations))
+    return min(baseline), min(optimised)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50_000)
+    parser.add_argument("--repeats", type=int, default=7)
+    args = parser.parse_args()
+
+    context = DecisionContext(
+        function_id="benefit",
+        version="1.0.0",
+        input_hash="0" * 16,
+        timestamp=datetime.utcnow(),
+        trace_id="benchmark",
+    )
+    with tempfile.TemporaryDirectory() as trace_dir:
+        plugins = {
+            "pre_execute": [ValidationPlugin(SCHEMA), TracingPlugin(trace_dir)],
+            "post_execute": [],
+        }
+        baseline, optimised = asyncio.run(
+            compare(plugins, context, args.iterations, args.repeats)
+        )
+
+    per_call = 1e6 / args.iterations
+    print(f"awaited plugins: {baseline * per_call:.2f} µs/execution")
+    print(f"fused pipeline:  {optimised * per_call:.2f} µs/execution")
+    print(f"speedup:         {baseline / optimised:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Rego Evaluator Benchmark
+
+Checks the in-process Rego evaluator against the fixtures in
+policies/rego/loan_approval/v1.0/policy_test.rego, then times evaluating the
+loan approval package. When an ``opa`` binary is available, a sample of
+inputs is also evaluated through ``opa eval`` and the documents compared.
+
+Usage: python scripts/benchmark_rego.py [--inputs N] [--opa PATH]
+"""
+
+import argparse
+import itertools
+import json
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from policy_as_code.features.rego import (  # noqa: E402
+    RegoEvalError,
+    RegoPolicy,
+    policy_sources,
+)
+
+POLICY_DIR = (
+    Path(__file__).resolve().parent.parent
+    / "policies"
+    / "rego"
+    / "loan_approval"
+    / "v1.0"
+)
+QUERY = "data.org.policy_as_code.loan_approval.v1"
+
+
+def make_inputs():
+    for amount, score, tier, status, income in itertools.product(
+        [None, 1000, 5000, 8000, 15000],
+        [None, 450, 499, 600, 650, 700, 800],
+        ["standard", "premium", "vip", "basic"],
+        ["employed", "unemployed"],
+        [None, 0, 4000],
+    ):
+        data = {
+            "customer_tier": tier,
+            "employment_status": status,
+            "monthly_income": income,
+        }
+        if amount is not None:
+            data["amount"] = amount
+        if score is not None:
+            data["customer_score"] = score
+        yield data
+
+
+def evaluate(policy: RegoPolicy, data):
+    try:
+        return policy.evaluate(data)
+    except RegoEvalError:
+        return "conflict"
+
+
+def opa_evaluate(opa: str, data):
+    result = subprocess.run(
+        [opa, "eval", "-d", str(POLICY_DIR / "policy.rego"), "-I", QUERY],
+        input=json.dumps(data),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return "conflict" if "conflict" in result.stderr else result.stderr
+    return json.loads(result.stdout)["result"][0]["expressions"][0]["value"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--inputs", type=int, default=None)
+    parser.add_argument("--opa", default=shutil.which("opa"))
+    parser.add_argument("--opa-samples", type=int, default=50)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with_tests = RegoPolicy(*policy_sources(POLICY_DIR, include_tests=True))
+    compile_ms = (time.perf_counter() - started) * 1e3
+    results = with_tests.run_tests()
+    failed = [name for name, passed in results.items() if not passed]
+    if failed:
+        raise SystemExit(f"fixtures failed: {failed}")
+    print(f"fixtures: {len(results)} passed (compiled in {compile_ms:.1f} ms)")
+
+    policy = RegoPolicy(*policy_sources(POLICY_DIR))
+    inputs = list(make_inputs())[: args.inputs]
+
+    started = time.perf_counter()
+    documents = [evaluate(policy, data) for data in inputs]
+    document_us = (time.perf_counter() - started) / len(inputs) * 1e6
+
+    started = time.perf_counter()
+    for data in inputs:
+        policy.query("allow", data)
+    allow_us = (time.perf_counter() - started) / len(inputs) * 1e6
+
+    conflicts = sum(document == "conflict" for document in documents)
+    print(f"inputs: {len(inputs)} ({conflicts} with conflicting decision_result)")
+    print(f"full document: {document_us:7.1f} µs per evaluation")
+    print(f"allow only:    {allow_us:7.1f} µs per evaluation")
+
+    if args.opa:
+        step = max(1, len(inputs) // args.opa_samples)
+        sample = list(range(0, len(inputs), step))
+        started = time.perf_counter()
+        mismatches = [
+            inputs[i]
+            for i in sample
+            if opa_evaluate(args.opa, inputs[i]) != documents[i]
+        ]
+        opa_us = (time.perf_counter() - started) / len(sample) * 1e6
+        print(f"opa eval:      {opa_us:7.0f} µs per evaluation ({len(sample)} inputs)")
+        if mismatches:
+            raise SystemExit(f"documents differ from opa for {mismatches[:3]}")
+        print("documents identical to opa eval")
+    else:
+        print("opa binary not found; skipped comparison with opa eval")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Rule Index Benchmark
+
+Compares first-match lookup by linear scan with the compiled RuleIndex on
+tax-table style schemas of growing size, and checks that both fire the same
+rule for every input.
+
+Usage: python scripts/benchmark_rule_index.py [--lookups N]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from policy_as_code.features.dsl import (  # noqa: E402
+    DSLRule,
+    DSLSchema,
+    Operator,
+    RuleAction,
+    RuleCondition,
+    RuleType,
+)
+from policy_as_code.features.dsl_compiler import CompiledSchema  # noqa: E402
+
+MUNICIPALITIES = [f"M{i:03d}" for i in range(300)]
+
+
+def make_schema(rule_count: int) -> DSLSchema:
+    rules = []
+    for i in range(rule_count):
+        if i % 4 == 0:
+            conditions = [
+                RuleCondition(
+                    "municipality", Operator.IN, MUNICIPALITIES[i % 300 :][:3]
+                )
+            ]
+        else:
+            conditions = [
+                RuleCondition("income", Operator.GE, i * 100),
+                RuleCondition("income", Operator.LT, (i + 1) * 100),
+            ]
+        rules.append(
+            DSLRule(
+                rule_id=f"bracket_{i}",
+                rule_type=RuleType.RANGE,
+                priority=rule_count - i,
+                conditions=conditions,
+                actions=[RuleAction("set", "bracket", i)],
+                description=f"Bracket {i}",
+            )
+        )
+    return DSLSchema(
+        name="tax_table",
+        version="1.0.0",
+        rules=rules,
+        input_schema={},
+        output_schema={"bracket": {"default": None}},
+    )
+
+
+def linear_match(compiled: CompiledSchema, data):
+    for rule in compiled.rules:
+        if rule.matches(data):
+            return rule
+    return None
+
+
+def time_lookups(match, inputs) -> float:
+    started = time.perf_counter()
+    for data in inputs:
+        match(data)
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lookups", type=int, default=2_000)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    for rule_count in (100, 1_000, 10_000):
+        compiled = CompiledSchema(make_schema(rule_count))
+        inputs = [
+            {
+                "income": rng.uniform(0, rule_count * 100),
+                "municipality": rng.choice(MUNICIPALITIES + ["other"] * 300),
+            }
+            for _ in range(args.lookups)
+        ]
+        for data in inputs:
+            if compiled.match(data) is not linear_match(compiled, data):
+                raise SystemExit(f"index and linear scan disagree on {data}")
+
+        linear = time_lookups(lambda data: linear_match(compiled, data), inputs)
+        indexed = time_lookups(compiled.match, inputs)
+        per_lookup = 1e6 / args.lookups
+        print(
+            f"{rule_count:>6} rules: linear {linear * per_lookup:9.1f} µs, "
+            f"indexed {indexed * per_lookup:6.1f} µs, "
+            f"speedup {linear / indexed:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Storage Backend Benchmark
+
+Stores synthetic decisions in FileStorage (one file per decision and the
+segmented decision log) and SQLiteStorage, then times decision history and
+stats reads against the filled store. Decisions are written in concurrent
+waves so SQLiteStorage's writer can batch them. With --postgres, the
+postgresql and postgresql-write-behind backends can be compared too.
+
+Usage: python scripts/benchmark_storage.py [--decisions N] [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from policy_as_code.core.decision_log import DecisionLog  # noqa: E402
+from policy_as_code.core.storage import (  # noqa: E402
+    FileStorage,
+    PostgreSQLStorage,
+    SQLiteStorage,
+)
+from policy_as_code.core.write_behind import WriteBehindConfig  # noqa: E402
+
+START = datetime(2024, 1, 1)
+
+
+async def make_backend(name: str, directory: Path, args):
+    if name == "file":
+        return FileStorage(str(directory))
+    if name == "file-log":
+        return FileStorage(
+            str(directory), decision_log=DecisionLog(str(directory / "log"))
+        )
+    if name == "sqlite":
+        return SQLiteStorage(str(directory / "decisions.db"))
+    storage = PostgreSQLStorage(
+        args.postgres,
+        write_behind=WriteBehindConfig(enabled=name == "postgresql-write-behind"),
+    )
+    await storage.connect()
+    async with storage.pool.acquire() as conn:
+        await conn.execute("TRUNCATE decisions, decision_daily_stats")
+    return storage
+
+
+async def fill(storage, decisions: int, functions: int, concurrency: int) -> float:
+    started = time.perf_counter()
+    for wave in range(0, decisions, concurrency):
+        await asyncio.gather(
+            *(
+                storage.store_decision(
+                    SimpleNamespace(
+                        trace_id=f"trace-{n}",
+                        function_id=f"fn_{n % functions}",
+                        version="1.0.0",
+                        timestamp=START + timedelta(seconds=n),
+                    ),
+                    {"success": n % 7 != 0, "execution_time_ms": n % 50},
+                )
+                for n in range(wave, min(wave + concurrency, decisions))
+            )
+        )
+    return time.perf_counter() - started
+
+
+async def timed(operation, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        await operation()
+    return (time.perf_counter() - started) / repeat
+
+
+async def run(name: str, args) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        storage = await make_backend(name, Path(directory), args)
+        elapsed = await fill(storage, args.decisions, args.functions, args.concurrency)
+        history = await timed(
+            lambda: storage.get_decision_history("fn_1", limit=100, offset=100),
+            args.repeat,
+        )
+        stats = await timed(lambda: storage.get_decision_stats("fn_1"), args.repeat)
+        print(
+            f"{name:9} {args.decisions / elapsed:10.0f} decisions/s"
+            f" {history * 1e3:10.2f} ms history {stats * 1e3:8.3f} ms stats"
+        )
+        if hasattr(storage, "close"):
+            await storage.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--decisions", type=int, default=20000)
+    parser.add_argument("--functions", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--backends", nargs="+", default=["file", "file-log", "sqlite"])
+    parser.add_argument(
+        "--postgres", help="connection string of a scratch database (truncated)"
+    )
+    args = parser.parse_args()
+    if any(name.startswith("postgresql") for name in args.backends):
+        if not args.postgres:
+            parser.error("--postgres is required for the postgresql backends")
+
+    print(
+        f"decisions: {args.decisions}, functions: {args.functions}, "
+        f"concurrency: {args.concurrency}"
+    )
+    for name in args.backends:
+        asyncio.run(run(name, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Tests for admission control and backpressure
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+import pytest
+
+from policy_as_code.core import enhanced_engine
+from policy_as_code.core.admission import (
+    OTHER_CLIENTS,
+    AdmissionConfig,
+    AdmissionController,
+    AdmissionRejectedError,
+)
+from policy_as_code.core.engine import DecisionEngine as CoreDecisionEngine
+from policy_as_code.core.storage import FileStorage
+from policy_as_code.monitoring.performance_monitor import (
+    MetricsCollector,
+    PerformanceMonitor,
+)
+from policy_as_code.tracing.enhanced_ledger import ImmutableTraceLedger
+
+SLOW_FUNCTION = """
+import time
+
+def decision_function(input_data, context):
+    time.sleep(0.05)
+    return {"value": input_data["x"]}
+"""
+
+
+def slow_function(input_data: Dict[str, Any], context) -> Dict[str, Any]:
+    time.sleep(0.05)
+    return {"value": input_data["x"]}
+
+
+async def hold(controller: AdmissionController, function_id: str, seconds: float):
+    async with controller.admit(function_id):
+        await asyncio.sleep(seconds)
+
+
+class TestAdmissionController:
+    """Test concurrency limits and bounded queues"""
+
+    @pytest.mark.asyncio
+    async def test_global_limit_bounds_concurrency(self):
+        """No more than max_concurrency blocks run at once"""
+        controller = AdmissionController(AdmissionConfig(max_concurrency=2))
+        running = []
+        peak = []
+
+        async def work():
+            async with controller.admit("f"):
+                running.append(1)
+                peak.append(len(running))
+                await asyncio.sleep(0.01)
+                running.pop()
+
+        await asyncio.gather(*(work() for _ in range(6)))
+
+        assert max(peak) == 2
+        stats = controller.get_stats()
+        assert stats["admitted"] == 6
+        assert stats["queued"] == 4
+        assert stats["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_immediately(self):
+        """Requests beyond the queue bound fail fast with 429"""
+        controller = AdmissionController(
+            AdmissionConfig(max_concurrency=1, max_queue_size=1)
+        )
+        holder = asyncio.ensure_future(hold(controller, "f", 0.05))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(hold(controller, "f", 0))
+        await asyncio.sleep(0)
+
+        started = time.perf_counter()
+        with pytest.raises(AdmissionRejectedError) as excinfo:
+            await hold(controller, "f", 0)
+
+        assert time.perf_counter() - started < 0.01
+        assert excinfo.value.reason == "queue_full"
+        assert excinfo.value.http_status == 429
+        assert excinfo.value.retryable is True
+        await asyncio.gather(holder, waiter)
+
+    @pytest.mark.asyncio
+    async def test_queue_deadline(self):
+        """Waiting longer than the queue timeout is rejected with 503"""
+        controller = AdmissionController(
+            AdmissionConfig(max_concurrency=1, queue_timeout_seconds=0.01)
+        )
+        holder = asyncio.ensure_future(hold(controller, "f", 0.1))
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejectedError) as excinfo:
+            await hold(controller, "f", 0)
+
+        assert excinfo.value.http_status == 503
+        assert controller.get_stats()["rejected"]["queue_timeout"] == 1
+        assert controller.queue_depth() == 0
+        await holder
+        # The abandoned wait must not leak a slot
+        await asyncio.wait_for(hold(controller, "f", 0), 0.1)
+
+    @pytest.mark.asyncio
+    async def test_per_function_limits(self):
+        """A saturated function does not block other functions"""
+        controller = AdmissionController(
+            AdmissionConfig(
+                max_concurrency=None,
+                function_limits={"slow": 1},
+                queue_timeout_seconds=0.01,
+            )
+        )
+        holder = asyncio.ensure_future(hold(controller, "slow", 0.05))
+        await asyncio.sleep(0)
+
+        await hold(controller, "other", 0)
+        with pytest.raises(AdmissionRejectedError):
+            await hold(controller, "slow", 0)
+        await holder
+
+        assert controller.get_stats()["functions"]["slow"]["limit"] == 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_recorded(self):
+        """Admissions, rejections and queue depth reach the monitor"""
+        monitor = PerformanceMonitor()
+        controller = AdmissionController(
+            AdmissionConfig(max_concurrency=1, max_queue_size=0), monitor
+        )
+        holder = asyncio.ensure_future(hold(controller, "f", 0.01))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejectedError):
+            await hold(controller, "f", 0)
+        await holder
+
+        admission = monitor.get_performance_summary()["admission"]
+        assert admission["admitted"] == 1
+        assert admission["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """A disabled controller admits everything"""
+        controller = AdmissionController(
+            AdmissionConfig(enabled=False, max_concurrency=1, max_queue_size=0)
+        )
+
+        await asyncio.gather(*(hold(controller, "f", 0.01) for _ in range(3)))
+
+
+class TestFairScheduling:
+    """Test weighted fair queuing across clients"""
+
+    async def grant_order(self, controller, clients):
+        """Queue one request per entry behind a held slot; return grant order"""
+        order = []
+
+        async def request(client_id):
+            async with controller.admit("f", client_id):
+                order.append(client_id)
+                await asyncio.sleep(0)
+
+        holder = asyncio.ensure_future(hold(controller, "f", 0.01))
+        await asyncio.sleep(0)
+        await asyncio.gather(holder, *(request(client) for client in clients))
+        return order
+
+    @pytest.mark.asyncio
+    async def test_bulk_client_cannot_starve_interactive(self):
+        """Interactive requests are interleaved with a queued bulk job"""
+        controller = AdmissionController(AdmissionConfig(max_concurrency=1))
+
+        order = await self.grant_order(controller, ["bulk"] * 20 + ["citizen"] * 3)
+
+        assert [i for i, c in enumerate(order) if c == "citizen"] == [1, 3, 5]
+        assert order.count("bulk") == 20
+
+    @pytest.mark.asyncio
+    async def test_fifo_without_fair_scheduling(self):
+        """Disabling fair scheduling restores arrival order"""
+        controller = AdmissionController(
+            AdmissionConfig(max_concurrency=1, fair_scheduling=False)
+        )
+
+        order = await self.grant_order(controller, ["bulk"] * 5 + ["citizen"])
+
+        assert order[-1] == "citizen"
+
+    @pytest.mark.asyncio
+    async def test_weights_set_slot_share(self):
+        """Busy clients receive slots in proportion to their weights"""
+        controller = AdmissionController(
+            AdmissionConfig(max_concurrency=1, client_weights={"gold": 3})
+        )
+
+        order = await self.grant_order(controller, ["basic"] * 12 + ["gold"] * 12)
+
+        assert order[:8].count("gold") == 6
+        assert order.count("gold") == 12
+
+    @pytest.mark.asyncio
+    async def test_per_client_queue_bound(self):
+        """A client that fills its own queue is rejected; others still queue"""
+        controller = AdmissionController(
+            AdmissionConfig(max_concurrency=1, client_queue_size=2)
+        )
+        holder = asyncio.ensure_future(hold(controller, "f", 0.02))
+        await asyncio.sleep(0)
+        bulk = [asyncio.ensure_future(hold(controller, "f", 0)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(AdmissionRejectedError) as excinfo:
+            await hold(controller, "f", 0)
+        assert excinfo.value.reason == "queue_full"
+        async with controller.admit("f", "citizen"):
+            pass
+        await asyncio.gather(holder, *bulk)
+
+        clients = controller.get_stats()["clients"]
+        assert clients["default"]["rejected"] == 1
+        assert clients["citizen"]["admitted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_client_metrics(self):
+        """Per-client share and latency reach stats and the monitor"""
+        monitor = PerformanceMonitor()
+        controller = AdmissionController(AdmissionConfig(), monitor)
+
+        for _ in range(3):
+            await hold(controller, "f", 0)
+        async with controller.admit("f", "b"):
+            await asyncio.sleep(0.01)
+
+        clients = controller.get_client_stats()
+        assert clients["default"]["share"] == 0.75
+        assert clients["b"]["share"] == 0.25
+        assert clients["b"]["p99_latency_ms"] >= 10
+        assert len(monitor.metrics_collector.metrics["admission_latency_ms"]) == 4
+        assert "admission_latency_ms" not in monitor.metrics_collector.timers
+
+    def test_admission_samples_bounded(self):
+        """Per-request admission samples only go to the bounded history"""
+        monitor = PerformanceMonitor()
+        collector = MetricsCollector(max_history_size=5)
+        monitor.metrics_collector = collector
+
+        for n in range(20):
+            monitor.record_admission("f", True, float(n), 0)
+            monitor.record_admission_latency("f", "default", float(n))
+
+        assert not collector.timers
+        assert len(collector.metrics["admission_wait_ms"]) == 5
+        assert len(collector.metrics["admission_latency_ms"]) == 5
+        assert collector.get_metric_summary("admission_wait_ms")["max"] == 19
+
+    @pytest.mark.asyncio
+    async def test_client_stats_bounded(self):
+        """Stats are kept for recent clients; older ones fold into one bucket"""
+        controller = AdmissionController(AdmissionConfig(max_tracked_clients=3))
+
+        await hold(controller, "f", 0)
+        for n in range(10):
+            async with controller.admit("f", f"client-{n}"):
+                pass
+        await hold(controller, "f", 0)
+
+        clients = controller.get_client_stats()
+        assert list(clients) == ["client-8", "client-9", "default", OTHER_CLIENTS]
+        assert clients[OTHER_CLIENTS]["admitted"] == 9
+        assert sum(client["admitted"] for client in clients.values()) == 12
+
+
+class TestEngineAdmission:
+    """Test admission control in the decision engines"""
+
+    @pytest.mark.asyncio
+    async def test_enhanced_engine_rejects_when_saturated(self, tmp_path):
+        """Rejections surface as AdmissionRejectedError, not ExecutionError"""
+        engine = enhanced_engine.DecisionEngine(
+            admission_config=AdmissionConfig(max_concurrency=1, max_queue_size=0)
+        )
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        engine.register_function("f", "1.0.0", slow_function)
+
+        outcomes = await asyncio.gather(
+            engine.execute_decision("f", "1.0.0", {"x": 1}),
+            engine.execute_decision("f", "1.0.0", {"x": 2}),
+            return_exceptions=True,
+        )
+
+        assert outcomes[0].result == {"value": 1}
+        assert isinstance(outcomes[1], AdmissionRejectedError)
+        health = await engine.health_check()
+        assert health["admission"]["rejected"]["queue_full"] == 1
+
+    @pytest.mark.asyncio
+    async def test_core_engine_admission_config(self, tmp_path):
+        """The core engine reads limits from its admission config section"""
+        engine = CoreDecisionEngine(
+            config={
+                "storage": {"path": str(tmp_path)},
+                "plugins": {"tracing": {"path": str(tmp_path / "traces")}},
+                "admission": {"max_concurrency": 1, "queue_timeout_seconds": 1},
+            }
+        )
+        await engine.deploy_function("f", "1.0.0", SLOW_FUNCTION)
+
+        results = await asyncio.gather(
+            *(engine.execute("f", {"x": i}, "1.0.0") for i in range(3))
+        )
+
+        assert [r["value"] for r in results] == [0, 1, 2]
+        assert engine.get_admission_stats()["admitted"] == 3
+
+    @pytest.mark.asyncio
+    async def test_engines_schedule_by_client(self, tmp_path):
+        """Client ids passed to the engines select fair-queuing lanes"""
+        engine = enhanced_engine.DecisionEngine()
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        engine.register_function("f", "1.0.0", slow_function)
+
+        await engine.execute_decision("f", "1.0.0", {"x": 1}, client_id="citizen")
+        await engine.execute_batch("f", [{"x": 2}, {"x": 3}], "1.0.0", client_id="bulk")
+
+        clients = engine.admission.get_client_stats()
+        assert clients["citizen"]["admitted"] == 1
+        assert clients["bulk"]["admitted"] == 1
+
+
+class TestRestBackpressure:
+    """Test mapping of admission rejections to HTTP responses"""
+
+    @pytest.mark.parametrize(
+        "reason,status", [("queue_full", 429), ("queue_timeout", 503)]
+    )
+    def test_rejection_status_and_retry_after(self, monkeypatch, reason, status):
+        """Rejected decisions return 429/503 with a Retry-After header"""
+        from fastapi.testclient import TestClient
+
+        from policy_as_code.api import enhanced_rest
+
+        async def reject(**kwargs):
+            raise AdmissionRejectedError("f", reason, retry_after_seconds=2)
+
+        monkeypatch.setattr(enhanced_rest.decision_engine, "execute_decision", reject)
+        enhanced_rest.idempotency_cache.clear()
+        client = TestClient(enhanced_rest.app)
+
+        response = client.post(
+            "/decisions",
+            json={"function_id": "f", "version": "1.0.0", "input_data": {"x": 1}},
+            headers={
+                "Authorization": "Bearer token",
+                "X-ROAD-CLIENT": "xroad:FI/ORG/1234567-8",
+                "X-REQUEST-NONCE": "n1",
+            },
+        )
+
+        assert response.status_code == status
+        assert response.headers["Retry-After"] == "2"
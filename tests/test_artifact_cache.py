@@ -0,0 +1,153 @@
+"""
+Tests for ahead-of-time decision function artifacts
+"""
+
+import pytest
+
+from policy_as_code.core.function_cache import CompiledFunctionCache
+from policy_as_code.features.artifact_cache import ArtifactCache
+from policy_as_code.features.constraints import (
+    EXAMPLE_DSL_RULES,
+    DeterminismError,
+    DeterministicFunction,
+    DFConstraintChecker,
+    DSLTranspiler,
+)
+
+PURE_FUNCTION = """
+def decision_function(input_data, context):
+    return {"approved": input_data.get("amount", 0) < 100}
+"""
+
+IMPURE_FUNCTION = """
+import random
+
+def decision_function(input_data, context):
+    return {"approved": random.random() < 0.5}
+"""
+
+
+def fail(*args, **kwargs):
+    raise AssertionError("should have been served from the artifact cache")
+
+
+def artifact_files(directory):
+    return sorted(directory.glob("*/*.artifact"))
+
+
+class TestArtifactCache:
+    """Test ArtifactCache persistence and invalidation"""
+
+    def test_artifacts_survive_restart(self, tmp_path, monkeypatch):
+        """A new cache on the same directory loads without checking or compiling"""
+        first = ArtifactCache(tmp_path)
+        built = first.compile_source(PURE_FUNCTION, "<loan>")
+
+        monkeypatch.setattr(DFConstraintChecker, "check_function", fail)
+        second = ArtifactCache(tmp_path)
+        loaded = second.compile_source(PURE_FUNCTION, "<loan>")
+
+        assert loaded.code == built.code
+        assert loaded.violations == built.violations == ()
+        assert second.get_stats()["hits"] == 1
+        assert second.get_stats()["misses"] == 0
+
+    def test_cached_verdict_rejects_function(self, tmp_path, monkeypatch):
+        """A stored constraint violation still blocks compilation"""
+        with pytest.raises(DeterminismError):
+            DeterministicFunction(
+                IMPURE_FUNCTION,
+                "decision_function",
+                ArtifactCache(tmp_path),
+            ).compile()
+
+        monkeypatch.setattr(DFConstraintChecker, "check_function", fail)
+        function = DeterministicFunction(
+            IMPURE_FUNCTION, "decision_function", ArtifactCache(tmp_path)
+        )
+        with pytest.raises(DeterminismError) as excinfo:
+            function.compile()
+        assert excinfo.value.error_type == "compilation_failed"
+        assert [v.code_snippet for v in excinfo.value.violations] == [
+            "import random",
+            "random.random()",
+        ]
+
+    def test_yaml_rules_skip_transpilation(self, tmp_path, monkeypatch):
+        """Precompiled YAML rules are loaded without re-running the transpiler"""
+        function = DeterministicFunction.from_yaml(
+            EXAMPLE_DSL_RULES, ArtifactCache(tmp_path)
+        )
+        function.compile()
+
+        monkeypatch.setattr(DSLTranspiler, "transpile_yaml_rules", fail)
+        monkeypatch.setattr(DFConstraintChecker, "check_function", fail)
+        reloaded = DeterministicFunction.from_yaml(
+            EXAMPLE_DSL_RULES, ArtifactCache(tmp_path)
+        )
+        reloaded.compile()
+
+        assert reloaded.function_code == function.function_code
+        assert reloaded.execute({"amount": 500, "customer_score": 750}) == {
+            "amount_approved": True,
+            "score_approved": True,
+            "approved": True,
+        }
+
+    def test_corrupt_artifact_is_rebuilt(self, tmp_path):
+        """A damaged file is a miss, is deleted and is replaced"""
+        ArtifactCache(tmp_path).compile_source(PURE_FUNCTION, "<loan>")
+        [path] = artifact_files(tmp_path)
+        path.write_bytes(path.read_bytes()[:-4])
+
+        cache = ArtifactCache(tmp_path)
+        artifact = cache.compile_source(PURE_FUNCTION, "<loan>")
+
+        assert artifact.code is not None
+        assert cache.get_stats()["invalid"] == 1
+        assert cache.get_stats()["stores"] == 1
+        assert ArtifactCache(tmp_path).get(artifact.key) is not None
+
+    def test_memory_is_bounded(self, tmp_path, monkeypatch):
+        """Only recent artifacts stay in memory; evicted ones load from disk"""
+        cache = ArtifactCache(tmp_path, max_memory_entries=2)
+        keys = [
+            cache.compile_source(PURE_FUNCTION, f"<loan_{n}>").key for n in range(3)
+        ]
+
+        assert cache.get_stats()["loaded"] == 2
+        monkeypatch.setattr(DFConstraintChecker, "check_function", fail)
+        assert cache.get(keys[0]).code is not None
+        assert cache.get_stats()["loaded"] == 2
+
+    def test_checker_upgrade_invalidates(self, tmp_path, monkeypatch):
+        """Changing the checker changes every key and prune removes old files"""
+        old = ArtifactCache(tmp_path)
+        old_key = old.compile_source(PURE_FUNCTION, "<loan>").key
+
+        monkeypatch.setattr(
+            DFConstraintChecker, "VERSION", DFConstraintChecker.VERSION + 1
+        )
+        new = ArtifactCache(tmp_path)
+
+        assert new.fingerprint != old.fingerprint
+        assert new.source_key(PURE_FUNCTION, "<loan>") != old_key
+        assert new.prune() == 1
+        assert artifact_files(tmp_path) == []
+        assert new.get(old_key) is None
+
+    def test_function_cache_uses_artifacts(self, tmp_path, monkeypatch):
+        """Storage-side compilation reuses artifact code objects"""
+        artifacts = ArtifactCache(tmp_path)
+        CompiledFunctionCache(artifact_cache=artifacts).load(
+            "loan", "1.0.0", PURE_FUNCTION
+        )
+
+        monkeypatch.setattr(DFConstraintChecker, "check_function", fail)
+        reloaded = ArtifactCache(tmp_path)
+        function = CompiledFunctionCache(artifact_cache=reloaded).load(
+            "loan", "1.0.0", PURE_FUNCTION
+        )
+
+        assert function({"amount": 50}, None) == {"approved": True}
+        assert reloaded.get_stats()["hits"] == 1
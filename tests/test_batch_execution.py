@@ -0,0 +1,116 @@
+"""
+Tests for batch decision execution
+"""
+
+import json
+from typing import Any, Dict
+
+import pytest
+
+from policy_as_code.core import enhanced_engine
+from policy_as_code.core.engine import DecisionEngine as CoreDecisionEngine
+from policy_as_code.core.storage import FileStorage
+from policy_as_code.tracing.enhanced_ledger import ImmutableTraceLedger
+
+THRESHOLD_FUNCTION = """
+def decision_function(input_data, context):
+    if input_data["income"] < 0:
+        raise ValueError("negative income")
+    return {"eligible": input_data["income"] < 30000}
+"""
+
+
+def threshold_function(input_data: Dict[str, Any], context) -> Dict[str, Any]:
+    if input_data["income"] < 0:
+        raise ValueError("negative income")
+    return {"eligible": input_data["income"] < 30000}
+
+
+class TestCoreExecuteBatch:
+    """Test DecisionEngine.execute_batch in the core engine"""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        config = {
+            "storage": {"path": str(tmp_path)},
+            "plugins": {"tracing": {"path": str(tmp_path / "traces")}},
+        }
+        return CoreDecisionEngine(config=config)
+
+    @pytest.mark.asyncio
+    async def test_results_in_order_with_item_errors(self, engine):
+        """Each input gets a result in order; failures do not abort the batch"""
+        await engine.deploy_function("benefit", "1.0.0", THRESHOLD_FUNCTION)
+        inputs = [{"income": 10000}, {"income": -1}, {"income": 50000}]
+
+        results = await engine.execute_batch("benefit", inputs)
+
+        assert [r.index for r in results] == [0, 1, 2]
+        assert results[0].result == {"eligible": True}
+        assert results[1].success is False
+        assert "negative income" in results[1].error
+        assert results[2].result == {"eligible": False}
+
+    @pytest.mark.asyncio
+    async def test_chunks_and_single_trace_append(self, engine, tmp_path):
+        """Chunks are bounded and every item is traced"""
+        await engine.deploy_function("benefit", "1.0.0", THRESHOLD_FUNCTION)
+        inputs = ({"income": i * 1000} for i in range(25))
+
+        chunk_sizes = []
+        async for chunk in engine.iter_execute_batch("benefit", inputs, chunk_size=10):
+            chunk_sizes.append(len(chunk))
+
+        assert chunk_sizes == [10, 10, 5]
+        trace_lines = []
+        for trace_file in (tmp_path / "traces").glob("*.jsonl"):
+            trace_lines.extend(trace_file.read_text().splitlines())
+        assert len(trace_lines) == 25
+        assert {json.loads(line)["status"] for line in trace_lines} == {"success"}
+
+    @pytest.mark.asyncio
+    async def test_batch_uses_result_cache(self, engine):
+        """Duplicate inputs within a batch are served from the cache"""
+        await engine.deploy_function("benefit", "1.0.0", THRESHOLD_FUNCTION)
+
+        await engine.execute_batch("benefit", [{"income": 1}, {"income": 1}])
+
+        assert engine.get_cache_stats()["results"]["hits"] == 1
+
+
+class TestEnhancedExecuteBatch:
+    """Test DecisionEngine.execute_batch in the enhanced engine"""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = enhanced_engine.DecisionEngine()
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        engine.register_function("benefit", "1.0.0", threshold_function)
+        engine.register_function("benefit", "1.10.0", threshold_function)
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_batch_results(self, engine):
+        """Results keep input order and record per-item failures"""
+        results = await engine.execute_batch(
+            "benefit", [{"income": 5}, {"income": -5}, {"income": 99999}]
+        )
+
+        assert [r.success for r in results] == [True, False, True]
+        assert results[0].version == "1.10.0"
+        assert results[0].result == {"eligible": True}
+        assert "negative income" in results[1].error_message
+        assert len({r.trace_id for r in results}) == 3
+
+    @pytest.mark.asyncio
+    async def test_batch_chunking(self, engine):
+        """Chunk size bounds each yielded chunk"""
+        chunks = []
+        async for chunk in engine.iter_execute_batch(
+            "benefit", [{"income": i} for i in range(7)], "1.0.0", chunk_size=3
+        ):
+            chunks.append(len(chunk))
+
+        assert chunks == [3, 3, 1]
+        assert engine.trace_ledger.get_ledger_stats()["total_entries"] == 7
@@ -0,0 +1,156 @@
+"""
+Tests for canonical JSON encoding and hash-once decision contexts
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from decimal import Decimal
+from pathlib import PurePosixPath
+from uuid import UUID
+
+import pytest
+
+from policy_as_code.core import enhanced_engine
+from policy_as_code.core.storage import FileStorage
+from policy_as_code.core.types import DecisionContext
+from policy_as_code.tracing.enhanced_ledger import (
+    ImmutableTraceLedger,
+    TraceEntry,
+    TraceEntryType,
+)
+from policy_as_code.utils.canonical import (
+    CanonicalPayload,
+    canonical_hash,
+    canonical_json,
+)
+
+
+class TestCanonicalJson:
+    """Test canonical serialisation"""
+
+    def test_key_order_does_not_matter(self):
+        """Equal mappings encode identically regardless of insertion order"""
+        assert canonical_json({"b": 1, "a": [1, 2]}) == '{"a":[1,2],"b":1}'
+        assert canonical_hash({"a": 1, "b": 2}) == canonical_hash({"b": 2, "a": 1})
+
+    def test_matches_previous_compact_encoding(self):
+        """Plain JSON data hashes as the compact sorted encoding did"""
+        data = {"income": 25000, "name": "Äijä", "tags": ["x"]}
+        expected = hashlib.sha256(
+            json.dumps(data, sort_keys=True, separators=(",", ":")).encode()
+        ).hexdigest()
+
+        assert canonical_hash(data) == expected
+
+    def test_extended_types(self):
+        """Datetimes, Decimals, UUIDs and sets are normalised"""
+        data = {
+            "at": datetime(2024, 1, 2, 3, 4, 5),
+            "rate": Decimal("0.10"),
+            "id": UUID("12345678-1234-5678-1234-567812345678"),
+            "codes": {"b", "a"},
+        }
+
+        assert json.loads(canonical_json(data)) == {
+            "at": "2024-01-02T03:04:05",
+            "rate": "0.10",
+            "id": "12345678-1234-5678-1234-567812345678",
+            "codes": ["a", "b"],
+        }
+
+    def test_unsupported_type_raises(self):
+        """Arbitrary objects are rejected rather than hashed by repr"""
+        with pytest.raises(TypeError):
+            canonical_json({"value": object()})
+
+    def test_lenient_falls_back_to_str(self):
+        """Lenient hashing encodes unknown types as str(), known ones as usual"""
+        value = PurePosixPath("/tmp/x")
+
+        lenient = canonical_hash(
+            {"path": value, "at": datetime(2024, 1, 1)}, lenient=True
+        )
+
+        assert lenient == canonical_hash(
+            {"path": "/tmp/x", "at": "2024-01-01T00:00:00"}
+        )
+
+    def test_payload_digest(self):
+        """A payload carries its bytes and their digest"""
+        payload = CanonicalPayload.of({"x": 1})
+
+        assert payload.data == b'{"x":1}'
+        assert payload.digest == hashlib.sha256(b'{"x":1}').hexdigest()
+
+
+class TestHashOnce:
+    """Test reuse of the canonical payload downstream"""
+
+    def test_context_for_input(self):
+        """Contexts built for an input carry the payload and its digest"""
+        context = DecisionContext.for_input(
+            "benefit", "1.0.0", {"income": 1}, datetime.now(), "t1"
+        )
+
+        assert context.input_hash == context.canonical_input.digest
+
+    @pytest.mark.asyncio
+    async def test_engine_reuses_context_payload(self, tmp_path, monkeypatch):
+        """The engine does not re-hash input when the context has a payload"""
+        engine = enhanced_engine.DecisionEngine()
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        engine.register_function(
+            "benefit", "1.0.0", lambda input_data, context: {"ok": True}
+        )
+        context = DecisionContext.for_input(
+            "benefit", "1.0.0", {"income": 1}, datetime.now(), "t1"
+        )
+
+        def fail(*args, **kwargs):
+            raise AssertionError("input hashed twice")
+
+        monkeypatch.setattr(CanonicalPayload, "of", fail)
+        result = await engine.execute_decision(
+            "benefit", "1.0.0", {"income": 1}, context
+        )
+
+        assert result.success is True
+
+    def test_ledger_verifies_legacy_entries(self):
+        """Entries hashed with the previous encoding still verify"""
+        ledger = ImmutableTraceLedger()
+        entry_data = {"timestamp": "2024-01-01T00:00:00", "function_id": "f"}
+        legacy_hash = ledger._legacy_hash_data(
+            {
+                "entry_data": entry_data,
+                "previous_hash": None,
+                "timestamp": entry_data["timestamp"],
+            }
+        )
+        ledger._entries.append(
+            TraceEntry(
+                entry_id="e1",
+                entry_type=TraceEntryType.DECISION_EXECUTION,
+                timestamp=datetime(2024, 1, 1),
+                data=entry_data,
+                previous_hash=None,
+                hash=legacy_hash,
+            )
+        )
+
+        assert legacy_hash != ledger._create_entry_hash(entry_data, None)
+        assert ledger.verify_integrity()["is_valid"] is True
+
+    @pytest.mark.asyncio
+    async def test_ledger_accepts_arbitrary_event_data(self):
+        """Event details the encoder does not know are hashed as str()"""
+        ledger = ImmutableTraceLedger()
+
+        await ledger.append_security_event(
+            "upload",
+            {"path": PurePosixPath("/tmp/x"), "z": 1j, "owner": object()},
+        )
+
+        assert ledger.verify_integrity()["is_valid"] is True
@@ -0,0 +1,375 @@
+"""
+Tests for execution deadlines and circuit breakers
+"""
+
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict
+
+import pytest
+
+from policy_as_code.core import enhanced_engine
+from policy_as_code.core.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    CircuitOpenError,
+    CircuitState,
+)
+from policy_as_code.core.engine import DecisionEngine as CoreDecisionEngine
+from policy_as_code.core.errors import (
+    ExecutionError,
+    ExecutionTimeoutError,
+    StorageError,
+)
+from policy_as_code.core.executors import (
+    DeadlineExceeded,
+    DecisionExecutor,
+    ExecutionConfig,
+    ExecutionMode,
+)
+from policy_as_code.core.storage import FileStorage
+from policy_as_code.core.types import DecisionContext
+from policy_as_code.tracing.enhanced_ledger import ImmutableTraceLedger
+
+HANGING_FUNCTION = """
+import time
+
+def decision_function(input_data, context):
+    time.sleep(input_data["sleep"])
+    return {"ok": True}
+"""
+
+
+def sleepy(input_data: Dict[str, Any], context) -> Dict[str, Any]:
+    time.sleep(input_data["sleep"])
+    return {"pid": os.getpid()}
+
+
+def failing(input_data: Dict[str, Any], context) -> Dict[str, Any]:
+    if input_data.get("fail"):
+        raise ValueError("boom")
+    return {"ok": True}
+
+
+def make_context(function_id: str = "f") -> DecisionContext:
+    return DecisionContext(
+        function_id=function_id,
+        version="1.0.0",
+        input_hash="h",
+        timestamp=datetime.now(),
+        trace_id="t1",
+    )
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions"""
+
+    def make_breaker(self, now, **overrides):
+        config = CircuitBreakerConfig(
+            minimum_calls=4, window_seconds=10, open_seconds=5, **overrides
+        )
+        return CircuitBreaker("f:1.0.0", config, clock=lambda: now[0])
+
+    def test_opens_on_failure_rate(self):
+        """The breaker opens once the windowed failure rate crosses the threshold"""
+        now = [100.0]
+        breaker = self.make_breaker(now)
+        for _ in range(2):
+            breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CircuitState.CLOSED
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError) as excinfo:
+            breaker.allow()
+        assert excinfo.value.http_status == 503
+
+    def test_opens_on_timeout_rate(self):
+        """Timeouts trip the breaker at their own, lower threshold"""
+        now = [100.0]
+        breaker = self.make_breaker(now, timeout_rate_threshold=0.25)
+        for _ in range(3):
+            breaker.record_success()
+        breaker.record_failure(timed_out=True)
+
+        assert breaker.state == CircuitState.OPEN
+
+    def test_old_outcomes_leave_the_window(self):
+        """Failures older than the window no longer count"""
+        now = [100.0]
+        breaker = self.make_breaker(now)
+        for _ in range(3):
+            breaker.record_failure()
+        now[0] = 120.0
+        for _ in range(3):
+            breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.CLOSED
+        assert breaker.get_stats()["window_calls"] == 4
+
+    def test_half_open_probe(self):
+        """After the open period one probe is let through"""
+        now = [100.0]
+        breaker = self.make_breaker(now)
+        for _ in range(4):
+            breaker.record_failure()
+        now[0] = 106.0
+
+        breaker.allow()
+        assert breaker.state == CircuitState.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+        breaker.record_success()
+
+        assert breaker.state == CircuitState.CLOSED
+        breaker.allow()
+
+    def test_failed_probe_reopens(self):
+        """A failing probe re-opens the breaker"""
+        now = [100.0]
+        breaker = self.make_breaker(now)
+        for _ in range(4):
+            breaker.record_failure()
+        now[0] = 106.0
+        breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == CircuitState.OPEN
+        assert breaker.times_opened == 2
+
+
+class TestExecutionDeadlines:
+    """Test executor deadlines"""
+
+    def test_per_function_timeout_overrides_default(self):
+        """Function-specific deadlines take precedence"""
+        config = ExecutionConfig(
+            timeout_seconds=10, function_timeouts={"f": 0.05, "f:2.0.0": 1}
+        )
+
+        assert config.timeout_for("f", "1.0.0") == 0.05
+        assert config.timeout_for("f", "2.0.0") == 1
+        assert config.timeout_for("g", "1.0.0") == 10
+
+    @pytest.mark.asyncio
+    async def test_coroutine_cancelled_on_timeout(self):
+        """Async functions are cancelled at the deadline"""
+        cancelled = []
+
+        async def hang(input_data, context):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        executor = DecisionExecutor(ExecutionConfig(timeout_seconds=0.05))
+        with pytest.raises(ExecutionTimeoutError):
+            await executor.run(hang, {}, make_context())
+
+        assert cancelled == [True]
+
+    @pytest.mark.asyncio
+    async def test_stuck_thread_is_abandoned(self):
+        """A timed-out thread is left behind and new work gets a fresh pool"""
+        executor = DecisionExecutor(
+            ExecutionConfig(mode=ExecutionMode.INLINE, timeout_seconds=0.05)
+        )
+
+        started = time.perf_counter()
+        with pytest.raises(ExecutionTimeoutError):
+            await executor.run(sleepy, {"sleep": 0.5}, make_context())
+        result = await executor.run(sleepy, {"sleep": 0}, make_context())
+        executor.shutdown(wait=False)
+
+        assert time.perf_counter() - started < 0.4
+        assert result["pid"] == os.getpid()
+        stats = executor.get_stats()
+        assert stats["timeouts"] == 1
+        assert stats["abandoned_threads"] == 1
+        # Deadlines keep synchronous functions off the event loop
+        assert stats["dispatch_counts"]["thread"] == 2
+
+    @pytest.mark.asyncio
+    async def test_stuck_worker_process_is_terminated(self):
+        """A timed-out worker process is killed and the pool restarted"""
+        executor = DecisionExecutor(
+            ExecutionConfig(
+                mode=ExecutionMode.PROCESS, max_workers=1, timeout_seconds=0.5
+            )
+        )
+        executor.register("f", "1.0.0", sleepy)
+        try:
+            with pytest.raises(ExecutionTimeoutError):
+                await executor.run(sleepy, {"sleep": 30}, make_context())
+            result = await executor.run(sleepy, {"sleep": 0}, make_context())
+        finally:
+            executor.shutdown()
+
+        assert result["pid"] != os.getpid()
+        assert executor.process_backend.get_stats()["terminations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_chunk_deadline_is_per_item(self):
+        """Only the overrunning item and those after it miss the deadline"""
+        executor = DecisionExecutor(ExecutionConfig(timeout_seconds=0.2))
+        items = [({"sleep": sleep}, make_context()) for sleep in (0.1, 0.1, 0.1, 1, 0)]
+
+        started = time.perf_counter()
+        outcomes = await executor.run_chunk("f", "1.0.0", sleepy, items)
+        executor.shutdown(wait=False)
+
+        assert time.perf_counter() - started < 0.8
+        assert [error is None for _, error, _ in outcomes] == [
+            True,
+            True,
+            True,
+            False,
+            False,
+        ]
+        assert all(isinstance(error, DeadlineExceeded) for _, error, _ in outcomes[3:])
+        assert executor.get_stats()["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_terminated_pool_resubmits_other_tasks(self):
+        """Tasks sharing the killed pool are rerun instead of failed"""
+        executor = DecisionExecutor(
+            ExecutionConfig(
+                mode=ExecutionMode.PROCESS,
+                max_workers=2,
+                function_timeouts={"f": 0.5},
+            )
+        )
+        executor.register("f", "1.0.0", sleepy)
+        executor.register("g", "1.0.0", sleepy)
+        try:
+            await executor.warm_up()
+            stuck, bystander = await asyncio.gather(
+                executor.run(sleepy, {"sleep": 30}, make_context()),
+                executor.run(sleepy, {"sleep": 1}, make_context("g")),
+                return_exceptions=True,
+            )
+        finally:
+            executor.shutdown()
+
+        assert isinstance(stuck, ExecutionTimeoutError)
+        assert bystander["pid"] != os.getpid()
+        stats = executor.process_backend.get_stats()
+        assert stats["terminations"] == 1
+        assert stats["resubmits"] == 1
+        assert stats["broken_pools"] == 0
+
+
+class TestEngineResilience:
+    """Test deadlines and breakers in the decision engines"""
+
+    @pytest.mark.asyncio
+    async def test_enhanced_engine_breaker_in_health_check(self, tmp_path):
+        """Failures open the breaker, which fails fast and shows in health"""
+        engine = enhanced_engine.DecisionEngine(
+            circuit_breaker_config=CircuitBreakerConfig(minimum_calls=2)
+        )
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        engine.register_function("f", "1.0.0", failing)
+
+        for i in range(2):
+            with pytest.raises(ExecutionError):
+                await engine.execute_decision("f", "1.0.0", {"fail": i + 1})
+        with pytest.raises(CircuitOpenError):
+            await engine.execute_decision("f", "1.0.0", {"fail": 0})
+
+        health = await engine.health_check()
+        assert health["status"] == "degraded"
+        assert health["open_circuits"] == ["f:1.0.0"]
+        assert health["circuit_breakers"]["f:1.0.0"]["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_enhanced_engine_timeout(self, tmp_path):
+        """Timeouts surface as ExecutionTimeoutError and count for the breaker"""
+        engine = enhanced_engine.DecisionEngine(
+            execution_config=ExecutionConfig(timeout_seconds=0.05)
+        )
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        engine.register_function("f", "1.0.0", sleepy)
+
+        with pytest.raises(ExecutionTimeoutError):
+            await engine.execute_decision("f", "1.0.0", {"sleep": 0.3})
+        engine.shutdown(wait=False)
+
+        stats = engine.circuit_breakers.get_stats()["f:1.0.0"]
+        assert stats["window_timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_enhanced_batch_timeouts_count_as_timeouts(self, tmp_path):
+        """Items abandoned at a batch deadline feed the breaker's timeout rate"""
+        engine = enhanced_engine.DecisionEngine(
+            execution_config=ExecutionConfig(timeout_seconds=0.05)
+        )
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        engine.register_function("f", "1.0.0", sleepy)
+
+        results = await engine.execute_batch(
+            "f", [{"sleep": 0}, {"sleep": 0.3}], "1.0.0"
+        )
+        engine.shutdown(wait=False)
+
+        assert [result.success for result in results] == [True, False]
+        stats = engine.circuit_breakers.get_stats()["f:1.0.0"]
+        assert stats["window_timeouts"] == 1
+        assert stats["window_failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_core_engine_deadline_and_breaker(self, tmp_path):
+        """The core engine reads deadlines and breaker settings from config"""
+        engine = CoreDecisionEngine(
+            config={
+                "storage": {"path": str(tmp_path)},
+                "plugins": {"tracing": {"path": str(tmp_path / "traces")}},
+                "execution": {"function_timeouts": {"hang": 0.05}},
+                "circuit_breaker": {"minimum_calls": 1},
+            }
+        )
+        await engine.deploy_function("hang", "1.0.0", HANGING_FUNCTION)
+
+        with pytest.raises(ExecutionTimeoutError):
+            await engine.execute("hang", {"sleep": 0.3}, "1.0.0")
+        with pytest.raises(CircuitOpenError):
+            await engine.execute("hang", {"sleep": 0}, "1.0.0")
+
+        assert engine.get_circuit_breaker_stats()["hang:1.0.0"]["state"] == "open"
+        executor_stats = engine.get_executor_stats()
+        assert executor_stats["timeouts"] == 1
+        assert executor_stats["abandoned_threads"] == 1
+        engine.shutdown(wait=False)
+
+    @pytest.mark.asyncio
+    async def test_core_engine_caller_errors_skip_breaker(self, tmp_path):
+        """Invalid input and unknown versions do not count against breakers"""
+        engine = CoreDecisionEngine(
+            config={
+                "storage": {"path": str(tmp_path)},
+                "plugins": {"tracing": {"path": str(tmp_path / "traces")}},
+                "circuit_breaker": {"minimum_calls": 1},
+            }
+        )
+        await engine.deploy_function("hang", "1.0.0", HANGING_FUNCTION)
+        engine.plugins["pre_execute"][0].schema = {
+            "input": {"sleep": {"required": True}}
+        }
+
+        with pytest.raises(ExecutionError, match="Required field"):
+            await engine.execute("hang", {}, "1.0.0")
+        with pytest.raises(StorageError, match="not found"):
+            await engine.execute("hang", {"sleep": 0}, "9.9.9")
+
+        assert await engine.execute("hang", {"sleep": 0}, "1.0.0") == {"ok": True}
+        stats = engine.get_circuit_breaker_stats()
+        assert list(stats) == ["hang:1.0.0"]
+        assert stats["hang:1.0.0"]["window_failures"] == 0
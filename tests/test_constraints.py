@@ -0,0 +1,128 @@
+"""
+Tests for decision function constraint checking
+"""
+
+import pytest
+
+from policy_as_code.features.constraints import (
+    ConstraintViolationType,
+    DeterministicFunction,
+    DFConstraintChecker,
+    check_functions,
+)
+
+MIXED_FUNCTION = """
+import os
+from random import choice
+
+def decision_function(input_data, context):
+    context.seen = open(str(time.time()))
+    return {"value": datetime.now(), "pick": choice([1, 2])}
+"""
+
+
+def fresh_function(n):
+    return f"""
+def decision_function(input_data, context):
+    return {{"approved": input_data.get("amount", 0) < {n}}}
+"""
+
+
+def fail(*args, **kwargs):
+    raise AssertionError("verdict should have come from the cache")
+
+
+@pytest.fixture(autouse=True)
+def clear_verdicts():
+    DFConstraintChecker.verdicts.clear()
+    yield
+    DFConstraintChecker.verdicts.clear()
+
+
+class TestDFConstraintChecker:
+    """Test the single-pass checker and its verdict cache"""
+
+    def test_reports_every_check_in_order(self):
+        """Violations are grouped by check: imports, calls, side effects, time"""
+        violations = DFConstraintChecker().check_function(MIXED_FUNCTION)
+
+        assert [(v.violation_type, v.code_snippet) for v in violations] == [
+            (ConstraintViolationType.BANNED_IMPORT, "import os"),
+            (ConstraintViolationType.BANNED_IMPORT, "from random import ..."),
+            (ConstraintViolationType.EXTERNAL_CALL, "open(str(time.time()))"),
+            (ConstraintViolationType.EXTERNAL_CALL, "time.time()"),
+            (ConstraintViolationType.EXTERNAL_CALL, "datetime.now()"),
+            (
+                ConstraintViolationType.SIDE_EFFECTS,
+                "context.seen = open(str(time.time()))",
+            ),
+            (ConstraintViolationType.FILE_IO, "open(str(time.time()))"),
+            (ConstraintViolationType.TIME_DEPENDENT, "time.time()"),
+            (ConstraintViolationType.TIME_DEPENDENT, "datetime.now()"),
+        ]
+
+    def test_syntax_error(self):
+        """Unparseable source is a single error"""
+        [violation] = DFConstraintChecker().check_function("def broken(:\n")
+
+        assert violation.severity == "error"
+        assert violation.message.startswith("Syntax error")
+
+    def test_verdicts_are_cached(self, monkeypatch):
+        """Re-validating unchanged source does not parse it again"""
+        function = DeterministicFunction(MIXED_FUNCTION)
+        first = function.validate()
+        hits = DFConstraintChecker.verdicts.hits
+
+        monkeypatch.setattr(DFConstraintChecker, "_check", fail)
+        second = DeterministicFunction(MIXED_FUNCTION).validate()
+
+        assert second == first
+        assert second is not first
+        assert DFConstraintChecker.verdicts.hits == hits + 1
+
+    def test_subclasses_keep_their_own_verdicts(self):
+        """A checker with other banned names does not reuse base verdicts"""
+
+        class LenientChecker(DFConstraintChecker):
+            BANNED_IMPORTS = set()
+
+        assert DFConstraintChecker().check_function("import os\n")
+        assert LenientChecker().check_function("import os\n") == []
+
+
+class TestCheckFunctions:
+    """Test bulk checking of a function registry"""
+
+    def test_inline_matches_single_checks(self, monkeypatch):
+        """Small registries are checked in-process, once per distinct source"""
+        registry = {
+            "mixed": MIXED_FUNCTION,
+            "copy": MIXED_FUNCTION,
+            "pure": fresh_function(1),
+        }
+        calls = []
+        original = DFConstraintChecker._check
+        monkeypatch.setattr(
+            DFConstraintChecker,
+            "_check",
+            lambda self, code: calls.append(code) or original(self, code),
+        )
+
+        verdicts = check_functions(registry)
+
+        assert len(calls) == 2
+        assert verdicts["pure"] == []
+        assert verdicts["mixed"] == verdicts["copy"]
+        assert verdicts["mixed"] == DFConstraintChecker().check_function(MIXED_FUNCTION)
+
+    def test_process_pool(self):
+        """Large registries are checked in worker processes and cached"""
+        registry = {f"fn_{n}": fresh_function(n) for n in range(8)}
+        registry["mixed"] = MIXED_FUNCTION
+
+        verdicts = check_functions(registry, max_workers=2, min_parallel=1)
+
+        assert all(verdicts[f"fn_{n}"] == [] for n in range(8))
+        assert len(verdicts["mixed"]) == 9
+        assert DFConstraintChecker.verdicts.get_stats()["size"] == 9
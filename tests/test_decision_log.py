@@ -0,0 +1,241 @@
+"""
+Tests for the segmented decision log and its FileStorage layout
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from policy_as_code.core.decision_log import DecisionLog
+from policy_as_code.core.storage import FileStorage
+
+START = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def record(n, function_id="f", version="1.0.0", minutes=None):
+    timestamp = START + timedelta(minutes=n if minutes is None else minutes)
+    return {
+        "trace_id": f"trace-{n}",
+        "function_id": function_id,
+        "version": version,
+        "timestamp": timestamp.isoformat(),
+        "result": {"success": n % 2 == 0, "execution_time_ms": n},
+    }
+
+
+def context(n, function_id="f", version="1.0.0"):
+    return SimpleNamespace(
+        trace_id=f"trace-{n}",
+        function_id=function_id,
+        version=version,
+        timestamp=START + timedelta(minutes=n),
+    )
+
+
+class TestDecisionLog:
+    """Test segment rotation, index seeks and recovery"""
+
+    def test_rotation_and_seeks(self, tmp_path):
+        """Records span segments and come back newest first"""
+        log = DecisionLog(str(tmp_path), max_segment_bytes=512)
+        for n in range(30):
+            log.append(record(n, version="1.0.0" if n % 3 else "2.0.0"))
+        log.append(record(99, function_id="g"))
+
+        assert log.get_stats()["segments"] > 1
+        assert log.get("trace-7") == record(7)
+        assert log.get("missing") is None
+        history = log.history("f", limit=5, offset=2)
+        assert [d["trace_id"] for d in history] == [
+            f"trace-{n}" for n in range(27, 22, -1)
+        ]
+        assert [d["trace_id"] for d in log.history("f", version="2.0.0", limit=3)] == [
+            "trace-27",
+            "trace-24",
+            "trace-21",
+        ]
+        between = log.between(record(10)["timestamp"], record(12)["timestamp"])
+        assert [d["trace_id"] for d in between] == ["trace-12", "trace-11", "trace-10"]
+
+    def test_out_of_order_timestamps(self, tmp_path):
+        """Late records are placed by timestamp, not arrival"""
+        log = DecisionLog(str(tmp_path))
+        log.append(record(1, minutes=10))
+        log.append(record(2, minutes=5))
+        log.append(record(3, minutes=20))
+
+        assert [d["trace_id"] for d in log.history("f")] == [
+            "trace-3",
+            "trace-1",
+            "trace-2",
+        ]
+        assert [d["trace_id"] for d in log.records("f")] == [
+            "trace-2",
+            "trace-1",
+            "trace-3",
+        ]
+
+    def test_reopen_recovers_torn_tail(self, tmp_path):
+        """Unindexed records are re-indexed and a torn record is dropped"""
+        log = DecisionLog(str(tmp_path))
+        for n in range(5):
+            log.append(record(n))
+        log.close()
+
+        index_path = next(tmp_path.glob("*.idx"))
+        lines = index_path.read_bytes().splitlines(keepends=True)
+        index_path.write_bytes(b"".join(lines[:3]) + lines[3][:10])
+        segment_path = next(tmp_path.glob("*.log"))
+        with open(segment_path, "ab") as f:
+            f.write(b"\x00\x00\x01\x00partial")
+
+        reopened = DecisionLog(str(tmp_path))
+
+        assert len(reopened) == 5
+        assert reopened.recovered == 2
+        assert reopened.get("trace-4") == record(4)
+        reopened.append(record(5))
+        assert [d["trace_id"] for d in reopened.history("f", limit=2)] == [
+            "trace-5",
+            "trace-4",
+        ]
+        assert len(DecisionLog(str(tmp_path))) == 6
+
+    def test_drop_before(self, tmp_path):
+        """Older records are hidden at once and their segments deleted"""
+        log = DecisionLog(str(tmp_path), max_segment_bytes=400)
+        for n in range(20):
+            log.append(record(n))
+        segments = log.get_stats()["segments"]
+
+        assert log.drop_before(record(10)["timestamp"]) == 10
+
+        assert len(log) == 10
+        assert log.get_stats()["segments"] < segments
+        assert log.get("trace-9") is None
+        assert log.history("f", limit=20)[-1]["trace_id"] == "trace-10"
+        assert log.between("", record(19)["timestamp"])[-1]["trace_id"] == "trace-10"
+        reopened = DecisionLog(str(tmp_path))
+        assert len(reopened) == 10
+        assert reopened.drop_before(record(5)["timestamp"]) == 0
+
+    def test_drop_before_waits_for_reads(self, tmp_path):
+        """A segment expiring during a read is deleted once the read is done"""
+        log = DecisionLog(str(tmp_path), max_segment_bytes=400)
+        for n in range(20):
+            log.append(record(n))
+        segments = len(list(tmp_path.glob("*.log")))
+        cutoffs = [record(10)["timestamp"], record(5)["timestamp"]]
+        read = log._read
+
+        def read_during_retention(locations):
+            log.drop_before(cutoffs.pop())
+            return read(locations)
+
+        log._read = read_during_retention
+        assert log.get("trace-2") == record(2)
+        assert [d["trace_id"] for d in log.history("f", limit=2, offset=12)] == [
+            "trace-7",
+            "trace-6",
+        ]
+
+        log._read = read
+        assert log.get("trace-7") is None
+        assert len(list(tmp_path.glob("*.log"))) < segments
+        assert log.get_stats()["segments"] == len(list(tmp_path.glob("*.log")))
+
+    def test_restored_trace_history(self, tmp_path):
+        """History returns only the latest record of a re-stored trace"""
+        log = DecisionLog(str(tmp_path))
+        for n in range(3):
+            log.append(record(n))
+        log.append(dict(record(1, minutes=10), version="2.0.0"))
+
+        assert [d["trace_id"] for d in log.history("f")] == [
+            "trace-1",
+            "trace-2",
+            "trace-0",
+        ]
+        assert log.history("f", version="1.0.0", limit=1)[0]["trace_id"] == "trace-2"
+        assert log.history("f", version="2.0.0")[0]["version"] == "2.0.0"
+        assert len(log) == 3
+        reopened = DecisionLog(str(tmp_path))
+        assert [d["trace_id"] for d in reopened.history("f", version="1.0.0")] == [
+            "trace-2",
+            "trace-0",
+        ]
+
+    def test_restored_trace_between(self, tmp_path):
+        """Time-range reads skip the superseded record of a trace"""
+        log = DecisionLog(str(tmp_path))
+        for n in range(3):
+            log.append(record(n))
+        log.append(record(1, minutes=1))
+
+        between = log.between(record(0)["timestamp"], record(2)["timestamp"])
+        assert [d["trace_id"] for d in between] == ["trace-2", "trace-1", "trace-0"]
+
+    def test_restored_trace_records(self, tmp_path):
+        """Full scans yield each trace once, at its latest position"""
+        log = DecisionLog(str(tmp_path))
+        for n in range(3):
+            log.append(record(n))
+        log.append(record(0, function_id="g"))
+
+        assert [d["trace_id"] for d in log.records("f")] == ["trace-1", "trace-2"]
+        assert [d["trace_id"] for d in log.records("g")] == ["trace-0"]
+        assert log.get("trace-0")["function_id"] == "g"
+
+
+class TestFileStorageDecisionLog:
+    """Test FileStorage with decisions in a segmented log"""
+
+    @pytest.mark.asyncio
+    async def test_store_and_query(self, tmp_path):
+        """Decisions go to the log instead of per-file JSON"""
+        storage = FileStorage(
+            str(tmp_path), decision_log=DecisionLog(str(tmp_path / "log"))
+        )
+        for n in range(4):
+            await storage.store_decision(context(n), record(n)["result"])
+
+        assert not list((tmp_path / "decisions").glob("*.json"))
+        assert (await storage.retrieve_decision("trace-2"))["result"] == record(2)[
+            "result"
+        ]
+        history = await storage.get_decision_history("f", limit=2)
+        assert [d["trace_id"] for d in history] == ["trace-3", "trace-2"]
+        stats = await storage.get_decision_stats("f")
+        assert stats["total_decisions"] == 4
+        assert stats["success_rate"] == 0.5
+        assert stats["first_decision"] == record(0)["timestamp"]
+
+    @pytest.mark.asyncio
+    async def test_legacy_files_readable_and_migrated(self, tmp_path):
+        """Per-file decisions are merged into reads until migrated"""
+        legacy = FileStorage(str(tmp_path))
+        for n in range(0, 6, 2):
+            await legacy.store_decision(context(n), record(n)["result"])
+
+        storage = FileStorage(
+            str(tmp_path), decision_log=DecisionLog(str(tmp_path / "log"))
+        )
+        for n in range(1, 6, 2):
+            await storage.store_decision(context(n), record(n)["result"])
+
+        expected = [f"trace-{n}" for n in range(5, -1, -1)]
+        history = await storage.get_decision_history("f", limit=10)
+        assert [d["trace_id"] for d in history] == expected
+        assert (await storage.retrieve_decision("trace-0"))["trace_id"] == "trace-0"
+        by_date = await storage.get_decisions_by_date_range(
+            START, START + timedelta(minutes=2)
+        )
+        assert [d["trace_id"] for d in by_date] == ["trace-2", "trace-1", "trace-0"]
+
+        assert await storage.migrate_decisions() == 3
+        assert not list((tmp_path / "decisions").glob("*.json"))
+        history = await storage.get_decision_history("f", limit=3, offset=1)
+        assert [d["trace_id"] for d in history] == expected[1:4]
+        migrated = await storage.retrieve_decision("trace-0")
+        assert migrated["result"] == record(0)["result"]
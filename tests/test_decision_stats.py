@@ -0,0 +1,196 @@
+"""
+Tests for incrementally maintained decision statistics
+"""
+
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from policy_as_code.core.decision_log import DecisionLog
+from policy_as_code.core.decision_stats import DecisionRollups
+from policy_as_code.core.storage import FileStorage
+
+
+def context(n, function_id="f", timestamp=None):
+    return SimpleNamespace(
+        trace_id=f"trace-{function_id}-{n}",
+        function_id=function_id,
+        version="1.0.0",
+        timestamp=timestamp or datetime(2024, 1, 1, 12) + timedelta(hours=n),
+    )
+
+
+def result(n):
+    return {"success": n % 4 != 0, "execution_time_ms": n}
+
+
+def fail(*args, **kwargs):
+    raise AssertionError("decisions were scanned")
+
+
+async def store(storage, count, function_id="f"):
+    for n in range(count):
+        await storage.store_decision(context(n, function_id), result(n))
+
+
+class TestDecisionRollups:
+    """Test the snapshot and journal persistence"""
+
+    def test_journal_replay_and_snapshot(self, tmp_path):
+        """Recorded decisions survive reopening, across compactions"""
+        rollups = DecisionRollups(str(tmp_path), snapshot_interval=3)
+        for n in range(7):
+            rollups.record("f", f"2024-01-0{1 + n % 2}T00:00:0{n}", n % 2 == 0, n)
+
+        reopened = DecisionRollups(str(tmp_path))
+
+        assert reopened.exists
+        assert reopened.stats("f") == rollups.stats("f")
+        assert reopened.stats("f")["total_decisions"] == 7
+        assert reopened.daily("f")["2024-01-02"]["total_decisions"] == 3
+        assert len(list(tmp_path.glob("journal-*.jsonl"))) == 1
+
+    def test_torn_journal_line(self, tmp_path):
+        """A partially written journal line is skipped"""
+        rollups = DecisionRollups(str(tmp_path))
+        rollups.record("f", "2024-01-01T00:00:00", True, 5.0)
+        with open(next(tmp_path.glob("journal-*.jsonl")), "a") as f:
+            f.write('["f", "2024-01-0')
+
+        reopened = DecisionRollups(str(tmp_path))
+        reopened.record("f", "2024-01-01T00:00:01", False, None)
+
+        assert DecisionRollups(str(tmp_path)).stats("f")["total_decisions"] == 2
+
+
+class TestFileStorageStats:
+    """Test FileStorage stats read from rollups"""
+
+    @pytest.mark.asyncio
+    async def test_stats_without_scanning(self, tmp_path, monkeypatch):
+        """Stats come from rollups and match a scan of the decisions"""
+        storage = FileStorage(str(tmp_path))
+        await store(storage, 30)
+        await store(storage, 3, function_id="g")
+        monkeypatch.setattr(storage, "_stored_decisions", fail)
+
+        stats = await storage.get_decision_stats("f")
+
+        assert stats == {
+            "total_decisions": 30,
+            "success_rate": 22 / 30,
+            "avg_execution_time": sum(range(1, 30)) / 29,
+            "first_decision": "2024-01-01T12:00:00",
+            "last_decision": "2024-01-02T17:00:00",
+        }
+        daily = await storage.get_daily_decision_stats("f")
+        assert list(daily) == ["2024-01-01", "2024-01-02"]
+        assert daily["2024-01-01"]["total_decisions"] == 12
+        assert await storage.get_decision_stats("missing") == {
+            "total_decisions": 0,
+            "success_rate": 0.0,
+            "avg_execution_time": 0.0,
+        }
+        monkeypatch.undo()
+        assert (await FileStorage(str(tmp_path)).get_decision_stats("f")) == stats
+
+    @pytest.mark.asyncio
+    async def test_existing_decisions_backfilled(self, tmp_path):
+        """Decisions stored before rollups existed are counted once"""
+        storage = FileStorage(str(tmp_path))
+        await store(storage, 5)
+        storage.decision_rollups.close()
+        for path in (tmp_path / "decisions" / "stats").iterdir():
+            path.unlink()
+
+        storage = FileStorage(str(tmp_path))
+        await storage.store_decision(context(5), result(5))
+
+        assert (await storage.get_decision_stats("f"))["total_decisions"] == 6
+
+    @pytest.mark.asyncio
+    async def test_rebuild_detects_drift(self, tmp_path):
+        """Rebuilding reports rollups that disagree with the decisions"""
+        storage = FileStorage(str(tmp_path))
+        await store(storage, 10)
+        report = await storage.rebuild_decision_stats(dry_run=True)
+        assert report["decisions"] == 10
+        assert report["mismatches"] == []
+
+        decision_file = tmp_path / "decisions" / "trace-f-1.json"
+        decision = json.loads(decision_file.read_text())
+        decision["result"]["success"] = False
+        decision_file.write_text(json.dumps(decision))
+        (tmp_path / "decisions" / "trace-f-2.json").unlink()
+
+        report = await storage.rebuild_decision_stats()
+
+        assert [m["day"] for m in report["mismatches"]] == ["2024-01-01"]
+        assert (await storage.get_decision_stats("f"))["total_decisions"] == 9
+        assert (await storage.rebuild_decision_stats())["mismatches"] == []
+
+    @pytest.mark.asyncio
+    async def test_cleanup_recounts_cutoff_day(self, tmp_path):
+        """Retention removes old days and recounts the partial one"""
+        storage = FileStorage(
+            str(tmp_path),
+            decision_log=DecisionLog(str(tmp_path / "log"), max_segment_bytes=300),
+        )
+        now = datetime.now()
+        for n, age in enumerate([timedelta(days=40), timedelta(days=39), timedelta(0)]):
+            await storage.store_decision(context(n, timestamp=now - age), result(n))
+
+        deleted = await storage.cleanup_old_decisions(retention_days=30)
+
+        assert deleted == 2
+        assert (await storage.get_decision_stats("f"))["total_decisions"] == 1
+        assert list(await storage.get_daily_decision_stats("f")) == [
+            now.date().isoformat()
+        ]
+        assert (await storage.rebuild_decision_stats())["mismatches"] == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("with_log", [False, True])
+    async def test_restored_trace_counted_once(self, tmp_path, with_log):
+        """Storing a trace id again replaces its counters"""
+        log = DecisionLog(str(tmp_path / "log")) if with_log else None
+        storage = FileStorage(str(tmp_path), decision_log=log)
+        await store(storage, 3)
+        await storage.store_decision(
+            context(1, timestamp=datetime(2024, 1, 3, 12)), result(0)
+        )
+
+        stats = await storage.get_decision_stats("f")
+        assert stats["total_decisions"] == 3
+        assert stats["success_rate"] == 1 / 3
+        assert len(await storage.get_decision_history("f")) == 3
+        assert list(await storage.get_daily_decision_stats("f")) == [
+            "2024-01-01",
+            "2024-01-03",
+        ]
+        report = await storage.rebuild_decision_stats(dry_run=True)
+        assert report["decisions"] == 3
+        assert report["mismatches"] == []
+        reopened = DecisionRollups(str(tmp_path / "decisions" / "stats"))
+        assert reopened.stats("f")["total_decisions"] == 3
+
+    @pytest.mark.asyncio
+    async def test_moved_decision_bounds_until_rebuild(self, tmp_path):
+        """Counters follow a moved decision; its old day keeps its bound"""
+        storage = FileStorage(str(tmp_path))
+        await store(storage, 2)
+        await storage.store_decision(
+            context(1, timestamp=datetime(2024, 1, 3, 12)), result(1)
+        )
+
+        daily = await storage.get_daily_decision_stats("f")
+        assert daily["2024-01-01"]["total_decisions"] == 1
+        assert daily["2024-01-01"]["last_decision"] == "2024-01-01T13:00:00"
+        report = await storage.rebuild_decision_stats(dry_run=True)
+        assert [m["day"] for m in report["mismatches"]] == ["2024-01-01"]
+
+        await storage.rebuild_decision_stats()
+        daily = await storage.get_daily_decision_stats("f")
+        assert daily["2024-01-01"]["last_decision"] == "2024-01-01T12:00:00"
@@ -0,0 +1,279 @@
+"""
+Tests for the DSL rule compiler
+"""
+
+import random
+
+import pytest
+
+from policy_as_code.core import enhanced_engine
+from policy_as_code.core.storage import FileStorage
+from policy_as_code.features.dsl import (
+    DSLRule,
+    DSLSchema,
+    Operator,
+    RuleAction,
+    RuleCondition,
+    RuleType,
+)
+from policy_as_code.features.dsl_compiler import (
+    CompiledSchema,
+    DSLCompileError,
+    DSLCompiler,
+    RuleIndex,
+    compile_condition,
+    register_dsl_schema,
+)
+from policy_as_code.tracing.enhanced_ledger import ImmutableTraceLedger
+
+
+def rule(rule_id, priority, conditions, status, enabled=True):
+    return DSLRule(
+        rule_id=rule_id,
+        rule_type=RuleType.CONDITION,
+        priority=priority,
+        conditions=conditions,
+        actions=[RuleAction("set", "status", status)],
+        description=rule_id,
+        enabled=enabled,
+    )
+
+
+def make_schema(version="1.0.0") -> DSLSchema:
+    return DSLSchema(
+        name="benefit",
+        version=version,
+        rules=[
+            rule(
+                "low_income",
+                10,
+                [RuleCondition("applicant.income", Operator.LT, 30000)],
+                "eligible",
+            ),
+            rule(
+                "blocked_region",
+                20,
+                [RuleCondition("region", Operator.IN, ["X", "Y"])],
+                "blocked",
+            ),
+            rule("fallback", 0, [], "review"),
+            rule(
+                "disabled",
+                100,
+                [RuleCondition("region", Operator.EQ, "A")],
+                "never",
+                enabled=False,
+            ),
+        ],
+        input_schema={},
+        output_schema={"status": {"type": "string", "default": "none"}},
+    )
+
+
+class TestCompiledConditions:
+    """Test condition closures"""
+
+    @pytest.mark.parametrize(
+        "operator,operand,value,expected",
+        [
+            (Operator.EQ, 1, 1, True),
+            (Operator.NE, 1, 1, False),
+            (Operator.LE, 5, 5, True),
+            (Operator.GT, 5, 5, False),
+            (Operator.IN, ["a", "b"], "a", True),
+            (Operator.NOT_IN, ["a", "b"], "c", True),
+            (Operator.IN, [{"k": 1}], {"k": 1}, True),
+            (Operator.CONTAINS, "x", "xyz", True),
+            (Operator.NOT_CONTAINS, "x", "abc", True),
+            (Operator.REGEX, r"^FI-\d+$", "FI-123", True),
+            (Operator.NOT_REGEX, r"^FI-", "SE-1", True),
+            (Operator.REGEX, r"\d", 5, False),
+        ],
+    )
+    def test_operators(self, operator, operand, value, expected):
+        """Each operator is bound to its comparison"""
+        predicate = compile_condition(RuleCondition("f", operator, operand))
+        assert predicate({"f": value}) is expected
+
+    def test_missing_and_mistyped_fields_do_not_hold(self):
+        """Missing fields and type errors are false even when negated"""
+        predicate = compile_condition(
+            RuleCondition("a.b", Operator.LT, 3, negated=True)
+        )
+
+        assert predicate({"a": {"b": 1}}) is False
+        assert predicate({"a": {"b": 5}}) is True
+        assert predicate({"a": 1}) is False
+        assert predicate({"a": {"b": "text"}}) is False
+
+    def test_invalid_regex_fails_at_compile_time(self):
+        """Bad patterns are reported with the rule id"""
+        with pytest.raises(DSLCompileError, match="r1"):
+            compile_condition(RuleCondition("f", Operator.REGEX, "("), "r1")
+
+
+class TestCompiledSchema:
+    """Test first-match evaluation"""
+
+    def test_priority_order_and_first_match(self):
+        """The highest-priority matching enabled rule fires"""
+        compiled = CompiledSchema(make_schema())
+
+        assert [r.rule_id for r in compiled.rules] == [
+            "blocked_region",
+            "low_income",
+            "fallback",
+        ]
+        assert compiled({"region": "X", "applicant": {"income": 1}}) == {
+            "status": "blocked",
+            "matched_rule": "blocked_region",
+        }
+        assert compiled({"region": "A", "applicant": {"income": 1}}) == {
+            "status": "eligible",
+            "matched_rule": "low_income",
+        }
+        assert compiled({"region": "A"})["matched_rule"] == "fallback"
+
+    def test_defaults_and_actions(self):
+        """Actions update the output that starts from schema defaults"""
+        schema = DSLSchema(
+            name="score",
+            version="1.0.0",
+            rules=[
+                DSLRule(
+                    rule_id="bonus",
+                    rule_type=RuleType.CUSTOM,
+                    priority=1,
+                    conditions=[],
+                    actions=[
+                        RuleAction("increment", "score", 5),
+                        RuleAction("append", "tags", "bonus"),
+                        RuleAction("remove", "tags", "base"),
+                    ],
+                    description="bonus",
+                )
+            ],
+            input_schema={},
+            output_schema={
+                "score": {"default": 10},
+                "tags": {"default": ["base"]},
+            },
+        )
+
+        assert CompiledSchema(schema)({}) == {
+            "score": 15,
+            "tags": ["bonus"],
+            "matched_rule": "bonus",
+        }
+
+
+def random_rule_set(rng, size):
+    rules = []
+    for i in range(size):
+        kind = rng.randrange(5)
+        low = rng.randrange(0, 100)
+        if kind == 0:
+            conditions = [
+                RuleCondition("income", Operator.GE, low),
+                RuleCondition("income", Operator.LT, low + rng.randrange(1, 20)),
+            ]
+        elif kind == 1:
+            operator = rng.choice([Operator.LT, Operator.LE, Operator.GT, Operator.GE])
+            conditions = [RuleCondition("income", operator, low + 0.5 * (i % 2))]
+        elif kind == 2:
+            conditions = [
+                RuleCondition("region", Operator.IN, rng.sample("ABCDEF", 2)),
+                RuleCondition("size", Operator.GT, rng.randrange(5)),
+            ]
+        elif kind == 3:
+            conditions = [RuleCondition("size", Operator.EQ, rng.randrange(5))]
+        else:
+            conditions = [
+                RuleCondition("income", Operator.LT, low, negated=True),
+                RuleCondition("region", Operator.NE, "A"),
+            ]
+        rules.append(rule(f"r{i}", rng.randrange(10), conditions, f"s{i}"))
+    return DSLSchema(
+        name="brackets",
+        version="1.0.0",
+        rules=rules,
+        input_schema={},
+        output_schema={},
+    )
+
+
+class TestRuleIndex:
+    """Test indexed first-match lookup"""
+
+    def test_index_matches_linear_scan(self):
+        """Indexed lookup fires the same rule as a linear scan"""
+        rng = random.Random(7)
+        compiled = CompiledSchema(random_rule_set(rng, 300))
+        assert compiled.index is not None
+
+        incomes = [0, 5, 5.5, 50, 99.5, 120, True, None, "50", float("nan")]
+        inputs = [
+            {
+                "income": rng.choice(incomes),
+                "region": rng.choice(["A", "C", "F", ["A"], 1]),
+                "size": rng.choice([0, 2, 4.0, "2"]),
+            }
+            for _ in range(500)
+        ] + [{}, {"income": 10}, {"region": "B"}]
+
+        for data in inputs:
+            linear = next((r for r in compiled.rules if r.matches(data)), None)
+            assert compiled.match(data) is linear, data
+
+    def test_candidates_narrow_disjoint_brackets(self):
+        """Disjoint range rules yield a single candidate"""
+        rules = [
+            rule(
+                f"band_{i}",
+                0,
+                [
+                    RuleCondition("income", Operator.GE, i * 1000),
+                    RuleCondition("income", Operator.LT, (i + 1) * 1000),
+                ],
+                str(i),
+            )
+            for i in range(1000)
+        ]
+        index = RuleIndex(rules)
+
+        assert index.candidates({"income": 4321}) == [4]
+        assert index.candidates({"income": 5000}) == [5]
+        assert index.candidates({"income": -1}) == []
+
+
+class TestDSLCompiler:
+    """Test the schema-hash compilation cache"""
+
+    def test_identical_schemas_share_compilation(self):
+        """Schemas with the same content hash compile once"""
+        compiler = DSLCompiler(max_entries=1)
+
+        first = compiler.compile(make_schema())
+        assert compiler.compile(make_schema()) is first
+        assert compiler.compile_dict(make_schema().to_dict()) is first
+        assert compiler.compile(make_schema("2.0.0")) is not first
+
+        stats = compiler.get_stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 2
+        assert stats["size"] == 1
+
+    @pytest.mark.asyncio
+    async def test_register_with_engine(self, tmp_path):
+        """A compiled schema runs as an engine decision function"""
+        engine = enhanced_engine.DecisionEngine()
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        register_dsl_schema(engine, make_schema())
+
+        result = await engine.execute_decision(
+            "benefit", "1.0.0", {"region": "Y", "applicant": {"income": 1}}
+        )
+
+        assert result.success, result.error_message
+        assert result.result["status"] == "blocked"
@@ -0,0 +1,259 @@
+"""
+Tests for DSL rule conflict detection
+"""
+
+import itertools
+import random
+
+from policy_as_code.features.dsl import (
+    EXAMPLE_CONFLICTED_SCHEMA,
+    ConflictType,
+    DSLAnalysisSession,
+    DSLRule,
+    DSLSchema,
+    Operator,
+    RuleAction,
+    RuleCondition,
+    RuleConflictDetector,
+    RuleType,
+    analyze_dsl_schema,
+)
+from policy_as_code.features.dsl_compiler import compile_conditions
+
+FIELDS = ["x", "y"]
+# Integer bounds are separated by the half-integers, so this grid hits
+# every region a rule's conditions can distinguish
+DOMAIN = [n / 2 for n in range(-2, 23)] + ["a", "b", None]
+OPERATORS = [
+    Operator.EQ,
+    Operator.NE,
+    Operator.LT,
+    Operator.LE,
+    Operator.GT,
+    Operator.GE,
+    Operator.IN,
+    Operator.NOT_IN,
+]
+
+
+def rule(rule_id, priority, conditions):
+    return DSLRule(
+        rule_id=rule_id,
+        rule_type=RuleType.CONDITION,
+        priority=priority,
+        conditions=conditions,
+        actions=[RuleAction("set", "out", rule_id)],
+        description=rule_id,
+    )
+
+
+def random_condition(rng):
+    operator = rng.choice(OPERATORS)
+    if operator in (Operator.IN, Operator.NOT_IN):
+        value = rng.sample([0, 3, 5, 8, "a"], 2)
+    elif operator in (Operator.EQ, Operator.NE):
+        value = rng.choice([0, 3, 5, 8, "a"])
+    else:
+        value = rng.randrange(11)
+    return RuleCondition(rng.choice(FIELDS), operator, value, rng.random() < 0.2)
+
+
+def grid_inputs():
+    for x, y in itertools.product(DOMAIN + ["missing"], repeat=2):
+        data = {}
+        if x != "missing":
+            data["x"] = x
+        if y != "missing":
+            data["y"] = y
+        yield data
+
+
+class TestConflictDetection:
+    """Test overlap and shadowing against exhaustive evaluation"""
+
+    def test_matches_exhaustive_evaluation(self):
+        """Reported overlaps and shadowing are exactly the true ones"""
+        rng = random.Random(11)
+        rules = [
+            rule(f"r{i}", 100 - i, [random_condition(rng) for _ in range(2)])
+            for i in range(40)
+        ]
+        inputs = list(grid_inputs())
+        matches = [
+            {i for i, data in enumerate(inputs) if compile_conditions(r)(data)}
+            for r in rules
+        ]
+        fields = [{c.field_name for c in r.conditions} for r in rules]
+
+        schema = DSLSchema("random", "1.0.0", rules, {}, {})
+        conflicts = RuleConflictDetector().detect_conflicts(schema)
+
+        overlaps = {
+            tuple(c.rule_ids)
+            for c in conflicts
+            if c.conflict_type == ConflictType.OVERLAPPING_CONDITIONS
+        }
+        expected = {
+            (rules[i].rule_id, rules[j].rule_id)
+            for i, j in itertools.combinations(range(len(rules)), 2)
+            if fields[i] & fields[j] and matches[i] & matches[j]
+        }
+        assert overlaps == expected
+
+        unreachable = {
+            c.rule_ids[0]: set(c.details["shadowing_rules"])
+            for c in conflicts
+            if c.conflict_type == ConflictType.UNREACHABLE_RULE
+        }
+        expected_unreachable = {}
+        for j, r in enumerate(rules):
+            shadowing = {
+                rules[i].rule_id
+                for i in range(j)
+                if matches[j] <= matches[i] and fields[i] <= fields[j]
+            }
+            if not matches[j]:
+                expected_unreachable[r.rule_id] = set()
+            elif shadowing:
+                expected_unreachable[r.rule_id] = shadowing
+        assert unreachable == expected_unreachable
+
+    def test_disjoint_brackets_do_not_overlap(self):
+        """Rules on a shared field with disjoint ranges are not reported"""
+        rules = [
+            rule(
+                f"band_{i}",
+                -i,
+                [
+                    RuleCondition("income", Operator.GE, i * 1000),
+                    RuleCondition("income", Operator.LT, (i + 1) * 1000),
+                ],
+            )
+            for i in range(50)
+        ]
+        rules.append(rule("catch_all", -100, []))
+
+        conflicts = RuleConflictDetector().detect_conflicts(
+            DSLSchema("brackets", "1.0.0", rules, {"income": {}}, {})
+        )
+
+        assert not [
+            c
+            for c in conflicts
+            if c.conflict_type == ConflictType.OVERLAPPING_CONDITIONS
+        ]
+        assert not [
+            c for c in conflicts if c.conflict_type == ConflictType.UNREACHABLE_RULE
+        ]
+
+    def test_catch_all_shadows_later_rules(self):
+        """A rule without conditions makes every later rule unreachable"""
+        rules = [
+            rule("always", 10, []),
+            rule("later", 5, [RuleCondition("x", Operator.EQ, 1)]),
+        ]
+
+        conflicts = RuleConflictDetector().detect_conflicts(
+            DSLSchema("s", "1.0.0", rules, {"x": {}}, {})
+        )
+
+        unreachable = [
+            c for c in conflicts if c.conflict_type == ConflictType.UNREACHABLE_RULE
+        ]
+        assert [c.rule_ids for c in unreachable] == [["later"]]
+        assert unreachable[0].details["shadowing_rules"] == ["always"]
+
+    def test_example_schema(self):
+        """The shipped example reports its shadowed rule"""
+        result = analyze_dsl_schema(EXAMPLE_CONFLICTED_SCHEMA)
+
+        by_type = {}
+        for conflict in result["conflicts"]:
+            by_type.setdefault(conflict["conflict_type"], []).append(
+                conflict["rule_ids"]
+            )
+        assert by_type["unreachable_rule"] == [["unreachable_rule"]]
+        assert by_type["overlapping_conditions"] == [
+            ["high_amount_approval", "unreachable_rule"]
+        ]
+
+
+def random_rule_data(rng, rule_id):
+    return {
+        "rule_id": rule_id,
+        "rule_type": rng.choice(["condition", "threshold", "range"]),
+        "priority": rng.randrange(20),
+        "conditions": [
+            random_condition(rng).to_dict() for _ in range(rng.randrange(4))
+        ],
+        "actions": [
+            {"action_type": "set", "field": rng.choice(["out", "x"]), "value": 1}
+        ],
+        "description": rule_id,
+        "enabled": rng.random() > 0.1,
+    }
+
+
+class TestDSLAnalysisSession:
+    """Test incremental analysis against full analysis"""
+
+    def test_revisions_match_full_analysis(self):
+        """Each revision gives the same result as analyzing it from scratch"""
+        rng = random.Random(11)
+        schema = {
+            "name": "edited",
+            "version": "1.0.0",
+            "rules": [random_rule_data(rng, f"r{i}") for i in range(30)],
+            "input_schema": {"x": {"type": "number"}},
+            "output_schema": {},
+        }
+        session = DSLAnalysisSession()
+        next_id = 30
+
+        for revision in range(60):
+            assert session.analyze(schema) == analyze_dsl_schema(schema), revision
+
+            rules = [dict(r) for r in schema["rules"]]
+            edit = rng.randrange(6)
+            index = rng.randrange(len(rules))
+            if edit == 0:
+                rules[index] = random_rule_data(rng, rules[index]["rule_id"])
+            elif edit == 1:
+                rules[index]["priority"] = rng.randrange(20)
+            elif edit == 2 and len(rules) > 5:
+                del rules[index]
+            elif edit == 3:
+                rules.append(random_rule_data(rng, f"r{next_id}"))
+                next_id += 1
+            elif edit == 4:
+                schema = {
+                    **schema,
+                    "input_schema": rng.choice(
+                        [{"x": {"type": "number"}}, {"x": {}, "y": {"type": "string"}}]
+                    ),
+                }
+            else:
+                rules[index]["enabled"] = not rules[index]["enabled"]
+            schema = {**schema, "rules": rules}
+
+    def test_duplicate_ids_and_syntax_errors(self):
+        """Revisions the session cannot diff still match full analysis"""
+        rng = random.Random(5)
+        rules = [random_rule_data(rng, f"r{i}") for i in range(5)]
+        base = {
+            "name": "edited",
+            "version": "1.0.0",
+            "rules": rules,
+            "input_schema": {},
+            "output_schema": {},
+        }
+        revisions = [
+            base,
+            {**base, "rules": rules + [dict(rules[0], priority=99)]},
+            {**base, "rules": rules[:2] + [{"rule_id": "broken"}]},
+            base,
+        ]
+        session = DSLAnalysisSession()
+
+        for schema in revisions:
+            assert session.analyze(schema) == analyze_dsl_schema(schema)
@@ -0,0 +1,198 @@
+"""
+Tests for vectorized DSL evaluation
+"""
+
+import numpy as np
+import pytest
+
+from policy_as_code.features.dsl import (
+    DSLRule,
+    DSLSchema,
+    Operator,
+    RuleAction,
+    RuleCondition,
+    RuleType,
+)
+from policy_as_code.features.dsl_compiler import CompiledSchema
+from policy_as_code.features.dsl_vectorized import VectorizedSchema, row_count
+
+
+def rule(rule_id, priority, conditions, actions):
+    return DSLRule(
+        rule_id=rule_id,
+        rule_type=RuleType.CONDITION,
+        priority=priority,
+        conditions=conditions,
+        actions=actions,
+        description=rule_id,
+    )
+
+
+def make_schema() -> DSLSchema:
+    return DSLSchema(
+        name="benefit",
+        version="1.0.0",
+        rules=[
+            rule(
+                "blocked_region",
+                30,
+                [RuleCondition("region", Operator.IN, ["X", "Y"])],
+                [RuleAction("set", "status", "blocked")],
+            ),
+            rule(
+                "finnish_low_income",
+                20,
+                [
+                    RuleCondition("applicant.income", Operator.LT, 30000),
+                    RuleCondition("applicant_id", Operator.REGEX, r"^FI-"),
+                ],
+                [
+                    RuleAction("set", "status", "eligible"),
+                    RuleAction("increment", "score", 10),
+                ],
+            ),
+            rule(
+                "large_household",
+                20,
+                [RuleCondition("household_size", Operator.GE, 4)],
+                [
+                    RuleAction("set", "status", "review"),
+                    RuleAction("remove", "score", 0),
+                ],
+            ),
+            rule(
+                "not_low_income",
+                10,
+                [RuleCondition("applicant.income", Operator.LT, 10000, negated=True)],
+                [RuleAction("append", "tags", "checked")],
+            ),
+        ],
+        input_schema={},
+        output_schema={
+            "status": {"default": "none"},
+            "score": {"default": 0},
+            "tags": {"default": []},
+        },
+    )
+
+
+def random_columns(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "region": rng.choice(["A", "B", "X", "Y"], size),
+        "applicant.income": rng.integers(0, 60000, size).astype(float),
+        "applicant_id": rng.choice(["FI-1", "FI-22", "SE-3", "NO-4"], size),
+        "household_size": rng.integers(1, 7, size),
+    }
+
+
+def to_rows(columns, size):
+    rows = []
+    for i in range(size):
+        row = {}
+        for name, column in columns.items():
+            if np.ma.is_masked(column[i]):
+                continue
+            value = column[i].item() if hasattr(column[i], "item") else column[i]
+            *parents, leaf = name.split(".")
+            target = row
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[leaf] = value
+        rows.append(row)
+    return rows
+
+
+class TestVectorizedSchema:
+    """Test equivalence with the row-wise compiled evaluator"""
+
+    def test_matches_row_wise_evaluation(self):
+        """Every row gets the output the compiled closures produce"""
+        columns = random_columns(2000)
+        compiled = CompiledSchema(make_schema())
+
+        result = VectorizedSchema(compiled).evaluate(columns)
+
+        assert result.rows() == [compiled(row) for row in to_rows(columns, 2000)]
+
+    def test_output_columns(self):
+        """Actions become columns gathered by matched rule"""
+        columns = {
+            "region": np.array(["X", "A", "A", "A"]),
+            "applicant.income": np.array([0.0, 20000.0, 50000.0, 5000.0]),
+            "applicant_id": np.array(["FI-1", "FI-1", "FI-1", "SE-1"]),
+            "household_size": np.array([1, 1, 5, 1]),
+        }
+
+        result = VectorizedSchema(make_schema()).evaluate(columns)
+
+        assert result.rule_index.tolist() == [0, 1, 2, -1]
+        assert result["status"].tolist() == ["blocked", "eligible", "review", "none"]
+        assert result["matched_rule"].tolist() == [
+            "blocked_region",
+            "finnish_low_income",
+            "large_household",
+            None,
+        ]
+        # The remove action drops "score" from the large_household output
+        assert result["score"].mask.tolist() == [False, False, True, False]
+
+    def test_missing_values_and_mixed_types(self):
+        """Masked entries, absent columns and type errors do not hold"""
+        income = np.ma.masked_array(
+            [5000.0, 5000.0, 50000.0], mask=[False, True, False]
+        )
+        household = np.array([5, "five", None], dtype=object)
+        columns = {
+            "applicant": {"income": income},
+            "household_size": household,
+        }
+        compiled = CompiledSchema(make_schema())
+
+        result = VectorizedSchema(compiled).evaluate(columns)
+
+        rows = [
+            {"applicant": {"income": 5000.0}, "household_size": 5},
+            {"household_size": "five"},
+            {"applicant": {"income": 50000.0}, "household_size": None},
+        ]
+        assert result.rows() == [compiled(row) for row in rows]
+        assert result.rule_index.tolist() == [2, -1, 3]
+
+    def test_record_array_input(self):
+        """Structured arrays are addressed by field name"""
+        records = np.array(
+            [("X", 1), ("A", 4), ("A", 1)],
+            dtype=[("region", "U1"), ("household_size", "i8")],
+        )
+
+        result = VectorizedSchema(make_schema()).evaluate(records)
+
+        assert result.rule_index.tolist() == [0, 2, -1]
+
+    def test_failing_action_raises_only_when_matched(self):
+        """A rule whose actions fail is an error only for matching rows"""
+        schema = DSLSchema(
+            name="broken",
+            version="1.0.0",
+            rules=[
+                rule(
+                    "bad",
+                    1,
+                    [RuleCondition("x", Operator.EQ, 1)],
+                    [RuleAction("increment", "label", 1)],
+                )
+            ],
+            input_schema={},
+            output_schema={"label": {"default": "text"}},
+        )
+        vectorized = VectorizedSchema(schema)
+
+        assert len(vectorized.evaluate({"x": np.array([0, 2])})) == 2
+        with pytest.raises(TypeError):
+            vectorized.evaluate({"x": np.array([0, 1])})
+
+    def test_row_count_rejects_ragged_columns(self):
+        """Columns of different lengths are rejected"""
+        with pytest.raises(ValueError):
+            row_count({"a": np.zeros(2), "b": {"c": np.zeros(3)}})
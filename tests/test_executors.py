@@ -0,0 +1,188 @@
+"""
+Tests for decision function execution backends
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict
+
+import pytest
+
+from policy_as_code.core import enhanced_engine
+from policy_as_code.core.executors import (
+    CostEstimator,
+    DecisionExecutor,
+    ExecutionConfig,
+    ExecutionMode,
+    ProcessPoolBackend,
+)
+from policy_as_code.core.storage import FileStorage
+from policy_as_code.core.types import DecisionContext
+from policy_as_code.monitoring.performance_monitor import PerformanceMonitor
+from policy_as_code.tracing.enhanced_ledger import ImmutableTraceLedger
+
+
+def benefit_amount(input_data: Dict[str, Any], context) -> Dict[str, Any]:
+    """CPU-bound style decision function that reports its worker"""
+    total = sum(i * i for i in range(input_data["n"])) % 1000
+    return {"amount": total, "pid": os.getpid(), "trace_id": context.trace_id}
+
+
+def make_context(trace_id: str = "t1") -> DecisionContext:
+    return DecisionContext(
+        function_id="benefit",
+        version="1.0.0",
+        input_hash="h",
+        timestamp=datetime.now(),
+        trace_id=trace_id,
+    )
+
+
+class TestDecisionExecutor:
+    """Test executor mode selection"""
+
+    @pytest.mark.asyncio
+    async def test_inline_mode(self):
+        """Inline mode runs on the calling thread"""
+        executor = DecisionExecutor(ExecutionConfig(mode=ExecutionMode.INLINE))
+
+        result = await executor.run(benefit_amount, {"n": 10}, make_context())
+
+        assert result["pid"] == os.getpid()
+        assert executor.get_stats()["dispatch_counts"]["inline"] == 1
+
+    @pytest.mark.asyncio
+    async def test_unpicklable_function_falls_back_to_threads(self):
+        """Closures cannot be shipped to processes and run on threads"""
+        executor = DecisionExecutor(
+            ExecutionConfig(mode=ExecutionMode.PROCESS, max_workers=1)
+        )
+        factor = 3
+
+        def closure(input_data, context):
+            return {"value": input_data["x"] * factor}
+
+        executor.register("benefit", "1.0.0", closure)
+        try:
+            result = await executor.run(closure, {"x": 2}, make_context())
+        finally:
+            executor.shutdown()
+
+        assert result == {"value": 6}
+        assert executor.get_stats()["dispatch_counts"]["thread"] == 1
+
+
+class TestAdaptiveDispatch:
+    """Test cost-based routing between backends"""
+
+    def test_cost_estimator_ewma(self):
+        """Estimates move towards new samples by alpha"""
+        estimator = CostEstimator(alpha=0.5)
+
+        assert estimator.observe("f", 10.0) == 10.0
+        assert estimator.observe("f", 20.0) == 15.0
+        assert estimator.estimate("missing") is None
+
+    def test_routing_by_estimated_cost(self):
+        """Cheap functions go inline, medium to threads, heavy to processes"""
+        executor = DecisionExecutor(
+            ExecutionConfig(
+                mode=ExecutionMode.ADAPTIVE,
+                inline_threshold_ms=1.0,
+                process_threshold_ms=10.0,
+            )
+        )
+        executor.register("benefit", "1.0.0", benefit_amount)
+        key = executor.function_key("benefit", "1.0.0")
+
+        assert executor.mode_for("benefit", "1.0.0", benefit_amount).value == "thread"
+        executor.cost_estimator.observe(key, 0.01)
+        assert executor.mode_for("benefit", "1.0.0", benefit_amount).value == "inline"
+        for _ in range(30):
+            executor.cost_estimator.observe(key, 5)
+        assert executor.mode_for("benefit", "1.0.0", benefit_amount).value == "thread"
+        for _ in range(30):
+            executor.cost_estimator.observe(key, 100)
+        assert executor.mode_for("benefit", "1.0.0", benefit_amount).value == "process"
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_fast_function_moves_inline(self):
+        """After a first measured run a microsecond function runs inline"""
+        monitor = PerformanceMonitor()
+        executor = DecisionExecutor(
+            ExecutionConfig(mode=ExecutionMode.ADAPTIVE), monitor=monitor
+        )
+
+        for _ in range(3):
+            await executor.run(benefit_amount, {"n": 1}, make_context())
+
+        counts = executor.get_stats()["dispatch_counts"]
+        assert counts["thread"] == 1
+        assert counts["inline"] == 2
+        summary = monitor.get_performance_summary()
+        assert summary["execution_dispatch"] == {"thread": 1, "inline": 2}
+
+
+class TestProcessPoolBackend:
+    """Test the process pool backend"""
+
+    @pytest.mark.asyncio
+    async def test_runs_in_worker_processes(self):
+        """Functions execute in pre-warmed worker processes"""
+        backend = ProcessPoolBackend(max_workers=2)
+        assert backend.register("benefit:1.0.0", benefit_amount)
+        try:
+            assert await backend.warm_up() >= 1
+            result = await backend.run("benefit:1.0.0", {"n": 100}, make_context())
+            outcomes = await backend.run_chunk(
+                "benefit:1.0.0",
+                [({"n": i}, make_context(f"t{i}")) for i in range(6)],
+            )
+        finally:
+            backend.shutdown()
+
+        assert result["pid"] != os.getpid()
+        assert [o[0]["trace_id"] for o in outcomes] == [f"t{i}" for i in range(6)]
+        assert all(error is None for _, error, _ in outcomes)
+
+    @pytest.mark.asyncio
+    async def test_recycles_workers(self):
+        """The pool is replaced after the configured number of tasks"""
+        backend = ProcessPoolBackend(max_workers=1, recycle_after_tasks=2)
+        backend.register("benefit:1.0.0", benefit_amount)
+        try:
+            for i in range(5):
+                await backend.run("benefit:1.0.0", {"n": 1}, make_context())
+        finally:
+            backend.shutdown()
+
+        assert backend.get_stats()["recycles"] == 2
+
+
+class TestEngineExecutionModes:
+    """Test the enhanced engine with a process execution backend"""
+
+    @pytest.mark.asyncio
+    async def test_execute_decision_in_process_pool(self, tmp_path):
+        """execute_decision and execute_batch use worker processes"""
+        engine = enhanced_engine.DecisionEngine(
+            execution_config=ExecutionConfig(mode=ExecutionMode.PROCESS, max_workers=2)
+        )
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        engine.register_function("benefit", "1.0.0", benefit_amount)
+
+        try:
+            await engine.warm_up_executor()
+            single = await engine.execute_decision("benefit", "1.0.0", {"n": 50})
+            batch = await engine.execute_batch(
+                "benefit", [{"n": i} for i in range(4)], "1.0.0"
+            )
+        finally:
+            engine.shutdown()
+
+        assert single.success is True
+        assert single.result["pid"] != os.getpid()
+        assert all(r.success for r in batch)
+        assert engine.executor.get_stats()["dispatch_counts"]["process"] == 5
@@ -0,0 +1,131 @@
+"""
+Tests for the compiled decision function cache
+"""
+
+import pytest
+
+from policy_as_code.core.errors import StorageError
+from policy_as_code.core.function_cache import CompiledFunctionCache
+from policy_as_code.core.storage import FileStorage, create_storage_backend
+
+FUNCTION_V1 = """
+def decision_function(input_data, context):
+    return {"approved": input_data.get("amount", 0) < 100}
+"""
+
+FUNCTION_V2 = """
+def decision_function(input_data, context):
+    return {"approved": input_data.get("amount", 0) < 500}
+"""
+
+
+class TestCompiledFunctionCache:
+    """Test CompiledFunctionCache behaviour"""
+
+    def test_load_compiles_once_per_source(self):
+        """Identical source is compiled once, even across versions"""
+        cache = CompiledFunctionCache()
+
+        first = cache.load("loan", "1.0.0", FUNCTION_V1)
+        second = cache.load("loan", "1.0.1", FUNCTION_V1)
+
+        assert first is second
+        assert cache.get_stats()["compilations"] == 1
+        assert cache.get("loan", "1.0.1") is first
+
+    def test_hit_and_miss_counters(self):
+        """Lookups are counted as hits or misses"""
+        cache = CompiledFunctionCache()
+
+        assert cache.get("loan", "1.0.0") is None
+        cache.load("loan", "1.0.0", FUNCTION_V1)
+        assert cache.get("loan", "1.0.0") is not None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_ratio"] == 0.5
+        assert stats["total_compile_time_ms"] > 0
+
+    def test_lru_eviction(self):
+        """Least recently used entries are evicted first"""
+        cache = CompiledFunctionCache(max_entries=2)
+
+        cache.load("a", "1", FUNCTION_V1)
+        cache.load("b", "1", FUNCTION_V2)
+        cache.get("a", "1")
+        cache.load("c", "1", "def decision_function(i, c):\n    return {}\n")
+
+        assert cache.get("a", "1") is not None
+        assert cache.get("b", "1") is None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_invalidate_keeps_shared_source(self):
+        """Invalidating one version keeps source still used by another"""
+        cache = CompiledFunctionCache()
+        cache.load("loan", "1.0.0", FUNCTION_V1)
+        cache.load("loan", "1.0.1", FUNCTION_V1)
+
+        cache.invalidate("loan", "1.0.0")
+
+        assert cache.get("loan", "1.0.0") is None
+        assert cache.get("loan", "1.0.1") is not None
+        assert cache.get_stats()["size"] == 1
+
+    def test_missing_decision_function(self):
+        """Source without decision_function is rejected"""
+        cache = CompiledFunctionCache()
+
+        with pytest.raises(StorageError):
+            cache.load("broken", "1.0.0", "x = 1\n")
+
+        assert cache.get_stats()["size"] == 0
+
+    def test_disabled_cache_always_compiles(self):
+        """A disabled cache compiles on every load"""
+        cache = CompiledFunctionCache(enabled=False)
+
+        cache.load("loan", "1.0.0", FUNCTION_V1)
+        cache.load("loan", "1.0.0", FUNCTION_V1)
+
+        assert cache.get("loan", "1.0.0") is None
+        assert cache.get_stats()["compilations"] == 2
+
+
+class TestFileStorageFunctionCache:
+    """Test FileStorage integration with the function cache"""
+
+    @pytest.mark.asyncio
+    async def test_hot_function_skips_disk(self, tmp_path):
+        """A cached function is served without reading the file"""
+        storage = FileStorage(str(tmp_path))
+        await storage.save_function("loan", "1.0.0", FUNCTION_V1)
+
+        first = await storage.load_function_object("loan", "1.0.0")
+        (tmp_path / "loan" / "1.0.0.py").unlink()
+        second = await storage.load_function_object("loan", "1.0.0")
+
+        assert first is second
+        assert second({"amount": 50}, None) == {"approved": True}
+
+    @pytest.mark.asyncio
+    async def test_save_function_invalidates(self, tmp_path):
+        """Redeploying a version replaces the cached callable"""
+        storage = FileStorage(str(tmp_path))
+        await storage.save_function("loan", "1.0.0", FUNCTION_V1)
+        old = await storage.load_function_object("loan", "1.0.0")
+
+        await storage.save_function("loan", "1.0.0", FUNCTION_V2)
+        new = await storage.load_function_object("loan", "1.0.0")
+
+        assert old is not new
+        assert new({"amount": 200}, None) == {"approved": True}
+
+    def test_factory_passes_cache_config(self, tmp_path):
+        """Cache settings are read from the storage config"""
+        storage = create_storage_backend(
+            "file",
+            {"path": str(tmp_path), "function_cache": {"max_entries": 8}},
+        )
+
+        assert storage.function_cache.max_entries == 8
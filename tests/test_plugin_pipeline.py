@@ -0,0 +1,177 @@
+"""
+Tests for the fused plugin pipeline
+"""
+
+from datetime import datetime
+from typing import Any, Dict
+
+import pytest
+
+from policy_as_code.core.engine import (
+    DecisionContext,
+    DecisionEngine,
+    DecisionPlugin,
+    TracingPlugin,
+    ValidationPlugin,
+)
+from policy_as_code.core.plugin_pipeline import PluginPipeline
+
+FUNCTION = """
+def decision_function(input_data, context):
+    return {"eligible": input_data["income"] < 30000}
+"""
+
+
+class AsyncStampPlugin(DecisionPlugin):
+    """Async plugin that returns a new dict"""
+
+    mutates_data = False
+
+    async def process(
+        self, data: Dict[str, Any], context: DecisionContext
+    ) -> Dict[str, Any]:
+        return {**data, "stamped": True}
+
+    @property
+    def name(self) -> str:
+        return "stamp"
+
+
+class AuditedValidationPlugin(ValidationPlugin):
+    """Overrides only the async entry point of a sync-capable plugin"""
+
+    async def process(
+        self, data: Dict[str, Any], context: DecisionContext
+    ) -> Dict[str, Any]:
+        return {**await super().process(data, context), "audited": True}
+
+
+def make_context() -> DecisionContext:
+    return DecisionContext(
+        function_id="benefit",
+        version="1.0.0",
+        input_hash="h",
+        timestamp=datetime.utcnow(),
+        trace_id="t1",
+    )
+
+
+class TestPluginPipeline:
+    """Test chain resolution and copying"""
+
+    def test_sync_chain_runs_without_awaiting(self, tmp_path):
+        """Synchronous plugins are called directly"""
+        pipeline = PluginPipeline(
+            {
+                "pre_execute": [ValidationPlugin(), TracingPlugin(str(tmp_path))],
+                "post_execute": [],
+            }
+        )
+        data = {"income": 1}
+
+        processed = pipeline.pre(data, make_context())
+
+        assert not pipeline.pre_is_async
+        assert processed["_trace"]["trace_id"] == "t1"
+        # The mutating tracing plugin ran on a copy
+        assert data == {"income": 1}
+
+    def test_non_mutating_chain_does_not_copy(self):
+        """Inputs pass through untouched when no plugin mutates them"""
+        pipeline = PluginPipeline(
+            {"pre_execute": [ValidationPlugin()], "post_execute": []}
+        )
+        data = {"income": 1}
+
+        assert pipeline.pre(data, make_context()) is data
+        assert pipeline.get_stats()["pre_execute"]["copies_input"] is False
+
+    @pytest.mark.asyncio
+    async def test_async_plugins_are_awaited(self):
+        """Chains with an async plugin return an awaitable"""
+        pipeline = PluginPipeline(
+            {
+                "pre_execute": [ValidationPlugin(), AsyncStampPlugin()],
+                "post_execute": [],
+            }
+        )
+
+        assert pipeline.pre_is_async
+        assert await pipeline.pre({"income": 1}, make_context()) == {
+            "income": 1,
+            "stamped": True,
+        }
+        stats = pipeline.get_stats()["pre_execute"]
+        assert stats["async_plugins"] == 1
+        assert stats["calls"] == 1
+
+    @pytest.mark.asyncio
+    async def test_overridden_process_is_not_skipped(self):
+        """An inherited process_sync does not bypass an overridden process"""
+        pipeline = PluginPipeline(
+            {"pre_execute": [AuditedValidationPlugin()], "post_execute": []}
+        )
+
+        assert pipeline.pre_is_async
+        assert await pipeline.pre({"income": 1}, make_context()) == {
+            "income": 1,
+            "audited": True,
+        }
+
+    def test_required_fields(self):
+        """Validation checks the required fields resolved from the schema"""
+        plugin = ValidationPlugin({"input": {"income": {"required": True}}})
+
+        with pytest.raises(ValueError):
+            plugin.process_sync({}, make_context())
+        plugin.schema = None
+        assert plugin.process_sync({}, make_context()) == {}
+
+
+class TestEnginePluginPipeline:
+    """Test the pipeline inside the core engine"""
+
+    @pytest.mark.asyncio
+    async def test_execute_does_not_mutate_caller_input(self, tmp_path):
+        """Tracing metadata never leaks into the caller's dict"""
+        engine = DecisionEngine(
+            config={
+                "storage": {"path": str(tmp_path)},
+                "plugins": {"tracing": {"path": str(tmp_path / "traces")}},
+                "security": {"enable_input_sanitization": False},
+            }
+        )
+        await engine.deploy_function("benefit", "1.0.0", FUNCTION)
+        input_data = {"income": 100}
+
+        result = await engine.execute("benefit", input_data, "1.0.0")
+
+        assert result == {"eligible": True}
+        assert input_data == {"income": 100}
+        stats = engine.get_plugin_stats()
+        assert stats["pre_execute"]["plugins"] == 2
+        assert stats["pre_execute"]["calls"] == 1
+        assert stats["avg_overhead_us"] > 0
+
+    @pytest.mark.asyncio
+    async def test_add_plugin_rebuilds_pipeline(self, tmp_path):
+        """Adding a plugin takes effect on the next execution"""
+        engine = DecisionEngine(
+            config={
+                "storage": {"path": str(tmp_path)},
+                "plugins": {
+                    "tracing": {"enabled": False},
+                    "caching": {"enabled": False},
+                },
+            }
+        )
+        await engine.deploy_function("benefit", "1.0.0", FUNCTION)
+        await engine.execute("benefit", {"income": 1}, "1.0.0")
+        assert not engine.plugin_pipeline.post_is_async
+
+        engine.add_plugin("post_execute", AsyncStampPlugin())
+        result = await engine.execute("benefit", {"income": 1}, "1.0.0")
+
+        assert result == {"eligible": True, "stamped": True}
+        with pytest.raises(ValueError):
+            engine.add_plugin("during", AsyncStampPlugin())
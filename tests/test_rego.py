@@ -0,0 +1,263 @@
+"""
+Tests for the in-process Rego policy compiler
+"""
+
+from pathlib import Path
+
+import pytest
+
+from policy_as_code.features.rego import (
+    RegoCompileError,
+    RegoCompiler,
+    RegoEvalError,
+    RegoPolicy,
+    load_rego_policy,
+    rego_compare,
+)
+
+LOAN_POLICY = (
+    Path(__file__).resolve().parent.parent
+    / "policies"
+    / "rego"
+    / "loan_approval"
+    / "v1.0"
+)
+
+APPLICANT = {
+    "amount": 3000,
+    "customer_score": 650,
+    "customer_tier": "standard",
+    "employment_status": "employed",
+    "monthly_income": 4000,
+    "loan_purpose": "personal",
+}
+
+EXAMPLE_POLICY = """
+package example.orders
+
+import rego.v1
+
+default limit := 100
+
+limit := 500 if input.tier in {"gold", "vip"}
+
+over_limit contains item.id if {
+    some item in input.items
+    item.amount > limit
+}
+
+tagged contains key if {
+    some key, value in input.tags
+    value == true
+}
+
+item_count := count(input.items)
+
+doubled := [limit * 2, limit / 3, -limit]
+
+first_sku := input.items[0].id
+
+names := {"by_id": {item.id: item.amount}} if {
+    some item in input.items
+    startswith(item.id, "A")
+}
+"""
+
+
+class TestLoanApprovalConformance:
+    """Test the shipped loan approval policy against its fixtures"""
+
+    def test_policy_test_fixtures(self):
+        """Every test_ rule in policy_test.rego holds"""
+        policy = load_rego_policy(LOAN_POLICY, include_tests=True)
+
+        results = policy.run_tests()
+
+        assert len(results) == 12
+        assert all(results.values()), results
+
+    @pytest.mark.parametrize(
+        "changes, expected",
+        [
+            (
+                {},
+                {
+                    "allow": True,
+                    "approved": True,
+                    "input_valid": True,
+                    "rule_small_personal_loans": True,
+                    "decision_result": "approved_small_personal_loans",
+                },
+            ),
+            (
+                {"customer_score": 400},
+                {
+                    "allow": False,
+                    "approved": False,
+                    "input_valid": True,
+                    "rule_minimum_credit_score": True,
+                    "deny": True,
+                    "decision_result": "rejected_minimum_credit_score",
+                },
+            ),
+            (
+                {"amount": 7000, "customer_tier": "basic", "monthly_income": None},
+                {
+                    "allow": False,
+                    "approved": False,
+                    "input_valid": True,
+                    "rule_income_verification": True,
+                    "deny": True,
+                    "decision_result": "rejected_income_verification",
+                },
+            ),
+            (
+                # null sorts below numbers, so null <= 5000 holds
+                {"amount": None},
+                {
+                    "allow": False,
+                    "approved": False,
+                    "rule_small_personal_loans": True,
+                    "decision_result": "approved_small_personal_loans",
+                },
+            ),
+        ],
+    )
+    def test_documents(self, changes, expected):
+        """The package document matches what OPA returns"""
+        policy = load_rego_policy(LOAN_POLICY)
+
+        assert policy.evaluate({**APPLICANT, **changes}) == expected
+
+    def test_missing_and_mistyped_fields(self):
+        """Missing fields are undefined; other types compare by type order"""
+        policy = load_rego_policy(LOAN_POLICY)
+
+        no_income = {k: v for k, v in APPLICANT.items() if k != "monthly_income"}
+        assert policy.query("input_valid", no_income) is True
+        assert policy.query("input_valid", {"amount": 10}) is None
+        # Strings sort above numbers, so "low" < 500 does not hold
+        assert (
+            policy.query("rule_minimum_credit_score", {"customer_score": "low"}) is None
+        )
+        # null sorts below numbers, so null > 0 does not hold
+        assert (
+            policy.query(
+                "rule_debt_to_income_check", {"amount": 20000, "monthly_income": None}
+            )
+            is None
+        )
+        assert policy.evaluate() == {
+            "allow": False,
+            "approved": False,
+            "decision_result": "rejected_default",
+        }
+
+    def test_conflicting_values(self):
+        """A complete rule with two different values is an error, as in OPA"""
+        policy = load_rego_policy(LOAN_POLICY)
+        applicant = {**APPLICANT, "amount": 15000, "customer_score": 700}
+        applicant["customer_tier"] = "premium"
+
+        assert policy.query("allow", applicant) is True
+        with pytest.raises(RegoEvalError):
+            policy.query("decision_result", applicant)
+
+
+class TestRegoSubset:
+    """Test iteration, sets, builtins and references"""
+
+    def test_iteration_and_sets(self):
+        """some ... in binds variables and partial set rules collect values"""
+        policy = RegoPolicy(EXAMPLE_POLICY)
+        document = policy.evaluate(
+            {
+                "tier": "gold",
+                "items": [
+                    {"id": "B2", "amount": 900},
+                    {"id": "A1", "amount": 600},
+                    {"id": "C3", "amount": 100},
+                    {"id": "B2", "amount": 700},
+                ],
+                "tags": {"urgent": True, "fragile": False, "gift": True},
+            }
+        )
+
+        assert document == {
+            "limit": 500,
+            "over_limit": ["A1", "B2"],
+            "tagged": ["gift", "urgent"],
+            "item_count": 4,
+            "doubled": [1000, 500 / 3, -500],
+            "first_sku": "B2",
+            "names": {"by_id": {"A1": 600}},
+        }
+
+    def test_undefined_input(self):
+        """Without input, only defaults and constant rules are defined"""
+        document = RegoPolicy(EXAMPLE_POLICY).evaluate()
+
+        assert document == {
+            "limit": 100,
+            "over_limit": [],
+            "tagged": [],
+            "doubled": [200, 100 / 3, -100],
+        }
+
+    def test_data_references(self):
+        """Rules can be referenced through data.<package> and data is readable"""
+        policy = RegoPolicy(
+            """
+package example.data
+allowed if { data.example.data.level >= data.thresholds.minimum }
+level := input.level
+"""
+        )
+
+        assert policy.query("allowed", {"level": 3}, {"thresholds": {"minimum": 2}})
+        assert (
+            policy.query("allowed", {"level": 1}, {"thresholds": {"minimum": 2}})
+            is None
+        )
+
+    def test_type_order(self):
+        """Values of different types order as in OPA"""
+        ordered = [None, False, True, -1, 2.5, "a", [1], {"a": 1}]
+        for i, lower in enumerate(ordered):
+            for higher in ordered[i + 1 :]:
+                assert rego_compare(lower, higher) == -1
+                assert rego_compare(higher, lower) == 1
+        assert rego_compare(1, 1.0) == 0
+
+    @pytest.mark.parametrize(
+        "source",
+        [
+            "package p\nf(x) := x + 1",
+            "package p\nallow if { unknown_builtin(input.x) }",
+            "package p\nallow if { input.x == missing_var }",
+            "package p\na if { b }\nb if { a }",
+            "package p\na := 1 if { input.x } else := 2",
+            "package p\nimport data.other",
+            "package p\nallow if { input.x ~ 1 }",
+        ],
+    )
+    def test_unsupported_policies(self, source):
+        """Policies outside the subset are rejected when compiled"""
+        with pytest.raises(RegoCompileError):
+            RegoPolicy(source)
+
+
+class TestRegoCompiler:
+    """Test the compiled policy cache"""
+
+    def test_identical_sources_compile_once(self):
+        """The same policy text returns the same compiled policy"""
+        compiler = RegoCompiler()
+
+        first = compiler.load(LOAN_POLICY)
+        second = compiler.load(LOAN_POLICY)
+
+        assert first is second
+        assert compiler.get_stats()["misses"] == 1
+        assert compiler.get_stats()["hits"] == 1
+        assert compiler.load(LOAN_POLICY, include_tests=True) is not first
@@ -0,0 +1,148 @@
+"""
+Tests for the bounded decision result cache
+"""
+
+import pytest
+
+from policy_as_code.core import enhanced_engine
+from policy_as_code.core.engine import DecisionEngine
+from policy_as_code.core.result_cache import ResultCache
+from policy_as_code.core.storage import FileStorage
+from policy_as_code.tracing.enhanced_ledger import ImmutableTraceLedger
+
+COUNTING_FUNCTION = """
+calls = {"count": 0}
+
+def decision_function(input_data, context):
+    calls["count"] += 1
+    return {"eligible": input_data["age"] >= 18, "calls": calls["count"]}
+"""
+
+
+class FakeClock:
+    """Manually advanced monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResultCache:
+    """Test ResultCache eviction and accounting"""
+
+    def test_hit_ratio(self):
+        """Hits and misses are reported as a ratio"""
+        cache = ResultCache()
+        cache.put("f", "1", "h", {"ok": True}, 10)
+
+        assert cache.get("f", "1", "h") == {"ok": True}
+        assert cache.get("f", "1", "other") is None
+        assert cache.get_stats()["hit_ratio"] == 0.5
+
+    def test_max_entries_evicts_lru(self):
+        """Entry limit evicts the least recently used entry"""
+        cache = ResultCache(max_entries=2)
+        cache.put("f", "1", "a", 1, 1)
+        cache.put("f", "1", "b", 2, 1)
+        cache.get("f", "1", "a")
+        cache.put("f", "1", "c", 3, 1)
+
+        assert cache.get("f", "1", "b") is None
+        assert cache.get("f", "1", "a") == 1
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_max_bytes_bound(self):
+        """Byte budget is enforced and oversized values are rejected"""
+        cache = ResultCache(max_bytes=100)
+        cache.put("f", "1", "a", "x", 60)
+        cache.put("f", "1", "b", "y", 60)
+
+        assert len(cache) == 1
+        assert cache.current_bytes == 60
+        assert cache.put("f", "1", "c", "z", 101) is False
+
+    def test_per_function_ttl(self):
+        """Per-function TTL overrides the default"""
+        clock = FakeClock()
+        cache = ResultCache(
+            default_ttl_seconds=100, function_ttls={"fast": 1}, clock=clock
+        )
+        cache.put("fast", "1", "h", "a", 1)
+        cache.put("slow", "1", "h", "b", 1)
+
+        clock.now = 5
+        assert cache.get("fast", "1", "h") is None
+        assert cache.get("slow", "1", "h") == "b"
+        assert cache.get_stats()["expirations"] == 1
+
+    def test_non_cacheable_functions(self):
+        """Opted-out functions are never stored"""
+        cache = ResultCache(non_cacheable=["random_audit"])
+
+        assert cache.put("random_audit", "1", "h", "x", 1) is False
+        cache.set_function_policy("other", cacheable=False)
+        assert cache.is_cacheable("other") is False
+
+
+class TestEngineResultCache:
+    """Test the result cache stage in the core DecisionEngine"""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        config = {
+            "storage": {"path": str(tmp_path)},
+            "plugins": {"tracing": {"path": str(tmp_path / "traces")}},
+        }
+        return DecisionEngine(config=config)
+
+    @pytest.mark.asyncio
+    async def test_repeated_input_skips_execution(self, engine):
+        """An identical request is served without running the function"""
+        await engine.deploy_function("age_check", "1.0.0", COUNTING_FUNCTION)
+
+        first = await engine.execute("age_check", {"age": 30})
+        second = await engine.execute("age_check", {"age": 30})
+        third = await engine.execute("age_check", {"age": 10})
+
+        assert first == second == {"eligible": True, "calls": 1}
+        assert third["calls"] == 2
+        assert engine.get_cache_stats()["results"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_result_is_a_copy(self, engine):
+        """Mutating a returned result does not corrupt the cache"""
+        await engine.deploy_function("age_check", "1.0.0", COUNTING_FUNCTION)
+
+        first = await engine.execute("age_check", {"age": 30})
+        first["eligible"] = False
+        second = await engine.execute("age_check", {"age": 30})
+
+        assert second["eligible"] is True
+
+    @pytest.mark.asyncio
+    async def test_redeploy_invalidates(self, engine):
+        """Deploying a version drops its cached results"""
+        await engine.deploy_function("age_check", "1.0.0", COUNTING_FUNCTION)
+        await engine.execute("age_check", {"age": 30})
+
+        await engine.deploy_function("age_check", "1.0.0", COUNTING_FUNCTION)
+        result = await engine.execute("age_check", {"age": 30})
+
+        assert result["calls"] == 1
+        assert engine.get_cache_stats()["results"]["hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_enhanced_reregister_invalidates(self, tmp_path):
+        """Registering a version again drops its cached results"""
+        engine = enhanced_engine.DecisionEngine()
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        engine.register_function("f", "1.0.0", lambda data, context: {"v": 1})
+        await engine.execute_decision("f", "1.0.0", {"age": 30})
+
+        engine.register_function("f", "1.0.0", lambda data, context: {"v": 2})
+        result = await engine.execute_decision("f", "1.0.0", {"age": 30})
+
+        assert result.result == {"v": 2}
@@ -0,0 +1,198 @@
+"""
+Tests for single-flight coalescing of identical executions
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+import pytest
+
+from policy_as_code.core import enhanced_engine
+from policy_as_code.core.engine import DecisionEngine as CoreDecisionEngine
+from policy_as_code.core.single_flight import SingleFlight
+from policy_as_code.core.storage import FileStorage
+from policy_as_code.tracing.enhanced_ledger import ImmutableTraceLedger
+
+CALLS = {"count": 0}
+
+SLOW_FUNCTION = """
+import time
+
+def decision_function(input_data, context):
+    time.sleep(0.05)
+    return {"eligible": input_data["income"] < 30000}
+"""
+
+
+def slow_function(input_data: Dict[str, Any], context) -> Dict[str, Any]:
+    CALLS["count"] += 1
+    time.sleep(0.05)
+    return {"eligible": input_data["income"] < 30000}
+
+
+class TestSingleFlight:
+    """Test the in-flight registry"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_run(self):
+        """Callers with the same key await the first execution"""
+        flight = SingleFlight()
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+            return {"value": 1}
+
+        outcomes = await asyncio.gather(*(flight.do("k", work) for _ in range(5)))
+
+        assert len(runs) == 1
+        assert [shared for _, shared in outcomes].count(False) == 1
+        assert all(value == {"value": 1} for value, _ in outcomes)
+        assert flight.get_stats()["coalesced"] == 4
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_callers_get_their_own_value(self):
+        """Mutating one caller's value does not change another's"""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return {"value": 1, "tags": ["a"]}
+
+        async def mutating_leader():
+            value, _ = await flight.do("k", work)
+            value["value"] = 2
+            value["tags"].append("b")
+            return value
+
+        leader = asyncio.ensure_future(mutating_leader())
+        await asyncio.sleep(0)
+        value, shared = await flight.do("k", work)
+        await leader
+
+        assert shared
+        assert value == {"value": 1, "tags": ["a"]}
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        """A failing execution fails all of its callers"""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        outcomes = await asyncio.gather(
+            flight.do("k", work), flight.do("k", work), return_exceptions=True
+        )
+
+        assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+        assert len(flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_shared_run(self):
+        """Cancelling the first caller leaves followers unaffected"""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        leader = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(flight.do("k", work))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == ("done", True)
+
+    @pytest.mark.asyncio
+    async def test_disabled(self):
+        """A disabled registry runs every call"""
+        flight = SingleFlight(enabled=False)
+        runs = []
+
+        async def work():
+            runs.append(1)
+            await asyncio.sleep(0.01)
+
+        await asyncio.gather(flight.do("k", work), flight.do("k", work))
+
+        assert len(runs) == 2
+
+
+class TestEngineCoalescing:
+    """Test coalescing in the decision engines"""
+
+    @pytest.mark.asyncio
+    async def test_enhanced_engine_coalesces_duplicates(self, tmp_path):
+        """Concurrent identical requests execute once but trace separately"""
+        engine = enhanced_engine.DecisionEngine()
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        engine.register_function("benefit", "1.0.0", slow_function)
+        CALLS["count"] = 0
+
+        results = await asyncio.gather(
+            *(
+                engine.execute_decision("benefit", "1.0.0", {"income": 100})
+                for _ in range(4)
+            )
+        )
+
+        assert CALLS["count"] == 1
+        assert all(r.result == {"eligible": True} for r in results)
+        assert len({r.trace_id for r in results}) == 4
+        assert engine.trace_ledger.get_ledger_stats()["total_entries"] == 4
+        health = await engine.health_check()
+        assert health["coalescing"]["coalesced"] == 3
+
+    @pytest.mark.asyncio
+    async def test_enhanced_batch_runs_distinct_inputs_once(self, tmp_path):
+        """Duplicate inputs within a batch chunk execute once"""
+        engine = enhanced_engine.DecisionEngine()
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        engine.register_function("benefit", "1.0.0", slow_function)
+        CALLS["count"] = 0
+
+        results = await engine.execute_batch(
+            "benefit", [{"income": 1}, {"income": 1}, {"income": 99999}], "1.0.0"
+        )
+
+        assert CALLS["count"] == 2
+        assert [r.result["eligible"] for r in results] == [True, True, False]
+        assert results[0].result is not results[1].result
+        assert len({r.trace_id for r in results}) == 3
+        assert engine._single_flight.get_stats()["coalesced"] == 1
+
+    @pytest.mark.asyncio
+    async def test_core_engine_coalesces_duplicates(self, tmp_path):
+        """The core engine shares one execution and keeps per-caller traces"""
+        engine = CoreDecisionEngine(
+            config={
+                "storage": {"path": str(tmp_path)},
+                "plugins": {
+                    "tracing": {"path": str(tmp_path / "traces")},
+                    "caching": {"enabled": False},
+                },
+            }
+        )
+        await engine.deploy_function("benefit", "1.0.0", SLOW_FUNCTION)
+
+        results = await asyncio.gather(
+            *(engine.execute("benefit", {"income": 5}, "1.0.0") for _ in range(3))
+        )
+
+        assert results == [{"eligible": True}] * 3
+        results[0]["eligible"] = False
+        assert results[1:] == [{"eligible": True}] * 2
+        assert engine.get_coalescing_stats()["executions"] == 1
+        assert engine.get_coalescing_stats()["coalesced"] == 2
+        trace_lines = []
+        for trace_file in (tmp_path / "traces").glob("*.jsonl"):
+            trace_lines.extend(trace_file.read_text().splitlines())
+        assert len(trace_lines) == 3
@@ -0,0 +1,259 @@
+"""
+Contract tests every storage backend must pass
+
+Runs against FileStorage (per-file and segmented-log layouts) and
+SQLiteStorage. Set POLICY_AS_CODE_TEST_POSTGRES to a connection string to
+include PostgreSQLStorage, with and without write-behind batching.
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+
+from policy_as_code.core.decision_log import DecisionLog
+from policy_as_code.core.errors import StorageError
+from policy_as_code.core.storage import (
+    FileStorage,
+    PostgreSQLStorage,
+    SQLiteStorage,
+)
+from policy_as_code.core.write_behind import WriteBehindConfig
+
+POSTGRES = os.environ.get("POLICY_AS_CODE_TEST_POSTGRES")
+
+FUNCTION_CODE = """
+def decision_function(input_data, context):
+    return {"approved": input_data.get("amount", 0) < 1000}
+"""
+
+START = datetime(2024, 3, 1, 9, 0, 0)
+
+
+def context(n, function_id="loan", version="1.0.0", timestamp=None):
+    return SimpleNamespace(
+        trace_id=f"trace-{function_id}-{n}",
+        function_id=function_id,
+        version=version,
+        timestamp=timestamp or START + timedelta(hours=n),
+    )
+
+
+def result(n):
+    return {"success": n % 3 != 0, "execution_time_ms": n + 1}
+
+
+@pytest_asyncio.fixture(
+    params=[
+        "file",
+        "file-log",
+        "sqlite",
+        *(
+            pytest.param(
+                name,
+                marks=pytest.mark.skipif(
+                    not POSTGRES, reason="POLICY_AS_CODE_TEST_POSTGRES not set"
+                ),
+            )
+            for name in ["postgresql", "postgresql-write-behind"]
+        ),
+    ]
+)
+async def storage(request, tmp_path):
+    if request.param == "file":
+        backend = FileStorage(str(tmp_path))
+    elif request.param == "file-log":
+        backend = FileStorage(
+            str(tmp_path),
+            decision_log=DecisionLog(str(tmp_path / "log"), max_segment_bytes=1024),
+        )
+    elif request.param == "sqlite":
+        backend = SQLiteStorage(str(tmp_path / "decisions.db"), batch_size=8)
+    else:
+        write_behind = None
+        if request.param == "postgresql-write-behind":
+            write_behind = WriteBehindConfig(enabled=True, max_batch=8)
+        backend = PostgreSQLStorage(POSTGRES, write_behind=write_behind)
+        await backend.connect()
+        async with backend.pool.acquire() as conn:
+            await conn.execute(
+                "TRUNCATE functions, decisions, decision_daily_stats, "
+                "releases, function_specs"
+            )
+    yield backend
+    if hasattr(backend, "close"):
+        await backend.close()
+
+
+class TestFunctionContract:
+    """Function versions round-trip through every backend"""
+
+    @pytest.mark.asyncio
+    async def test_save_load_and_list(self, storage):
+        """Saved versions load back and list in semantic-version order"""
+        for version in ["1.9.0", "1.10.0", "1.2.0"]:
+            await storage.save_function("loan", version, FUNCTION_CODE)
+
+        assert await storage.load_function("loan", "1.10.0") == FUNCTION_CODE
+        assert "loan" in await storage.list_functions()
+        assert await storage.list_versions("loan") == ["1.2.0", "1.9.0", "1.10.0"]
+        assert await storage.get_latest_version("loan") == "1.10.0"
+        function = await storage.load_function_object("loan", "1.2.0")
+        assert function({"amount": 10}, None) == {"approved": True}
+        with pytest.raises(StorageError):
+            await storage.load_function("loan", "9.9.9")
+
+
+class TestDecisionContract:
+    """Decisions, history and statistics behave the same everywhere"""
+
+    @pytest.mark.asyncio
+    async def test_store_retrieve_and_history(self, storage):
+        """History is newest first and paginates"""
+        for n in range(12):
+            await storage.store_decision(context(n), result(n))
+        await storage.store_decision(context(0, function_id="other"), result(0))
+
+        decision = await storage.retrieve_decision("trace-loan-4")
+        assert decision["function_id"] == "loan"
+        assert decision["version"] == "1.0.0"
+        assert decision["result"] == result(4)
+        assert datetime.fromisoformat(decision["timestamp"]) == START + timedelta(
+            hours=4
+        )
+        with pytest.raises(StorageError):
+            await storage.retrieve_decision("missing")
+
+        history = await storage.get_decision_history("loan", limit=3, offset=2)
+        assert [d["trace_id"] for d in history] == [
+            "trace-loan-9",
+            "trace-loan-8",
+            "trace-loan-7",
+        ]
+        assert len(await storage.get_decision_history("loan")) == 12
+        assert await storage.get_decision_history("unknown") == []
+
+        in_range = await storage.get_decisions_by_date_range(
+            START + timedelta(hours=2), START + timedelta(hours=4)
+        )
+        assert [d["trace_id"] for d in in_range] == [
+            "trace-loan-4",
+            "trace-loan-3",
+            "trace-loan-2",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes(self, storage):
+        """Decisions stored concurrently are all readable"""
+        await asyncio.gather(
+            *(storage.store_decision(context(n), result(n)) for n in range(40))
+        )
+
+        assert len(await storage.get_decision_history("loan", limit=100)) == 40
+        assert (await storage.get_decision_stats("loan"))["total_decisions"] == 40
+
+    @pytest.mark.asyncio
+    async def test_stats_and_rebuild(self, storage):
+        """Stats match the stored decisions and survive a rebuild"""
+        for n in range(30):
+            await storage.store_decision(context(n), result(n))
+
+        stats = await storage.get_decision_stats("loan")
+        assert stats["total_decisions"] == 30
+        assert stats["success_rate"] == pytest.approx(20 / 30)
+        assert stats["avg_execution_time"] == pytest.approx(15.5)
+        assert datetime.fromisoformat(stats["first_decision"]) == START
+        daily = await storage.get_daily_decision_stats("loan")
+        assert list(daily) == ["2024-03-01", "2024-03-02"]
+        assert daily["2024-03-01"]["total_decisions"] == 15
+        assert (await storage.get_decision_stats("unknown"))["total_decisions"] == 0
+
+        report = await storage.rebuild_decision_stats(dry_run=True)
+        assert report["decisions"] == 30
+        assert report["mismatches"] == []
+
+    @pytest.mark.asyncio
+    async def test_restored_trace(self, storage):
+        """Storing a trace id again replaces its decision in reads and stats"""
+        for n in range(3):
+            await storage.store_decision(context(n), result(n))
+        await storage.store_decision(context(1), result(3))
+
+        decision = await storage.retrieve_decision("trace-loan-1")
+        assert decision["result"] == result(3)
+        assert len(await storage.get_decision_history("loan")) == 3
+        stats = await storage.get_decision_stats("loan")
+        assert stats["total_decisions"] == 3
+        assert stats["success_rate"] == pytest.approx(1 / 3)
+        daily = await storage.get_daily_decision_stats("loan")
+        assert daily["2024-03-01"]["total_decisions"] == 3
+
+    @pytest.mark.asyncio
+    async def test_cleanup(self, storage):
+        """Old decisions are removed and stats recounted"""
+        now = datetime.now()
+        await storage.store_decision(
+            context(0, timestamp=now - timedelta(days=100)), result(0)
+        )
+        await storage.store_decision(context(1, timestamp=now), result(1))
+
+        assert await storage.cleanup_old_decisions(retention_days=30) == 1
+        assert [d["trace_id"] for d in await storage.get_decision_history("loan")] == [
+            "trace-loan-1"
+        ]
+        assert (await storage.get_decision_stats("loan"))["total_decisions"] == 1
+        assert (await storage.rebuild_decision_stats())["mismatches"] == []
+
+
+class TestRecordContract:
+    """Releases and function specs"""
+
+    @pytest.mark.asyncio
+    async def test_releases(self, storage):
+        """Releases store, filter and update"""
+        for n, (df_id, status) in enumerate(
+            [("loan", "PENDING"), ("loan", "ACTIVE"), ("fraud", "PENDING")]
+        ):
+            await storage.store_release(
+                {
+                    "release_id": f"rel-{n}",
+                    "df_id": df_id,
+                    "version": "1.0.0",
+                    "status": status,
+                    "effective_from": START,
+                    "sunset_date": None,
+                    "change_summary": "initial",
+                    "signatures": [],
+                    "created_at": START + timedelta(minutes=n),
+                    "created_by": "tester",
+                }
+            )
+
+        assert (await storage.get_release("rel-1"))["status"] == "ACTIVE"
+        assert await storage.get_release("missing") is None
+        assert [r["release_id"] for r in await storage.get_releases(df_id="loan")] == [
+            "rel-1",
+            "rel-0",
+        ]
+        assert [
+            r["release_id"] for r in await storage.get_releases(status="PENDING")
+        ] == ["rel-2", "rel-0"]
+
+        release = await storage.get_release("rel-0")
+        release["status"] = "ACTIVE"
+        await storage.update_release("rel-0", release)
+        assert (await storage.get_release("rel-0"))["status"] == "ACTIVE"
+        with pytest.raises(StorageError):
+            await storage.update_release("missing", release)
+
+    @pytest.mark.asyncio
+    async def test_function_specs(self, storage):
+        """Specs round-trip and unknown specs are None"""
+        spec = {"id": "loan", "version": "1.0.0", "rules": [{"if": "x", "then": 1}]}
+        await storage.store_function_spec("loan", "1.0.0", spec)
+
+        assert await storage.retrieve_function_spec("loan", "1.0.0") == spec
+        assert await storage.retrieve_function_spec("loan", "2.0.0") is None
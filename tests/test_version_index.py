@@ -0,0 +1,120 @@
+"""
+Tests for semantic-version ordering and the storage version index
+"""
+
+import pytest
+
+from policy_as_code.core.storage import FileStorage
+from policy_as_code.core.version_index import (
+    VersionIndex,
+    sort_versions,
+    version_sort_key,
+)
+
+FUNCTION_CODE = """
+def decision_function(input_data, context):
+    return {"ok": True}
+"""
+
+
+class TestVersionOrdering:
+    """Test semantic-version precedence"""
+
+    def test_numeric_components(self):
+        """Numeric parts compare as integers, not strings"""
+        assert sort_versions(["1.10.0", "1.9.0", "1.2.0"]) == [
+            "1.2.0",
+            "1.9.0",
+            "1.10.0",
+        ]
+
+    def test_prerelease_before_release(self):
+        """Pre-releases sort before their release"""
+        assert sort_versions(["1.0.0", "1.0.0-rc.1", "1.0.0-alpha"]) == [
+            "1.0.0-alpha",
+            "1.0.0-rc.1",
+            "1.0.0",
+        ]
+
+    def test_v_prefix_and_build_metadata(self):
+        """A 'v' prefix and build metadata do not affect precedence"""
+        assert version_sort_key("v2.0")[:4] == version_sort_key("2.0.0+build.7")[:4]
+        assert sort_versions(["v1.0", "v0.9"]) == ["v0.9", "v1.0"]
+
+    def test_non_semver_sorts_first(self):
+        """Free-form versions sort before semver ones"""
+        assert sort_versions(["1.0.0", "latest-draft"]) == ["latest-draft", "1.0.0"]
+
+
+class TestVersionIndex:
+    """Test VersionIndex bookkeeping"""
+
+    def test_add_keeps_order(self):
+        """Inserted versions keep semantic order"""
+        index = VersionIndex()
+        index.set("f", ["1.0.0", "1.2.0"])
+        index.add("f", "1.10.0")
+        index.add("f", "1.1.0")
+
+        assert index.versions("f") == ["1.0.0", "1.1.0", "1.2.0", "1.10.0"]
+        assert index.latest("f") == "1.10.0"
+
+    def test_freshness_window(self):
+        """Entries go stale after the refresh interval"""
+        now = [0.0]
+        index = VersionIndex(refresh_interval_seconds=5, clock=lambda: now[0])
+        index.set("f", ["1.0.0"])
+
+        assert index.is_fresh("f")
+        now[0] = 6
+        assert not index.is_fresh("f")
+        index.touch("f")
+        assert index.is_fresh("f")
+
+
+class TestFileStorageVersionIndex:
+    """Test FileStorage latest-version resolution"""
+
+    @pytest.mark.asyncio
+    async def test_latest_uses_semver(self, tmp_path):
+        """Latest version honours semantic ordering"""
+        storage = FileStorage(str(tmp_path))
+        for version in ["1.9.0", "1.10.0", "1.2.0"]:
+            await storage.save_function("f", version, FUNCTION_CODE)
+
+        assert await storage.get_latest_version("f") == "1.10.0"
+        assert await storage.list_versions("f") == ["1.2.0", "1.9.0", "1.10.0"]
+
+    @pytest.mark.asyncio
+    async def test_hot_path_does_not_touch_filesystem(self, tmp_path, monkeypatch):
+        """A fresh index answers without listing the directory"""
+        storage = FileStorage(str(tmp_path))
+        await storage.save_function("f", "1.0.0", FUNCTION_CODE)
+        await storage.get_latest_version("f")
+
+        def fail(*args, **kwargs):
+            raise AssertionError("filesystem was scanned")
+
+        monkeypatch.setattr(storage, "_refresh_version_index", fail)
+        await storage.save_function("f", "1.1.0", FUNCTION_CODE)
+
+        assert await storage.get_latest_version("f") == "1.1.0"
+
+    @pytest.mark.asyncio
+    async def test_external_changes_picked_up_after_refresh(self, tmp_path):
+        """Files added outside the backend appear once the entry is stale"""
+        storage = FileStorage(str(tmp_path), version_index=VersionIndex(0))
+        await storage.save_function("f", "1.0.0", FUNCTION_CODE)
+        assert await storage.get_latest_version("f") == "1.0.0"
+
+        (tmp_path / "f" / "2.0.0.py").write_text(FUNCTION_CODE)
+
+        assert await storage.get_latest_version("f") == "2.0.0"
+
+    @pytest.mark.asyncio
+    async def test_unknown_function(self, tmp_path):
+        """Unknown functions have no latest version"""
+        storage = FileStorage(str(tmp_path))
+
+        assert await storage.get_latest_version("missing") is None
+        assert await storage.list_versions("missing") == []
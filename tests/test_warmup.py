@@ -0,0 +1,236 @@
+"""
+Tests for startup warm-up and readiness
+"""
+
+import json
+from typing import Any, Dict
+
+import pytest
+
+from policy_as_code.core import enhanced_engine
+from policy_as_code.core.engine import DecisionEngine as CoreDecisionEngine
+from policy_as_code.core.storage import FileStorage
+from policy_as_code.core.warmup import WarmUp, WarmUpStatus
+from policy_as_code.tracing.enhanced_ledger import ImmutableTraceLedger
+
+FUNCTION_V1 = """
+def decision_function(input_data, context):
+    return {"version": 1, "eligible": input_data["income"] < 30000}
+"""
+
+FUNCTION_V2 = """
+def decision_function(input_data, context):
+    return {"version": 2, "eligible": input_data["income"] < 40000}
+"""
+
+
+def benefit(input_data: Dict[str, Any], context) -> Dict[str, Any]:
+    return {"eligible": input_data["income"] < 30000}
+
+
+def make_core_engine(tmp_path) -> CoreDecisionEngine:
+    return CoreDecisionEngine(
+        config={
+            "storage": {"path": str(tmp_path / "functions")},
+            "plugins": {"tracing": {"path": str(tmp_path / "traces")}},
+        }
+    )
+
+
+async def deploy_all(engine: CoreDecisionEngine) -> None:
+    for function_id in ("benefit", "housing"):
+        await engine.deploy_function(function_id, "1.0.0", FUNCTION_V1)
+        await engine.deploy_function(function_id, "1.1.0", FUNCTION_V2)
+    # Start cold, as after a restart
+    engine.storage.function_cache.clear()
+
+
+class TestCoreEngineWarmUp:
+    """Test warm-up in the core decision engine"""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_compiles_latest_versions(self, tmp_path):
+        """Latest versions are compiled before the first request"""
+        engine = make_core_engine(tmp_path)
+        await deploy_all(engine)
+        assert not engine.ready
+        assert engine.readiness_check()["status"] == "pending"
+
+        report = await engine.warm_up()
+
+        assert engine.ready
+        assert report.warmed == 2
+        assert report.duration_ms > 0
+        cache = engine.storage.function_cache
+        assert cache.get_compiled("benefit", "1.1.0") is not None
+        assert cache.get_compiled("benefit", "1.0.0") is None
+
+        compilations = cache.get_stats()["compilations"]
+        assert await engine.execute("benefit", {"income": 35000}) == {
+            "version": 2,
+            "eligible": True,
+        }
+        assert cache.get_stats()["compilations"] == compilations
+
+    @pytest.mark.asyncio
+    async def test_warm_up_all_versions(self, tmp_path):
+        """Every deployed version can be warmed"""
+        engine = make_core_engine(tmp_path)
+        await deploy_all(engine)
+
+        report = await engine.warm_up(versions="all")
+
+        assert report.warmed == 4
+        assert engine.readiness_check()["warmed"] == 4
+
+    @pytest.mark.asyncio
+    async def test_warm_up_active_versions(self, tmp_path):
+        """Active releases are warmed instead of the newest deployment"""
+        engine = make_core_engine(tmp_path)
+        await deploy_all(engine)
+        await engine.storage.store_release(
+            {
+                "release_id": "benefit_1.0.0",
+                "df_id": "benefit",
+                "version": "1.0.0",
+                "status": "ACTIVE",
+            }
+        )
+
+        report = await engine.warm_up(versions="active")
+
+        warmed = {(item.function_id, item.version) for item in report.functions}
+        assert warmed == {("benefit", "1.0.0"), ("housing", "1.1.0")}
+
+    @pytest.mark.asyncio
+    async def test_canary_failures_are_reported(self, tmp_path):
+        """A failing canary is reported without blocking readiness"""
+        engine = make_core_engine(tmp_path)
+        await deploy_all(engine)
+
+        report = await engine.warm_up(
+            canary_inputs={"benefit": {"income": 1}, "housing": {"rent": 1}}
+        )
+
+        assert engine.ready
+        assert report.warmed == 1
+        assert [item.function_id for item in report.failed] == ["housing"]
+        assert "KeyError" in report.failed[0].error
+        assert list((tmp_path / "traces").glob("*.jsonl")) == []
+        assert engine.readiness_check()["failed"] == {
+            "housing:1.1.0": report.failed[0].error
+        }
+
+    @pytest.mark.asyncio
+    async def test_enumeration_error_marks_failed(self, tmp_path):
+        """Readiness stays down when functions cannot be listed"""
+        engine = make_core_engine(tmp_path)
+
+        async def broken():
+            raise OSError("storage unavailable")
+
+        engine.list_functions = broken
+
+        with pytest.raises(OSError):
+            await engine.warm_up()
+
+        assert not engine.ready
+        assert engine.readiness_check()["status"] == WarmUpStatus.FAILED.value
+
+
+class TestEnhancedEngineWarmUp:
+    """Test warm-up in the enhanced decision engine"""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_with_canary(self, tmp_path):
+        """Registered functions are primed and canaries run untraced"""
+        engine = enhanced_engine.DecisionEngine()
+        engine.storage_backend = FileStorage(str(tmp_path))
+        engine.trace_ledger = ImmutableTraceLedger(engine.storage_backend)
+        engine.register_function("benefit", "1.0.0", benefit)
+        engine.register_function("benefit", "1.10.0", benefit)
+
+        report = await engine.warm_up(canary_inputs={"benefit": {"income": 1}})
+
+        assert [(item.version, item.ok) for item in report.functions] == [
+            ("1.10.0", True)
+        ]
+        assert report.functions[0].canary_ms is not None
+        assert engine.trace_ledger.get_ledger_stats()["total_entries"] == 0
+        health = await engine.health_check()
+        assert health["warm_up"]["ready"] is True
+        assert health["warm_up"]["canaries"] == 1
+
+
+class TestWarmUpReadiness:
+    """Test readiness reporting"""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """No more than ``concurrency`` functions are primed at once"""
+        import asyncio
+
+        warmup = WarmUp()
+        running = []
+        peak = []
+
+        async def prime(function_id, version):
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+        targets = [(f"f{i}", "1.0.0") for i in range(6)]
+        await warmup.run(targets, prime, concurrency=2)
+
+        assert max(peak) == 2
+        assert warmup.get_stats()["warmed"] == 6
+
+    def test_ready_endpoint(self):
+        """/ready answers 503 until startup warm-up completes"""
+        from fastapi.testclient import TestClient
+
+        from policy_as_code.api import enhanced_rest
+
+        enhanced_rest.decision_engine.warmup = WarmUp()
+        client = TestClient(enhanced_rest.app)
+        assert client.get("/ready").status_code == 503
+
+        with TestClient(enhanced_rest.app) as started:
+            response = started.get("/ready")
+
+        assert response.status_code == 200
+        assert response.json()["ready"] is True
+        assert "duration_ms" in response.json()
+
+
+class TestWarmUpCommand:
+    """Test the warmup CLI command"""
+
+    def test_warmup_command(self, tmp_path):
+        """The command warms functions and fails on canary errors"""
+        import asyncio
+
+        from click.testing import CliRunner
+
+        from policy_as_code.cli import cli
+
+        engine = make_core_engine(tmp_path)
+        asyncio.run(deploy_all(engine))
+        canaries = tmp_path / "canaries.json"
+        canaries.write_text(json.dumps({"benefit": {"income": 1}}))
+        storage = str(tmp_path / "functions")
+        runner = CliRunner()
+
+        result = runner.invoke(
+            cli, ["warmup", "--storage", storage, "--canaries", str(canaries)]
+        )
+        assert result.exit_code == 0, result.output
+        assert "Warmed 2 function versions" in result.output
+
+        canaries.write_text(json.dumps({"benefit": {}}))
+        result = runner.invoke(
+            cli, ["warmup", "--storage", storage, "--canaries", str(canaries)]
+        )
+        assert result.exit_code == 1
+        assert "benefit v1.1.0" in result.output
@@ -0,0 +1,155 @@
+"""
+Tests for write-behind batching
+"""
+
+import asyncio
+
+import pytest
+
+from policy_as_code.core.write_behind import WriteBehindBuffer, WriteBehindConfig
+
+
+class Sink:
+    """Flush target recording batches, optionally failing or blocking"""
+
+    def __init__(self, failures=0):
+        self.batches = []
+        self.failures = failures
+        self.gate = None
+
+    async def __call__(self, records):
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.batches.append(list(records))
+
+    @property
+    def records(self):
+        return [record for batch in self.batches for record in batch]
+
+
+def buffer(sink, **options):
+    return WriteBehindBuffer(sink, WriteBehindConfig(enabled=True, **options))
+
+
+class TestWriteBehindBuffer:
+    """Test batching thresholds, acknowledgement and draining"""
+
+    @pytest.mark.asyncio
+    async def test_batches_by_size(self):
+        """Full batches are written at once, the rest on flush"""
+        sink = Sink()
+        writes = buffer(sink, max_batch=4, max_delay_ms=60000)
+
+        await asyncio.gather(*(writes.put(n) for n in range(10)))
+        await writes.flush()
+
+        assert [len(batch) for batch in sink.batches] == [4, 4, 2]
+        assert sink.records == list(range(10))
+        stats = writes.get_stats()
+        assert stats["flushes"] == 3
+        assert stats["max_flush_size"] == 4
+        assert stats["buffered"] == 0
+        await writes.close()
+
+    @pytest.mark.asyncio
+    async def test_batches_by_delay(self):
+        """A partial batch is written once its oldest record is due"""
+        sink = Sink()
+        writes = buffer(sink, max_batch=100, max_delay_ms=10)
+
+        for n in range(3):
+            await writes.put(n)
+        assert sink.batches == []
+        await asyncio.sleep(0.2)
+
+        assert sink.batches == [[0, 1, 2]]
+        assert writes.get_stats()["last_lag_ms"] >= 10
+        await writes.close()
+
+    @pytest.mark.asyncio
+    async def test_ack_after_flush(self):
+        """In flush mode callers wait for the write and see its error"""
+        sink = Sink(failures=1)
+        writes = buffer(sink, ack="flush", max_delay_ms=1)
+
+        with pytest.raises(ConnectionError):
+            await writes.put("lost")
+        await writes.put("kept")
+
+        assert sink.records == ["kept"]
+        stats = writes.get_stats()
+        assert stats["failures"] == 1
+        assert stats["dropped"] == 0
+        await writes.close()
+
+    @pytest.mark.asyncio
+    async def test_retries_then_drops(self):
+        """In enqueue mode failed batches are retried, then dropped"""
+        sink = Sink(failures=2)
+        writes = buffer(sink, max_delay_ms=1, max_retries=2, retry_delay_ms=1)
+        await writes.put("retried")
+        await writes.flush()
+        assert sink.records == ["retried"]
+
+        sink.failures = 3
+        await writes.put("dropped")
+        await writes.flush()
+
+        assert sink.records == ["retried"]
+        stats = writes.get_stats()
+        assert stats["failures"] == 5
+        assert stats["dropped"] == 1
+        assert stats["last_error"] == "database unavailable"
+        await writes.close()
+
+    @pytest.mark.asyncio
+    async def test_backpressure_and_close(self):
+        """Writers wait while the buffer is full and close drains it"""
+        sink = Sink()
+        sink.gate = asyncio.Event()
+        writes = buffer(sink, capacity=2, max_batch=2, max_delay_ms=1)
+
+        puts = [asyncio.create_task(writes.put(n)) for n in range(7)]
+        await asyncio.sleep(0.05)
+        assert len(writes) == 2
+        assert not all(put.done() for put in puts)
+        assert writes.get_stats()["blocked"] > 0
+
+        sink.gate.set()
+        await asyncio.gather(*puts)
+        await writes.close()
+
+        assert sink.records == list(range(7))
+        assert len(writes) == 0
+
+    @pytest.mark.asyncio
+    async def test_buffered_includes_batch_in_flight(self):
+        """Unwritten records stay visible until their batch completes"""
+        sink = Sink()
+        sink.gate = asyncio.Event()
+        writes = buffer(sink, max_batch=2, max_delay_ms=1)
+
+        for n in range(3):
+            await writes.put(n)
+        await asyncio.sleep(0.05)
+        assert sink.batches == []
+        assert writes.buffered() == [0, 1, 2]
+
+        sink.gate.set()
+        await writes.flush()
+        assert writes.buffered() == []
+        await writes.close()
+
+    def test_config(self):
+        """Config sections are read with defaults and validated"""
+        config = WriteBehindConfig.from_config({"enabled": True, "ack": "flush"})
+        assert config.enabled
+        assert config.ack == "flush"
+        assert config.max_batch == WriteBehindConfig().max_batch
+        with pytest.raises(ValueError):
+            WriteBehindConfig(ack="never")
+        with pytest.raises(ValueError):
+            WriteBehindConfig(max_batch=10, capacity=5)